@@ -6,11 +6,14 @@ import io
 import json
 import logging
 import os
+import threading
 import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import httpx
 import xmltodict
@@ -21,7 +24,16 @@ try:  # pragma: no cover - dependency guard
 except ImportError:  # pragma: no cover - dependency guard
     yaml = None
 
+try:  # pragma: no cover - optional HTTP/2 support for httpx
+    import h2  # type: ignore  # noqa: F401
+except ImportError:  # pragma: no cover - dependency guard
+    h2 = None
+
+from core.env import env_bool, env_float, env_int
+from ingest.rate_limiter import TokenBucket
+from ingest.streaming_download import DownloadedFile, stream_download
 from services.ingest_errors import FatalIngestError, TransientIngestError
+from services.prometheus_helpers import build_counter
 
 load_dotenv()
 
@@ -33,6 +45,94 @@ CORP_CODE_URL = f"{DART_API_BASE}/corpCode.xml"
 DOCUMENT_URL = f"{DART_API_BASE}/document.xml"
 DS005_CATALOG_PATH = Path(__file__).resolve().parents[1] / "configs" / "ds005_endpoints.yaml"
 
+DART_HTTP_POOLED = env_bool("DART_HTTP_POOLED", True)
+DART_HTTP2 = env_bool("DART_HTTP2", True)
+DART_HTTP_MAX_CONNECTIONS = env_int("DART_HTTP_MAX_CONNECTIONS", 10, minimum=1)
+DART_HTTP_KEEPALIVE_SECONDS = env_float("DART_HTTP_KEEPALIVE_SECONDS", 30.0, minimum=0.0)
+DART_HTTP_TIMEOUT_SECONDS = env_float("DART_HTTP_TIMEOUT_SECONDS", 60.0, minimum=1.0)
+DART_RATE_LIMIT_PER_SECOND = env_float("DART_RATE_LIMIT_PER_SECOND", 5.0, minimum=0.0)
+DART_RATE_LIMIT_BURST = env_int("DART_RATE_LIMIT_BURST", 5, minimum=1)
+DART_LIST_CONCURRENCY = env_int("DART_LIST_CONCURRENCY", 4, minimum=1)
+ERROR_XML_MAX_BYTES = 64 * 1024
+
+_REQUEST_COUNTER = build_counter(
+    "dart_http_requests_total",
+    "DART OpenAPI requests grouped by endpoint and result (ok, error).",
+    ("endpoint", "result"),
+)
+_RATE_LIMIT_WAIT_COUNTER = build_counter(
+    "dart_rate_limit_wait_seconds_total",
+    "Seconds DART requests spent waiting for the shared token bucket.",
+)
+
+_SHARED_LOCK = threading.Lock()
+_SHARED_CLIENT: Optional[httpx.Client] = None
+_SHARED_CLIENT_PID: Optional[int] = None
+_SHARED_LIMITER: Optional[TokenBucket] = None
+
+
+def shared_http_client() -> httpx.Client:
+    """Return the process-wide keep-alive client used by pooled ``DartClient`` instances.
+
+    The client is rebuilt after a fork so worker processes never share sockets
+    with their parent. HTTP/2 is negotiated when the ``h2`` package is installed.
+    """
+
+    global _SHARED_CLIENT, _SHARED_CLIENT_PID
+    pid = os.getpid()
+    client = _SHARED_CLIENT
+    if client is not None and _SHARED_CLIENT_PID == pid:
+        return client
+    with _SHARED_LOCK:
+        if _SHARED_CLIENT is None or _SHARED_CLIENT_PID != pid:
+            _SHARED_CLIENT = httpx.Client(
+                timeout=DART_HTTP_TIMEOUT_SECONDS,
+                http2=DART_HTTP2 and h2 is not None,
+                limits=httpx.Limits(
+                    max_connections=DART_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=DART_HTTP_MAX_CONNECTIONS,
+                    keepalive_expiry=DART_HTTP_KEEPALIVE_SECONDS,
+                ),
+            )
+            _SHARED_CLIENT_PID = pid
+        return _SHARED_CLIENT
+
+
+def close_shared_http_client() -> None:
+    """Close the process-wide client (shutdown hooks and tests)."""
+
+    global _SHARED_CLIENT, _SHARED_CLIENT_PID
+    with _SHARED_LOCK:
+        client, _SHARED_CLIENT, _SHARED_CLIENT_PID = _SHARED_CLIENT, None, None
+    if client is not None:
+        client.close()
+
+
+def shared_rate_limiter() -> Optional[TokenBucket]:
+    """Return the token bucket shared by every thread, or ``None`` when unthrottled."""
+
+    global _SHARED_LIMITER
+    if DART_RATE_LIMIT_PER_SECOND <= 0:
+        return None
+    if _SHARED_LIMITER is None:
+        with _SHARED_LOCK:
+            if _SHARED_LIMITER is None:
+                _SHARED_LIMITER = TokenBucket(DART_RATE_LIMIT_PER_SECOND, DART_RATE_LIMIT_BURST)
+    return _SHARED_LIMITER
+
+
+def _record_request(endpoint: str, result: str) -> None:
+    if _REQUEST_COUNTER is None:
+        return
+    _REQUEST_COUNTER.labels(endpoint=endpoint, result=result).inc()
+
+
+def _decode_json_text(response: httpx.Response) -> str:
+    try:
+        return response.content.decode("utf-8")
+    except UnicodeDecodeError:
+        return response.content.decode("euc-kr", errors="replace")
+
 
 def _load_json_payload(text: str, *, context: str) -> Dict[str, Any]:
     stripped = (text or "").strip()
@@ -47,6 +147,13 @@ def _load_json_payload(text: str, *, context: str) -> Dict[str, Any]:
         raise FatalIngestError(f"{context} responded with invalid JSON.") from exc
 
 
+def _as_int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
 def _load_ds005_catalog(path: Path) -> Dict[str, str]:
     """Load DS005 endpoint metadata from the shared YAML catalog."""
     if yaml is None:
@@ -88,20 +195,70 @@ def _load_ds005_catalog(path: Path) -> Dict[str, str]:
 DS005_ENDPOINTS: Dict[str, str] = _load_ds005_catalog(DS005_CATALOG_PATH)
 
 class DartClient:
-    """Wrapper around DART OpenAPI endpoints used in M1 pipeline."""
+    """Wrapper around DART OpenAPI endpoints used in M1 pipeline.
+
+    In pooled mode (``DART_HTTP_POOLED``, the default) every instance shares one
+    keep-alive ``httpx.Client``; otherwise each call opens its own client as
+    before. Requests in both modes draw from ``rate_limiter`` (by default the
+    process-wide token bucket sized by ``DART_RATE_LIMIT_PER_SECOND``).
+    """
 
-    def __init__(self, api_key: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        *,
+        base_url: Optional[str] = None,
+        pooled: Optional[bool] = None,
+        http_client: Optional[httpx.Client] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+    ) -> None:
         self.api_key = api_key or os.getenv("DART_API_KEY")
         if not self.api_key:
             raise ValueError("DART_API_KEY is missing in environment variables.")
+        self.base_url = (base_url or DART_API_BASE).rstrip("/")
+        self.pooled = DART_HTTP_POOLED if pooled is None else pooled
+        self._http_client = http_client
+        self._rate_limiter = rate_limiter if rate_limiter is not None else shared_rate_limiter()
         self._corp_codes: Optional[Dict[str, str]] = None
 
+    @contextmanager
+    def _client(self) -> Iterator[httpx.Client]:
+        if self._http_client is not None:
+            yield self._http_client
+        elif self.pooled:
+            yield shared_http_client()
+        else:
+            with httpx.Client(timeout=DART_HTTP_TIMEOUT_SECONDS) as client:
+                yield client
+
+    def _acquire_token(self) -> None:
+        if self._rate_limiter is None:
+            return
+        waited = self._rate_limiter.acquire()
+        if waited and _RATE_LIMIT_WAIT_COUNTER is not None:
+            _RATE_LIMIT_WAIT_COUNTER.inc(waited)
+
+    def _http_get(self, endpoint: str, params: Dict[str, Any], *, follow_redirects: bool = False) -> httpx.Response:
+        """GET ``endpoint`` under the rate limit; raises ``httpx.HTTPError`` like ``raise_for_status``."""
+        self._acquire_token()
+        try:
+            with self._client() as client:
+                response = client.get(
+                    f"{self.base_url}/{endpoint}",
+                    params=params,
+                    follow_redirects=follow_redirects,
+                )
+                response.raise_for_status()
+        except httpx.HTTPError:
+            _record_request(endpoint, "error")
+            raise
+        _record_request(endpoint, "ok")
+        return response
+
     def _load_corp_codes(self) -> Dict[str, str]:
         """Fetch and cache the DART corporation code table."""
         try:
-            with httpx.Client(timeout=60.0) as client:
-                response = client.get(CORP_CODE_URL, params={"crtfc_key": self.api_key})
-                response.raise_for_status()
+            response = self._http_get("corpCode.xml", {"crtfc_key": self.api_key})
         except httpx.HTTPError as exc:
             logger.error("Failed to download corp code ZIP: %s", exc)
             raise TransientIngestError("Failed to download corp code ZIP.") from exc
@@ -145,68 +302,67 @@ class DartClient:
         max_pages: Optional[int] = None,
         throttle_seconds: float = 0.2,
         corp_code: Optional[str] = None,
+        concurrency: Optional[int] = None,
     ) -> List[Dict[str, str]]:
         """Return filings submitted between ``since`` and ``until`` (inclusive).
 
-        Fetches pages sequentially until the API stops returning results or ``max_pages`` is
-        reached. A small delay is applied between requests to respect OpenDART rate limits.
+        Fetches pages until the API stops returning results or ``max_pages`` is
+        reached. With ``concurrency > 1`` (default ``DART_LIST_CONCURRENCY``) the
+        first page's ``total_page`` is used to fetch the remaining pages in
+        parallel; results are still returned in page order. Requests are paced by
+        the rate limiter; ``throttle_seconds`` only applies when no limiter is
+        configured.
         """
-        aggregated: List[Dict[str, str]] = []
-        current_page = page_no
-        fetched_pages = 0
         range_end_dt = until or datetime.now()
-        end_date = range_end_dt.strftime("%Y%m%d")
-        range_end_display = range_end_dt.date()
+        base_params: Dict[str, Any] = {
+            "crtfc_key": self.api_key,
+            "bgn_de": since.strftime("%Y%m%d"),
+            "end_de": range_end_dt.strftime("%Y%m%d"),
+            "page_count": page_count,
+        }
+        if corp_code:
+            base_params["corp_code"] = corp_code
+        workers = concurrency if concurrency is not None else DART_LIST_CONCURRENCY
+        aggregated: List[Dict[str, str]] = []
+
+        def _log_page(page: int, items: List[Dict[str, str]]) -> None:
+            logger.info(
+                "Fetched %d filings from page %d (total=%d) between %s and %s.",
+                len(items),
+                page,
+                len(aggregated),
+                since.date(),
+                range_end_dt.date(),
+            )
 
         try:
-            with httpx.Client(timeout=60.0) as client:
-                while True:
-                    params = {
-                        "crtfc_key": self.api_key,
-                        "bgn_de": since.strftime("%Y%m%d"),
-                        "end_de": end_date,
-                        "page_no": current_page,
-                        "page_count": page_count,
-                    }
-                    if corp_code:
-                        params["corp_code"] = corp_code
-                    try:
-                        response = client.get(f"{DART_API_BASE}/list.json", params=params)
-                        response.raise_for_status()
-                    except httpx.HTTPError as exc:
-                        logger.error("Failed to list recent filings: %s", exc)
-                        raise TransientIngestError("DART list.json call failed.") from exc
-
-                    try:
-                        text = response.content.decode("utf-8")
-                    except UnicodeDecodeError:
-                        text = response.content.decode("euc-kr", errors="replace")
-                    payload = _load_json_payload(text, context="list.json")
-                    if payload.get("status") != "000":
-                        message = payload.get("message", "Unknown DART error")
-                        logger.error("DART returned error status (page %s): %s", current_page, message)
-                        raise RuntimeError(f"DART error: {message}")
-
-                    page_items = payload.get("list") or []
-                    aggregated.extend(page_items)
-                    fetched_pages += 1
-                    logger.info(
-                        "Fetched %d filings from page %d (total=%d) between %s and %s.",
-                        len(page_items),
-                        current_page,
-                        len(aggregated),
-                        since.date(),
-                        range_end_display,
-                    )
-
-                    if max_pages is not None and fetched_pages >= max_pages:
-                        break
-                    if len(page_items) < page_count or not page_items:
-                        break
-
-                    current_page += 1
-                    if throttle_seconds > 0:
-                        time.sleep(throttle_seconds)
+            current_page = page_no
+            fetched_pages = 0
+            while True:
+                payload = self._fetch_list_page(base_params, current_page)
+                page_items = payload.get("list") or []
+                aggregated.extend(page_items)
+                fetched_pages += 1
+                _log_page(current_page, page_items)
+
+                if max_pages is not None and fetched_pages >= max_pages:
+                    break
+                if len(page_items) < page_count or not page_items:
+                    break
+
+                total_pages = _as_int(payload.get("total_page"))
+                if workers > 1 and total_pages is not None:
+                    last_page = total_pages
+                    if max_pages is not None:
+                        last_page = min(last_page, page_no + max_pages - 1)
+                    for page, items in self._fetch_list_pages(base_params, current_page + 1, last_page, workers):
+                        aggregated.extend(items)
+                        _log_page(page, items)
+                    break
+
+                current_page += 1
+                if throttle_seconds > 0 and self._rate_limiter is None:
+                    time.sleep(throttle_seconds)
         except TransientIngestError:
             raise
         except FatalIngestError:
@@ -216,43 +372,103 @@ class DartClient:
 
         return aggregated
 
-    def download_document_zip(self, receipt_no: str) -> Optional[bytes]:
-        """Download the raw filing ZIP payload for a given receipt number."""
+    def _fetch_list_page(self, base_params: Dict[str, Any], page: int) -> Dict[str, Any]:
+        try:
+            response = self._http_get("list.json", {**base_params, "page_no": page})
+        except httpx.HTTPError as exc:
+            logger.error("Failed to list recent filings: %s", exc)
+            raise TransientIngestError("DART list.json call failed.") from exc
+
+        payload = _load_json_payload(_decode_json_text(response), context="list.json")
+        if payload.get("status") != "000":
+            message = payload.get("message", "Unknown DART error")
+            logger.error("DART returned error status (page %s): %s", page, message)
+            raise RuntimeError(f"DART error: {message}")
+        return payload
+
+    def _fetch_list_pages(
+        self,
+        base_params: Dict[str, Any],
+        first_page: int,
+        last_page: int,
+        workers: int,
+    ) -> Iterator[Tuple[int, List[Dict[str, str]]]]:
+        """Yield ``(page, items)`` for ``first_page..last_page`` in order, fetched concurrently."""
+        pages = list(range(first_page, last_page + 1))
+        if not pages:
+            return
+        with ThreadPoolExecutor(max_workers=min(workers, len(pages)), thread_name_prefix="dart-list") as executor:
+            futures = [executor.submit(self._fetch_list_page, base_params, page) for page in pages]
+            for page, future in zip(pages, futures):
+                yield page, future.result().get("list") or []
+
+    def stream_document(self, receipt_no: str, *, dest_dir: Optional[str] = None) -> Optional[DownloadedFile]:
+        """Stream the filing payload for ``receipt_no`` into a temp file.
+
+        Returns ``None`` when DART answers with viewer HTML, an error XML or an
+        unsupported payload. The caller owns the returned file and should
+        ``discard()`` it (or use it as a context manager) once parsed.
+        """
         params = {"crtfc_key": self.api_key, "rcept_no": receipt_no}
         try:
-            with httpx.Client(timeout=60.0, follow_redirects=True) as client:
-                response = client.get(DOCUMENT_URL, params=params)
-                response.raise_for_status()
+            with self._client() as client:
+                download = stream_download(
+                    client,
+                    f"{self.base_url}/document.xml",
+                    params=params,
+                    dest_dir=dest_dir,
+                    before_request=self._acquire_token,
+                )
         except httpx.HTTPError as exc:
+            _record_request("document.xml", "error")
             logger.error("Failed to download document for %s: %s", receipt_no, exc)
             raise TransientIngestError(f"Document download failed for {receipt_no}.") from exc
+        _record_request("document.xml", "ok")
+
+        if self._accept_document_payload(receipt_no, download):
+            return download
+        download.discard()
+        return None
+
+    def download_document_zip(self, receipt_no: str) -> Optional[bytes]:
+        """Download the raw filing ZIP payload for a given receipt number.
+
+        Kept for callers that need bytes; ``stream_document`` avoids holding the
+        payload in memory.
+        """
+        download = self.stream_document(receipt_no)
+        if download is None:
+            return None
+        with download:
+            return download.read_bytes()
 
-        content_type = response.headers.get("Content-Type", "").lower()
-        content_bytes = response.content
+    @staticmethod
+    def _accept_document_payload(receipt_no: str, download: DownloadedFile) -> bool:
+        content_type = (download.content_type or "").lower()
+        head = download.head
 
-        if (
-            "zip" in content_type
-            or content_bytes.startswith(b"PK")
-            or zipfile.is_zipfile(io.BytesIO(content_bytes))
-        ):
-            return content_bytes
+        if "zip" in content_type or head.startswith(b"PK") or zipfile.is_zipfile(download.path):
+            return True
 
-        if content_bytes.startswith(b"%PDF"):
-            return content_bytes
+        if head.startswith(b"%PDF"):
+            return True
 
-        stripped = content_bytes.lstrip()
+        stripped = head.lstrip()
         lowered_prefix = stripped[:32].lower()
         if lowered_prefix.startswith(b"<html") or lowered_prefix.startswith(b"<!doctype html"):
             logger.warning(
                 "DART document download returned viewer HTML for %s; falling back to viewer scraping.",
                 receipt_no,
             )
-            return None
+            return False
         if stripped.startswith(b"<?xml") or stripped.startswith(b"<"):
+            if download.size > ERROR_XML_MAX_BYTES:
+                # Error responses are a few hundred bytes; anything larger is a document.
+                return True
             try:
-                payload = xmltodict.parse(content_bytes)
+                payload = xmltodict.parse(download.read_bytes())
             except Exception:
-                return content_bytes
+                return True
 
             status = payload.get("result", {}).get("status")
             if status and status != "000":
@@ -260,13 +476,13 @@ class DartClient:
                 logger.warning(
                     "DART document download returned error XML (%s): %s", receipt_no, message
                 )
-                return None
-            return content_bytes
+                return False
+            return True
 
         logger.warning(
             "DART document download returned unsupported payload (%s): content-type=%s", receipt_no, content_type
         )
-        return None
+        return False
 
     @staticmethod
     def make_viewer_url(receipt_no: str) -> str:
@@ -278,23 +494,14 @@ class DartClient:
 
     def _get_json(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Fetch JSON payload from a DART endpoint with shared error handling."""
-        payload: Dict[str, Any] = {}
         merged_params = {"crtfc_key": self.api_key, **params}
-        url = f"{DART_API_BASE}/{endpoint}"
         try:
-            with httpx.Client(timeout=60.0) as client:
-                response = client.get(url, params=merged_params)
-                response.raise_for_status()
+            response = self._http_get(endpoint, merged_params)
         except httpx.HTTPError as exc:
             logger.error("DART request failed for %s: %s", endpoint, exc)
             raise TransientIngestError(f"DART endpoint {endpoint} call failed.") from exc
 
-        try:
-            text = response.content.decode("utf-8")
-        except UnicodeDecodeError:
-            text = response.content.decode("euc-kr", errors="replace")
-
-        payload = _load_json_payload(text, context=endpoint)
+        payload = _load_json_payload(_decode_json_text(response), context=endpoint)
 
         status = payload.get("status")
         if status and status != "000":
@@ -406,4 +613,4 @@ class DartClient:
         return issues
 
 
-__all__ = ["DartClient"]
+__all__ = ["DartClient", "close_shared_http_client", "shared_http_client", "shared_rate_limiter"]
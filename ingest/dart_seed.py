@@ -3,22 +3,29 @@
 from __future__ import annotations
 
 import logging
+import threading
 import time
 import uuid
+from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, Mapping, Optional, cast
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, cast
 
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
+from core.env import env_int
 from database import SessionLocal
 from ingest.dart_client import DartClient
 from ingest.file_downloader import attempt_viewer_fallback, parse_filing_bundle
+from ingest.staged_pipeline import Stage, run_staged_pipeline
+from ingest.streaming_download import DownloadedFile
 from models.filing import Filing, STATUS_PENDING
 from services import storage_service
 from services.dart_sync import sync_additional_disclosures
 from services.ingest_metrics import observe_latency, record_error, record_result
+from services.ingest_policy_service import viewer_fallback_state
+from services.receipt_dedup_service import DatabaseReceiptDeduper
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -27,6 +34,11 @@ UPLOAD_DIR = "uploads"
 PACKAGE_STAGE = "seed.package"
 TASK_STAGE = "seed.task"
 
+SEED_FETCH_WORKERS = env_int("SEED_FETCH_WORKERS", 4, minimum=1)
+SEED_PARSE_WORKERS = env_int("SEED_PARSE_WORKERS", 2, minimum=1)
+SEED_UPLOAD_WORKERS = env_int("SEED_UPLOAD_WORKERS", 4, minimum=1)
+SEED_QUEUE_SIZE = env_int("SEED_QUEUE_SIZE", 8, minimum=1)
+
 
 def _insert_filing_record(db: Session, values: Dict[str, object]) -> Optional[Filing]:
     """Insert a filing row if it does not already exist."""
@@ -78,6 +90,244 @@ def _enqueue_filing_task(filing_id: uuid.UUID) -> None:
         logger.warning("process_filing task does not expose delay().")
 
 
+@dataclass
+class _SeedJob:
+    """One filing travelling through the seed pipeline."""
+
+    meta: Mapping[str, Any]
+    receipt_no: str
+    viewer_url: str
+    download: Optional[DownloadedFile] = None
+    fetch_started: float = 0.0
+    package_data: Optional[Dict[str, Any]] = None
+    package_result: Optional[str] = None
+    xml_entries: List[Dict[str, Any]] = field(default_factory=list)
+    storage_meta: Dict[str, str] = field(default_factory=dict)
+
+    def discard(self) -> None:
+        if self.download is not None:
+            self.download.discard()
+            self.download = None
+
+
+class _FilingSeeder:
+    """Stage functions of the seed pipeline.
+
+    ``fetch``, ``parse`` and ``upload`` run on worker threads and never touch
+    the session except through ``_viewer_flag_state``, which takes ``db_lock``.
+    ``write`` is the pipeline sink: it runs on the calling thread, in listing
+    order, so inserts, commits and task enqueues happen exactly as the serial
+    seeder did them.
+    """
+
+    def __init__(
+        self,
+        client: DartClient,
+        db: Session,
+        deduper: DatabaseReceiptDeduper,
+        *,
+        metadata_only: bool,
+    ) -> None:
+        self.client = client
+        self.db = db
+        self.deduper = deduper
+        self.db_lock = threading.Lock()
+        self.metadata_only = metadata_only
+        self.created_count = 0
+
+    def _viewer_flag_state(self, corp_code: Optional[str]) -> Tuple[bool, Optional[str]]:
+        with self.db_lock:
+            return viewer_fallback_state(self.db, corp_code)
+
+    def fetch(self, job: _SeedJob) -> _SeedJob:
+        job.fetch_started = time.perf_counter()
+        if self.metadata_only:
+            return job
+        try:
+            job.download = self.client.stream_document(job.receipt_no)
+        except Exception as exc:  # pragma: no cover - defensive network guard
+            logger.warning("Direct ZIP download failed for %s: %s", job.receipt_no, exc)
+            record_error(PACKAGE_STAGE, "zip_download", exc)
+            job.download = None
+        return job
+
+    def parse(self, job: _SeedJob) -> _SeedJob:
+        if self.metadata_only:
+            # Metadata-only mode: skip download
+            job.package_data = {}
+            job.package_result = "metadata_only"
+            return job
+
+        receipt_no = job.receipt_no
+        package_data = None
+        if job.download is not None:
+            with job.download:
+                package_data = parse_filing_bundle(
+                    receipt_no=receipt_no,
+                    data=job.download,
+                    save_dir=UPLOAD_DIR,
+                    download_url=self.client.make_document_url(receipt_no),
+                )
+            job.download = None
+            if package_data:
+                job.package_result = "success"
+            else:
+                record_error(PACKAGE_STAGE, "zip_payload", "EmptyPackage")
+
+        if not package_data:
+            corp_code = job.meta.get("corp_code")
+            fallback_outcome = attempt_viewer_fallback(
+                receipt_no=receipt_no,
+                viewer_url=job.viewer_url,
+                save_dir=UPLOAD_DIR,
+                corp_code=corp_code,
+                corp_name=job.meta.get("corp_name"),
+                db=self.db,
+                flag_resolver=self._viewer_flag_state,
+            )
+            package_data = fallback_outcome.package
+            job.package_result = fallback_outcome.status
+
+            if fallback_outcome.status == "fallback_blocked":
+                logger.warning(
+                    "Viewer fallback blocked for receipt %s (corp_code=%s).",
+                    receipt_no,
+                    corp_code,
+                )
+            elif fallback_outcome.status == "fallback_disabled":
+                logger.warning("Viewer fallback globally disabled for %s.", receipt_no)
+            elif fallback_outcome.status == "fallback_failure":
+                logger.error("Failed to obtain filing package for %s via viewer.", receipt_no)
+            elif fallback_outcome.status == "fallback_success":
+                logger.info("Recovered filing package for %s via viewer fallback.", receipt_no)
+
+            if not package_data:
+                if fallback_outcome.status == "fallback_failure":
+                    record_error(PACKAGE_STAGE, "viewer_fallback", "NoPackage")
+                observe_latency(PACKAGE_STAGE, time.perf_counter() - job.fetch_started)
+                record_result(PACKAGE_STAGE, job.package_result)
+                return job
+
+        observe_latency(PACKAGE_STAGE, time.perf_counter() - job.fetch_started)
+        record_result(PACKAGE_STAGE, job.package_result or "success")
+        job.package_data = dict(package_data)
+        return job
+
+    def upload(self, job: _SeedJob) -> _SeedJob:
+        package_data = job.package_data
+        if package_data is None:
+            return job
+        for xml_path in package_data.get("xml") or []:
+            entry: Dict[str, Any] = {"path": xml_path}
+            if storage_service.is_enabled():
+                object_name = f"{job.receipt_no}/xml/{Path(xml_path).name}"
+                uploaded_xml = storage_service.upload_file(
+                    xml_path,
+                    object_name=object_name,
+                    content_type="application/xml",
+                )
+                if uploaded_xml:
+                    entry["storage"] = storage_service.provider_name()
+                    entry["object"] = uploaded_xml
+                    entry["object_name"] = uploaded_xml
+            job.xml_entries.append(entry)
+        # Object names are keyed by receipt number, so re-uploading for a filing
+        # that loses the insert race below overwrites the same object.
+        job.storage_meta = _ensure_storage_copy(job.receipt_no, package_data.get("pdf"))
+        return job
+
+    def write(self, job: _SeedJob) -> None:
+        package_data = job.package_data
+        if package_data is None:
+            return
+        db = self.db
+        receipt_no = job.receipt_no
+        meta = job.meta
+        pdf_path = package_data.get("pdf")
+
+        source_files = {
+            "package": package_data.get("download_url"),
+            "pdf": pdf_path,
+            "xml": job.xml_entries,
+            "attachments": package_data.get("attachments"),
+        }
+
+        try:
+            receipt_raw = meta.get("rcept_dt")
+            filed_at = datetime.strptime(receipt_raw, "%Y%m%d") if isinstance(receipt_raw, str) else None
+        except ValueError:
+            filed_at = None
+
+        filing_values: Dict[str, object] = {
+            "id": uuid.uuid4(),
+            "corp_code": meta.get("corp_code"),
+            "corp_name": meta.get("corp_name"),
+            "ticker": meta.get("stock_code"),
+            "report_name": meta.get("report_nm"),
+            "title": meta.get("report_nm"),
+            "receipt_no": receipt_no,
+            "filed_at": filed_at,
+            "file_name": Path(pdf_path).name if pdf_path else None,
+            "file_path": pdf_path,
+            "status": STATUS_PENDING,
+            "analysis_status": STATUS_PENDING,
+            "urls": {
+                "viewer": job.viewer_url,
+                "download": package_data.get("download_url"),
+            },
+            "source_files": source_files,
+        }
+
+        with self.db_lock:
+            new_filing = _insert_filing_record(db, filing_values)
+            self.deduper.add(receipt_no)
+            if not new_filing:
+                logger.info("Filing %s already exists. Skipping duplicate insert.", receipt_no)
+                return
+
+            if job.storage_meta:
+                existing_urls = cast(Optional[Mapping[str, Any]], new_filing.urls)
+                urls = dict(existing_urls) if isinstance(existing_urls, Mapping) else {}
+                urls.update(job.storage_meta)
+                cast(Any, new_filing).urls = urls
+                db.commit()
+
+            try:
+                sync_additional_disclosures(db=db, client=self.client, filing=new_filing)
+            except Exception as exc:  # pragma: no cover - defensive logging
+                logger.warning(
+                    "Failed to sync extended DART disclosures for %s: %s",
+                    receipt_no,
+                    exc,
+                    exc_info=True,
+                )
+
+        filing_id = cast(Optional[uuid.UUID], new_filing.id)
+        if filing_id:
+            _enqueue_filing_task(filing_id)
+        self.created_count += 1
+
+
+def _pending_jobs(
+    client: DartClient,
+    filings_meta: Sequence[Mapping[str, Any]],
+    deduper: DatabaseReceiptDeduper,
+    db_lock: threading.Lock,
+) -> Iterator[_SeedJob]:
+    """Yield jobs for listed filings that are not stored yet, one dedup batch at a time."""
+
+    for start in range(0, len(filings_meta), deduper.batch_size):
+        page = filings_meta[start : start + deduper.batch_size]
+        with db_lock:
+            new_receipts = set(deduper.filter_new([meta.get("rcept_no") for meta in page]))
+        for meta in page:
+            receipt_no = meta.get("rcept_no")
+            if receipt_no not in new_receipts:
+                continue
+            new_receipts.discard(receipt_no)
+            yield _SeedJob(meta=meta, receipt_no=receipt_no, viewer_url=client.make_viewer_url(receipt_no))
+
+
 def seed_recent_filings(
     days_back: int = 1,
     db: Optional[Session] = None,
@@ -85,13 +335,23 @@ def seed_recent_filings(
     end_date: Optional[date] = None,
     corp_code: Optional[str] = None,
     metadata_only: bool = False,
+    workers: Optional[Mapping[str, int]] = None,
+    queue_size: Optional[int] = None,
+    deduper: Optional[DatabaseReceiptDeduper] = None,
 ) -> int:
+    """Seed filings listed by DART since ``days_back`` (or the explicit date range).
+
+    Filings flow through a fetch -> parse -> upload -> DB write pipeline so
+    network, CPU and storage latency overlap. ``workers`` overrides the
+    per-stage thread counts (keys ``fetch``, ``parse``, ``upload``); rows are
+    still written one at a time in listing order. Already stored receipts are
+    skipped via ``deduper`` (default: batched ``IN`` lookups on ``db``).
+    """
     own_session = False
     if db is None:
         db = SessionLocal()
         own_session = True
 
-    created_count = 0
     task_stage_result = "success"
     task_started = time.perf_counter()
 
@@ -113,163 +373,32 @@ def seed_recent_filings(
             logger.info("No new filings detected in the last %d day(s).", days_back)
             return 0
 
-        existing_receipts = {
-            receipt for (receipt,) in db.query(Filing.receipt_no).all() if receipt
+        stage_workers = {
+            "fetch": SEED_FETCH_WORKERS,
+            "parse": SEED_PARSE_WORKERS,
+            "upload": SEED_UPLOAD_WORKERS,
         }
+        stage_workers.update(workers or {})
+        if deduper is None:
+            deduper = DatabaseReceiptDeduper(db)
+        seeder = _FilingSeeder(client, db, deduper, metadata_only=metadata_only)
+        stats = run_staged_pipeline(
+            _pending_jobs(client, filings_meta, deduper, seeder.db_lock),
+            [
+                Stage("fetch", seeder.fetch, stage_workers["fetch"]),
+                Stage("parse", seeder.parse, stage_workers["parse"]),
+                Stage("upload", seeder.upload, stage_workers["upload"]),
+            ],
+            seeder.write,
+            name="dart_seed",
+            sink_name="db_write",
+            queue_size=queue_size or SEED_QUEUE_SIZE,
+            cleanup=_SeedJob.discard,
+        )
+        deduper.save()
 
-        for meta in filings_meta:
-            receipt_no = meta.get("rcept_no")
-            if not receipt_no or receipt_no in existing_receipts:
-                continue
-            viewer_url = client.make_viewer_url(receipt_no)
-            fetch_started = time.perf_counter()
-            package_data = None
-            package_result: Optional[str] = None
-
-            if not metadata_only:
-                try:
-                    zip_bytes = client.download_document_zip(receipt_no)
-                except Exception as exc:  # pragma: no cover - defensive network guard
-                    logger.warning("Direct ZIP download failed for %s: %s", receipt_no, exc)
-                    record_error(PACKAGE_STAGE, "zip_download", exc)
-                    zip_bytes = None
-
-                if zip_bytes:
-                    package_data = parse_filing_bundle(
-                        receipt_no=receipt_no,
-                        data=zip_bytes,
-                        save_dir=UPLOAD_DIR,
-                        download_url=client.make_document_url(receipt_no),
-                    )
-                    if package_data:
-                        package_result = "success"
-                    else:
-                        record_error(PACKAGE_STAGE, "zip_payload", "EmptyPackage")
-
-                if not package_data:
-                    corp_code = meta.get("corp_code")
-                    fallback_outcome = attempt_viewer_fallback(
-                        receipt_no=receipt_no,
-                        viewer_url=viewer_url,
-                        save_dir=UPLOAD_DIR,
-                        corp_code=corp_code,
-                        corp_name=meta.get("corp_name"),
-                        db=db,
-                    )
-                    package_data = fallback_outcome.package
-                    package_result = fallback_outcome.status
-
-                    if fallback_outcome.status == "fallback_blocked":
-                        logger.warning(
-                            "Viewer fallback blocked for receipt %s (corp_code=%s).",
-                            receipt_no,
-                            corp_code,
-                        )
-                    elif fallback_outcome.status == "fallback_disabled":
-                        logger.warning("Viewer fallback globally disabled for %s.", receipt_no)
-                    elif fallback_outcome.status == "fallback_failure":
-                        logger.error("Failed to obtain filing package for %s via viewer.", receipt_no)
-                    elif fallback_outcome.status == "fallback_success":
-                        logger.info("Recovered filing package for %s via viewer fallback.", receipt_no)
-
-                    if not package_data:
-                        if fallback_outcome.status == "fallback_failure":
-                            record_error(PACKAGE_STAGE, "viewer_fallback", "NoPackage")
-                        fetch_duration = time.perf_counter() - fetch_started
-                        observe_latency(PACKAGE_STAGE, fetch_duration)
-                        record_result(PACKAGE_STAGE, package_result)
-                        continue
-
-                fetch_duration = time.perf_counter() - fetch_started
-                observe_latency(PACKAGE_STAGE, fetch_duration)
-                record_result(PACKAGE_STAGE, package_result or "success")
-            else:
-                # Metadata-only mode: skip download
-                package_data = {}
-                package_result = "metadata_only"
-
-            pdf_path = package_data.get("pdf")
-            xml_entries = []
-            for xml_path in package_data.get("xml") or []:
-                entry = {"path": xml_path}
-                if storage_service.is_enabled():
-                    object_name = f"{receipt_no}/xml/{Path(xml_path).name}"
-                    uploaded_xml = storage_service.upload_file(
-                        xml_path,
-                        object_name=object_name,
-                        content_type="application/xml",
-                    )
-                    if uploaded_xml:
-                        entry["storage"] = storage_service.provider_name()
-                        entry["object"] = uploaded_xml
-                        entry["object_name"] = uploaded_xml
-                xml_entries.append(entry)
-
-            source_files = {
-                "package": package_data.get("download_url"),
-                "pdf": pdf_path,
-                "xml": xml_entries,
-                "attachments": package_data.get("attachments"),
-            }
-
-            try:
-                receipt_raw = meta.get("rcept_dt")
-                filed_at = datetime.strptime(receipt_raw, "%Y%m%d") if isinstance(receipt_raw, str) else None
-            except ValueError:
-                filed_at = None
-
-            filing_values: Dict[str, object] = {
-                "id": uuid.uuid4(),
-                "corp_code": meta.get("corp_code"),
-                "corp_name": meta.get("corp_name"),
-                "ticker": meta.get("stock_code"),
-                "report_name": meta.get("report_nm"),
-                "title": meta.get("report_nm"),
-                "receipt_no": receipt_no,
-                "filed_at": filed_at,
-                "file_name": Path(pdf_path).name if pdf_path else None,
-                "file_path": pdf_path,
-                "status": STATUS_PENDING,
-                "analysis_status": STATUS_PENDING,
-                "urls": {
-                    "viewer": viewer_url,
-                    "download": package_data.get("download_url"),
-                },
-                "source_files": source_files,
-            }
-
-            new_filing = _insert_filing_record(db, filing_values)
-            if not new_filing:
-                logger.info("Filing %s already exists. Skipping duplicate insert.", receipt_no)
-                existing_receipts.add(receipt_no)
-                continue
-            existing_receipts.add(receipt_no)
-
-            storage_meta = _ensure_storage_copy(receipt_no, pdf_path)
-            if storage_meta:
-                existing_urls = cast(Optional[Mapping[str, Any]], new_filing.urls)
-                urls = dict(existing_urls) if isinstance(existing_urls, Mapping) else {}
-                urls.update(storage_meta)
-                cast(Any, new_filing).urls = urls
-                db.commit()
-
-            try:
-                sync_additional_disclosures(db=db, client=client, filing=new_filing)
-            except Exception as exc:  # pragma: no cover - defensive logging
-                logger.warning(
-                    "Failed to sync extended DART disclosures for %s: %s",
-                    receipt_no,
-                    exc,
-                    exc_info=True,
-                )
-
-            filing_id = cast(Optional[uuid.UUID], new_filing.id)
-            if filing_id:
-                _enqueue_filing_task(filing_id)
-            created_count += 1
-
-        logger.info("Seeded %d new filings.", created_count)
-        return created_count
+        logger.info("Seeded %d new filings in %.1fs (%s).", seeder.created_count, stats.elapsed_seconds, stats.summary())
+        return seeder.created_count
 
     except Exception as exc:
         logger.error("Error during DART seed: %s", exc, exc_info=True)
@@ -281,6 +410,8 @@ def seed_recent_filings(
         observe_latency(TASK_STAGE, time.perf_counter() - task_started)
         if task_stage_result == "success":
             record_result(TASK_STAGE, "success")
+        if deduper is not None:
+            deduper.reset()
         if own_session:
             db.close()
 
@@ -6,12 +6,14 @@ import io
 import logging
 import os
 import re
+import shutil
 import time
 import zipfile
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from html import unescape
 from pathlib import Path
-from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, TypedDict
+from typing import TYPE_CHECKING, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, TypedDict, Union
 from urllib.parse import parse_qs, unquote, urljoin, urlparse
 
 import httpx
@@ -20,6 +22,7 @@ from lxml import etree, html as lxml_html  # type: ignore[reportMissingImports]
 
 from core.env import env_bool, env_str
 from ingest.legal_guard import evaluate_viewer_access
+from ingest.streaming_download import DownloadedFile, stream_download
 from services.audit_log import audit_ingest_event
 from services.ingest_policy_service import viewer_fallback_state
 from services.notification_service import dispatch_notification
@@ -32,6 +35,8 @@ logger.setLevel(logging.INFO)
 
 MAX_RETRIES = 3
 RETRY_DELAY_SEC = 1.5
+SNIFF_BYTES = 4096
+COPY_CHUNK_BYTES = 1024 * 1024
 
 RECOVER_HTML_PARSER = etree.HTMLParser(recover=True)
 PDF_FUNCTION_CALL_RE = re.compile(
@@ -121,6 +126,22 @@ def _get_with_retry(client: httpx.Client, url: str) -> httpx.Response:
     raise last_error
 
 
+def _download_with_retry(client: httpx.Client, url: str, dest_dir: Path) -> DownloadedFile:
+    """Stream ``url`` into a temp file under ``dest_dir`` with the same retry policy as ``_get_with_retry``."""
+    last_error: Optional[Exception] = None
+    for attempt in range(1, MAX_RETRIES + 1):
+        normalized_url = _force_https(url)
+        try:
+            return stream_download(client, normalized_url, dest_dir=str(dest_dir))
+        except httpx.HTTPError as exc:
+            last_error = exc
+            logger.warning("Download of %s failed (%d/%d): %s", normalized_url, attempt, MAX_RETRIES, exc)
+            if attempt < MAX_RETRIES:
+                time.sleep(RETRY_DELAY_SEC)
+    assert last_error is not None
+    raise last_error
+
+
 class AttachmentInfo(TypedDict):
     name: str
     path: str
@@ -162,14 +183,38 @@ class ViewerFallbackResult:
     metadata: Dict[str, object] = field(default_factory=dict)
 
 
+BundleSource = Union[bytes, DownloadedFile, str, "os.PathLike[str]"]
+
+
+@contextmanager
+def _open_bundle_source(data: BundleSource) -> Iterator[BinaryIO]:
+    if isinstance(data, (bytes, bytearray)):
+        yield io.BytesIO(data)
+        return
+    path = data.path if isinstance(data, DownloadedFile) else Path(data)
+    with open(path, "rb") as handle:
+        yield handle
+
+
+def _copy_to(source: BinaryIO, output_path: Path) -> None:
+    with open(output_path, "wb") as target:
+        shutil.copyfileobj(source, target, COPY_CHUNK_BYTES)
+
+
 def parse_filing_bundle(
     receipt_no: str,
-    data: bytes,
+    data: BundleSource,
     save_dir: str,
     download_url: Optional[str] = None,
     content_type_header: Optional[str] = None,
 ) -> Optional[FilingPackage]:
-    """Persist downloaded ZIP/PDF content and return file metadata."""
+    """Persist downloaded ZIP/PDF content and return file metadata.
+
+    ``data`` is either the payload bytes or a file on disk (a path or a
+    :class:`DownloadedFile`). Files are sniffed from their first bytes and ZIP
+    members are copied out one at a time, so large bundles never need to fit
+    in memory.
+    """
     base_dir = Path(save_dir) / receipt_no
     base_dir.mkdir(parents=True, exist_ok=True)
 
@@ -181,77 +226,79 @@ def parse_filing_bundle(
         "attachments": [],
     }
 
-    content_type = _guess_content_type(data, content_type_header)
-
-    # Some responses are labelled generically (e.g. application/octet-stream) but
-    # still contain a valid ZIP payload.  We proactively inspect the bytes so we
-    # do not discard legitimate filings.
-    zip_buffer = io.BytesIO(data)
-    is_zip_payload = content_type.startswith("application/zip")
-    if not is_zip_payload:
-        try:
-            is_zip_payload = zipfile.is_zipfile(zip_buffer)
-        except zipfile.BadZipFile:
-            is_zip_payload = False
-        finally:
-            zip_buffer.seek(0)
-
-    if is_zip_payload:
-        logger.info(
-            "Extracting ZIP bundle for receipt %s (detected content-type: %s).",
-            receipt_no,
-            content_type_header or content_type,
-        )
-        with zipfile.ZipFile(zip_buffer) as archive:
-            for member in archive.infolist():
-                if member.is_dir():
-                    continue
-                output_path = base_dir / member.filename
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                with archive.open(member) as source, open(output_path, "wb") as target:
-                    target.write(source.read())
-
-                path_str = str(output_path.resolve())
-                lower_name = member.filename.lower()
-                if lower_name.endswith((".xml", ".xbrl")):
-                    _ensure_xml_bucket(package).append(path_str)
-                elif lower_name.endswith(".pdf"):
-                    if package["pdf"] is None:
-                        package["pdf"] = path_str
-                    _ensure_attachment_bucket(package).append(
-                        {"name": member.filename, "path": path_str, "type": "pdf"}
-                    )
-                else:
-                    _ensure_attachment_bucket(package).append(
-                        {"name": member.filename, "path": path_str, "type": output_path.suffix.lower() or "file"}
-                    )
-
-        if not _ensure_xml_bucket(package):
-            logger.warning("No XML/XBRL files found in ZIP for %s.", receipt_no)
-
-    elif content_type.startswith("application/pdf"):
-        pdf_path = base_dir / f"{receipt_no}.pdf"
-        pdf_path.write_bytes(data)
-        package["pdf"] = str(pdf_path.resolve())
-    else:
-        stripped = data.lstrip()
-        lowered_prefix = stripped[:32].lower()
-        if lowered_prefix.startswith(b"<html") or lowered_prefix.startswith(b"<!doctype html"):
-            logger.warning(
-                "Viewer HTML detected for receipt %s while parsing bundle; requesting fallback.",
+    with _open_bundle_source(data) as source:
+        head = source.read(SNIFF_BYTES)
+        source.seek(0)
+        content_type = _guess_content_type(head, content_type_header)
+
+        # Some responses are labelled generically (e.g. application/octet-stream) but
+        # still contain a valid ZIP payload.  We proactively inspect the bytes so we
+        # do not discard legitimate filings.
+        is_zip_payload = content_type.startswith("application/zip")
+        if not is_zip_payload:
+            try:
+                is_zip_payload = zipfile.is_zipfile(source)
+            except zipfile.BadZipFile:
+                is_zip_payload = False
+            finally:
+                source.seek(0)
+
+        if is_zip_payload:
+            logger.info(
+                "Extracting ZIP bundle for receipt %s (detected content-type: %s).",
                 receipt_no,
+                content_type_header or content_type,
             )
+            with zipfile.ZipFile(source) as archive:
+                for member in archive.infolist():
+                    if member.is_dir():
+                        continue
+                    output_path = base_dir / member.filename
+                    output_path.parent.mkdir(parents=True, exist_ok=True)
+                    with archive.open(member) as member_source:
+                        _copy_to(member_source, output_path)
+
+                    path_str = str(output_path.resolve())
+                    lower_name = member.filename.lower()
+                    if lower_name.endswith((".xml", ".xbrl")):
+                        _ensure_xml_bucket(package).append(path_str)
+                    elif lower_name.endswith(".pdf"):
+                        if package["pdf"] is None:
+                            package["pdf"] = path_str
+                        _ensure_attachment_bucket(package).append(
+                            {"name": member.filename, "path": path_str, "type": "pdf"}
+                        )
+                    else:
+                        _ensure_attachment_bucket(package).append(
+                            {"name": member.filename, "path": path_str, "type": output_path.suffix.lower() or "file"}
+                        )
+
+            if not _ensure_xml_bucket(package):
+                logger.warning("No XML/XBRL files found in ZIP for %s.", receipt_no)
+
+        elif content_type.startswith("application/pdf"):
+            pdf_path = base_dir / f"{receipt_no}.pdf"
+            _copy_to(source, pdf_path)
+            package["pdf"] = str(pdf_path.resolve())
+        else:
+            stripped = head.lstrip()
+            lowered_prefix = stripped[:32].lower()
+            if lowered_prefix.startswith(b"<html") or lowered_prefix.startswith(b"<!doctype html"):
+                logger.warning(
+                    "Viewer HTML detected for receipt %s while parsing bundle; requesting fallback.",
+                    receipt_no,
+                )
+                return None
+            if stripped.startswith(b"<?xml") or stripped.startswith(b"<"):
+                # Treat raw XML payloads as valid filings (even if the header did not
+                # advertise XML explicitly).
+                xml_path = base_dir / f"{receipt_no}.xml"
+                _copy_to(source, xml_path)
+                _ensure_xml_bucket(package).append(str(xml_path.resolve()))
+                return package
+
+            logger.error("Unsupported content type %s while parsing receipt %s.", content_type, receipt_no)
             return None
-        if stripped.startswith(b"<?xml") or stripped.startswith(b"<"):
-            # Treat raw XML payloads as valid filings (even if the header did not
-            # advertise XML explicitly).
-            xml_path = base_dir / f"{receipt_no}.xml"
-            xml_path.write_bytes(data)
-            _ensure_xml_bucket(package).append(str(xml_path.resolve()))
-            return package
-
-        logger.error("Unsupported content type %s while parsing receipt %s.", content_type, receipt_no)
-        return None
 
     return package
 
@@ -422,35 +469,35 @@ def _download_from_candidate_urls(
 
     for idx, url in enumerate(urls):
         try:
-            response = _get_with_retry(client, _force_https(url))
+            download = _download_with_retry(client, url, base_dir)
         except Exception as exc:
             logger.debug("Candidate asset fetch failed for %s: %s", url, exc)
             continue
 
-        data = response.content
-        content_type = response.headers.get("content-type")
-        detected_type = _guess_content_type(data, content_type)
-
-        if detected_type.startswith("application/zip"):
-            parsed = parse_filing_bundle(
-                receipt_no=receipt_no,
-                data=data,
-                save_dir=save_dir,
-                download_url=url,
-                content_type_header=content_type,
-            )
-            if parsed:
-                logger.info("Recovered filing bundle via direct ZIP link %s.", url)
-                return parsed
-            continue
-
-        if not detected_type.endswith("pdf"):
-            continue
-
-        pkg = ensure_package()
-        filename = _derive_filename_from_url(url, receipt_no, idx, detected_type)
-        output_path = base_dir / filename
-        output_path.write_bytes(data)
+        with download:
+            content_type = download.content_type
+            detected_type = _guess_content_type(download.head, content_type)
+
+            if detected_type.startswith("application/zip"):
+                parsed = parse_filing_bundle(
+                    receipt_no=receipt_no,
+                    data=download,
+                    save_dir=save_dir,
+                    download_url=url,
+                    content_type_header=content_type,
+                )
+                if parsed:
+                    logger.info("Recovered filing bundle via direct ZIP link %s.", url)
+                    return parsed
+                continue
+
+            if not detected_type.endswith("pdf"):
+                continue
+
+            pkg = ensure_package()
+            filename = _derive_filename_from_url(url, receipt_no, idx, detected_type)
+            output_path = base_dir / filename
+            os.replace(download.path, output_path)
         attachment_type = output_path.suffix.lower().lstrip(".") or "pdf"
         pkg["pdf"] = pkg.get("pdf") or str(output_path.resolve())
         _ensure_attachment_bucket(pkg).append(
@@ -507,46 +554,47 @@ def fetch_viewer_bundle(viewer_url: str, save_dir: str) -> Optional[FilingPackag
                 if not isinstance(href, str) or not href.strip():
                     continue
                 full_url = urljoin("https://dart.fss.or.kr", href)
-                file_response = _get_with_retry(client, _force_https(full_url))
-                content_type = file_response.headers.get("content-type")
-                data = file_response.content
+                download = _download_with_retry(client, full_url, base_dir)
+                content_type = download.content_type
 
                 if "zip.do" in href:
-                    parsed = parse_filing_bundle(
-                        receipt_no=receipt_no,
-                        data=data,
-                        save_dir=save_dir,
-                        download_url=full_url,
-                        content_type_header=content_type,
-                    )
+                    with download:
+                        parsed = parse_filing_bundle(
+                            receipt_no=receipt_no,
+                            data=download,
+                            save_dir=save_dir,
+                            download_url=full_url,
+                            content_type_header=content_type,
+                        )
                     if parsed:
                         package = parsed
                     continue
 
-                pkg = ensure_package()
+                with download:
+                    pkg = ensure_package()
 
-                parsed_url = urlparse(full_url)
-                filename = None
-                query = parse_qs(parsed_url.query)
-                if "fl_nm" in query:
-                    filename = unquote(query["fl_nm"][0])
-                elif parsed_url.path:
-                    filename = os.path.basename(parsed_url.path)
+                    parsed_url = urlparse(full_url)
+                    filename = None
+                    query = parse_qs(parsed_url.query)
+                    if "fl_nm" in query:
+                        filename = unquote(query["fl_nm"][0])
+                    elif parsed_url.path:
+                        filename = os.path.basename(parsed_url.path)
 
-                attachments_bucket = _ensure_attachment_bucket(pkg)
-                if not filename:
-                    filename = f"{receipt_no}_{len(attachments_bucket)}.dat"
+                    attachments_bucket = _ensure_attachment_bucket(pkg)
+                    if not filename:
+                        filename = f"{receipt_no}_{len(attachments_bucket)}.dat"
 
-                output_path = base_dir / filename
-                output_path.write_bytes(data)
-                attachment_type = output_path.suffix.lower().lstrip(".") or "file"
-                if attachment_type == "pdf":
-                    if pkg.get("pdf") is None:
-                        pkg["pdf"] = str(output_path.resolve())
-                elif attachment_type in {"xml", "xbrl"}:
-                    _ensure_xml_bucket(pkg).append(str(output_path.resolve()))
+                    output_path = base_dir / filename
+                    os.replace(download.path, output_path)
+                    attachment_type = output_path.suffix.lower().lstrip(".") or "file"
+                    if attachment_type == "pdf":
+                        if pkg.get("pdf") is None:
+                            pkg["pdf"] = str(output_path.resolve())
+                    elif attachment_type in {"xml", "xbrl"}:
+                        _ensure_xml_bucket(pkg).append(str(output_path.resolve()))
 
-                attachments_bucket.append({"name": filename, "path": str(output_path.resolve()), "type": attachment_type})
+                    attachments_bucket.append({"name": filename, "path": str(output_path.resolve()), "type": attachment_type})
 
             if package:
                 return package
@@ -582,8 +630,13 @@ def attempt_viewer_fallback(
     viewer_fetcher: Callable[[str, str], Optional[FilingPackage]] = fetch_viewer_bundle,
     legal_evaluator: Callable[[str], Dict[str, object]] = evaluate_viewer_access,
     audit_logger: Callable[..., None] = audit_ingest_event,
+    flag_resolver: Optional[Callable[[Optional[str]], Tuple[bool, Optional[str]]]] = None,
 ) -> ViewerFallbackResult:
-    """Attempt to download a filing via the viewer scraper with audit logging."""
+    """Attempt to download a filing via the viewer scraper with audit logging.
+
+    ``flag_resolver`` replaces the ``viewer_fallback_state(db, corp_code)`` lookup,
+    e.g. so a caller on a worker thread can serialise access to a shared session.
+    """
     try:
         legal_meta = dict(legal_evaluator(viewer_url))
     except Exception as exc:  # pragma: no cover - defensive fallback
@@ -600,7 +653,9 @@ def attempt_viewer_fallback(
     fallback_enabled = _viewer_fallback_enabled()
     flag_allowed = True
     flag_reason = None
-    if db is not None:
+    if flag_resolver is not None:
+        flag_allowed, flag_reason = flag_resolver(corp_code)
+    elif db is not None:
         flag_allowed, flag_reason = viewer_fallback_state(db, corp_code)
 
     feature_flags: Dict[str, object] = {
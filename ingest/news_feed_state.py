@@ -0,0 +1,129 @@
+"""Per-feed fetch state: HTTP validators and a rolling set of seen entries.
+
+``fetch_news_batch`` sends the stored ``ETag``/``Last-Modified`` validators with
+each feed request so unchanged feeds answer ``304 Not Modified``, and skips
+entries whose GUID or URL is already in the feed's seen-set, so nothing that was
+ingested before is parsed, embedded or analysed again. State lives in Redis
+(``NEWS_FEED_STATE_REDIS_URL``), a local SQLite file
+(``NEWS_FEED_STATE_SQLITE_PATH``) or, when neither is configured, in process
+memory.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional
+
+from core.env import env_int, env_str
+from services.kv_tier import BlobTier, LoggedTier, MemoryBlobTier, build_shared_tier
+
+NEWS_FEED_SEEN_MAX = env_int("NEWS_FEED_SEEN_MAX", 1000, minimum=0)
+NEWS_FEED_STATE_TTL_SECONDS = env_int("NEWS_FEED_STATE_TTL_SECONDS", 30 * 24 * 3600, minimum=3600)
+NEWS_FEED_STATE_REDIS_URL = env_str("NEWS_FEED_STATE_REDIS_URL")
+NEWS_FEED_STATE_SQLITE_PATH = env_str("NEWS_FEED_STATE_SQLITE_PATH")
+
+_KEY_PREFIX = "news:feed-state:v1"
+_SQLITE_TABLE = "news_feed_state"
+
+
+@dataclass
+class FeedState:
+    """Validators from the last ``200`` response and recently seen entry keys."""
+
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    seen: "OrderedDict[str, None]" = field(default_factory=OrderedDict)
+
+    def has_seen(self, keys: Iterable[str]) -> bool:
+        return any(key in self.seen for key in keys if key)
+
+    def remember(self, keys: Iterable[str], *, limit: Optional[int] = None) -> None:
+        cap = NEWS_FEED_SEEN_MAX if limit is None else limit
+        for key in keys:
+            if not key:
+                continue
+            self.seen[key] = None
+            self.seen.move_to_end(key)
+        while len(self.seen) > cap:
+            self.seen.popitem(last=False)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {"etag": self.etag, "last_modified": self.last_modified, "seen": list(self.seen)},
+            ensure_ascii=False,
+        )
+
+    @classmethod
+    def from_json(cls, raw: Any) -> "FeedState":
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+        payload = json.loads(raw) if raw else {}
+        return cls(
+            etag=payload.get("etag"),
+            last_modified=payload.get("last_modified"),
+            seen=OrderedDict((key, None) for key in payload.get("seen") or []),
+        )
+
+
+class FeedStateStore:
+    """Reads and writes :class:`FeedState` records, keyed by feed URL, through a blob tier."""
+
+    def __init__(self, tier: BlobTier) -> None:
+        self._tier = LoggedTier(tier, label="News feed state")
+
+    @property
+    def name(self) -> str:
+        return self._tier.name
+
+    def get(self, feed_url: str) -> FeedState:
+        raw = self._tier.get(feed_url)
+        return FeedState.from_json(raw) if raw else FeedState()
+
+    def set(self, feed_url: str, state: FeedState) -> None:
+        self._tier.set(feed_url, state.to_json().encode("utf-8"))
+
+
+_STORE: Optional[FeedStateStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def _build_store() -> FeedStateStore:
+    tier = build_shared_tier(
+        "News feed state",
+        redis_url=NEWS_FEED_STATE_REDIS_URL,
+        sqlite_path=NEWS_FEED_STATE_SQLITE_PATH,
+        table=_SQLITE_TABLE,
+        prefix=_KEY_PREFIX,
+        ttl_seconds=NEWS_FEED_STATE_TTL_SECONDS,
+    )
+    return FeedStateStore(tier or MemoryBlobTier(ttl_seconds=NEWS_FEED_STATE_TTL_SECONDS))
+
+
+def get_feed_state_store() -> FeedStateStore:
+    """Return the process-wide feed state store."""
+
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                _STORE = _build_store()
+    return _STORE
+
+
+def reset_feed_state_store() -> None:
+    """Forget the process-wide store (used by tests and config reloads)."""
+
+    global _STORE
+    with _STORE_LOCK:
+        _STORE = None
+
+
+__all__ = [
+    "FeedState",
+    "FeedStateStore",
+    "get_feed_state_store",
+    "reset_feed_state_store",
+]
@@ -2,15 +2,22 @@
 
 from __future__ import annotations
 
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Iterable, List, Optional, Set
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlparse
 
-from core.env import env_float, env_int, env_str
+import httpx
+
+from core.env import env_bool, env_float, env_int, env_str
 from core.logging import get_logger
+from ingest.news_feed_state import FeedState, FeedStateStore, get_feed_state_store
 from schemas.news import NewsArticleCreate
+from services.prometheus_helpers import build_histogram
 from services.kogl_license import detect_kogl_license
 from services.ingest_errors import FatalIngestError, TransientIngestError
 
@@ -21,6 +28,13 @@ except ImportError:  # pragma: no cover - optional dependency in unit tests
 
 
 logger = get_logger(__name__)
+
+_FEED_FETCH_SECONDS = build_histogram(
+    "news_feed_fetch_seconds",
+    "Latency of news feed fetches (including retries) by feed host and result.",
+    ("host", "result"),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0),
+)
 _DEFAULT_USER_AGENT = "KFinanceNewsBot/0.1 (+https://kfinance.ai)"
 
 
@@ -118,17 +132,87 @@ def _iter_feed_sources(feed_urls: Iterable[str]) -> Iterable[str]:
             yield url
 
 
-def _load_feed_bytes(feed_url: str) -> bytes:
-    request = Request(feed_url, headers=_get_request_headers())
+class _HostLimiter:
+    """Cap concurrent requests per feed host, independent of the worker count."""
+
+    def __init__(self, per_host: int) -> None:
+        self._per_host = max(1, per_host)
+        self._lock = threading.Lock()
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            semaphore = self._slots.get(host)
+            if semaphore is None:
+                semaphore = self._slots[host] = threading.BoundedSemaphore(self._per_host)
+        with semaphore:
+            yield
+
+
+@dataclass
+class _FeedResponse:
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+def _feed_http_client(max_connections: int) -> httpx.Client:
     timeout = env_float("NEWS_FEED_TIMEOUT", 10.0, minimum=1.0)
+    return httpx.Client(
+        headers=_get_request_headers(),
+        timeout=timeout,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+    )
+
+
+def _load_feed_bytes(
+    feed_url: str,
+    *,
+    client: httpx.Client,
+    state: Optional[FeedState] = None,
+    host_limiter: Optional[_HostLimiter] = None,
+) -> Optional[_FeedResponse]:
+    """GET ``feed_url``, sending stored validators; ``None`` means 304 Not Modified."""
+
+    headers: Dict[str, str] = {}
+    if state is not None and env_bool("NEWS_FEED_CONDITIONAL_GET", True):
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        if state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
     try:
-        with urlopen(request, timeout=timeout) as response:  # noqa: S310 - controlled allowlist
-            return response.read()
-    except (HTTPError, URLError, TimeoutError) as exc:
+        if host_limiter is not None:
+            with host_limiter.slot(feed_url):
+                response = client.get(feed_url, headers=headers)
+        else:
+            response = client.get(feed_url, headers=headers)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+    except httpx.HTTPError as exc:
         raise TransientIngestError(f"Failed to download feed {feed_url}") from exc
+    return _FeedResponse(
+        body=response.content,
+        etag=response.headers.get("etag"),
+        last_modified=response.headers.get("last-modified"),
+    )
+
 
+def _parse_feed_retry(
+    feed_url: str,
+    state: Optional[FeedState] = None,
+    *,
+    client: Optional[httpx.Client] = None,
+    host_limiter: Optional[_HostLimiter] = None,
+):
+    """Fetch and parse ``feed_url`` with retries; ``None`` when the feed is unchanged.
 
-def _parse_feed_retry(feed_url: str):
+    On a ``200`` the response validators are copied onto ``state`` so the
+    caller can persist them together with the entries it consumed.
+    """
     if feedparser is None:
         logger.warning("feedparser is not installed. Skipping feed %s.", feed_url)
         raise FatalIngestError("feedparser dependency is missing.")
@@ -137,35 +221,46 @@ def _parse_feed_retry(feed_url: str):
     backoff_base = env_float("NEWS_FEED_RETRY_BACKOFF", 1.5, minimum=0.5)
     sleep_cap = env_float("NEWS_FEED_RETRY_MAX_SLEEP", 5.0, minimum=0.5)
     last_error: Optional[Exception] = None
+    own_client = client is None
+    http_client = client or _feed_http_client(1)
 
-    for attempt in range(1, max_attempts + 1):
-        try:
-            raw_bytes = _load_feed_bytes(feed_url)
-            parsed = feedparser.parse(raw_bytes)
-            if getattr(parsed, "bozo", 0):
+    try:
+        for attempt in range(1, max_attempts + 1):
+            try:
+                response = _load_feed_bytes(feed_url, client=http_client, state=state, host_limiter=host_limiter)
+                if response is None:
+                    return None
+                parsed = feedparser.parse(response.body)
+                if getattr(parsed, "bozo", 0):
+                    logger.warning(
+                        "Feed parser reported issues for %s: %s",
+                        feed_url,
+                        getattr(parsed, "bozo_exception", "unknown error"),
+                    )
+                if state is not None:
+                    state.etag = response.etag
+                    state.last_modified = response.last_modified
+                return parsed
+            except (TransientIngestError, ValueError) as exc:
+                last_error = exc
                 logger.warning(
-                    "Feed parser reported issues for %s: %s",
+                    "Feed fetch attempt %d/%d failed for %s: %s",
+                    attempt,
+                    max_attempts,
                     feed_url,
-                    getattr(parsed, "bozo_exception", "unknown error"),
+                    exc.__cause__ or exc,
                 )
-            return parsed
-        except (HTTPError, URLError, TimeoutError, ValueError) as exc:
-            last_error = exc
-            logger.warning(
-                "Feed fetch attempt %d/%d failed for %s: %s",
-                attempt,
-                max_attempts,
-                feed_url,
-                exc,
-            )
-        except Exception as exc:  # pragma: no cover - defensive logging
-            last_error = exc
-            logger.error("Unexpected error while fetching %s: %s", feed_url, exc, exc_info=True)
+            except Exception as exc:  # pragma: no cover - defensive logging
+                last_error = exc
+                logger.error("Unexpected error while fetching %s: %s", feed_url, exc, exc_info=True)
 
-        if attempt < max_attempts:
-            sleep_seconds = min(backoff_base * attempt, sleep_cap)
-            if sleep_seconds > 0:
-                time.sleep(sleep_seconds)
+            if attempt < max_attempts:
+                sleep_seconds = min(backoff_base * attempt, sleep_cap)
+                if sleep_seconds > 0:
+                    time.sleep(sleep_seconds)
+    finally:
+        if own_client:
+            http_client.close()
 
     if last_error:
         logger.error("Feed fetch failed after %d attempts for %s: %s", max_attempts, feed_url, last_error)
@@ -173,6 +268,126 @@ def _parse_feed_retry(feed_url: str):
     raise TransientIngestError(f"Feed {feed_url} returned no data.")
 
 
+def _entry_keys(entry, article: NewsArticleCreate) -> List[str]:
+    keys: List[str] = []
+    guid = entry.get("id") or entry.get("guid")
+    if guid:
+        keys.append(f"guid:{guid}")
+    keys.append(f"url:{article.url}" if article.url else f"title:{article.headline}-{article.published_at.isoformat()}")
+    return keys
+
+
+@dataclass
+class _FeedOutcome:
+    feed_url: str
+    status: str
+    articles: List[NewsArticleCreate] = field(default_factory=list)
+    skipped: int = 0
+    state: Optional[FeedState] = None
+
+
+class NewsBatch(list):
+    """Articles returned by ``fetch_news_batch`` plus the feed state they advance.
+
+    Validators and seen-sets of feeds that produced new articles are only
+    persisted by :meth:`commit`, which the caller invokes once the articles are
+    enqueued. Until then (or if enqueueing fails) the same articles are fetched
+    again on the next cycle.
+    """
+
+    def __init__(
+        self,
+        articles: Iterable[NewsArticleCreate] = (),
+        *,
+        store: Optional[FeedStateStore] = None,
+        pending: Optional[List[Tuple[str, FeedState, List[NewsArticleCreate]]]] = None,
+    ) -> None:
+        super().__init__(articles)
+        self._store = store
+        self._pending = pending or []
+
+    def commit(self, *, failed: Iterable[NewsArticleCreate] = ()) -> None:
+        """Persist feed state, except for feeds with an article listed in ``failed``."""
+
+        failed_ids = {id(article) for article in failed}
+        pending, self._pending = self._pending, []
+        if self._store is None:
+            return
+        for feed_url, state, feed_articles in pending:
+            if any(id(article) in failed_ids for article in feed_articles):
+                logger.warning("Keeping previous state for %s; some of its articles were not enqueued.", feed_url)
+                continue
+            self._store.set(feed_url, state)
+
+
+def _feed_source_name(parsed, feed_url: str) -> tuple:
+    feed_meta = getattr(parsed, "feed", {}) or {}
+    if hasattr(feed_meta, "get"):
+        source_name = feed_meta.get("title")
+    elif isinstance(feed_meta, dict):
+        source_name = feed_meta.get("title")
+    else:
+        source_name = getattr(feed_meta, "title", None)
+    return feed_meta, source_name or feed_url
+
+
+def _fetch_feed(
+    feed_url: str,
+    limit_per_feed: int,
+    *,
+    client: httpx.Client,
+    host_limiter: _HostLimiter,
+    store: FeedStateStore,
+) -> _FeedOutcome:
+    started = time.perf_counter()
+    state = store.get(feed_url)
+    status = "error"
+    try:
+        try:
+            parsed = _parse_feed_retry(feed_url, state, client=client, host_limiter=host_limiter)
+        except TransientIngestError as exc:
+            logger.warning("%s", exc)
+            return _FeedOutcome(feed_url=feed_url, status="failed")
+        if parsed is None:
+            status = "not_modified"
+            logger.info("Feed %s not modified since last fetch.", feed_url)
+            return _FeedOutcome(feed_url=feed_url, status=status)
+
+        status = "ok"
+        feed_meta, source_name = _feed_source_name(parsed, feed_url)
+        entries = (getattr(parsed, "entries", None) or [])[:limit_per_feed]
+        outcome = _FeedOutcome(feed_url=feed_url, status=status)
+        for entry in entries:
+            try:
+                article = _entry_to_article(entry, source_name=source_name, feed_meta=feed_meta)
+            except Exception as exc:  # pragma: no cover - defensive logging
+                logger.error("Failed to normalize entry from %s: %s", feed_url, exc, exc_info=True)
+                continue
+            keys = _entry_keys(entry, article)
+            if state.has_seen(keys):
+                outcome.skipped += 1
+                continue
+            state.remember(keys)
+            outcome.articles.append(article)
+        logger.info(
+            "Fetched %d entries from %s (%d new, %d already seen)",
+            len(entries),
+            feed_url,
+            len(outcome.articles),
+            outcome.skipped,
+        )
+        if outcome.articles:
+            # Persisted by NewsBatch.commit() once the articles are enqueued.
+            outcome.state = state
+        else:
+            store.set(feed_url, state)
+        return outcome
+    finally:
+        if _FEED_FETCH_SECONDS is not None:
+            host = urlparse(feed_url).netloc.lower() or "unknown"
+            _FEED_FETCH_SECONDS.labels(host=host, result=status).observe(time.perf_counter() - started)
+
+
 def _load_mock_articles(limit: int) -> List[NewsArticleCreate]:
     try:
         from ingest.news_client import MockNewsClient
@@ -186,7 +401,14 @@ def _load_mock_articles(limit: int) -> List[NewsArticleCreate]:
 
 
 def fetch_news_batch(limit_per_feed: int = 5, *, use_mock_fallback: bool = False) -> List[NewsArticleCreate]:
-    """Fetch latest news articles from configured RSS/Atom feeds."""
+    """Fetch new articles from configured RSS/Atom feeds.
+
+    Feeds are fetched concurrently (``NEWS_FEED_CONCURRENCY`` workers, at most
+    ``NEWS_FEED_PER_HOST_CONNECTIONS`` requests per host) with conditional GETs.
+    Live results are returned as a :class:`NewsBatch`; entries from batches that
+    were committed (``NewsBatch.commit``) are filtered out via each feed's
+    persisted seen-set, so an empty list means nothing new was published.
+    """
     if feedparser is None:
         if use_mock_fallback:
             return _load_mock_articles(limit_per_feed)
@@ -203,48 +425,50 @@ def fetch_news_batch(limit_per_feed: int = 5, *, use_mock_fallback: bool = False
         raise FatalIngestError("NEWS_FEEDS is empty; cannot ingest news.")
 
     articles: List[NewsArticleCreate] = []
+    pending: List[Tuple[str, FeedState, List[NewsArticleCreate]]] = []
     seen_keys: Set[str] = set()
     failed_feeds: List[str] = []
-
-    for feed_url in feed_urls:
-        try:
-            parsed = _parse_feed_retry(feed_url)
-        except FatalIngestError:
-            raise
-        except TransientIngestError as exc:
-            failed_feeds.append(feed_url)
-            logger.warning("%s", exc)
-            continue
-
-        feed_meta = getattr(parsed, "feed", {}) or {}
-        if hasattr(feed_meta, "get"):
-            source_name = feed_meta.get("title")
-        elif isinstance(feed_meta, dict):
-            source_name = feed_meta.get("title")
-        else:
-            source_name = getattr(feed_meta, "title", None)
-        if not source_name:
-            source_name = feed_url
-
-        entries = (getattr(parsed, "entries", None) or [])[:limit_per_feed]
-        logger.info("Fetched %d entries from %s", len(entries), feed_url)
-
-        for entry in entries:
-            try:
-                article = _entry_to_article(entry, source_name=source_name, feed_meta=feed_meta)
-            except Exception as exc:  # pragma: no cover - defensive logging
-                logger.error("Failed to normalize entry from %s: %s", feed_url, exc, exc_info=True)
-                continue
-
-            dedupe_key = article.url or f"{article.headline}-{article.published_at.isoformat()}"
-            if dedupe_key in seen_keys:
+    unchanged_feeds = 0
+    store = get_feed_state_store()
+    concurrency = min(env_int("NEWS_FEED_CONCURRENCY", 8, minimum=1), len(feed_urls))
+    host_limiter = _HostLimiter(env_int("NEWS_FEED_PER_HOST_CONNECTIONS", 2, minimum=1))
+
+    with _feed_http_client(concurrency) as client, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [
+            pool.submit(
+                _fetch_feed,
+                feed_url,
+                limit_per_feed,
+                client=client,
+                host_limiter=host_limiter,
+                store=store,
+            )
+            for feed_url in feed_urls
+        ]
+        # Collect in configuration order so cross-feed dedup matches the serial fetcher.
+        for future in futures:
+            outcome = future.result()
+            if outcome.status == "failed":
+                failed_feeds.append(outcome.feed_url)
                 continue
-            seen_keys.add(dedupe_key)
-            articles.append(article)
+            if outcome.status == "not_modified" or (not outcome.articles and outcome.skipped):
+                unchanged_feeds += 1
+            if outcome.state is not None:
+                pending.append((outcome.feed_url, outcome.state, outcome.articles))
+            for article in outcome.articles:
+                dedupe_key = article.url or f"{article.headline}-{article.published_at.isoformat()}"
+                if dedupe_key in seen_keys:
+                    continue
+                seen_keys.add(dedupe_key)
+                articles.append(article)
 
     if failed_feeds:
         logger.warning("Failed to fetch %d feed(s): %s", len(failed_feeds), ", ".join(failed_feeds))
 
+    if not articles and unchanged_feeds:
+        logger.info("No new articles: %d feed(s) unchanged or fully seen.", unchanged_feeds)
+        return NewsBatch()
+
     if not articles:
         if use_mock_fallback:
             return _load_mock_articles(limit_per_feed)
@@ -252,7 +476,7 @@ def fetch_news_batch(limit_per_feed: int = 5, *, use_mock_fallback: bool = False
             raise TransientIngestError("All configured news feeds failed.")
         raise FatalIngestError("Configured news feeds returned no entries.")
 
-    return articles
+    return NewsBatch(articles, store=store, pending=pending)
 
 
-__all__ = ["fetch_news_batch"]
+__all__ = ["NewsBatch", "fetch_news_batch"]
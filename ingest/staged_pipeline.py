@@ -0,0 +1,282 @@
+"""Bounded multi-stage thread pipeline with in-order delivery.
+
+``run_staged_pipeline`` pushes items through a sequence of stages, each served
+by its own worker threads and fed by a bounded queue. A full queue blocks the
+stage in front of it, so a slow stage (e.g. storage uploads) throttles the
+network fetchers instead of letting work pile up in memory. The sink runs on
+the calling thread and receives results in input order; an exception raised by
+any stage is carried along with its item and re-raised when the sink reaches
+it, so everything before the failing item is committed exactly as a serial
+loop would have done.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from core.logging import get_logger
+from services.prometheus_helpers import build_counter, build_gauge, build_histogram
+
+logger = get_logger(__name__)
+
+_STAGE_ITEMS = build_counter(
+    "ingest_stage_items_total",
+    "Items processed by staged ingest pipelines.",
+    ("pipeline", "stage", "result"),
+)
+_STAGE_QUEUE_DEPTH = build_gauge(
+    "ingest_stage_queue_depth",
+    "Items waiting in front of each staged ingest pipeline stage.",
+    ("pipeline", "stage"),
+)
+_STAGE_SECONDS = build_histogram(
+    "ingest_stage_seconds",
+    "Time spent per item in each staged ingest pipeline stage.",
+    ("pipeline", "stage"),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+
+_POLL_SECONDS = 0.1
+_DONE = object()
+
+
+@dataclass(frozen=True)
+class Stage:
+    """A named step executed by ``workers`` threads."""
+
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+
+
+@dataclass
+class StageStats:
+    processed: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+
+
+@dataclass
+class PipelineStats:
+    """Per-stage counters returned by :func:`run_staged_pipeline`."""
+
+    stages: Dict[str, StageStats] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+
+    def summary(self) -> str:
+        parts = []
+        for name, stats in self.stages.items():
+            rate = stats.processed / stats.busy_seconds if stats.busy_seconds > 0 else 0.0
+            parts.append(f"{name}={stats.processed} ({stats.busy_seconds:.1f}s busy, {rate:.1f}/s)")
+        return ", ".join(parts)
+
+
+class _Failure:
+    __slots__ = ("item", "error")
+
+    def __init__(self, item: Any, error: BaseException) -> None:
+        self.item = item
+        self.error = error
+
+
+class _Run:
+    def __init__(self, name: str, stage_names: Sequence[str], cleanup: Optional[Callable[[Any], None]]) -> None:
+        self.name = name
+        self.stop = threading.Event()
+        self.cleanup = cleanup
+        self.lock = threading.Lock()
+        self.stats = PipelineStats(stages={stage: StageStats() for stage in stage_names})
+
+    def record(self, stage: str, seconds: float, ok: bool) -> None:
+        with self.lock:
+            stats = self.stats.stages[stage]
+            stats.busy_seconds += seconds
+            if ok:
+                stats.processed += 1
+            else:
+                stats.failed += 1
+        if _STAGE_ITEMS is not None:
+            _STAGE_ITEMS.labels(pipeline=self.name, stage=stage, result="success" if ok else "failure").inc()
+        if _STAGE_SECONDS is not None:
+            _STAGE_SECONDS.labels(pipeline=self.name, stage=stage).observe(seconds)
+
+    def depth(self, stage: str, inbox: "queue.Queue[Any]") -> None:
+        if _STAGE_QUEUE_DEPTH is not None:
+            _STAGE_QUEUE_DEPTH.labels(pipeline=self.name, stage=stage).set(inbox.qsize())
+
+    def put(self, outbox: "queue.Queue[Any]", entry: Any) -> bool:
+        """Block until ``entry`` fits in ``outbox``; give up once the run is stopping."""
+
+        while not self.stop.is_set():
+            try:
+                outbox.put(entry, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        self.discard(entry)
+        return False
+
+    def get(self, inbox: "queue.Queue[Any]") -> Any:
+        while not self.stop.is_set():
+            try:
+                return inbox.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def discard(self, entry: Any) -> None:
+        if self.cleanup is None or entry is _DONE:
+            return
+        _seq, value = entry
+        if isinstance(value, _Failure):
+            value = value.item
+        if value is None:
+            return
+        try:
+            self.cleanup(value)
+        except Exception:  # pragma: no cover - cleanup is best effort
+            logger.debug("Pipeline %s cleanup failed.", self.name, exc_info=True)
+
+
+def run_staged_pipeline(
+    items: Iterable[Any],
+    stages: Sequence[Stage],
+    sink: Callable[[Any], None],
+    *,
+    name: str = "pipeline",
+    sink_name: str = "sink",
+    queue_size: int = 8,
+    cleanup: Optional[Callable[[Any], None]] = None,
+) -> PipelineStats:
+    """Run ``items`` through ``stages`` and hand each result to ``sink`` in input order.
+
+    Every stage reads from a queue holding at most ``queue_size`` items, and the
+    number of items between the producer and the sink is capped as well, so the
+    reorder buffer in front of the sink stays bounded even when one item is slow.
+    ``cleanup`` is called for items that were in flight when the run stopped
+    early because a stage or the sink raised.
+    """
+
+    if not stages:
+        raise ValueError("At least one stage is required.")
+    size = max(1, queue_size)
+    run = _Run(name, [stage.name for stage in stages] + [sink_name], cleanup)
+    inboxes: List["queue.Queue[Any]"] = [queue.Queue(maxsize=size) for _ in range(len(stages) + 1)]
+    in_flight = threading.BoundedSemaphore(size * (len(stages) + 1))
+    remaining = [max(1, stage.workers) for stage in stages]
+    threads: List[threading.Thread] = []
+
+    def admit(entry: Any) -> bool:
+        while not in_flight.acquire(timeout=_POLL_SECONDS):
+            if run.stop.is_set():
+                break
+        if run.stop.is_set():
+            run.discard(entry)
+            return False
+        if not run.put(inboxes[0], entry):
+            return False
+        run.depth(stages[0].name, inboxes[0])
+        return True
+
+    def produce() -> None:
+        seq = 0
+        iterator = iter(items)
+        while True:
+            try:
+                item = next(iterator)
+            except StopIteration:
+                break
+            except BaseException as exc:  # surface iterator failures through the sink, in order
+                admit((seq, _Failure(None, exc)))
+                return
+            if not admit((seq, item)):
+                return
+            seq += 1
+        for _ in range(remaining[0]):
+            run.put(inboxes[0], _DONE)
+
+    def work(index: int) -> None:
+        stage = stages[index]
+        inbox, outbox = inboxes[index], inboxes[index + 1]
+        while True:
+            entry = run.get(inbox)
+            if entry is _DONE:
+                break
+            run.depth(stage.name, inbox)
+            seq, value = entry
+            if not isinstance(value, _Failure):
+                started = time.perf_counter()
+                try:
+                    value = stage.func(value)
+                    run.record(stage.name, time.perf_counter() - started, True)
+                except BaseException as exc:
+                    run.record(stage.name, time.perf_counter() - started, False)
+                    value = _Failure(value, exc)
+            if not run.put(outbox, (seq, value)):
+                break
+        with run.lock:
+            remaining[index] -= 1
+            last = remaining[index] == 0
+        if last:
+            downstream = remaining[index + 1] if index + 1 < len(stages) else 1
+            for _ in range(downstream):
+                run.put(outbox, _DONE)
+
+    started = time.perf_counter()
+    threads.append(threading.Thread(target=produce, name=f"{name}-producer", daemon=True))
+    for index, stage in enumerate(stages):
+        for worker in range(remaining[index]):
+            threads.append(threading.Thread(target=work, args=(index,), name=f"{name}-{stage.name}-{worker}", daemon=True))
+    for thread in threads:
+        thread.start()
+
+    pending: Dict[int, Any] = {}
+    next_seq = 0
+    sink_box = inboxes[-1]
+    try:
+        while True:
+            entry = run.get(sink_box)
+            if entry is _DONE:
+                break
+            run.depth(sink_name, sink_box)
+            seq, value = entry
+            pending[seq] = value
+            while next_seq in pending:
+                value = pending.pop(next_seq)
+                next_seq += 1
+                in_flight.release()
+                if isinstance(value, _Failure):
+                    run.discard((seq, value))
+                    raise value.error
+                sink_started = time.perf_counter()
+                try:
+                    sink(value)
+                except BaseException:
+                    run.record(sink_name, time.perf_counter() - sink_started, False)
+                    raise
+                run.record(sink_name, time.perf_counter() - sink_started, True)
+    except BaseException:
+        run.stop.set()
+        for value in pending.values():
+            run.discard((0, value))
+        raise
+    finally:
+        run.stop.set()
+        for thread in threads:
+            thread.join()
+        for inbox in inboxes:
+            while True:
+                try:
+                    run.discard(inbox.get_nowait())
+                except queue.Empty:
+                    break
+        run.stats.elapsed_seconds = time.perf_counter() - started
+
+    return run.stats
+
+
+__all__ = ["PipelineStats", "Stage", "StageStats", "run_staged_pipeline"]
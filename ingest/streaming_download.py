@@ -0,0 +1,217 @@
+"""Stream HTTP downloads to disk with a checksum, a size cap and range resume.
+
+Filing bundles can be hundreds of megabytes. ``stream_download`` writes the
+body to a temp file chunk by chunk while hashing it, so a worker holds at most
+one chunk in memory per download. If the connection drops mid-body and the
+server advertised ``Accept-Ranges: bytes``, it resumes with a ``Range`` request
+(guarded by ``If-Range`` when an ETag/Last-Modified validator was sent). A
+server that ignores the range restarts the body from scratch.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Mapping, Optional
+
+import httpx
+
+from core.env import env_int, env_str
+from core.logging import get_logger
+from services.ingest_errors import FatalIngestError
+
+logger = get_logger(__name__)
+
+DOWNLOAD_MAX_BYTES = env_int("DOWNLOAD_MAX_BYTES", 512 * 1024 * 1024, minimum=1)
+DOWNLOAD_CHUNK_BYTES = env_int("DOWNLOAD_CHUNK_BYTES", 1024 * 1024, minimum=1024)
+DOWNLOAD_RESUME_ATTEMPTS = env_int("DOWNLOAD_RESUME_ATTEMPTS", 3, minimum=0)
+DOWNLOAD_TEMP_DIR = env_str("DOWNLOAD_TEMP_DIR")
+
+HEAD_BYTES = 4096
+_CONTENT_RANGE_RE = re.compile(r"bytes\s+(\d+)-\d+/(\d+|\*)", re.IGNORECASE)
+
+
+class DownloadTooLargeError(FatalIngestError):
+    """Raised when a response body exceeds the configured size cap."""
+
+
+class _TruncatedBody(Exception):
+    """The server closed the body before ``Content-Length`` bytes arrived."""
+
+
+@dataclass
+class DownloadedFile:
+    """Body of a finished download, stored in a temp file owned by the caller."""
+
+    path: Path
+    size: int
+    sha256: str
+    head: bytes
+    content_type: Optional[str]
+    url: str
+    resumed: int = 0
+
+    def open(self) -> BinaryIO:
+        return self.path.open("rb")
+
+    def read_bytes(self) -> bytes:
+        return self.path.read_bytes()
+
+    def discard(self) -> None:
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> "DownloadedFile":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.discard()
+
+
+def _content_length(response: httpx.Response) -> Optional[int]:
+    if response.headers.get("content-encoding"):
+        return None
+    try:
+        return int(response.headers.get("content-length", ""))
+    except ValueError:
+        return None
+
+
+def _range_start(response: httpx.Response) -> Optional[int]:
+    match = _CONTENT_RANGE_RE.match(response.headers.get("content-range", ""))
+    return int(match.group(1)) if match else None
+
+
+def stream_download(
+    client: httpx.Client,
+    url: str,
+    *,
+    params: Optional[Mapping[str, Any]] = None,
+    headers: Optional[Mapping[str, str]] = None,
+    follow_redirects: bool = True,
+    max_bytes: Optional[int] = None,
+    dest_dir: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+    resume_attempts: Optional[int] = None,
+    before_request: Optional[Callable[[], Any]] = None,
+) -> DownloadedFile:
+    """Download ``url`` into a temp file and return its path, size and SHA-256.
+
+    Raises ``httpx.HTTPError`` for HTTP/transport failures that could not be
+    resumed and :class:`DownloadTooLargeError` once the body passes
+    ``max_bytes``; the temp file is removed in both cases. ``before_request`` is
+    called before every request, including resumes (e.g. to take a rate-limit
+    token).
+    """
+
+    limit = max_bytes if max_bytes is not None else DOWNLOAD_MAX_BYTES
+    step = chunk_size or DOWNLOAD_CHUNK_BYTES
+    attempts_left = DOWNLOAD_RESUME_ATTEMPTS if resume_attempts is None else resume_attempts
+    directory = dest_dir or DOWNLOAD_TEMP_DIR or None
+    if directory:
+        Path(directory).mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(prefix="download-", suffix=".part", dir=directory)
+    path = Path(temp_name)
+
+    digest = hashlib.sha256()
+    head = bytearray()
+    written = 0
+    resumed = 0
+    expected: Optional[int] = None
+    content_type: Optional[str] = None
+    validator: Optional[str] = None
+    ranges_supported = False
+
+    try:
+        with os.fdopen(fd, "wb") as sink:
+            while True:
+                request_headers: Dict[str, str] = dict(headers or {})
+                if written:
+                    request_headers["Range"] = f"bytes={written}-"
+                    if validator:
+                        request_headers["If-Range"] = validator
+                if before_request is not None:
+                    before_request()
+                try:
+                    with client.stream(
+                        "GET",
+                        url,
+                        params=params,
+                        headers=request_headers,
+                        follow_redirects=follow_redirects,
+                    ) as response:
+                        if written and response.status_code == 206:
+                            start = _range_start(response)
+                            if start != written:
+                                raise httpx.RemoteProtocolError(
+                                    f"Range response for {url} starts at {start}, expected {written}.",
+                                    request=response.request,
+                                )
+                        else:
+                            response.raise_for_status()
+                            if written and response.status_code != 200:
+                                raise httpx.RemoteProtocolError(
+                                    f"Unexpected {response.status_code} response resuming {url}.",
+                                    request=response.request,
+                                )
+                            if written:
+                                logger.info("Server ignored range request for %s; restarting download.", url)
+                                sink.seek(0)
+                                sink.truncate()
+                                digest = hashlib.sha256()
+                                head.clear()
+                                written = 0
+                            content_type = response.headers.get("content-type")
+                            validator = response.headers.get("etag") or response.headers.get("last-modified")
+                            ranges_supported = "bytes" in response.headers.get("accept-ranges", "").lower()
+                            expected = _content_length(response)
+                            if expected is not None and expected > limit:
+                                raise DownloadTooLargeError(
+                                    f"Download of {url} is {expected} bytes, above the {limit} byte cap."
+                                )
+                        for chunk in response.iter_bytes(step):
+                            written += len(chunk)
+                            if written > limit:
+                                raise DownloadTooLargeError(f"Download of {url} exceeded the {limit} byte cap.")
+                            digest.update(chunk)
+                            sink.write(chunk)
+                            if len(head) < HEAD_BYTES:
+                                head.extend(chunk[: HEAD_BYTES - len(head)])
+                    if expected is not None and written < expected:
+                        raise _TruncatedBody(f"received {written} of {expected} bytes")
+                    break
+                except (httpx.TransportError, _TruncatedBody) as exc:
+                    if not written or not ranges_supported or attempts_left <= 0:
+                        if isinstance(exc, _TruncatedBody):
+                            raise httpx.RemoteProtocolError(f"Truncated download of {url}: {exc}") from exc
+                        raise
+                    attempts_left -= 1
+                    resumed += 1
+                    logger.warning("Download of %s interrupted at %d bytes (%s); resuming.", url, written, exc)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+
+    return DownloadedFile(
+        path=path,
+        size=written,
+        sha256=digest.hexdigest(),
+        head=bytes(head),
+        content_type=content_type,
+        url=url,
+        resumed=resumed,
+    )
+
+
+__all__ = [
+    "DOWNLOAD_MAX_BYTES",
+    "DownloadTooLargeError",
+    "DownloadedFile",
+    "stream_download",
+]
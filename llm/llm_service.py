@@ -8,6 +8,7 @@ import json
 import math
 import os
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, cast
 
 import litellm
@@ -31,105 +32,15 @@ from llm.prompts import (
     query_classifier,
 )
 from services import deeplink_service
-
-logger = get_logger(__name__)
-
-DEFAULT_LITELLM_CONFIG = Path(__file__).resolve().parent.parent / "litellm_config.yaml"
-
-if not os.getenv("LITELLM_CONFIG_PATH") and DEFAULT_LITELLM_CONFIG.exists():
-    os.environ["LITELLM_CONFIG_PATH"] = str(DEFAULT_LITELLM_CONFIG)
-
-
-def _apply_litellm_aliases() -> None:
-    config_path = os.getenv("LITELLM_CONFIG_PATH")
-    if not config_path:
-        return
-    path = Path(config_path)
-    if not path.is_file():
-        return
-    try:
-        import yaml
-    except ImportError:
-        logger.debug("PyYAML not available; skipping LiteLLM alias load.")
-        return
-    try:
-        config = yaml.safe_load(path.read_text(encoding="utf-8"))
-    except Exception as exc:
-        logger.warning("Failed to parse LiteLLM config for aliases: %s", exc)
-        return
-    model_list = config.get("model_list") if isinstance(config, dict) else None
-    if not isinstance(model_list, list):
-        return
-    alias_map: Dict[str, str] = {}
-    for entry in model_list:
-        if not isinstance(entry, dict):
-            continue
-        alias = entry.get("model_name")
-        params = entry.get("litellm_params")
-        if not alias or not isinstance(params, dict):
-            continue
-        target = params.get("model")
-        if isinstance(target, str) and target:
-            alias_map.setdefault(alias, target)
-    if alias_map:
-        litellm.model_alias_map.update(alias_map)
-
-
-_apply_litellm_aliases()
-
-
-def _extract_usage_payload(response: Any) -> Optional[Dict[str, int]]:
-    """Normalize token usage info from various response shapes."""
-
-    def _normalize(raw: Any) -> Optional[Dict[str, int]]:
-        if raw is None:
-            return None
-        if isinstance(raw, dict):
-            data = raw
-        else:
-            data = {key: getattr(raw, key, None) for key in ("prompt_tokens", "completion_tokens", "total_tokens")}
-        cleaned = {key: int(value) for key, value in data.items() if isinstance(value, (int, float))}
-        return cleaned or None
-
-    usage = getattr(response, "usage", None)
-    payload = _normalize(usage)
-    if payload:
-        return payload
-    if hasattr(response, "model_dump"):  # pydantic-style objects
-        dumped = response.model_dump()
-"""LLM interaction helpers for filings, news analysis, and RAG answers."""
-
-from __future__ import annotations
-
-import asyncio
-import hashlib
-import json
-import math
-import os
-from pathlib import Path
-from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, cast
-
-import litellm
-
-
-from core.env import env_bool
-from core.logging import get_logger
-from llm import guardrails
-from llm.prompts import (
-    analyze_news,
-    chat_summary,
-    classify_filing,
-    extract_info,
-    judge_guard,
-    semantic_router,
-    rag_qa,
-    self_check,
-    summarize_report,
-    table_aware_rag,
-    value_chain_extract,
-    query_classifier,
+from services.llm_decision_cache import (
+    QUERY_CLASSIFIER_CACHE_SIMILARITY,
+    QUERY_CLASSIFIER_CACHE_TTL_SECONDS,
+    ROUTER_CACHE_SIMILARITY,
+    ROUTER_CACHE_TTL_SECONDS,
+    get_decision_cache,
+    prompt_version,
 )
-from services import deeplink_service
+from services.llm_completion_cache import CompletionCache, completion_cache_key, get_completion_cache
 
 logger = get_logger(__name__)
 
@@ -215,6 +126,15 @@ ROUTER_MODEL = os.getenv("LLM_ROUTER_MODEL", QUALITY_FALLBACK_MODEL)
 QUERY_CLASSIFIER_MODEL = os.getenv("LLM_QUERY_CLASSIFIER_MODEL", JUDGE_MODEL)
 # Dedicated model for investment memo/report generation; falls back to QUALITY_FALLBACK_MODEL if unset.
 REPORT_MODEL = os.getenv("LLM_REPORT_MODEL", QUALITY_FALLBACK_MODEL)
+RAG_LINK_DEEPLINK = env_bool("RAG_LINK_DEEPLINK", True)
+MAX_CITATIONS_PER_BUCKET = int(os.getenv("RAG_MAX_CITATIONS_PER_BUCKET", "10"))
+RAG_REQUIRE_SNIPPET = env_bool("RAG_REQUIRE_SNIPPET", True)
+
+
+def _choice_content(response: Any) -> str:
+    """Return the first choice's message content, or an empty string."""
+
+    try:
         response_any = cast(Any, response)
         choices = getattr(response_any, "choices", None)
         if isinstance(choices, list) and choices:
@@ -235,16 +155,62 @@ REPORT_MODEL = os.getenv("LLM_REPORT_MODEL", QUALITY_FALLBACK_MODEL)
     return ""
 
 
+def _cached_response(content: str) -> Any:
+    """Minimal completion-shaped object for content served from the completion cache."""
+
+    return SimpleNamespace(choices=[{"message": {"role": "assistant", "content": content}}], usage=None)
+
+
+def _store_completion(
+    cache: CompletionCache,
+    task: str,
+    key: str,
+    response: Any,
+    model: str,
+    validator: Optional[Callable[[str], bool]],
+) -> None:
+    content = _choice_content(response)
+    if validator is not None and not validator(content):
+        logger.info("Not caching %s completion from %s: content failed validation.", task, model)
+        return
+    cache.set(task, key, content, model)
+
+
+def _is_json_object(content: str) -> bool:
+    try:
+        return isinstance(json.loads(content or "{}"), dict)
+    except ValueError:
+        return False
+
+
 def _safe_completion(
     model: str,
     messages: List[Dict[str, Any]],
     *,
     response_format: Optional[Dict[str, Any]] = None,
     fallback_model: Optional[str] = None,
+    cache_task: Optional[str] = None,
+    cache_validator: Optional[Callable[[str], bool]] = None,
 ) -> Tuple[Optional[Any], Optional[str]]:
+    """Call ``model`` (then ``fallback_model``); returns ``(response, model_used)`` or ``(None, error)``.
+
+    With ``cache_task`` the completion cache is consulted first, and a fresh reply
+    is stored only when ``cache_validator`` (if given) accepts its content.
+    """
+
+    cache = get_completion_cache() if cache_task else None
+    cache_key: Optional[str] = None
+    if cache is not None and cache_task:
+        cache_key = completion_cache_key(model, messages, {"response_format": response_format})
+        cached = cache.get(cache_task, cache_key)
+        if cached is not None:
+            content, cached_model = cached
+            return _cached_response(content), cached_model or model
+
     try:
         response = litellm.completion(model=model, messages=messages, response_format=response_format)
-        response_content = _choice_content(response)
+        if cache_key is not None and cache is not None and cache_task:
+            _store_completion(cache, cache_task, cache_key, response, model, cache_validator)
 
         return response, model
     except Exception as primary_err:
@@ -259,7 +225,8 @@ def _safe_completion(
                     response_format=response_format,
                 )
                 logger.info("Fallback model %s succeeded after %s failure.", fallback_model, model)
-                response_content = _choice_content(response)
+                if cache_key is not None and cache is not None and cache_task:
+                    _store_completion(cache, cache_task, cache_key, response, fallback_model, cache_validator)
 
                 return response, fallback_model
             except Exception as fallback_err:
@@ -280,12 +247,15 @@ def _json_completion(
     messages: List[Dict[str, Any]],
     *,
     fallback_model: Optional[str] = QUALITY_FALLBACK_MODEL,
+    cache_task: Optional[str] = None,
 ) -> Dict[str, Any]:
     response, model_used = _safe_completion(
         model=model,
         messages=messages,
         response_format={"type": "json_object"},
         fallback_model=fallback_model,
+        cache_task=cache_task,
+        cache_validator=_is_json_object,
     )
     if response is None:
         return {"error": model_used}
@@ -308,12 +278,14 @@ def _run_json_prompt(
     normalizer: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
     default_on_error: Optional[Dict[str, Any]] = None,
     log_level: str = "error",
+    cache_task: Optional[str] = None,
 ) -> Dict[str, Any]:
     log_method = getattr(logger, log_level, logger.error)
     result = _json_completion(
         model=model,
         messages=messages,
         fallback_model=fallback_model,
+        cache_task=cache_task,
     )
     if "error" in result:
         log_method("%s failed: %s", label, result["error"])
@@ -375,6 +347,7 @@ def classify_filing_content(raw_md: str) -> Dict[str, Any]:
         label="Filing classification",
         model=CLASSIFICATION_MODEL,
         messages=messages,
+        cache_task="filing_classification",
     )
 
 
@@ -399,28 +372,48 @@ def classify_query_category(question: str) -> Dict[str, Any]:
     if not normalized:
         return {"category": "chitchat"}
 
-    messages = query_classifier.get_prompt(normalized)
-    return _run_json_prompt(
-        label="Front door query classifier",
-        model=QUERY_CLASSIFIER_MODEL,
-        messages=messages,
-        normalizer=_normalize_query_category,
-        default_on_error={"category": "financial_query"},
-        log_level="warning",
+    def _classify() -> Dict[str, Any]:
+        return _run_json_prompt(
+            label="Front door query classifier",
+            model=QUERY_CLASSIFIER_MODEL,
+            messages=query_classifier.get_prompt(normalized),
+            normalizer=_normalize_query_category,
+            default_on_error={"category": "financial_query"},
+            log_level="warning",
+        )
+
+    cache = get_decision_cache(
+        "query_classifier",
+        version=lambda: prompt_version(QUERY_CLASSIFIER_MODEL, query_classifier.get_prompt),
+        ttl_seconds=QUERY_CLASSIFIER_CACHE_TTL_SECONDS,
+        similarity_threshold=QUERY_CLASSIFIER_CACHE_SIMILARITY,
     )
+    if cache is None:
+        return _classify()
+    return cache.get_or_compute(normalized, _classify)
 
 
 def route_chat_query(question: str) -> Dict[str, Any]:
     """Invoke the SemanticRouter prompt to classify a query into actions."""
 
-    messages = semantic_router.get_prompt(question)
-    return _run_json_prompt(
-        label="Semantic router",
-        model=ROUTER_MODEL,
-        messages=messages,
-        default_on_error=dict(_ROUTER_FALLBACK),
-        log_level="warning",
+    def _route() -> Dict[str, Any]:
+        return _run_json_prompt(
+            label="Semantic router",
+            model=ROUTER_MODEL,
+            messages=semantic_router.get_prompt(question),
+            default_on_error=dict(_ROUTER_FALLBACK),
+            log_level="warning",
+        )
+
+    cache = get_decision_cache(
+        "semantic_router",
+        version=lambda: prompt_version(ROUTER_MODEL, semantic_router.get_prompt),
+        ttl_seconds=ROUTER_CACHE_TTL_SECONDS,
+        similarity_threshold=ROUTER_CACHE_SIMILARITY,
     )
+    if cache is None or not (question or "").strip():
+        return _route()
+    return cache.get_or_compute(question, _route)
 
 
 def extract_structured_info(raw_md: str) -> Dict[str, Any]:
@@ -430,6 +423,7 @@ def extract_structured_info(raw_md: str) -> Dict[str, Any]:
         label="Filing extraction",
         model=EXTRACTION_MODEL,
         messages=messages,
+        cache_task="filing_extraction",
     )
 
 
@@ -547,6 +541,7 @@ def analyze_news_article(article_text: str) -> Dict[str, Any]:
         messages=messages,
         fallback_model=QUALITY_FALLBACK_MODEL,
         normalizer=validate_news_analysis_result,
+        cache_task="news_analysis",
     )
     if "error" in validated:
         return validated
@@ -608,6 +603,7 @@ def self_check_extracted_info(raw_md: str, candidate_facts: List[Dict[str, Any]]
         label="Self-check verification",
         model=SELF_CHECK_MODEL,
         messages=messages,
+        cache_task="self_check",
     )
 
 
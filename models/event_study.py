@@ -126,6 +126,21 @@ class EventSummary(Base):
     dist = Column(JSONB, nullable=True)
 
 
+class EventCohortPartial(Base):
+    """Mergeable AR/CAR statistics for one (window, event type, cap bucket, month) cell."""
+
+    __tablename__ = "event_cohort_partials"
+
+    window_key = Column(String, primary_key=True)
+    event_type = Column(String, primary_key=True)
+    cap_bucket = Column(String, primary_key=True)
+    period = Column(Date, primary_key=True)
+    signature = Column(String, nullable=False)
+    n = Column(Integer, nullable=False, default=0)
+    stats = Column(JSONB, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+
 class EventIngestJob(Base):
     """Book-keeps batch ingestion windows so we can resume or monitor progress."""
 
@@ -144,11 +159,23 @@ class EventIngestJob(Base):
     updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
 
 
+class EventJobCheckpoint(Base):
+    """Keyset position of an interrupted batch job so the next run can resume it."""
+
+    __tablename__ = "event_job_checkpoints"
+
+    job_name = Column(String, primary_key=True)
+    position = Column(JSONB, nullable=False, default=dict)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+
 __all__ = [
     "EventRecord",
     "Price",
     "EventStudyResult",
     "EventWindow",
     "EventSummary",
+    "EventCohortPartial",
     "EventIngestJob",
+    "EventJobCheckpoint",
 ]
@@ -0,0 +1,13 @@
+-- Per-month cohort partials used to aggregate event_summary incrementally
+
+CREATE TABLE IF NOT EXISTS event_cohort_partials (
+    window_key TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    cap_bucket TEXT NOT NULL,
+    period DATE NOT NULL,
+    signature TEXT NOT NULL,
+    n INTEGER NOT NULL DEFAULT 0,
+    stats JSONB NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (window_key, event_type, cap_bucket, period)
+);
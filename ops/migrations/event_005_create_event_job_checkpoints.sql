@@ -0,0 +1,7 @@
+-- Resume positions for batch jobs that walk events in keyset order
+
+CREATE TABLE IF NOT EXISTS event_job_checkpoints (
+    job_name TEXT PRIMARY KEY,
+    position JSONB NOT NULL DEFAULT '{}'::jsonb,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
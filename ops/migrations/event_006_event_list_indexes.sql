@@ -0,0 +1,8 @@
+-- Indexes behind the fused event list query (keyset order, per-row evidence count)
+
+CREATE INDEX IF NOT EXISTS idx_events_event_date_rcept_no
+    ON events (event_date DESC NULLS LAST, rcept_no DESC);
+
+-- Same expression SQLAlchemy emits for payload["document"]["receiptNo"].astext on PostgreSQL 14+
+CREATE INDEX IF NOT EXISTS idx_evidence_snapshots_receipt_no
+    ON evidence_snapshots ((payload['document'] ->> 'receiptNo'));
@@ -0,0 +1,298 @@
+"""Per-page PDF analysis shared by the chunker and the table extractor.
+
+``analyze_document`` runs the expensive PyMuPDF calls once per page — text
+blocks, ``find_tables`` and the image blocks of ``get_text("dict")`` — and
+returns plain, picklable :class:`PageAnalysis` records. Large documents can be
+analysed by a process pool over contiguous page ranges; results are always
+returned in page order, so anything built from them is independent of the
+worker count.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+from core.env import env_int, env_str
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+PDF_PARSE_WORKERS = env_int("PDF_PARSE_WORKERS", 1, minimum=1)
+PDF_PARSE_PAGES_PER_TASK = env_int("PDF_PARSE_PAGES_PER_TASK", 16, minimum=1)
+PDF_PARSE_PARALLEL_MIN_PAGES = env_int("PDF_PARSE_PARALLEL_MIN_PAGES", 32, minimum=1)
+PDF_FIGURE_SPILL_DIR = env_str("PDF_FIGURE_SPILL_DIR", "uploads/figures")
+
+
+@dataclass
+class TableSnapshot:
+    """Rows, bbox and cell geometry of a table found by ``page.find_tables``."""
+
+    rows: List[List[Any]]
+    bbox: Any
+    cells: List[Dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class PageAnalysis:
+    """Everything the chunker and ``TableExtractor`` need from one page."""
+
+    page_number: int
+    width: float
+    height: float
+    text_blocks: List[Tuple[Any, ...]] = field(default_factory=list)
+    tables: List[TableSnapshot] = field(default_factory=list)
+    image_blocks: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def _sanitize_rect(rect: Any) -> List[float]:
+    if hasattr(rect, "x0") and hasattr(rect, "y0") and hasattr(rect, "x1") and hasattr(rect, "y1"):
+        return [float(rect.x0), float(rect.y0), float(rect.x1), float(rect.y1)]
+    if isinstance(rect, (list, tuple)) and len(rect) >= 4:
+        return [float(rect[0]), float(rect[1]), float(rect[2]), float(rect[3])]
+    return [0.0, 0.0, 0.0, 0.0]
+
+
+def _find_tables(page: Any) -> List[Any]:
+    find_tables = getattr(page, "find_tables", None)
+    if not callable(find_tables):
+        return []
+    try:
+        tables_obj = find_tables()
+    except Exception:
+        return []
+    if isinstance(tables_obj, list):
+        return tables_obj
+    candidate = getattr(tables_obj, "tables", None)
+    if isinstance(candidate, list):
+        return candidate
+    return []
+
+
+def _snapshot_table(table: Any, page_number: int) -> TableSnapshot:
+    rows = table.extract() or []
+    cells: List[Dict[str, Any]] = []
+    try:
+        for cell in table.cells or []:
+            cells.append(
+                {
+                    "row": getattr(cell, "row", None),
+                    "column": getattr(cell, "col", None),
+                    "bbox": _sanitize_rect(cell.bbox),
+                    "span": getattr(cell, "span", None),
+                }
+            )
+    except Exception:
+        logger.debug("Failed to read cell metadata for table on page %s.", page_number, exc_info=True)
+    return TableSnapshot(rows=rows, bbox=getattr(table, "bbox", None), cells=cells)
+
+
+def spill_image(image: Optional[bytes], spill_dir: Optional[str]) -> Dict[str, Any]:
+    """Hash ``image`` and (when ``spill_dir`` is set) write it there by content hash."""
+
+    if not image:
+        return {"image_sha256": None, "image_bytes": 0}
+    digest = hashlib.sha256(image).hexdigest()
+    if spill_dir:
+        target = Path(spill_dir) / digest
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = target.with_name(f".{digest}.{os.getpid()}.tmp")
+            temp_path.write_bytes(image)
+            os.replace(temp_path, target)
+    return {"image_sha256": digest, "image_bytes": len(image)}
+
+
+def _image_blocks(page: Any, spill_dir: Optional[str]) -> List[Dict[str, Any]]:
+    dict_blocks_raw = page.get_text("dict")
+    if not isinstance(dict_blocks_raw, Mapping):
+        return []
+    blocks_value = dict_blocks_raw.get("blocks", [])
+    if not isinstance(blocks_value, list):
+        return []
+    images: List[Dict[str, Any]] = []
+    for block in blocks_value:
+        if not isinstance(block, Mapping) or block.get("type") != 1:
+            continue
+        entry = {"bbox": block.get("bbox", [0, 0, 0, 0])}
+        entry.update(spill_image(block.get("image"), spill_dir))
+        images.append(entry)
+    return images
+
+
+def analyze_page(
+    page: Any,
+    page_number: int,
+    *,
+    include_text: bool = True,
+    spill_dir: Optional[str] = None,
+) -> PageAnalysis:
+    """Run the PyMuPDF extraction calls for ``page`` once.
+
+    Figure bytes never leave this function: they are hashed and written to
+    ``spill_dir``, and only ``image_sha256``/``image_bytes`` are kept.
+    """
+
+    analysis = PageAnalysis(
+        page_number=page_number,
+        width=float(page.rect.width or 1.0),
+        height=float(page.rect.height or 1.0),
+    )
+    if include_text:
+        analysis.text_blocks = [tuple(block) for block in page.get_text("blocks")]
+    analysis.tables = [_snapshot_table(table, page_number) for table in _find_tables(page)]
+    if include_text:
+        analysis.image_blocks = _image_blocks(page, spill_dir)
+    return analysis
+
+
+def _iter_range(
+    pdf_path: str,
+    start: Optional[int],
+    stop: Optional[int],
+    include_text: bool,
+    spill_dir: Optional[str],
+) -> Iterator[PageAnalysis]:
+    document = fitz.open(pdf_path)
+    try:
+        page_count = len(document)
+        stop = page_count if stop is None else min(stop, page_count)
+        for page_index in range(start or 0, stop):
+            yield analyze_page(
+                document[page_index],
+                page_index + 1,
+                include_text=include_text,
+                spill_dir=spill_dir,
+            )
+    finally:
+        document.close()
+
+
+def _analyze_range(
+    pdf_path: str,
+    start: int,
+    stop: int,
+    include_text: bool,
+    spill_dir: Optional[str],
+) -> List[PageAnalysis]:
+    return list(_iter_range(pdf_path, start, stop, include_text, spill_dir))
+
+
+def _page_ranges(page_count: int, pages_per_task: int) -> List[Tuple[int, int]]:
+    step = max(1, pages_per_task)
+    return [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+
+
+def _can_fork_workers() -> bool:
+    # Daemonic multiprocessing children are not allowed to start their own pools.
+    return not multiprocessing.current_process().daemon
+
+
+def _page_count(pdf_path: str) -> int:
+    document = fitz.open(pdf_path)
+    try:
+        return len(document)
+    finally:
+        document.close()
+
+
+def iter_page_analyses(
+    pdf_path: str,
+    *,
+    workers: Optional[int] = None,
+    pages_per_task: Optional[int] = None,
+    max_pages: Optional[int] = None,
+    include_text: bool = True,
+    spill_dir: Optional[str] = None,
+) -> Iterator[PageAnalysis]:
+    """Yield page analyses for ``pdf_path`` in page order.
+
+    The serial path keeps a single page's analysis alive at a time and closes the
+    document when the generator is exhausted or closed. With ``workers > 1`` page
+    ranges are analysed by a process pool and yielded in range order as each one
+    completes; closing the generator cancels the ranges that have not started.
+    """
+
+    if spill_dir is None:
+        spill_dir = PDF_FIGURE_SPILL_DIR or None
+    worker_count = workers if workers is not None else PDF_PARSE_WORKERS
+    if worker_count <= 1 or not _can_fork_workers():
+        yield from _iter_range(pdf_path, 0, max_pages, include_text, spill_dir)
+        return
+
+    page_count = _page_count(pdf_path)
+    if max_pages:
+        page_count = min(page_count, max_pages)
+    if page_count < PDF_PARSE_PARALLEL_MIN_PAGES:
+        yield from _iter_range(pdf_path, 0, page_count, include_text, spill_dir)
+        return
+
+    ranges = _page_ranges(page_count, pages_per_task or PDF_PARSE_PAGES_PER_TASK)
+    logger.info(
+        "Analysing '%s' with %d workers over %d page ranges.",
+        pdf_path,
+        min(worker_count, len(ranges)),
+        len(ranges),
+    )
+    yielded = 0
+    try:
+        with ProcessPoolExecutor(max_workers=min(worker_count, len(ranges))) as pool:
+            futures = [
+                pool.submit(_analyze_range, pdf_path, start, stop, include_text, spill_dir)
+                for start, stop in ranges
+            ]
+            try:
+                for future in futures:
+                    for analysis in future.result():
+                        yield analysis
+                        yielded += 1
+            finally:
+                # Closing the generator early must not wait for ranges nobody will read.
+                for future in futures:
+                    future.cancel()
+    except Exception as exc:
+        logger.warning("Parallel PDF analysis failed for '%s'; retrying serially: %s", pdf_path, exc)
+        yield from _iter_range(pdf_path, yielded, page_count, include_text, spill_dir)
+
+
+def analyze_document(
+    pdf_path: str,
+    *,
+    workers: Optional[int] = None,
+    pages_per_task: Optional[int] = None,
+    max_pages: Optional[int] = None,
+    include_text: bool = True,
+    spill_dir: Optional[str] = None,
+) -> List[PageAnalysis]:
+    """Analyse every page of ``pdf_path`` (optionally with a process pool).
+
+    The result list is ordered by page number regardless of ``workers``.
+    """
+
+    return list(
+        iter_page_analyses(
+            pdf_path,
+            workers=workers,
+            pages_per_task=pages_per_task,
+            max_pages=max_pages,
+            include_text=include_text,
+            spill_dir=spill_dir,
+        )
+    )
+
+
+__all__ = [
+    "PageAnalysis",
+    "TableSnapshot",
+    "analyze_document",
+    "analyze_page",
+    "iter_page_analyses",
+    "spill_image",
+]
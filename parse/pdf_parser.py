@@ -5,13 +5,12 @@ from __future__ import annotations
 import logging
 import re
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple, Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 import hashlib
 
-import fitz  # PyMuPDF
-
 from parse.chunk_utils import build_chunk, normalize_text
+from parse.pdf_analysis import PageAnalysis, TableSnapshot, iter_page_analyses
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -135,290 +134,271 @@ def _should_merge(prev_block: Dict[str, Any], next_block: Dict[str, Any]) -> boo
     return horizontal_shift <= COLUMN_ALIGNMENT_TOLERANCE
 
 
-def extract_chunks(pdf_path: str) -> List[Dict[str, Any]]:
-    """Return chunks of text/table/footnote/figure elements from a PDF."""
+class _PageChunkBuilder:
+    """Accumulate one page's blocks into chunks with O(1) bookkeeping per block.
+
+    ``chunk_counter`` is shared across pages by the caller so chunk ids stay
+    identical to the historical, fully serial parser.
+    """
+
+    def __init__(self, analysis: PageAnalysis, chunk_counter: int) -> None:
+        self.page_number = analysis.page_number
+        self.page_width = analysis.width
+        self.page_height = analysis.height
+        self.chunk_counter = chunk_counter
+        self._char_cursor = 0
+        self._reset_pending()
+
+    def _reset_pending(self) -> None:
+        self._pending_lines: List[str] = []
+        self._pending_blocks: List[Any] = []
+        self._pending_bbox = [float("inf"), float("inf"), 0.0, 0.0]
+        self._pending_length = 0
+
+    def _next_id(self, kind: str) -> str:
+        chunk_id = f"pdf-{kind}-{self.page_number}-{self.chunk_counter}"
+        self.chunk_counter += 1
+        return chunk_id
+
+    def _allocate_char_span(self, text: str) -> Tuple[int, int]:
+        safe_len = len(text or "")
+        start = self._char_cursor
+        end = start + safe_len
+        self._char_cursor = end + (1 if safe_len else 0)
+        return start, end
+
+    def _metadata(self, bbox: Sequence[float], base: Dict[str, Any], content: str) -> Dict[str, Any]:
+        metadata = _enrich_metadata(
+            float(bbox[0]),
+            float(bbox[1]),
+            float(bbox[2]),
+            float(bbox[3]),
+            page_width=self.page_width,
+            page_height=self.page_height,
+            base=base,
+        )
+        hash_value = _sentence_hash(content)
+        if hash_value:
+            metadata["sentence_hash"] = hash_value
+        return metadata
+
+    def _start_pending(self, info: Dict[str, Any]) -> None:
+        self._pending_lines = list(info["body_lines"])
+        self._pending_blocks = [info["block_index"]]
+        self._pending_bbox = [info["x0"], info["y0"], info["x1"], info["y1"]]
+        self._pending_length = sum(len(line) for line in info["body_lines"])
+
+    def _extend_pending(self, info: Dict[str, Any]) -> None:
+        self._pending_lines.extend(info["body_lines"])
+        self._pending_blocks.append(info["block_index"])
+        bbox = self._pending_bbox
+        bbox[0] = min(bbox[0], info["x0"])
+        bbox[1] = min(bbox[1], info["y0"])
+        bbox[2] = max(bbox[2], info["x1"])
+        bbox[3] = max(bbox[3], info["y1"])
+        self._pending_length += sum(len(line) for line in info["body_lines"])
+
+    def _current_span(self) -> Dict[str, Any]:
+        bbox = self._pending_bbox
+        return {"x0": bbox[0], "y0": bbox[1], "x1": bbox[2], "y1": bbox[3], "body_lines": self._pending_lines}
+
+    def flush(self) -> Iterator[Dict[str, Any]]:
+        if not self._pending_lines:
+            return
+        content = " ".join(self._pending_lines).strip()
+        if not content:
+            self._reset_pending()
+            return
+
+        char_start, char_end = self._allocate_char_span(content)
+        base_meta: Dict[str, Any] = {
+            "block_indices": [idx for idx in self._pending_blocks if idx is not None],
+            "approx_char_length": len(content),
+            "char_start": char_start,
+            "char_end": char_end,
+        }
+        hash_value = _sentence_hash(content)
+        if hash_value:
+            base_meta["sentence_hash"] = hash_value
+        metadata = _enrich_metadata(
+            self._pending_bbox[0],
+            self._pending_bbox[1],
+            self._pending_bbox[2],
+            self._pending_bbox[3],
+            page_width=self.page_width,
+            page_height=self.page_height,
+            base=base_meta,
+        )
+        yield build_chunk(
+            self._next_id("text"),
+            chunk_type="text",
+            content=content,
+            section="body",
+            source="pdf",
+            page_number=self.page_number,
+            metadata=metadata,
+        )
+        self._reset_pending()
+
+    def add_block(self, info: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        if info["body_lines"]:
+            if not self._pending_lines:
+                self._start_pending(info)
+            elif _should_merge(self._current_span(), info) or self._pending_length < MIN_PARAGRAPH_LENGTH:
+                self._extend_pending(info)
+            else:
+                yield from self.flush()
+                self._start_pending(info)
+        else:
+            yield from self.flush()
+
+        if info["footnote_lines"] and (info["y0"] / self.page_height) >= FOOTNOTE_Y_RATIO:
+            footnote_content = " ".join(info["footnote_lines"])
+            char_start, char_end = self._allocate_char_span(footnote_content)
+            metadata = self._metadata(
+                (info["x0"], info["y0"], info["x1"], info["y1"]),
+                {
+                    "block_index": info["block_index"],
+                    "footnote_lines": info["footnote_lines"],
+                    "char_start": char_start,
+                    "char_end": char_end,
+                },
+                footnote_content,
+            )
+            yield build_chunk(
+                self._next_id("footnote"),
+                chunk_type="footnote",
+                content=footnote_content,
+                section="footnote",
+                source="pdf",
+                page_number=self.page_number,
+                metadata=metadata,
+            )
+
+    def add_table(self, table_index: int, table: TableSnapshot) -> Iterator[Dict[str, Any]]:
+        table_data = table.rows
+        if not table_data:
+            return
+
+        table_text = _table_to_text(table_data)
+        char_start, char_end = self._allocate_char_span(table_text)
+        page_height = self.page_height
+        cells_metadata: List[Dict[str, Any]] = []
+        for cell in table.cells:
+            cell_bbox = cell["bbox"]
+            cells_metadata.append(
+                {
+                    "row": cell["row"],
+                    "column": cell["column"],
+                    "bbox": cell_bbox,
+                    "y_start_pct": _clamp_pct((cell_bbox[1] / page_height) * 100.0 if page_height else 0.0),
+                    "y_end_pct": _clamp_pct((cell_bbox[3] / page_height) * 100.0 if page_height else 0.0),
+                    "span": cell["span"],
+                }
+            )
+
+        table_metadata = self._metadata(
+            _sanitize_rect(table.bbox),
+            {
+                "table_json": table_data,
+                "cell_coordinates": cells_metadata,
+                "table_index": table_index,
+                "char_start": char_start,
+                "char_end": char_end,
+            },
+            table_text,
+        )
+        yield build_chunk(
+            self._next_id("table"),
+            chunk_type="table",
+            content=table_text,
+            section="table",
+            source="pdf",
+            page_number=self.page_number,
+            metadata=table_metadata,
+        )
+
+    def add_figure(self, block: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        figure_content = f"Figure image on page {self.page_number}"
+        char_start, char_end = self._allocate_char_span(figure_content)
+        figure_metadata = self._metadata(
+            block.get("bbox", [0, 0, 0, 0]),
+            {
+                "image_sha256": block.get("image_sha256"),
+                "image_bytes": block.get("image_bytes", 0),
+                "char_start": char_start,
+                "char_end": char_end,
+            },
+            figure_content,
+        )
+        yield build_chunk(
+            self._next_id("figure"),
+            chunk_type="figure",
+            content=figure_content,
+            section="figure",
+            source="pdf",
+            page_number=self.page_number,
+            metadata=figure_metadata,
+        )
+
+    def build(self, analysis: PageAnalysis) -> Iterator[Dict[str, Any]]:
+        for block in analysis.text_blocks:
+            yield from self.add_block(_build_block_info(block))
+        yield from self.flush()
+        for table_index, table in enumerate(analysis.tables, start=1):
+            yield from self.add_table(table_index, table)
+        for block in analysis.image_blocks:
+            yield from self.add_figure(block)
+
+
+def iter_chunks(
+    pdf_path: str,
+    *,
+    analyses: Optional[Iterable[PageAnalysis]] = None,
+    workers: Optional[int] = None,
+    spill_dir: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield chunks page by page.
+
+    Without ``analyses`` the document is analysed lazily (one page in memory at
+    a time when serial) and closed as soon as the generator finishes or is
+    closed. Figure images are written to ``spill_dir`` (default
+    ``PDF_FIGURE_SPILL_DIR``); chunk metadata only keeps their hash and size.
+    """
     path = Path(pdf_path)
     if not path.is_file():
         raise FileNotFoundError(f"PDF file not found: {pdf_path}")
 
-    chunks: List[Dict[str, Any]] = []
+    if analyses is None:
+        analyses = iter_page_analyses(pdf_path, workers=workers, spill_dir=spill_dir)
     chunk_counter = 1
+    for analysis in analyses:
+        builder = _PageChunkBuilder(analysis, chunk_counter)
+        yield from builder.build(analysis)
+        chunk_counter = builder.chunk_counter
 
-    try:
-        document = fitz.open(pdf_path)
-        page_count = len(document)
-        logger.info("Parsing PDF '%s' (%d pages).", pdf_path, page_count)
-
-        for page_index in range(page_count):
-            page = document[page_index]
-            page_number = page_index + 1
-            page_height = float(page.rect.height or 1.0)
-            page_width = float(page.rect.width or 1.0)
-
-            block_infos = [_build_block_info(block) for block in page.get_text("blocks")]
-
-            pending_lines: List[str] = []
-            pending_blocks: List[Any] = []
-            pending_bbox = [float("inf"), float("inf"), 0.0, 0.0]
-            current_span: Optional[Dict[str, Any]] = None
-            page_char_cursor = 0
-
-            def _allocate_char_span(text: str) -> Tuple[int, int]:
-                nonlocal page_char_cursor
-                safe_len = len(text or "")
-                start = page_char_cursor
-                end = start + safe_len
-                page_char_cursor = end + (1 if safe_len else 0)
-                return start, end
-
-            def _reset_pending() -> None:
-                nonlocal pending_lines, pending_blocks, pending_bbox, current_span
-                pending_lines = []
-                pending_blocks = []
-                pending_bbox = [float("inf"), float("inf"), 0.0, 0.0]
-                current_span = None
-
-            def _flush_pending() -> None:
-                nonlocal chunk_counter, pending_lines, pending_blocks, pending_bbox, current_span
-                if not pending_lines:
-                    return
-                content = " ".join(pending_lines).strip()
-                if not content:
-                    _reset_pending()
-                    return
-
-                char_start, char_end = _allocate_char_span(content)
-                base_meta: Dict[str, Any] = {
-                    "block_indices": [idx for idx in pending_blocks if idx is not None],
-                    "approx_char_length": len(content),
-                    "char_start": char_start,
-                    "char_end": char_end,
-                }
-                hash_value = _sentence_hash(content)
-                if hash_value:
-                    base_meta["sentence_hash"] = hash_value
-                metadata = _enrich_metadata(
-                    pending_bbox[0],
-                    pending_bbox[1],
-                    pending_bbox[2],
-                    pending_bbox[3],
-                    page_width=page_width,
-                    page_height=page_height,
-                    base=base_meta,
-                )
-                chunks.append(
-                    build_chunk(
-                        f"pdf-text-{page_number}-{chunk_counter}",
-                        chunk_type="text",
-                        content=content,
-                        section="body",
-                        source="pdf",
-                        page_number=page_number,
-                        metadata=metadata,
-                    )
-                )
-                chunk_counter += 1
-                _reset_pending()
-
-            for info in block_infos:
-                has_body = bool(info["body_lines"])
-                has_footnote = bool(info["footnote_lines"])
-
-                if has_body:
-                    if not pending_lines:
-                        pending_lines = list(info["body_lines"])
-                        pending_blocks = [info["block_index"]]
-                        pending_bbox = [info["x0"], info["y0"], info["x1"], info["y1"]]
-                        current_span = {
-                            "x0": info["x0"],
-                            "y0": info["y0"],
-                            "x1": info["x1"],
-                            "y1": info["y1"],
-                            "body_lines": list(info["body_lines"]),
-                        }
-                    else:
-                        should_merge = current_span is not None and _should_merge(current_span, info)
-                        pending_text_length = sum(len(line) for line in pending_lines)
-                        if should_merge or pending_text_length < MIN_PARAGRAPH_LENGTH:
-                            pending_lines.extend(info["body_lines"])
-                            pending_blocks.append(info["block_index"])
-                            pending_bbox[0] = min(pending_bbox[0], info["x0"])
-                            pending_bbox[1] = min(pending_bbox[1], info["y0"])
-                            pending_bbox[2] = max(pending_bbox[2], info["x1"])
-                            pending_bbox[3] = max(pending_bbox[3], info["y1"])
-                            current_span = {
-                                "x0": min(current_span["x0"], info["x0"]) if current_span else info["x0"],
-                                "y0": min(current_span["y0"], info["y0"]) if current_span else info["y0"],
-                                "x1": max(current_span["x1"], info["x1"]) if current_span else info["x1"],
-                                "y1": max(current_span["y1"], info["y1"]) if current_span else info["y1"],
-                                "body_lines": list(pending_lines),
-                            }
-                        else:
-                            _flush_pending()
-                            pending_lines = list(info["body_lines"])
-                            pending_blocks = [info["block_index"]]
-                            pending_bbox = [info["x0"], info["y0"], info["x1"], info["y1"]]
-                            current_span = {
-                                "x0": info["x0"],
-                                "y0": info["y0"],
-                                "x1": info["x1"],
-                                "y1": info["y1"],
-                                "body_lines": list(info["body_lines"]),
-                            }
-                else:
-                    _flush_pending()
-
-                if has_footnote and (info["y0"] / page_height) >= FOOTNOTE_Y_RATIO:
-                    footnote_content = " ".join(info["footnote_lines"])
-                    char_start, char_end = _allocate_char_span(footnote_content)
-                    metadata = _enrich_metadata(
-                        info["x0"],
-                        info["y0"],
-                        info["x1"],
-                        info["y1"],
-                        page_width=page_width,
-                        page_height=page_height,
-                        base={
-                            "block_index": info["block_index"],
-                            "footnote_lines": info["footnote_lines"],
-                            "char_start": char_start,
-                            "char_end": char_end,
-                        },
-                    )
-                    hash_value = _sentence_hash(footnote_content)
-                    if hash_value:
-                        metadata["sentence_hash"] = hash_value
-                    chunks.append(
-                        build_chunk(
-                            f"pdf-footnote-{page_number}-{chunk_counter}",
-                            chunk_type="footnote",
-                            content=footnote_content,
-                            section="footnote",
-                            source="pdf",
-                            page_number=page_number,
-                            metadata=metadata,
-                        )
-                    )
-                    chunk_counter += 1
-
-            _flush_pending()
-
-            find_tables = getattr(page, "find_tables", None)
-            tables_list: List[Any] = []
-            if callable(find_tables):
-                try:
-                    tables_obj = find_tables()
-                    if isinstance(tables_obj, list):
-                        tables_list = tables_obj
-                    else:
-                        candidate = getattr(tables_obj, "tables", None)
-                        if isinstance(candidate, list):
-                            tables_list = candidate
-                except Exception:
-                    tables_list = []
-            for table_index, table in enumerate(tables_list, start=1):
-                table_data = table.extract()
-                if not table_data:
-                    continue
-
-                table_text = _table_to_text(table_data)
-                char_start, char_end = _allocate_char_span(table_text)
-                cells_metadata: List[Dict[str, Any]] = []
-                try:
-                    for cell in table.cells or []:
-                        cell_bbox = _sanitize_rect(cell.bbox)
-                        cells_metadata.append(
-                            {
-                                "row": getattr(cell, "row", None),
-                                "column": getattr(cell, "col", None),
-                                "bbox": cell_bbox,
-                                "y_start_pct": _clamp_pct(
-                                    (cell_bbox[1] / page_height) * 100.0 if page_height else 0.0
-                                ),
-                                "y_end_pct": _clamp_pct(
-                                    (cell_bbox[3] / page_height) * 100.0 if page_height else 0.0
-                                ),
-                                "span": getattr(cell, "span", None),
-                            }
-                        )
-                except Exception:
-                    logger.debug("Failed to read cell metadata for table on page %s.", page_number, exc_info=True)
-
-                table_bbox = _sanitize_rect(table.bbox)
-                table_metadata = _enrich_metadata(
-                    table_bbox[0],
-                    table_bbox[1],
-                    table_bbox[2],
-                    table_bbox[3],
-                    page_width=page_width,
-                    page_height=page_height,
-                    base={
-                        "table_json": table_data,
-                        "cell_coordinates": cells_metadata,
-                        "table_index": table_index,
-                        "char_start": char_start,
-                        "char_end": char_end,
-                    },
-                )
-                hash_value = _sentence_hash(table_text)
-                if hash_value:
-                    table_metadata["sentence_hash"] = hash_value
-
-                chunks.append(
-                    build_chunk(
-                        f"pdf-table-{page_number}-{chunk_counter}",
-                        chunk_type="table",
-                        content=table_text,
-                        section="table",
-                        source="pdf",
-                        page_number=page_number,
-                        metadata=table_metadata,
-                    )
-                )
-                chunk_counter += 1
-
-            dict_blocks_raw = page.get_text("dict")
-            dict_blocks: List[Any] = []
-            if isinstance(dict_blocks_raw, Mapping):
-                blocks_value = dict_blocks_raw.get("blocks", [])
-                if isinstance(blocks_value, list):
-                    dict_blocks = blocks_value
-            for block in dict_blocks:
-                if not isinstance(block, Mapping):
-                    continue
-                if block.get("type") != 1:
-                    continue
-                bbox = block.get("bbox", [0, 0, 0, 0])
-                figure_content = f"Figure image on page {page_number}"
-                char_start, char_end = _allocate_char_span(figure_content)
-                figure_metadata = _enrich_metadata(
-                    float(bbox[0]),
-                    float(bbox[1]),
-                    float(bbox[2]),
-                    float(bbox[3]),
-                    page_width=page_width,
-                    page_height=page_height,
-                    base={"image": block.get("image"), "char_start": char_start, "char_end": char_end},
-                )
-                hash_value = _sentence_hash(figure_content)
-                if hash_value:
-                    figure_metadata["sentence_hash"] = hash_value
-                chunks.append(
-                    build_chunk(
-                        f"pdf-figure-{page_number}-{chunk_counter}",
-                        chunk_type="figure",
-                        content=figure_content,
-                        section="figure",
-                        source="pdf",
-                        page_number=page_number,
-                        metadata=figure_metadata,
-                    )
-                )
-                chunk_counter += 1
-
-        logger.info("Extracted %d chunks from '%s'.", len(chunks), pdf_path)
-        return chunks
 
+def extract_chunks(
+    pdf_path: str,
+    *,
+    analyses: Optional[Sequence[PageAnalysis]] = None,
+    workers: Optional[int] = None,
+    spill_dir: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Return chunks of text/table/footnote/figure elements from a PDF.
+
+    ``analyses`` lets callers reuse a :func:`parse.pdf_analysis.analyze_document`
+    result (e.g. one shared with ``TableExtractor``); otherwise the document is
+    analysed here with ``workers`` processes. Chunk ids are assigned serially in
+    page order, so the output does not depend on the worker count.
+    """
+    logger.info("Parsing PDF '%s'.", pdf_path)
+    try:
+        chunks = list(iter_chunks(pdf_path, analyses=analyses, workers=workers, spill_dir=spill_dir))
+    except FileNotFoundError:
+        raise
     except Exception as exc:
         logger.error("Error while parsing PDF '%s': %s", pdf_path, exc, exc_info=True)
         raise
+    logger.info("Extracted %d chunks from '%s'.", len(chunks), pdf_path)
+    return chunks
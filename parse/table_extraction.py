@@ -11,12 +11,11 @@ import re
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
-
-import fitz  # type: ignore[import]
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from core.logging import get_logger
 from parse.chunk_utils import normalize_text
+from parse.pdf_analysis import PageAnalysis, iter_page_analyses
 
 logger = get_logger(__name__)
 
@@ -354,186 +353,202 @@ class TableExtractor:
         self.max_tables = max_tables
         self.time_budget_seconds = max(5.0, time_budget_seconds)
 
-    def extract(self, pdf_path: str) -> List[TableExtractionResult]:
+    def _analyse_pages(self, pdf_path: str, workers: Optional[int]) -> Iterator[PageAnalysis]:
+        pages = iter_page_analyses(pdf_path, workers=workers, max_pages=self.max_pages, include_text=False)
+        try:
+            while True:
+                try:
+                    analysis = next(pages)
+                except StopIteration:
+                    return
+                except Exception as exc:  # pragma: no cover - PyMuPDF runtime guard
+                    raise TableExtractorError(f"Unable to open PDF: {exc}") from exc
+                yield analysis
+        finally:
+            pages.close()
+
+    def extract(
+        self,
+        pdf_path: str,
+        *,
+        analyses: Optional[Iterable[PageAnalysis]] = None,
+        workers: Optional[int] = None,
+    ) -> List[TableExtractionResult]:
+        """Build structured tables for ``pdf_path``.
+
+        Pass ``analyses`` from :func:`parse.pdf_analysis.analyze_document` to reuse
+        the tables already detected for chunking instead of running
+        ``find_tables`` a second time. Otherwise pages are analysed lazily, so the
+        time budget and ``max_tables`` stop detection on the remaining pages.
+        """
+
         path = Path(pdf_path)
         if not path.is_file():
             raise TableExtractorError(f"PDF not found: {pdf_path}")
 
-        started = time.perf_counter()
-        results: List[TableExtractionResult] = []
+        owned: Optional[Iterator[PageAnalysis]] = None
+        if analyses is None:
+            owned = analyses = self._analyse_pages(pdf_path, workers)
         try:
-            document = fitz.open(pdf_path)
-        except Exception as exc:  # pragma: no cover - PyMuPDF runtime guard
-            raise TableExtractorError(f"Unable to open PDF: {exc}") from exc
+            return self._extract_pages(pdf_path, analyses)
+        finally:
+            if owned is not None:
+                owned.close()
 
-        try:
-            page_count = len(document)
-            for page_offset in range(page_count):
-                page_number = page_offset + 1
-                page = document[page_offset]
-                if self.max_pages and page_number > self.max_pages:
-                    break
-                find_tables = getattr(page, "find_tables", None)
-                tables: List[Any] = []
-                if callable(find_tables):
-                    try:
-                        tables_obj = find_tables()
-                        if isinstance(tables_obj, list):
-                            tables = tables_obj
-                        else:
-                            candidate = getattr(tables_obj, "tables", None)
-                            if isinstance(candidate, list):
-                                tables = candidate
-                    except Exception:
-                        tables = []
-                if not tables:
+    def _extract_pages(self, pdf_path: str, analyses: Iterable[PageAnalysis]) -> List[TableExtractionResult]:
+        started = time.perf_counter()
+        results: List[TableExtractionResult] = []
+        for analysis in analyses:
+            page_number = analysis.page_number
+            if self.max_pages and page_number > self.max_pages:
+                break
+            tables = analysis.tables
+            if not tables:
+                continue
+
+            for table_index, table in enumerate(tables, start=1):
+                table_start = time.perf_counter()
+                raw = table.rows
+                if not raw:
+                    continue
+                matrix = _normalize_matrix(raw)
+                if not matrix or not any(any(cell for cell in row) for row in matrix):
                     continue
 
-                for table_index, table in enumerate(tables, start=1):
-                    table_start = time.perf_counter()
-                    raw = table.extract()
-                    if not raw:
-                        continue
-                    matrix = _normalize_matrix(raw)
-                    if not matrix or not any(any(cell for cell in row) for row in matrix):
-                        continue
-
-                    header_rows_count = _detect_header_rows(matrix)
-                    header_rows = matrix[:header_rows_count]
-                    body_rows = matrix[header_rows_count:] or []
-
-                    header_matrix = _fill_header_matrix(header_rows, len(matrix[0]))
-                    header_paths = _build_header_paths(header_matrix)
-
-                    rows_for_csv = header_rows + body_rows
-                    csv_payload = _build_csv(rows_for_csv)
-                    html_payload = _build_html(header_rows, body_rows)
-
-                    cell_payloads: List[TableCellPayload] = []
-                    non_empty_cells = 0
-                    numeric_cells = 0
-                    for row_idx, row in enumerate(body_rows):
-                        for col_idx, value in enumerate(row):
-                            normalized = value
-                            numeric_value = _parse_numeric(value)
-                            vtype = _value_type(value)
-                            if normalized:
-                                non_empty_cells += 1
-                            if numeric_value is not None:
-                                numeric_cells += 1
-                            header_path = header_paths[col_idx] if col_idx < len(header_paths) else []
-                            confidence = 0.25
-                            if normalized:
-                                confidence += 0.5
-                            if numeric_value is not None:
-                                confidence += 0.2
-                            cell_payloads.append(
-                                TableCellPayload(
-                                    row_index=row_idx,
-                                    column_index=col_idx,
-                                    header_path=header_path,
-                                    raw_value=value,
-                                    normalized_value=normalized,
-                                    numeric_value=numeric_value,
-                                    value_type=vtype,
-                                    confidence=min(1.0, confidence),
-                                )
+                header_rows_count = _detect_header_rows(matrix)
+                header_rows = matrix[:header_rows_count]
+                body_rows = matrix[header_rows_count:] or []
+
+                header_matrix = _fill_header_matrix(header_rows, len(matrix[0]))
+                header_paths = _build_header_paths(header_matrix)
+
+                rows_for_csv = header_rows + body_rows
+                csv_payload = _build_csv(rows_for_csv)
+                html_payload = _build_html(header_rows, body_rows)
+
+                cell_payloads: List[TableCellPayload] = []
+                non_empty_cells = 0
+                numeric_cells = 0
+                for row_idx, row in enumerate(body_rows):
+                    for col_idx, value in enumerate(row):
+                        normalized = value
+                        numeric_value = _parse_numeric(value)
+                        vtype = _value_type(value)
+                        if normalized:
+                            non_empty_cells += 1
+                        if numeric_value is not None:
+                            numeric_cells += 1
+                        header_path = header_paths[col_idx] if col_idx < len(header_paths) else []
+                        confidence = 0.25
+                        if normalized:
+                            confidence += 0.5
+                        if numeric_value is not None:
+                            confidence += 0.2
+                        cell_payloads.append(
+                            TableCellPayload(
+                                row_index=row_idx,
+                                column_index=col_idx,
+                                header_path=header_path,
+                                raw_value=value,
+                                normalized_value=normalized,
+                                numeric_value=numeric_value,
+                                value_type=vtype,
+                                confidence=min(1.0, confidence),
                             )
-
-                    total_cells = len(body_rows) * len(matrix[0]) if body_rows else 0
-                    non_empty_ratio = (non_empty_cells / total_cells) if total_cells else 0.0
-                    header_coverage = (
-                        sum(1 for path in header_paths if path)
-                        / len(header_paths)
-                        if header_paths
-                        else 0.0
-                    )
-                    numeric_ratio = (numeric_cells / total_cells) if total_cells else 0.0
-
-                    text_tokens = []
-                    for row in header_rows:
-                        text_tokens.extend(row)
-                    for row in body_rows[:3]:
-                        text_tokens.extend(row)
-                    table_type, matched_keywords, base_confidence = _classify_table(text_tokens)
-
-                    if self.target_types and table_type not in self.target_types:
-                        continue
-
-                    title = _derive_title(header_rows, header_paths, page_number, table_index)
-                    derived_confidence = min(
-                        0.99,
-                        max(
-                            base_confidence,
-                            0.5 + (0.2 * header_coverage) + (0.2 * non_empty_ratio) + (0.05 * numeric_ratio),
-                        ),
-                    )
-                    bbox_values = list(getattr(table, "bbox", []) or [])
-                    if len(bbox_values) >= 4:
-                        bbox = (
-                            float(bbox_values[0]),
-                            float(bbox_values[1]),
-                            float(bbox_values[2]),
-                            float(bbox_values[3]),
                         )
-                    else:
-                        bbox = (0.0, 0.0, 0.0, 0.0)
-                    stats = {
-                        "rowCount": len(body_rows),
-                        "columnCount": len(matrix[0]) if matrix else 0,
-                        "headerRows": header_rows_count,
-                        "nonEmptyCells": non_empty_cells,
-                        "nonEmptyRatio": round(non_empty_ratio, 4),
-                        "headerCoverage": round(header_coverage, 4),
-                        "numericRatio": round(numeric_ratio, 4),
-                    }
-                    table_json = {
-                        "headerRows": header_rows,
-                        "bodyRows": body_rows,
-                        "headerPaths": header_paths,
-                        "bbox": list(bbox),
-                        "metrics": stats,
-                    }
-                    checksum = hashlib.sha1(
-                        repr(table_json).encode("utf-8", errors="ignore")
-                    ).hexdigest()
-
-                    duration_ms = (time.perf_counter() - table_start) * 1000.0
-
-                    result = TableExtractionResult(
-                        page_number=page_number,
-                        table_index=table_index,
-                        bbox=bbox,
-                        header_rows=header_rows,
-                        body_rows=body_rows,
-                        header_paths=header_paths,
-                        table_type=table_type,
-                        matched_keywords=matched_keywords,
-                        title=title,
-                        confidence=round(derived_confidence, 4),
-                        stats=stats,
-                        html=html_payload,
-                        csv=csv_payload,
-                        json_payload=table_json,
-                        cells=cell_payloads,
-                        checksum=checksum,
-                        duration_ms=duration_ms,
-                    )
-                    results.append(result)
-
-                    if self.max_tables and len(results) >= self.max_tables:
-                        return results
-                elapsed = time.perf_counter() - started
-                if elapsed >= self.time_budget_seconds:
-                    logger.warning(
-                        "Table extraction aborted for %s after %.2fs (time budget %.2fs).",
-                        pdf_path,
-                        elapsed,
-                        self.time_budget_seconds,
+
+                total_cells = len(body_rows) * len(matrix[0]) if body_rows else 0
+                non_empty_ratio = (non_empty_cells / total_cells) if total_cells else 0.0
+                header_coverage = (
+                    sum(1 for path in header_paths if path)
+                    / len(header_paths)
+                    if header_paths
+                    else 0.0
+                )
+                numeric_ratio = (numeric_cells / total_cells) if total_cells else 0.0
+
+                text_tokens = []
+                for row in header_rows:
+                    text_tokens.extend(row)
+                for row in body_rows[:3]:
+                    text_tokens.extend(row)
+                table_type, matched_keywords, base_confidence = _classify_table(text_tokens)
+
+                if self.target_types and table_type not in self.target_types:
+                    continue
+
+                title = _derive_title(header_rows, header_paths, page_number, table_index)
+                derived_confidence = min(
+                    0.99,
+                    max(
+                        base_confidence,
+                        0.5 + (0.2 * header_coverage) + (0.2 * non_empty_ratio) + (0.05 * numeric_ratio),
+                    ),
+                )
+                bbox_values = list(getattr(table, "bbox", []) or [])
+                if len(bbox_values) >= 4:
+                    bbox = (
+                        float(bbox_values[0]),
+                        float(bbox_values[1]),
+                        float(bbox_values[2]),
+                        float(bbox_values[3]),
                     )
-                    break
-        finally:
-            document.close()
+                else:
+                    bbox = (0.0, 0.0, 0.0, 0.0)
+                stats = {
+                    "rowCount": len(body_rows),
+                    "columnCount": len(matrix[0]) if matrix else 0,
+                    "headerRows": header_rows_count,
+                    "nonEmptyCells": non_empty_cells,
+                    "nonEmptyRatio": round(non_empty_ratio, 4),
+                    "headerCoverage": round(header_coverage, 4),
+                    "numericRatio": round(numeric_ratio, 4),
+                }
+                table_json = {
+                    "headerRows": header_rows,
+                    "bodyRows": body_rows,
+                    "headerPaths": header_paths,
+                    "bbox": list(bbox),
+                    "metrics": stats,
+                }
+                checksum = hashlib.sha1(
+                    repr(table_json).encode("utf-8", errors="ignore")
+                ).hexdigest()
+
+                duration_ms = (time.perf_counter() - table_start) * 1000.0
+
+                result = TableExtractionResult(
+                    page_number=page_number,
+                    table_index=table_index,
+                    bbox=bbox,
+                    header_rows=header_rows,
+                    body_rows=body_rows,
+                    header_paths=header_paths,
+                    table_type=table_type,
+                    matched_keywords=matched_keywords,
+                    title=title,
+                    confidence=round(derived_confidence, 4),
+                    stats=stats,
+                    html=html_payload,
+                    csv=csv_payload,
+                    json_payload=table_json,
+                    cells=cell_payloads,
+                    checksum=checksum,
+                    duration_ms=duration_ms,
+                )
+                results.append(result)
+
+                if self.max_tables and len(results) >= self.max_tables:
+                    return results
+            elapsed = time.perf_counter() - started
+            if elapsed >= self.time_budget_seconds:
+                logger.warning(
+                    "Table extraction aborted for %s after %.2fs (time budget %.2fs).",
+                    pdf_path,
+                    elapsed,
+                    self.time_budget_seconds,
+                )
+                break
         return results
 
 
@@ -74,6 +74,12 @@ from services.notification_service import dispatch_notification
 from services.reliability.source_reliability import score_article as score_source_reliability
 from services.aggregation.news_statistics import summarize_news_signals, build_top_topics
 from services.embedding_utils import EMBEDDING_MODEL, embed_texts
+from services.news_vector_writer import (
+    NEWS_VECTOR_SHARED_WRITER,
+    NewsVectorEntry,
+    NewsVectorWriter,
+    get_news_vector_writer,
+)
 from services.memory.facade import MEMORY_SERVICE
 from services.user_settings_service import read_user_proactive_settings, read_user_lightmem_settings
 from services.lightmem_config import default_user_id as lightmem_default_user_id
@@ -200,7 +206,13 @@ def _store_news_vector_entry(
     topics: Sequence[str],
     sentiment_score: Optional[float],
     reliability: Optional[float],
+    writer: NewsVectorWriter,
 ) -> None:
+    """Queue the article's vector on ``writer``.
+
+    The write happens when the writer flushes, so embedding and upsert failures
+    are reported per article by the writer instead of raising here.
+    """
     text = (chunk_text or "").strip()
     if not text:
         return
@@ -256,21 +268,14 @@ def _store_news_vector_entry(
     if news_signal.url:
         metadata["viewer_url"] = news_signal.url
 
-    chunk_id = f"news:{news_signal.id}"
-    chunk_payload = {
-        "id": f"{chunk_id}#0",
-        "content": text,
-        "metadata": metadata,
-    }
-    try:
-        vector_service.store_chunk_vectors(
-            chunk_id,
-            [chunk_payload],
-            metadata=metadata,
-        )
-        logger.debug("Stored news vector chunk for %s", news_signal.url)
-    except Exception as exc:
-        logger.warning("Failed to store news vector for %s: %s", news_signal.url, exc, exc_info=True)
+    entry = NewsVectorEntry(
+        key=f"news:{news_signal.id}",
+        text=text,
+        metadata=metadata,
+        label=news_signal.url,
+    )
+    writer.add(entry)
+    logger.debug("Queued news vector chunk for %s", news_signal.url)
 
 
 UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
@@ -298,6 +303,16 @@ def _retry_or_dead_letter(
     filing: Optional[Filing],
     exc: Exception,
 ) -> None:
+    """Retry ``process_filing`` or dead-letter it once the retry budget is spent."""
+    _handle_ingest_exception(
+        task,
+        exc,
+        payload={"filing_id": filing_id},
+        receipt_no=cast(Optional[str], filing.receipt_no) if filing is not None else None,
+        corp_code=cast(Optional[str], filing.corp_code) if filing is not None else None,
+        ticker=cast(Optional[str], filing.ticker) if filing is not None else None,
+        db=db,
+    )
 
 
 def _handle_ingest_exception(
@@ -572,6 +587,86 @@ def _attach_memory_hint(summary: Optional[str], hint: Optional[str], *, max_char
     return trimmed
 
 
+def _persist_news_signal(db: Session, article: NewsArticleCreate, analysis: Mapping[str, Any]) -> NewsSignal:
+    signal = db.query(NewsSignal).filter(NewsSignal.url == article.url).one_or_none()
+    if signal is None:
+        signal = NewsSignal(url=article.url)
+        db.add(signal)
+    topics = list(analysis.get("topics") or [])
+    signal.ticker = article.ticker or resolve_news_ticker(
+        db,
+        headline=article.headline,
+        summary=article.summary,
+        body=article.original_text,
+        topics=topics,
+    )
+    signal.source = article.source
+    signal.headline = article.headline
+    signal.summary = sanitize_news_summary(article.summary)
+    signal.published_at = article.published_at
+    signal.license_type = article.license_type
+    signal.license_url = article.license_url
+    signal.sentiment = analysis.get("sentiment")
+    signal.topics = topics
+    signal.evidence = {"rationale": analysis["rationale"]} if analysis.get("rationale") else None
+    signal.source_reliability = score_source_reliability(article.source, article.url)
+    db.flush()
+    assign_article_to_sector(db, signal)
+    db.commit()
+    return signal
+
+
+def _process_news_payload(payload: Mapping[str, Any], *, writer: NewsVectorWriter) -> Dict[str, Any]:
+    try:
+        article = NewsArticleCreate.model_validate(payload)
+    except ValidationError as exc:
+        logger.warning("Discarding invalid news payload: %s", exc)
+        return {"status": "invalid"}
+
+    analysis = llm_service.analyze_news_article(article.original_text)
+    if "error" in analysis:
+        logger.warning("News analysis failed for %s: %s", article.url, analysis.get("error"))
+        analysis = {}
+
+    db = _open_session()
+    try:
+        signal = _persist_news_signal(db, article, analysis)
+        _store_news_vector_entry(
+            signal,
+            chunk_text=signal.summary or article.original_text,
+            topics=signal.topics or [],
+            sentiment_score=signal.sentiment,
+            reliability=signal.source_reliability,
+            writer=writer,
+        )
+        return {"status": "processed", "signal_id": str(signal.id)}
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@shared_task(name="news.process_article", bind=True, max_retries=3)
+def process_news_article(self, payload: Mapping[str, Any]) -> Dict[str, Any]:
+    """Analyse one fetched article, store its signal and write its vector.
+
+    Each invocation writes through its own :class:`NewsVectorWriter`, which is
+    flushed before the task returns, so a worker that is killed afterwards
+    loses nothing. ``NEWS_VECTOR_SHARED_WRITER`` switches long-lived workers to
+    the process-wide writer, which batches across tasks on a timer.
+    """
+
+    try:
+        if NEWS_VECTOR_SHARED_WRITER:
+            return _process_news_payload(payload, writer=get_news_vector_writer())
+        with NewsVectorWriter(max_delay=0) as writer:
+            return _process_news_payload(payload, writer=writer)
+    except Exception as exc:
+        logger.error("News article processing failed: %s", exc, exc_info=True)
+        raise self.retry(exc=exc, countdown=_ingest_retry_delay(self.request.retries))
+
+
 @shared_task(name="proactive.scan", bind=True, max_retries=1)
 def scan_proactive_notifications(self, window_minutes: int = 15) -> Dict[str, int]:
     """Scan recent filings/news and upsert proactive notifications based on user interest tags."""
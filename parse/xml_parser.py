@@ -2,20 +2,32 @@
 
 from __future__ import annotations
 
+import codecs
 import logging
 import re
 import hashlib
+from collections import deque
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Mapping, Optional, Tuple
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
 from bs4 import BeautifulSoup
 from bs4.element import Tag
 
+from core.env import env_str
 from parse.chunk_utils import build_chunk, normalize_text
 
+try:  # pragma: no cover - lxml ships with the bs4 "xml" feature
+    from lxml import etree
+except ImportError:  # pragma: no cover
+    etree = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+XML_PARSE_ENGINE = env_str("XML_PARSE_ENGINE", "stream")
+XML_STREAM_READ_BYTES = 64 * 1024
+
 MIN_PARAGRAPH_LENGTH = 200
 MIN_LIST_LENGTH = 10
 PARAGRAPH_TAGS = ("p", "para", "paragraph", "div", "section", "item")
@@ -23,6 +35,9 @@ TABLE_TAGS = ("table", "TABLE")
 FIGURE_TAGS = ("figure", "FIGURE", "img", "image")
 HEAD_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6", "title")
 LIST_TAGS = ("ul", "ol")
+TABLE_CELL_TAGS = ("th", "td", "te", "tu", "ts", "tf", "tc", "tds")
+_PLAIN_CONTAINER_TAGS = {"document", "body", "cover"}
+_XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
 FOOTNOTE_HINT = re.compile(r"(?:주석|각주|비고|^주\)|^\*+|footnote)", re.IGNORECASE)
 HEADING_PATTERNS = [
     re.compile(r"^제\s*\d+\s*장", re.IGNORECASE),
@@ -44,6 +59,8 @@ def _serialize_attrs(tag) -> Dict[str, str]:
 
 
 def _compute_xpath(tag: Tag) -> Optional[str]:
+    if isinstance(tag, _StreamNode):
+        return tag.xpath or None
     if not tag or not getattr(tag, "name", None):
         return None
     parts: List[str] = []
@@ -144,18 +161,20 @@ def _section_metadata(tag: Tag, source_file: str, tracker: SectionTracker, extra
     return _build_metadata(tag, source_file, extra=payload, include_text=include_text)
 
 
-def _gather_list_block(list_tag: Tag) -> Optional[str]:
-    items: List[str] = []
-    for li in list_tag.find_all("li", recursive=False):
-        text = normalize_text(li.get_text(" ", strip=True))
-        if text:
-            items.append(text)
+def _join_list_items(texts: Iterable[str]) -> Optional[str]:
+    items = [text for text in texts if text]
     if not items:
         return None
     combined = " • ".join(items)
     return combined if len(combined) >= MIN_LIST_LENGTH else None
 
 
+def _gather_list_block(list_tag: Tag) -> Optional[str]:
+    return _join_list_items(
+        normalize_text(li.get_text(" ", strip=True)) for li in list_tag.find_all("li", recursive=False)
+    )
+
+
 MAX_FOOTNOTE_LENGTH = 800
 
 
@@ -172,7 +191,7 @@ def _looks_like_footnote(tag: Tag, text: str) -> bool:
     name = (tag.name or "").lower()
     if name in {"footnote", "foot-note", "fn"}:
         return True
-    if name in {"document", "body", "cover"}:
+    if name in _PLAIN_CONTAINER_TAGS:
         return False
 
     classes_attr = tag.get("class")
@@ -232,24 +251,415 @@ def _append_chunk(
     )
 
 
-def _extract_table_payload(table_tag: Tag) -> Tuple[Optional[str], Dict[str, Any]]:
-    rows: List[List[str]] = []
-    for row in table_tag.find_all("tr"):
-        cells: List[str] = []
-        for cell in row.find_all(["th", "td", "te", "tu", "ts", "tf", "tc", "tds"]):
-            cell_text = normalize_text(cell.get_text(" ", strip=True))
-            cells.append(cell_text)
-        if any(cell.strip() for cell in cells):
-            rows.append(cells)
+def _assemble_table_payload(
+    row_cells: Iterable[List[str]],
+    fallback_text: Callable[[], str],
+) -> Tuple[Optional[str], Dict[str, Any]]:
+    rows: List[List[str]] = [cells for cells in row_cells if any(cell.strip() for cell in cells)]
     table_text = "\n".join(" \t ".join(r) for r in rows if any(cell.strip() for cell in r))
     if not table_text:
-        table_text = normalize_text(table_tag.get_text(" ", strip=True))
+        table_text = fallback_text()
     metadata_extra: Dict[str, Any] = {"table_rows": rows}
     return (table_text or None), metadata_extra
 
 
-def extract_chunks_from_xml(xml_paths: List[str]) -> List[Dict[str, object]]:
-    """Return text/table/footnote/figure chunks extracted from XML files."""
+def _extract_table_payload(table_tag: Tag) -> Tuple[Optional[str], Dict[str, Any]]:
+    row_cells = (
+        [normalize_text(cell.get_text(" ", strip=True)) for cell in row.find_all(list(TABLE_CELL_TAGS))]
+        for row in table_tag.find_all("tr")
+    )
+    return _assemble_table_payload(row_cells, lambda: normalize_text(table_tag.get_text(" ", strip=True)))
+
+
+class _ChunkEmitter:
+    """Turn tags into chunks in document order.
+
+    Both parsing engines hand every tag to :meth:`process` in the same order, so
+    the paragraph buffer, section tracking, per-type counters and hash
+    de-duplication behave identically whichever engine produced the tags.
+    """
+
+    def __init__(self, chunks: List[Dict[str, object]], *, base_id: str, source_file: str) -> None:
+        self.chunks = chunks
+        self.base_id = base_id
+        self.source_file = source_file
+        self.tracker = SectionTracker()
+        self.seen_hashes: set = set()
+        self.text_buffer: List[str] = []
+        self.buffer_length = 0
+        self.buffer_tag: Any = None
+        self.counters = {"text": 1, "list": 1, "table": 1, "footnote": 1, "figure": 1}
+
+    def _append(self, chunk_type: str, content: str, tag: Any, **kwargs: Any) -> None:
+        _append_chunk(
+            self.chunks,
+            self.seen_hashes,
+            chunk_id=f"{self.base_id}-{chunk_type}-{self.counters[chunk_type]}",
+            chunk_type=chunk_type,
+            content=content,
+            tag=tag,
+            source_file=self.source_file,
+            tracker=self.tracker,
+            **kwargs,
+        )
+        self.counters[chunk_type] += 1
+
+    def flush(self) -> None:
+        if self.text_buffer and self.buffer_tag is not None:
+            combined = normalize_text(" ".join(self.text_buffer))
+            if combined:
+                self._append("text", combined, self.buffer_tag, include_text=True)
+        self.text_buffer = []
+        self.buffer_length = 0
+        self.buffer_tag = None
+
+    def process(
+        self,
+        tag: Any,
+        *,
+        text: Callable[[], str],
+        table: Callable[[], Tuple[Optional[str], Dict[str, Any]]],
+        list_block: Callable[[], Optional[str]],
+    ) -> bool:
+        """Emit whatever ``tag`` contributes; return True when its subtree is consumed."""
+
+        lname = tag.name.lower()
+        if lname in HEAD_TAGS:
+            title = text()
+            if _is_heading_text(title):
+                self.tracker.update(title)
+            return False
+
+        if lname in TABLE_TAGS:
+            self.flush()
+            table_text, metadata_extra = table()
+            if table_text:
+                self._append("table", table_text, tag, extra_metadata=metadata_extra)
+            return True
+
+        if lname in LIST_TAGS:
+            self.flush()
+            block = list_block()
+            if block:
+                self._append("list", block, tag, section="list")
+            return True
+
+        text_value = text()
+        if _looks_like_footnote(tag, text_value):
+            self.flush()
+            if text_value:
+                self._append("footnote", text_value, tag)
+            return True
+
+        if lname in FIGURE_TAGS:
+            self.flush()
+            caption = text_value
+            if lname in ("img", "image"):
+                caption = caption or f"Image source: {tag.get('src', '')}"
+            caption = caption or "Figure extracted from XML"
+            self._append("figure", caption, tag)
+            return True
+
+        if lname in PARAGRAPH_TAGS and text_value:
+            if self.buffer_tag is None:
+                self.buffer_tag = tag
+            self.text_buffer.append(text_value)
+            self.buffer_length += len(text_value)
+            if self.buffer_length >= MIN_PARAGRAPH_LENGTH:
+                self.flush()
+        return False
+
+
+def _declared_encoding(head: bytes) -> str:
+    declared_encoding = "utf-8"
+    match = re.search(br'encoding=["\']([^"\']+)["\']', head[:200])
+    if match:
+        declared_encoding = match.group(1).decode("ascii", errors="ignore").lower() or declared_encoding
+    return declared_encoding
+
+
+def _tag_text(tag: Tag) -> str:
+    return normalize_text(tag.get_text(" ", strip=True))
+
+
+def _extract_dom(path_obj: Path, emitter: _ChunkEmitter) -> None:
+    raw_bytes = path_obj.read_bytes()
+    declared_encoding = _declared_encoding(raw_bytes)
+    try:
+        raw_text = raw_bytes.decode(declared_encoding, errors="replace")
+    except LookupError:
+        raw_text = raw_bytes.decode("utf-8", errors="replace")
+    soup = BeautifulSoup(raw_text, "xml")
+    for tag in list(soup.find_all(True)):
+        if not isinstance(tag, Tag) or not getattr(tag, "name", None):
+            continue
+        consumed = emitter.process(
+            tag,
+            text=partial(_tag_text, tag),
+            table=partial(_extract_table_payload, tag),
+            list_block=partial(_gather_list_block, tag),
+        )
+        if consumed:
+            tag.decompose()
+
+
+class _StreamNode:
+    """Element seen by the streaming engine.
+
+    Only what the chunker needs survives the parse: name and attributes, the
+    xpath (built from the parent's running per-name sibling counters), the
+    normalized text while some tag still needs it, and child nodes inside
+    tables and lists, whose payload is built from their subtree.
+    """
+
+    __slots__ = (
+        "name",
+        "attrs",
+        "parent",
+        "xpath",
+        "counts",
+        "pieces",
+        "length",
+        "children",
+        "text",
+        "ready",
+        "dropped",
+        "limit_text",
+        "feeds_parent",
+    )
+
+    def __init__(self, name: str, attrs: Dict[str, str], parent: Optional["_StreamNode"]) -> None:
+        self.name = name
+        self.attrs = attrs
+        self.parent = parent
+        self.xpath = ""
+        self.counts: Dict[str, int] = {}
+        self.pieces: Optional[List[str]] = None
+        self.length = 0
+        self.children: Optional[List["_StreamNode"]] = None
+        self.text: Optional[str] = None
+        self.ready = False
+        self.dropped = False
+        self.limit_text = False
+        self.feeds_parent = False
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.attrs.get(key, default)
+
+    def add_piece(self, piece: str) -> None:
+        assert self.pieces is not None
+        self.length += len(piece) + (1 if self.pieces else 0)
+        self.pieces.append(piece)
+        if self.limit_text and self.length > MAX_FOOTNOTE_LENGTH:
+            # Too long to be a footnote, so the tag cannot emit anything itself.
+            self.limit_text = False
+            self.ready = True
+            if not self.feeds_parent:
+                self.pieces = None
+
+    def stream_text(self) -> str:
+        return self.text or ""
+
+    def descendants(self) -> Iterator["_StreamNode"]:
+        stack = list(reversed(self.children or []))
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.children:
+                stack.extend(reversed(node.children))
+
+
+def _node_table_payload(table: _StreamNode) -> Tuple[Optional[str], Dict[str, Any]]:
+    rows = (
+        [cell.stream_text() for cell in row.descendants() if cell.name in TABLE_CELL_TAGS]
+        for row in table.descendants()
+        if row.name == "tr"
+    )
+    return _assemble_table_payload(rows, table.stream_text)
+
+
+def _node_list_block(list_node: _StreamNode) -> Optional[str]:
+    return _join_list_items(child.stream_text() for child in list_node.children or [] if child.name == "li")
+
+
+def _split_qname(qname: str) -> Tuple[Optional[str], str]:
+    if qname[:1] == "{" and "}" in qname:
+        namespace, local = qname[1:].split("}", 1)
+        return namespace, local
+    return None, qname
+
+
+class _StreamTarget:
+    """lxml parser target that chunks the document while it is being parsed.
+
+    Names, attributes and text strings are derived exactly as BeautifulSoup's
+    ``lxml-xml`` builder derives them from the same callbacks. Tags are handed to
+    :class:`_ChunkEmitter` in document order as soon as their decision is known:
+    at the start tag for plain containers, once a tag's text outgrows
+    ``MAX_FOOTNOTE_LENGTH`` for other non-text tags, and at the end tag
+    otherwise. A consumed table/list/footnote/figure drops its descendants and
+    frees its slot in the parent's sibling counter, as ``decompose`` does.
+    """
+
+    def __init__(self, emitter: _ChunkEmitter) -> None:
+        self._emitter = emitter
+        self._document = _StreamNode("[document]", {}, None)
+        self._stack: List[_StreamNode] = [self._document]
+        self._pending: Deque[_StreamNode] = deque()
+        self._data: List[str] = []
+        self._nsmaps: List[Optional[Dict[str, Optional[str]]]] = [{_XML_NAMESPACE: "xml"}]
+
+    def _prefix_for(self, namespace: Optional[str]) -> Optional[str]:
+        if namespace is None:
+            return None
+        for inverted in reversed(self._nsmaps):
+            if inverted is not None and namespace in inverted:
+                return inverted[namespace]
+        return None
+
+    def _end_data(self) -> None:
+        if not self._data:
+            return
+        piece = normalize_text("".join(self._data))
+        self._data = []
+        node = self._stack[-1]
+        if piece and node.pieces is not None:
+            node.add_piece(piece)
+
+    def _classify(self, node: _StreamNode, parent: _StreamNode) -> None:
+        lname = node.name.lower()
+        node.feeds_parent = parent.pieces is not None
+        if parent.children is not None or lname in TABLE_TAGS or lname in LIST_TAGS:
+            node.children = []
+        if node.children is not None or lname in HEAD_TAGS or lname in FIGURE_TAGS or lname in PARAGRAPH_TAGS:
+            node.pieces = []
+        elif lname in _PLAIN_CONTAINER_TAGS:
+            node.ready = True
+            node.pieces = [] if node.feeds_parent else None
+        else:
+            node.limit_text = True
+            node.pieces = []
+
+    def start(self, tag: str, attrib: Mapping[str, str], nsmap: Optional[Mapping[Optional[str], str]] = None) -> None:
+        self._end_data()
+        nsmap = nsmap or {}
+        if nsmap:
+            self._nsmaps.append({uri: prefix for prefix, uri in nsmap.items()})
+        elif len(self._nsmaps) > 1:
+            self._nsmaps.append(None)
+        attrs: Dict[str, str] = {}
+        for key, value in attrib.items():
+            namespace, local = _split_qname(key)
+            prefix = self._prefix_for(namespace)
+            attrs[f"{prefix}:{local}" if prefix else local] = value
+        for prefix, uri in nsmap.items():
+            attrs[f"xmlns:{prefix}" if prefix else "xmlns"] = uri
+        parent = self._stack[-1]
+        node = _StreamNode(_split_qname(tag)[1], attrs, parent)
+        self._classify(node, parent)
+        if parent.children is not None:
+            parent.children.append(node)
+        self._stack.append(node)
+        self._pending.append(node)
+        self._drain()
+
+    def end(self, tag: str) -> None:
+        self._end_data()
+        node = self._stack.pop()
+        if node.pieces is not None:
+            node.text = " ".join(node.pieces)
+            node.pieces = None
+            parent = node.parent
+            if node.text and parent is not None and parent.pieces is not None:
+                parent.add_piece(node.text)
+        node.ready = True
+        if len(self._nsmaps) > 1:
+            self._nsmaps.pop()
+        self._drain()
+
+    def data(self, data: str) -> None:
+        self._data.append(data)
+
+    def comment(self, text: str) -> None:
+        self._end_data()
+
+    def pi(self, target: str, data: Optional[str] = None) -> None:
+        self._end_data()
+
+    def doctype(self, *args: Any) -> None:
+        self._end_data()
+
+    def close(self) -> None:
+        self._end_data()
+        while self._stack[-1] is not self._document:
+            self.end(self._stack[-1].name)
+
+    def _drain(self) -> None:
+        pending = self._pending
+        while pending and pending[0].ready:
+            self._process(pending.popleft())
+
+    def _process(self, node: _StreamNode) -> None:
+        parent = node.parent
+        assert parent is not None
+        if parent.dropped:
+            node.dropped = True
+            return
+        index = parent.counts.get(node.name, 0) + 1
+        parent.counts[node.name] = index
+        step = f"{node.name}[{index}]"
+        node.xpath = f"{parent.xpath}/{step}" if parent.xpath else step
+        consumed = self._emitter.process(
+            node,
+            text=node.stream_text,
+            table=partial(_node_table_payload, node),
+            list_block=partial(_node_list_block, node),
+        )
+        if consumed:
+            node.dropped = True
+            parent.counts[node.name] = index - 1
+
+
+def _iter_decoded(path_obj: Path) -> Iterator[str]:
+    with path_obj.open("rb") as handle:
+        chunk = handle.read(XML_STREAM_READ_BYTES)
+        try:
+            decoder = codecs.getincrementaldecoder(_declared_encoding(chunk))(errors="replace")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        leading = True
+        while True:
+            final = not chunk
+            text = decoder.decode(chunk, final=final)
+            if leading and text:
+                leading = False
+                if text[0] == "\N{BYTE ORDER MARK}":
+                    text = text[1:]
+            if text:
+                yield text
+            if final:
+                return
+            chunk = handle.read(XML_STREAM_READ_BYTES)
+
+
+def _extract_stream(path_obj: Path, emitter: _ChunkEmitter) -> None:
+    target = _StreamTarget(emitter)
+    parser = etree.XMLParser(target=target, recover=True)
+    for text in _iter_decoded(path_obj):
+        parser.feed(text)
+    parser.close()
+
+
+def extract_chunks_from_xml(xml_paths: List[str], *, engine: Optional[str] = None) -> List[Dict[str, object]]:
+    """Return text/table/footnote/figure chunks extracted from XML files.
+
+    ``engine`` overrides ``XML_PARSE_ENGINE``: ``"stream"`` chunks each file while
+    lxml parses it, ``"dom"`` builds a BeautifulSoup tree first. Both produce the
+    same chunks.
+    """
+    selected = (engine or XML_PARSE_ENGINE or "stream").strip().lower()
+    if selected == "stream" and etree is None:
+        selected = "dom"
     chunks: List[Dict[str, object]] = []
 
     for xml_path in xml_paths:
@@ -259,150 +669,13 @@ def extract_chunks_from_xml(xml_paths: List[str]) -> List[Dict[str, object]]:
             continue
 
         try:
-            raw_bytes = path_obj.read_bytes()
-            declared_encoding = "utf-8"
-            match = re.search(br'encoding=["\']([^"\']+)["\']', raw_bytes[:200])
-            if match:
-                declared_encoding = match.group(1).decode("ascii", errors="ignore").lower() or declared_encoding
-            try:
-                raw_text = raw_bytes.decode(declared_encoding, errors="replace")
-            except LookupError:
-                raw_text = raw_bytes.decode("utf-8", errors="replace")
-            soup = BeautifulSoup(raw_text, "xml")
-            source_file = str(path_obj.resolve())
-            base_id = path_obj.stem
-            tracker = SectionTracker()
-            seen_hashes: set = set()
-            text_buffer: List[str] = []
-            buffer_tag: Optional[Tag] = None
-            text_counter = 1
-            list_counter = 1
-            table_counter = 1
-            footnote_counter = 1
-            figure_counter = 1
-
-            def flush_text_buffer() -> None:
-                nonlocal text_buffer, buffer_tag, text_counter
-                if not text_buffer or buffer_tag is None:
-                    text_buffer = []
-                    buffer_tag = None
-                    return
-                combined = normalize_text(" ".join(text_buffer))
-                if combined:
-                    _append_chunk(
-                        chunks,
-                        seen_hashes,
-                        chunk_id=f"{base_id}-text-{text_counter}",
-                        chunk_type="text",
-                        content=combined,
-                        tag=buffer_tag,
-                        source_file=source_file,
-                        tracker=tracker,
-                        include_text=True,
-                    )
-                    text_counter += 1
-                text_buffer = []
-                buffer_tag = None
-
-            all_tags = list(soup.find_all(True))
+            emitter = _ChunkEmitter(chunks, base_id=path_obj.stem, source_file=str(path_obj.resolve()))
             start_count = len(chunks)
-            for tag in all_tags:
-                if not isinstance(tag, Tag) or not getattr(tag, "name", None):
-                    continue
-                lname = tag.name.lower()
-                if lname in HEAD_TAGS:
-                    title = normalize_text(tag.get_text(" ", strip=True))
-                    if _is_heading_text(title):
-                        tracker.update(title)
-                    continue
-
-                if lname in TABLE_TAGS:
-                    flush_text_buffer()
-                    table_text, metadata_extra = _extract_table_payload(tag)
-                    if table_text:
-                        _append_chunk(
-                            chunks,
-                            seen_hashes,
-                            chunk_id=f"{base_id}-table-{table_counter}",
-                            chunk_type="table",
-                            content=table_text,
-                            tag=tag,
-                            source_file=source_file,
-                            tracker=tracker,
-                            extra_metadata=metadata_extra,
-                        )
-                        table_counter += 1
-                    tag.decompose()
-                    continue
-
-                if lname in LIST_TAGS:
-                    flush_text_buffer()
-                    block = _gather_list_block(tag)
-                    if block:
-                        _append_chunk(
-                            chunks,
-                            seen_hashes,
-                            chunk_id=f"{base_id}-list-{list_counter}",
-                            chunk_type="list",
-                            content=block,
-                            tag=tag,
-                            source_file=source_file,
-                            tracker=tracker,
-                            section="list",
-                        )
-                        list_counter += 1
-                    tag.decompose()
-                    continue
-
-                text_value = normalize_text(tag.get_text(" ", strip=True))
-                if _looks_like_footnote(tag, text_value):
-                    flush_text_buffer()
-                    if text_value:
-                        _append_chunk(
-                            chunks,
-                            seen_hashes,
-                            chunk_id=f"{base_id}-footnote-{footnote_counter}",
-                            chunk_type="footnote",
-                            content=text_value,
-                            tag=tag,
-                            source_file=source_file,
-                            tracker=tracker,
-                        )
-                        footnote_counter += 1
-                    tag.decompose()
-                    continue
-
-                if lname in FIGURE_TAGS:
-                    flush_text_buffer()
-                    caption = text_value
-                    if lname in ("img", "image"):
-                        caption = caption or f"Image source: {tag.get('src', '')}"
-                    caption = caption or "Figure extracted from XML"
-                    _append_chunk(
-                        chunks,
-                        seen_hashes,
-                        chunk_id=f"{base_id}-figure-{figure_counter}",
-                        chunk_type="figure",
-                        content=caption,
-                        tag=tag,
-                        source_file=source_file,
-                        tracker=tracker,
-                    )
-                    figure_counter += 1
-                    tag.decompose()
-                    continue
-
-                if lname in PARAGRAPH_TAGS:
-                    if not text_value:
-                        continue
-                    if buffer_tag is None:
-                        buffer_tag = tag
-                    text_buffer.append(text_value)
-                    if sum(len(segment) for segment in text_buffer) >= MIN_PARAGRAPH_LENGTH:
-                        flush_text_buffer()
-                    continue
-
-            flush_text_buffer()
+            if selected == "stream":
+                _extract_stream(path_obj, emitter)
+            else:
+                _extract_dom(path_obj, emitter)
+            emitter.flush()
             logger.info("Extracted %d chunks from XML %s.", len(chunks) - start_count, xml_path)
         except Exception as exc:
             logger.error("Failed to parse XML %s: %s", xml_path, exc, exc_info=True)
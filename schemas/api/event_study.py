@@ -109,6 +109,12 @@ class EventStudyEventsResponse(BaseModel):
     offset: int
     window_end: int = Field(..., serialization_alias="windowEnd")
     events: List[EventStudyEventItem]
+    next_cursor: Optional[str] = Field(
+        default=None,
+        serialization_alias="nextCursor",
+        description="Keyset cursor for the page after this one; absent on the last page.",
+    )
+    total_is_estimate: bool = Field(default=False, serialization_alias="totalIsEstimate")
 
 
 class EventStudySeriesPoint(BaseModel):
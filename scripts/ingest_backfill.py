@@ -19,6 +19,7 @@ load_dotenv_if_available()
 from database import SessionLocal  # noqa: E402
 from ingest.dart_seed import seed_recent_filings  # noqa: E402
 from services.ingest_metrics import observe_backfill_duration  # noqa: E402
+from services.receipt_dedup_service import RECEIPT_BLOOM_PATH, build_receipt_deduper  # noqa: E402
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +58,12 @@ def main() -> None:
         action="store_true",
         help="Fetch only filing metadata without downloading content (saves API quota).",
     )
+    parser.add_argument(
+        "--bloom-snapshot",
+        default=RECEIPT_BLOOM_PATH,
+        help="Persisted Bloom filter of stored receipts used to skip known filings "
+        "(built from the database on first use; default: RECEIPT_BLOOM_PATH).",
+    )
     parser.add_argument("--log-level", default="INFO", help="Logging level (default: INFO).")
     args = parser.parse_args()
 
@@ -72,6 +79,7 @@ def main() -> None:
 
     db = SessionLocal()
     try:
+        deduper = build_receipt_deduper(db, bloom_path=args.bloom_snapshot)
         for chunk_start, chunk_end in _chunk_range(start_date, end_date, max(1, args.chunk_days)):
             logger.info(
                 "Backfilling filings %s -> %s (corp_code=%s, metadata_only=%s)",
@@ -86,6 +94,7 @@ def main() -> None:
                 end_date=chunk_end,
                 corp_code=args.corp_code,
                 metadata_only=args.metadata_only,
+                deduper=deduper,
             )
             total_inserted += created
     finally:
@@ -7,14 +7,16 @@ from scripts._path import add_root
 add_root()
 
 from ingest.news_client import MockNewsClient
-from ingest.news_fetcher import fetch_news_batch
+from ingest.news_fetcher import NewsBatch, fetch_news_batch
 from parse.tasks import process_news_article
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def _dispatch_articles(articles: List):
+def _dispatch_articles(articles: List) -> List:
+    """Enqueue ``articles``; returns the ones that could not be enqueued."""
+    failed = []
     for article in articles:
         try:
             payload = article.model_dump() if hasattr(article, "model_dump") else article.dict()
@@ -22,7 +24,9 @@ def _dispatch_articles(articles: List):
             task_fn.delay(payload)
             logger.info("Queued news article for Celery processing: '%s'", article.headline)
         except Exception as exc:
+            failed.append(article)
             logger.error("Failed to enqueue article '%s': %s", article.headline, exc, exc_info=True)
+    return failed
 
 
 def seed_news(use_mock: bool = False, limit: int = 5):
@@ -42,8 +46,11 @@ def seed_news(use_mock: bool = False, limit: int = 5):
             logger.warning("No news articles fetched. Nothing to enqueue.")
             return
 
-        _dispatch_articles(articles)
-        logger.info("Dispatched %d article(s) to Celery.", len(articles))
+        failed = _dispatch_articles(articles)
+        if isinstance(articles, NewsBatch):
+            # Mark the articles as seen only now that they are queued.
+            articles.commit(failed=failed)
+        logger.info("Dispatched %d article(s) to Celery.", len(articles) - len(failed))
     except Exception as exc:
         logger.error("Unexpected error during news seeding: %s", exc, exc_info=True)
 
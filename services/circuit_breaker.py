@@ -0,0 +1,161 @@
+"""Minimal thread-safe circuit breaker with optional background health probing."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Optional
+
+from core.logging import get_logger
+from services.prometheus_helpers import build_gauge
+
+logger = get_logger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_HALF_OPEN = "half_open"
+STATE_OPEN = "open"
+
+_STATE_VALUES = {STATE_CLOSED: 0.0, STATE_HALF_OPEN: 1.0, STATE_OPEN: 2.0}
+
+_STATE_GAUGE = build_gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state per breaker (0=closed, 1=half_open, 2=open).",
+    ("breaker",),
+)
+
+
+class CircuitBreaker:
+    """Closed → open after ``failure_threshold`` consecutive failures.
+
+    While open, requests are rejected. Once ``cooldown_seconds`` have elapsed the
+    breaker moves to half-open either when the background probe succeeds or, when
+    no probe is configured, on the next request. A single trial request is allowed
+    in half-open; success closes the breaker, failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 30.0,
+        probe_interval_seconds: float = 10.0,
+    ) -> None:
+        self.name = name
+        self._failure_threshold = max(1, failure_threshold)
+        self._cooldown = max(0.0, cooldown_seconds)
+        self._probe_interval = max(0.1, probe_interval_seconds)
+        self._lock = threading.Lock()
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._probe: Optional[Callable[[], None]] = None
+        self._probe_thread: Optional[threading.Thread] = None
+        self._publish()
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def _publish(self) -> None:
+        if _STATE_GAUGE is None:
+            return
+        _STATE_GAUGE.labels(breaker=self.name).set(_STATE_VALUES[self._state])
+
+    def _transition(self, state: str) -> None:
+        if state == self._state:
+            return
+        logger.info("Circuit breaker %s: %s -> %s", self.name, self._state, state)
+        self._state = state
+        if state == STATE_OPEN:
+            self._opened_at = time.monotonic()
+        self._trial_in_flight = False
+        self._publish()
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._state == STATE_CLOSED:
+                return True
+            if self._state == STATE_OPEN:
+                if self._probe is not None or time.monotonic() - self._opened_at < self._cooldown:
+                    return False
+                self._transition(STATE_HALF_OPEN)
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._transition(STATE_CLOSED)
+
+    def record_failure(self, *, probe: Optional[Callable[[], None]] = None) -> None:
+        """Count a failure; ``probe`` (if given) is used to test recovery while open."""
+
+        with self._lock:
+            if probe is not None:
+                self._probe = probe
+            self._failures += 1
+            if self._state == STATE_HALF_OPEN or self._failures >= self._failure_threshold:
+                self._transition(STATE_OPEN)
+                self._opened_at = time.monotonic()
+                self._start_probe_locked()
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Release a half-open trial that finished without a verdict (e.g. a timeout)."""
+
+        with self._lock:
+            self._trial_in_flight = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probe = None
+            self._transition(STATE_CLOSED)
+
+    def _start_probe_locked(self) -> None:
+        if self._probe is None:
+            return
+        if self._probe_thread is not None and self._probe_thread.is_alive():
+            return
+        self._probe_thread = threading.Thread(
+            target=self._probe_loop,
+            name=f"breaker-probe-{self.name}",
+            daemon=True,
+        )
+        self._probe_thread.start()
+
+    def _probe_loop(self) -> None:
+        while True:
+            time.sleep(self._probe_interval)
+            with self._lock:
+                if self._state != STATE_OPEN:
+                    return
+                if time.monotonic() - self._opened_at < self._cooldown:
+                    continue
+                probe = self._probe
+            if probe is None:
+                return
+            try:
+                probe()
+            except Exception as exc:
+                logger.debug("Circuit breaker %s probe failed: %s", self.name, exc)
+                with self._lock:
+                    if self._state == STATE_OPEN:
+                        self._opened_at = time.monotonic()
+                continue
+            with self._lock:
+                if self._state == STATE_OPEN:
+                    self._transition(STATE_HALF_OPEN)
+            return
+
+
+__all__ = [
+    "CircuitBreaker",
+    "STATE_CLOSED",
+    "STATE_HALF_OPEN",
+    "STATE_OPEN",
+]
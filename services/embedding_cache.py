@@ -0,0 +1,228 @@
+"""Content-addressed cache for query embeddings.
+
+Two tiers are supported:
+
+* an in-process, size-bounded LRU (always on when the cache is enabled), built
+  on :class:`services.kv_tier.MemoryBlobTier`, and
+* an optional shared tier backed by Redis (``EMBEDDING_CACHE_REDIS_URL``) or a
+  local SQLite file (``EMBEDDING_CACHE_SQLITE_PATH``).
+
+Entries are keyed by ``(model, sha256(normalized text))`` and stored as packed
+float32 vectors so a 1536-dim embedding costs ~6KB instead of a Python list of
+boxed floats.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence
+
+from core.env import env_bool, env_int, env_str
+from services.kv_tier import BlobTier, LoggedTier, MemoryBlobTier, build_shared_tier
+from services.prometheus_helpers import build_counter, build_gauge
+
+EMBEDDING_CACHE_ENABLED = env_bool("EMBEDDING_CACHE_ENABLED", True)
+EMBEDDING_CACHE_MAX_ENTRIES = env_int("EMBEDDING_CACHE_MAX_ENTRIES", 4096, minimum=1)
+EMBEDDING_CACHE_TTL_SECONDS = env_int("EMBEDDING_CACHE_TTL_SECONDS", 7 * 24 * 3600, minimum=60)
+EMBEDDING_CACHE_REDIS_URL = env_str("EMBEDDING_CACHE_REDIS_URL")
+EMBEDDING_CACHE_SQLITE_PATH = env_str("EMBEDDING_CACHE_SQLITE_PATH")
+
+_KEY_PREFIX = "emb:v1"
+_SQLITE_TABLE = "embedding_cache"
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_LOOKUP_COUNTER = build_counter(
+    "embedding_cache_lookups_total",
+    "Embedding cache lookups grouped by tier and result.",
+    ("tier", "result"),
+)
+_SIZE_GAUGE = build_gauge(
+    "embedding_cache_entries",
+    "Current number of entries held by the in-process embedding cache.",
+)
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially different phrasings share a cache entry."""
+
+    return _WHITESPACE_RE.sub(" ", text or "").strip()
+
+
+def cache_key(model: str, text: str) -> str:
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{model}:{digest}"
+
+
+def _pack(vector: Sequence[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _unpack(blob: bytes) -> List[float]:
+    values = array("f")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+def _record_lookup(tier: str, hit: bool) -> None:
+    if _LOOKUP_COUNTER is None:
+        return
+    _LOOKUP_COUNTER.labels(tier=tier, result="hit" if hit else "miss").inc()
+
+
+class EmbeddingCache:
+    """Bounded LRU of packed embeddings with an optional shared second tier."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_seconds: int = EMBEDDING_CACHE_TTL_SECONDS,
+        shared: Optional[BlobTier] = None,
+    ) -> None:
+        self._memory = MemoryBlobTier(ttl_seconds=ttl_seconds, max_entries=max_entries)
+        self._shared = LoggedTier(shared, label="Embedding cache") if shared is not None else None
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _remember(self, key: str, blob: bytes) -> None:
+        self._memory.set_many([(key, blob)])
+        if _SIZE_GAUGE is not None:
+            _SIZE_GAUGE.set(float(len(self._memory)))
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        key = cache_key(model, text)
+        blob = self._memory.get_many([key])[0]
+        _record_lookup(self._memory.name, blob is not None)
+        if blob is not None:
+            return _unpack(blob)
+        if self._shared is None:
+            return None
+        blob = self._shared.get(key)
+        _record_lookup(self._shared.name, blob is not None)
+        if blob is None:
+            return None
+        self._remember(key, blob)
+        return _unpack(blob)
+
+    def set(self, model: str, text: str, vector: Sequence[float]) -> None:
+        key = cache_key(model, text)
+        blob = _pack(vector)
+        self._remember(key, blob)
+        if self._shared is not None:
+            self._shared.set(key, blob)
+
+    def invalidate(self, *, model: Optional[str] = None, text: Optional[str] = None) -> None:
+        """Drop cached vectors.
+
+        ``text`` + ``model`` removes a single entry, ``model`` alone removes every
+        entry produced by that model and no arguments clears everything.
+        """
+
+        if text is not None:
+            if not model:
+                raise ValueError("model is required when invalidating a single text.")
+            key = cache_key(model, text)
+            self._memory.delete([key])
+            if self._shared is not None:
+                self._shared.delete(key)
+            return
+        prefix = f"{model}:" if model else ""
+        self._memory.clear(prefix)
+        if self._shared is not None:
+            self._shared.clear(prefix)
+
+    def get_or_embed(
+        self,
+        model: str,
+        texts: Sequence[str],
+        embed_fn: Callable[[List[str]], List[List[float]]],
+    ) -> List[List[float]]:
+        """Return vectors for ``texts``, calling ``embed_fn`` only for the misses.
+
+        Duplicate texts inside ``texts`` are embedded once.
+        """
+
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        pending: Dict[str, List[int]] = {}
+        for index, text in enumerate(texts):
+            cached = self.get(model, text)
+            if cached is not None:
+                results[index] = cached
+                continue
+            pending.setdefault(normalize_text(text), []).append(index)
+
+        if pending:
+            missing_texts = [texts[indexes[0]] for indexes in pending.values()]
+            vectors = embed_fn(missing_texts)
+            if len(vectors) != len(missing_texts):
+                raise RuntimeError(
+                    f"Embedding provider returned {len(vectors)} vectors for {len(missing_texts)} inputs."
+                )
+            for indexes, text, vector in zip(pending.values(), missing_texts, vectors):
+                self.set(model, text, vector)
+                for index in indexes:
+                    results[index] = list(vector)
+
+        return [vector or [] for vector in results]
+
+
+_CACHE: Optional[EmbeddingCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def _build_shared_tier() -> Optional[BlobTier]:
+    return build_shared_tier(
+        "Embedding cache",
+        redis_url=EMBEDDING_CACHE_REDIS_URL,
+        sqlite_path=EMBEDDING_CACHE_SQLITE_PATH,
+        table=_SQLITE_TABLE,
+        prefix=_KEY_PREFIX,
+        ttl_seconds=EMBEDDING_CACHE_TTL_SECONDS,
+    )
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Return the process-wide cache, or ``None`` when caching is disabled."""
+
+    global _CACHE
+    if not EMBEDDING_CACHE_ENABLED:
+        return None
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = EmbeddingCache(
+                    max_entries=EMBEDDING_CACHE_MAX_ENTRIES,
+                    ttl_seconds=EMBEDDING_CACHE_TTL_SECONDS,
+                    shared=_build_shared_tier(),
+                )
+    return _CACHE
+
+
+def invalidate_embeddings(*, model: Optional[str] = None, text: Optional[str] = None) -> None:
+    """Invalidate cached embeddings on the process-wide cache (no-op when disabled)."""
+
+    cache = get_embedding_cache()
+    if cache is not None:
+        cache.invalidate(model=model, text=text)
+
+
+def reset_embedding_cache() -> None:
+    """Forget the process-wide cache instance (used by tests and config reloads)."""
+
+    global _CACHE
+    with _CACHE_LOCK:
+        _CACHE = None
+
+
+__all__ = [
+    "EmbeddingCache",
+    "cache_key",
+    "get_embedding_cache",
+    "invalidate_embeddings",
+    "normalize_text",
+    "reset_embedding_cache",
+]
@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import os
-from typing import Iterable, List, Sequence, Any
+from typing import Iterable, List, Optional, Sequence, Any
 
 import litellm
 
+from services.embedding_cache import get_embedding_cache
+
 EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
 
 
@@ -18,20 +20,36 @@ def _clean_text(value: Any) -> str:
     return str(value).strip()
 
 
-def embed_text(text: str) -> List[float]:
+def _embed_remote(model: str, texts: List[str]) -> List[List[float]]:
+    response = litellm.embedding(model=model, input=texts)
+    return [item["embedding"] for item in response.data]
+
+
+def embed_text(text: str, *, model_name: Optional[str] = None) -> List[float]:
     cleaned = _clean_text(text)
     if not cleaned:
         raise ValueError("text must be a non-empty string.")
-    response = litellm.embedding(model=EMBEDDING_MODEL, input=[cleaned])
-    return response.data[0]["embedding"]
-
-
-def embed_texts(texts: Sequence[str]) -> List[List[float]]:
+    model = model_name or EMBEDDING_MODEL
+    cache = get_embedding_cache()
+    if cache is None:
+        return _embed_remote(model, [cleaned])[0]
+    return cache.get_or_embed(model, [cleaned], lambda missing: _embed_remote(model, missing))[0]
+
+
+def embed_texts(
+    texts: Sequence[str],
+    *,
+    model_name: Optional[str] = None,
+    use_cache: bool = False,
+) -> List[List[float]]:
     if not texts:
         return []
     cleaned_texts = [_clean_text(text) for text in texts]
     filtered = [text for text in cleaned_texts if text]
     if not filtered:
         return []
-    response = litellm.embedding(model=EMBEDDING_MODEL, input=filtered)
-    return [item["embedding"] for item in response.data]
+    model = model_name or EMBEDDING_MODEL
+    cache = get_embedding_cache() if use_cache else None
+    if cache is None:
+        return _embed_remote(model, filtered)
+    return cache.get_or_embed(model, filtered, lambda missing: _embed_remote(model, missing))
@@ -0,0 +1,226 @@
+"""Incremental cohort statistics behind the nightly event-study summaries.
+
+``aggregate_event_summaries`` used to load every event of every
+(event type, cap bucket) cohort and rebuild its statistics from scratch for
+every window preset. Instead, each window keeps one
+:class:`~services.event_study_engine.CohortPartial` per
+(event type, cap bucket, event month) cell in ``event_cohort_partials``. A
+single grouped query fingerprints every cell (event count, AR/CAR row count and
+their sums); only cells whose fingerprint changed since the last run are
+re-read and rebuilt, and the preset summaries are produced by merging the
+partials.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from core.logging import get_logger
+from models.event_study import EventCohortPartial, EventRecord, EventStudyResult
+from services.event_study_engine import CohortPartial
+from services.prometheus_helpers import build_counter
+
+logger = get_logger(__name__)
+
+UNBUCKETED = "-"
+"""Cell bucket for events without a cap bucket; they only count toward ``ALL``."""
+
+_CELL_COUNTER = build_counter(
+    "event_cohort_cells_total",
+    "Event cohort partial cells per summary run, by outcome (reused, rebuilt, removed).",
+    ("result",),
+)
+
+
+@dataclass(frozen=True, order=True)
+class CohortCell:
+    event_type: str
+    cap_bucket: str
+    period: date
+
+
+def _cell(event_type: str, cap_bucket: Optional[str], event_date: date) -> CohortCell:
+    return CohortCell(event_type, cap_bucket or UNBUCKETED, event_date.replace(day=1))
+
+
+def _record(result: str, count: int) -> None:
+    if _CELL_COUNTER is not None and count:
+        _CELL_COUNTER.labels(result=result).inc(count)
+
+
+def cell_signatures(
+    db: Session,
+    *,
+    start: int,
+    end: int,
+    event_types: Sequence[str],
+) -> Dict[CohortCell, str]:
+    """Fingerprint every cell from the AR/CAR rows inside ``[start, end]``."""
+
+    rows = (
+        db.query(
+            EventRecord.event_type,
+            EventRecord.cap_bucket,
+            EventRecord.event_date,
+            func.count(func.distinct(EventStudyResult.rcept_no)),
+            func.count(EventStudyResult.t),
+            func.sum(EventStudyResult.ar),
+            func.sum(EventStudyResult.car),
+        )
+        .join(EventStudyResult, EventStudyResult.rcept_no == EventRecord.rcept_no)
+        .filter(
+            EventRecord.event_type.in_(list(event_types)),
+            EventRecord.event_date != None,  # noqa: E711
+            EventStudyResult.t >= start,
+            EventStudyResult.t <= end,
+        )
+        .group_by(EventRecord.event_type, EventRecord.cap_bucket, EventRecord.event_date)
+        .order_by(EventRecord.event_type, EventRecord.cap_bucket, EventRecord.event_date)
+        .all()
+    )
+    totals: Dict[CohortCell, List[float]] = defaultdict(lambda: [0, 0, 0.0, 0.0])
+    for event_type, cap_bucket, event_date, events, series_rows, ar_sum, car_sum in rows:
+        total = totals[_cell(event_type, cap_bucket, event_date)]
+        total[0] += int(events or 0)
+        total[1] += int(series_rows or 0)
+        total[2] += float(ar_sum or 0.0)
+        total[3] += float(car_sum or 0.0)
+    return {
+        cell: f"{events}:{series_rows}:{ar_sum:.9f}:{car_sum:.9f}"
+        for cell, (events, series_rows, ar_sum, car_sum) in totals.items()
+    }
+
+
+def _rebuild_cells(db: Session, cells: Sequence[CohortCell], *, start: int, end: int) -> Dict[CohortCell, CohortPartial]:
+    """Re-read the AR/CAR rows of ``cells`` (one query per event type) and fold them."""
+
+    wanted = set(cells)
+    by_type: Dict[str, List[CohortCell]] = defaultdict(list)
+    for cell in cells:
+        by_type[cell.event_type].append(cell)
+
+    rows_by_cell: Dict[CohortCell, List[Tuple[str, int, object, object]]] = defaultdict(list)
+    for event_type, type_cells in by_type.items():
+        first = min(cell.period for cell in type_cells)
+        last = max(cell.period for cell in type_cells)
+        last = date(last.year + (last.month == 12), last.month % 12 + 1, 1)
+        query = (
+            db.query(
+                EventRecord.cap_bucket,
+                EventRecord.event_date,
+                EventStudyResult.rcept_no,
+                EventStudyResult.t,
+                EventStudyResult.ar,
+                EventStudyResult.car,
+            )
+            .join(EventStudyResult, EventStudyResult.rcept_no == EventRecord.rcept_no)
+            .filter(
+                EventRecord.event_type == event_type,
+                EventRecord.event_date >= first,
+                EventRecord.event_date < last,
+                EventStudyResult.t >= start,
+                EventStudyResult.t <= end,
+            )
+        )
+        for cap_bucket, event_date, rcept_no, t, ar, car in query.yield_per(5000):
+            cell = _cell(event_type, cap_bucket, event_date)
+            if cell in wanted:
+                rows_by_cell[cell].append((rcept_no, t, ar, car))
+
+    return {
+        cell: CohortPartial.from_rows([row[0] for row in rows], rows, start=start, end=end)
+        for cell, rows in rows_by_cell.items()
+    }
+
+
+def refresh_cohort_partials(
+    db: Session,
+    *,
+    window_key: str,
+    start: int,
+    end: int,
+    event_types: Sequence[str],
+) -> Dict[CohortCell, CohortPartial]:
+    """Bring the stored partials of ``window_key`` up to date and return all of them.
+
+    Changes are added to ``db`` but not committed.
+    """
+
+    signatures = cell_signatures(db, start=start, end=end, event_types=event_types)
+    stored = {
+        _cell(row.event_type, row.cap_bucket, row.period): row
+        for row in db.query(EventCohortPartial).filter(EventCohortPartial.window_key == window_key)
+    }
+
+    partials: Dict[CohortCell, CohortPartial] = {}
+    changed: List[CohortCell] = []
+    for cell, signature in signatures.items():
+        row = stored.get(cell)
+        if row is not None and row.signature == signature and (row.stats or {}).get("width") == end - start + 1:
+            partials[cell] = CohortPartial.from_json(row.stats)
+        else:
+            changed.append(cell)
+
+    removed = [row for cell, row in stored.items() if cell not in signatures]
+    for row in removed:
+        db.delete(row)
+
+    rebuilt = _rebuild_cells(db, sorted(changed), start=start, end=end) if changed else {}
+    for cell in changed:
+        partial = rebuilt.get(cell) or CohortPartial(width=end - start + 1)
+        partials[cell] = partial
+        db.merge(
+            EventCohortPartial(
+                window_key=window_key,
+                event_type=cell.event_type,
+                cap_bucket=cell.cap_bucket,
+                period=cell.period,
+                signature=signatures[cell],
+                n=partial.n,
+                stats=partial.to_json(),
+            )
+        )
+
+    _record("reused", len(signatures) - len(changed))
+    _record("rebuilt", len(changed))
+    _record("removed", len(removed))
+    if changed or removed:
+        logger.info(
+            "Event cohort partials for %s: %d reused, %d rebuilt, %d removed.",
+            window_key,
+            len(signatures) - len(changed),
+            len(changed),
+            len(removed),
+        )
+    return partials
+
+
+def merge_cohorts(partials: Dict[CohortCell, CohortPartial], *, width: int) -> Dict[Tuple[str, str], CohortPartial]:
+    """Merge cell partials into (event type, cap bucket) cohorts, plus ``ALL`` per event type."""
+
+    cohorts: Dict[Tuple[str, str], CohortPartial] = {}
+    for cell, partial in sorted(partials.items()):
+        targets = [(cell.event_type, "ALL")]
+        if cell.cap_bucket != UNBUCKETED:
+            targets.append((cell.event_type, cell.cap_bucket))
+        for key in targets:
+            cohort = cohorts.get(key)
+            if cohort is None:
+                cohort = cohorts[key] = CohortPartial(width=width)
+            cohort.merge(partial)
+    return cohorts
+
+
+__all__ = [
+    "CohortCell",
+    "UNBUCKETED",
+    "cell_signatures",
+    "merge_cohorts",
+    "refresh_cohort_partials",
+]
@@ -0,0 +1,404 @@
+"""Vectorised event-study math on dense return matrices.
+
+The event-study service used to issue two price queries per event, walk the
+calendar one day at a time and fit each market model in pure Python. This
+module loads the returns of every symbol a batch of events needs through the
+set-based, cached ``price_series_cache`` layer into a ``symbols x calendar
+days`` NumPy matrix (``NaN`` where a symbol has no return that day), then
+computes alpha/beta, AR and CAR for all events at once with masked array
+arithmetic. Cohorts are folded into mergeable :class:`CohortPartial`
+statistics, from which AAR/CAAR, summary statistics and histograms follow.
+Results match the previous day-by-day implementation: the same days enter the
+estimation and event windows, and AR/CAR are rounded the same way.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from statistics import NormalDist
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from services.price_series_cache import load_price_frame
+
+MIN_ESTIMATION_SAMPLES = 30
+
+
+@dataclass
+class ReturnMatrix:
+    """Daily returns of ``symbols`` over consecutive calendar days from ``start``."""
+
+    start: date
+    symbols: Tuple[str, ...]
+    values: np.ndarray
+
+    def __post_init__(self) -> None:
+        self._rows = {symbol: index for index, symbol in enumerate(self.symbols)}
+
+    @property
+    def days(self) -> int:
+        return int(self.values.shape[1])
+
+    def row_index(self, symbol: Optional[str]) -> int:
+        """Row of ``symbol`` in :attr:`values`, or ``-1`` when it was not loaded."""
+
+        if not symbol:
+            return -1
+        return self._rows.get(symbol, -1)
+
+
+def load_return_matrix(db: Session, symbols: Iterable[str], start: date, end: date) -> ReturnMatrix:
+    """Load ``Price.ret`` for ``symbols`` between ``start`` and ``end`` (inclusive)."""
+
+    frame = load_price_frame(db, symbols, start, end)
+    return ReturnMatrix(start=start, symbols=frame.tickers, values=frame.returns_by_calendar_day(start, end))
+
+
+@dataclass(frozen=True)
+class EventSpec:
+    """An event to evaluate: ``key`` identifies it in the results."""
+
+    key: Hashable
+    symbol: Optional[str]
+    event_date: date
+
+
+@dataclass
+class EventReturns:
+    """Market-model fit and the AR/CAR path over the observed event-window days."""
+
+    alpha: float
+    beta: float
+    t: np.ndarray
+    ar: np.ndarray
+    car: np.ndarray
+
+    def as_series(self) -> Dict[int, Tuple[float, float]]:
+        """AR/CAR keyed by event-day index, rounded like the stored series."""
+
+        return {
+            int(t): (round(float(ar), 6), round(float(car), 6))
+            for t, ar, car in zip(self.t, self.ar, self.car)
+        }
+
+
+def matrix_bounds(
+    event_dates: Iterable[date],
+    estimation_window: Tuple[int, int],
+    event_window: Tuple[int, int],
+) -> Tuple[date, date]:
+    """Calendar range a :class:`ReturnMatrix` must cover for these events."""
+
+    dates = list(event_dates)
+    return (
+        min(dates) + timedelta(days=estimation_window[0]),
+        max(dates) + timedelta(days=event_window[1]),
+    )
+
+
+def compute_event_returns(
+    matrix: ReturnMatrix,
+    events: Sequence[EventSpec],
+    *,
+    benchmark_symbol: str,
+    estimation_window: Tuple[int, int],
+    event_window: Tuple[int, int],
+    min_samples: int = MIN_ESTIMATION_SAMPLES,
+) -> Tuple[Dict[Hashable, EventReturns], Dict[Hashable, str]]:
+    """Fit the market model and compute AR/CAR for every event in one pass.
+
+    Only days from the start of the estimation window through the end of the
+    event window are considered, and a day counts only when both the asset and
+    the benchmark have a return. Returns ``(results, errors)`` keyed by
+    ``EventSpec.key``; events without ``min_samples`` estimation days land in
+    ``errors``.
+    """
+
+    results: Dict[Hashable, EventReturns] = {}
+    errors: Dict[Hashable, str] = {}
+    if not events:
+        return results, errors
+
+    offsets = np.arange(estimation_window[0], event_window[1] + 1)
+    in_estimation = offsets <= estimation_window[1]
+    in_event = offsets >= event_window[0]
+
+    # Column 0 of the padded matrix is an all-NaN sentinel for days outside it.
+    padded = np.full((len(matrix.symbols) + 1, matrix.days + 1), np.nan, dtype=np.float64)
+    padded[:-1, 1:] = matrix.values
+    missing_row = len(matrix.symbols)
+
+    asset_rows = np.array([matrix.row_index(event.symbol) for event in events])
+    asset_rows[asset_rows < 0] = missing_row
+    bench_row = matrix.row_index(benchmark_symbol)
+    if bench_row < 0:
+        bench_row = missing_row
+    anchors = np.array([(event.event_date - matrix.start).days for event in events])
+    columns = anchors[:, None] + offsets[None, :]
+    columns = np.where((columns >= 0) & (columns < matrix.days), columns + 1, 0)
+
+    y = padded[asset_rows[:, None], columns]
+    x = padded[bench_row, columns]
+    valid = ~np.isnan(y) & ~np.isnan(x)
+
+    estimation = valid & in_estimation[None, :]
+    counts = estimation.sum(axis=1)
+    safe_counts = np.maximum(counts, 1)
+    x_est = np.where(estimation, x, 0.0)
+    y_est = np.where(estimation, y, 0.0)
+    mean_x = x_est.sum(axis=1) / safe_counts
+    mean_y = y_est.sum(axis=1) / safe_counts
+    dx = np.where(estimation, x - mean_x[:, None], 0.0)
+    dy = np.where(estimation, y - mean_y[:, None], 0.0)
+    numerator = (dx * dy).sum(axis=1)
+    denominator = (dx * dx).sum(axis=1)
+    beta = np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator != 0)
+    alpha = mean_y - beta * mean_x
+
+    observed = valid & in_event[None, :]
+    ar = np.where(observed, y - (alpha[:, None] + beta[:, None] * x), 0.0)
+    car = np.cumsum(ar, axis=1)
+
+    for index, event in enumerate(events):
+        if counts[index] < min_samples:
+            errors[event.key] = "insufficient estimation window"
+            continue
+        mask = observed[index]
+        results[event.key] = EventReturns(
+            alpha=float(alpha[index]),
+            beta=float(beta[index]),
+            t=offsets[mask],
+            ar=ar[index, mask],
+            car=car[index, mask],
+        )
+    return results, errors
+
+
+_CAR_SCALE = 1_000_000
+
+
+@dataclass
+class CohortPartial:
+    """Mergeable sufficient statistics of an event cohort over one event window.
+
+    ``ar_sum``/``ar_count`` hold the per-day AR totals of complete events,
+    ``car_sum``/``car_m2`` the sum and centred sum of squares of their
+    window-end CARs and ``car_bins`` a histogram of those CARs at the 1e-6
+    resolution the series are stored with, so a merged histogram is exact.
+    """
+
+    width: int
+    n: int = 0
+    hits: int = 0
+    car_sum: float = 0.0
+    car_m2: float = 0.0
+    ar_sum: np.ndarray = field(default=None)  # type: ignore[assignment]
+    ar_count: np.ndarray = field(default=None)  # type: ignore[assignment]
+    car_bins: Dict[int, int] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if self.ar_sum is None:
+            self.ar_sum = np.zeros(self.width, dtype=np.float64)
+        if self.ar_count is None:
+            self.ar_count = np.zeros(self.width, dtype=np.int64)
+
+    @classmethod
+    def from_rows(
+        cls,
+        keys: Sequence[Hashable],
+        rows: Iterable[Tuple[Hashable, int, Any, Any]],
+        *,
+        start: int,
+        end: int,
+    ) -> "CohortPartial":
+        """Fold ``(key, t, ar, car)`` rows of the events in ``keys`` into a partial.
+
+        Only events with a row for every day in ``[start, end]`` contribute,
+        and only their non-null ARs and window-end CARs are counted.
+        """
+
+        width = end - start + 1
+        positions = {key: index for index, key in enumerate(dict.fromkeys(keys))}
+        present = np.zeros((len(positions), width), dtype=bool)
+        ar = np.full((len(positions), width), np.nan, dtype=np.float64)
+        car = np.full(len(positions), np.nan, dtype=np.float64)
+        for key, t, ar_value, car_value in rows:
+            index = positions.get(key)
+            if index is None or not start <= t <= end:
+                continue
+            present[index, t - start] = True
+            if ar_value is not None:
+                ar[index, t - start] = float(ar_value)
+            if t == end and car_value is not None:
+                car[index] = float(car_value)
+
+        complete = present.all(axis=1)
+        complete_ar = ar[complete]
+        observed = ~np.isnan(complete_ar)
+        samples = car[complete]
+        samples = samples[~np.isnan(samples)]
+        partial = cls(
+            width=width,
+            ar_sum=np.where(observed, complete_ar, 0.0).sum(axis=0),
+            ar_count=observed.sum(axis=0).astype(np.int64),
+        )
+        if samples.size:
+            mean = float(samples.mean())
+            partial.n = int(samples.size)
+            partial.hits = int(np.count_nonzero(samples > 0))
+            partial.car_sum = float(samples.sum())
+            partial.car_m2 = float(np.square(samples - mean).sum())
+            micros, counts = np.unique(np.rint(samples * _CAR_SCALE).astype(np.int64), return_counts=True)
+            partial.car_bins = {int(key): int(count) for key, count in zip(micros, counts)}
+        return partial
+
+    def merge(self, other: "CohortPartial") -> "CohortPartial":
+        """Add ``other`` into this partial (Chan et al. update for the centred moments)."""
+
+        if other.width != self.width:
+            raise ValueError("Cannot merge cohort partials of different window widths.")
+        if other.n:
+            if self.n:
+                total = self.n + other.n
+                delta = other.car_sum / other.n - self.car_sum / self.n
+                self.car_m2 += other.car_m2 + delta * delta * self.n * other.n / total
+            else:
+                self.car_m2 = other.car_m2
+            self.n += other.n
+            self.hits += other.hits
+            self.car_sum += other.car_sum
+            for key, count in other.car_bins.items():
+                self.car_bins[key] = self.car_bins.get(key, 0) + count
+        self.ar_sum = self.ar_sum + other.ar_sum
+        self.ar_count = self.ar_count + other.ar_count
+        return self
+
+    def aar(self) -> np.ndarray:
+        """Mean AR per event day (``0`` where no complete event has a value)."""
+
+        return np.divide(
+            self.ar_sum,
+            self.ar_count,
+            out=np.zeros(self.width, dtype=np.float64),
+            where=self.ar_count > 0,
+        )
+
+    def car_samples(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Distinct window-end CAR values and how many events ended on each."""
+
+        if not self.car_bins:
+            return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.int64)
+        keys = np.fromiter(self.car_bins.keys(), dtype=np.int64, count=len(self.car_bins))
+        counts = np.fromiter(self.car_bins.values(), dtype=np.int64, count=len(self.car_bins))
+        return keys / _CAR_SCALE, counts
+
+    def stats(self, *, significance: float) -> Dict[str, float]:
+        mean = self.car_sum / self.n if self.n else 0.0
+        return _stats_from_moments(self.n, mean, self.car_m2, self.hits, significance=significance)
+
+    def histogram(self, bins: int = 12) -> List[Dict[str, Any]]:
+        values, counts = self.car_samples()
+        return histogram(values, bins=bins, weights=counts)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "width": self.width,
+            "n": self.n,
+            "hits": self.hits,
+            "car_sum": self.car_sum,
+            "car_m2": self.car_m2,
+            "ar_sum": self.ar_sum.tolist(),
+            "ar_count": self.ar_count.tolist(),
+            "car_bins": [[key, count] for key, count in sorted(self.car_bins.items())],
+        }
+
+    @classmethod
+    def from_json(cls, payload: Dict[str, Any]) -> "CohortPartial":
+        return cls(
+            width=int(payload["width"]),
+            n=int(payload.get("n") or 0),
+            hits=int(payload.get("hits") or 0),
+            car_sum=float(payload.get("car_sum") or 0.0),
+            car_m2=float(payload.get("car_m2") or 0.0),
+            ar_sum=np.asarray(payload["ar_sum"], dtype=np.float64),
+            ar_count=np.asarray(payload["ar_count"], dtype=np.int64),
+            car_bins={int(key): int(count) for key, count in payload.get("car_bins") or []},
+        )
+
+
+def _stats_from_moments(n: int, mean: float, m2: float, hits: int, *, significance: float) -> Dict[str, float]:
+    if n == 0:
+        return {"n": 0, "hit_rate": 0.0, "mean": 0.0, "ci_lo": 0.0, "ci_hi": 0.0, "p_value": 1.0}
+    variance = max(0.0, m2) / max(1, n - 1)
+    se = math.sqrt(variance) / math.sqrt(n)
+    alpha = min(0.5, max(1e-4, significance))
+    normal_dist = NormalDist()
+    ci = normal_dist.inv_cdf(1 - alpha / 2) * se if se > 0 else 0.0
+    p_value = 2 * (1 - normal_dist.cdf(abs(mean / se))) if se > 0 else 1.0
+    return {"n": n, "hit_rate": hits / n, "mean": mean, "ci_lo": mean - ci, "ci_hi": mean + ci, "p_value": p_value}
+
+
+def summary_stats(samples: Sequence[float], *, significance: float) -> Dict[str, float]:
+    """Mean, hit rate, normal confidence interval and two-sided p-value of ``samples``."""
+
+    values = np.asarray(samples, dtype=np.float64)
+    if values.size == 0:
+        return _stats_from_moments(0, 0.0, 0.0, 0, significance=significance)
+    mean = float(values.mean())
+    m2 = float(np.square(values - mean).sum())
+    hits = int(np.count_nonzero(values > 0))
+    return _stats_from_moments(int(values.size), mean, m2, hits, significance=significance)
+
+
+def histogram(
+    samples: Sequence[float],
+    bins: int = 12,
+    *,
+    weights: Optional[Sequence[int]] = None,
+) -> List[Dict[str, Any]]:
+    """Equal-width histogram with half-open ``[start, end)`` bins over the sample range.
+
+    ``weights`` counts each sample that many times.
+    """
+
+    values = np.asarray(samples, dtype=np.float64)
+    if values.size == 0:
+        return []
+    order = np.argsort(values, kind="stable")
+    values = values[order]
+    counts = np.ones(values.size, dtype=np.int64) if weights is None else np.asarray(weights, dtype=np.int64)[order]
+    cumulative = np.concatenate([[0], np.cumsum(counts)])
+    lo = float(values[0])
+    hi = float(values[-1])
+    if lo == hi:
+        lo -= 0.01
+        hi += 0.01
+    bin_width = (hi - lo) / bins
+    starts = [lo + bin_width * i for i in range(bins)]
+    ends = [value + bin_width for value in starts]
+    totals = (
+        cumulative[np.searchsorted(values, ends, side="left")]
+        - cumulative[np.searchsorted(values, starts, side="left")]
+    )
+    return [
+        {"bin": i, "range": [round(starts[i], 6), round(ends[i], 6)], "count": int(totals[i])}
+        for i in range(bins)
+    ]
+
+
+__all__ = [
+    "CohortPartial",
+    "EventReturns",
+    "EventSpec",
+    "MIN_ESTIMATION_SAMPLES",
+    "ReturnMatrix",
+    "compute_event_returns",
+    "histogram",
+    "load_return_matrix",
+    "matrix_bounds",
+    "summary_stats",
+]
@@ -1,28 +1,32 @@
-"\"\"\"Ingestion and aggregation helpers for event study pipelines.\"\"\""
+"""Ingestion and aggregation helpers for event study pipelines."""
 
 from __future__ import annotations
 
+import base64
+import binascii
+import json
 import logging
-import math
-from collections import defaultdict
+import time
 from dataclasses import dataclass
 import uuid
 from datetime import date, datetime, timedelta, timezone
-from statistics import NormalDist
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from sqlalchemy import and_, asc, func, or_, case
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, or_, case, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, aliased
 
-from core.env import env_str
+from core.env import env_int, env_str
 from database import SessionLocal
 from models.company import FilingEvent
 from models.event_study import (
     EventIngestJob,
+    EventJobCheckpoint,
     EventRecord,
     EventStudyResult,
     EventSummary,
-    Price,
 )
 from models.evidence import EvidenceSnapshot
 from models.filing import Filing
@@ -53,12 +57,29 @@ from services.event_study_windows import (
     get_event_window_span,
     list_event_window_presets,
 )
-from services import focus_score_service
+from services import event_cohort_partials, event_study_engine, focus_score_service
+from services.prometheus_helpers import build_counter, build_histogram
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_BENCHMARK_SYMBOL = env_str("EVENT_STUDY_BENCHMARK", "KOSPI")
 DEFAULT_SIGNIFICANCE = 0.1
+EVENT_STUDY_BATCH_SIZE = env_int("EVENT_STUDY_BATCH_SIZE", 500, minimum=1)
+EVENT_INGEST_BATCH_SIZE = env_int("EVENT_INGEST_BATCH_SIZE", 500, minimum=1)
+EVENT_DERIVED_METRICS_BATCH_SIZE = env_int("EVENT_DERIVED_METRICS_BATCH_SIZE", 1000, minimum=1)
+EVENT_LIST_EXACT_COUNT_BELOW = env_int("EVENT_LIST_EXACT_COUNT_BELOW", 1000, minimum=0)
+
+_INGEST_BATCH_SECONDS = build_histogram(
+    "event_ingest_batch_seconds",
+    "Time spent per filing batch in event ingestion, by stage.",
+    ("stage",),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+_INGEST_EVENTS = build_counter(
+    "event_ingest_events_total",
+    "Events seen by filing ingestion, by outcome (created, refreshed, skipped).",
+    ("result",),
+)
 
 _EVENT_TYPES: Tuple[str, ...] = (
     "BUYBACK",
@@ -105,10 +126,20 @@ def ingest_events_from_filings(
     *,
     start_date: date,
     end_date: date,
+    batch_size: Optional[int] = None,
+    refresh_existing: bool = False,
 ) -> int:
-    """Convert filings in the date range into normalized event records."""
+    """Convert filings in the date range into normalized event records.
+
+    Filings are processed in chunks of ``batch_size``: security metadata and
+    already-ingested receipts for the whole chunk are prefetched with ``IN``
+    queries and the new events are written with a single upsert. Existing
+    events are skipped unless ``refresh_existing`` is set, in which case they
+    are re-extracted and overwritten.
+    """
 
     job = _create_ingest_job(start_date, end_date)
+    size = max(1, batch_size or EVENT_INGEST_BATCH_SIZE)
     created = 0
     skipped = 0
 
@@ -121,66 +152,267 @@ def ingest_events_from_filings(
         .order_by(Filing.filed_at.asc())
     )
     try:
-        for filing in filings_query.yield_per(500):
-            attributes = extract_event_attributes(filing)
-            if not attributes.event_type or not filing.receipt_no:
-                continue
+        chunk: List[Filing] = []
+        for filing in filings_query.yield_per(size):
+            chunk.append(filing)
+            if len(chunk) >= size:
+                batch_created, batch_skipped = _ingest_filing_batch(db, chunk, refresh_existing=refresh_existing)
+                created += batch_created
+                skipped += batch_skipped
+                chunk = []
+        if chunk:
+            batch_created, batch_skipped = _ingest_filing_batch(db, chunk, refresh_existing=refresh_existing)
+            created += batch_created
+            skipped += batch_skipped
+
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        _update_ingest_job(
+            job.id,
+            status="failed",
+            events_created=created,
+            events_skipped=skipped,
+            errors={"message": str(exc)},
+        )
+        raise
+
+    _update_ingest_job(
+        job.id,
+        status="completed",
+        events_created=created,
+        events_skipped=skipped,
+    )
+    return created
+
+
+def _observe_ingest_stage(stage: str, started: float) -> float:
+    now = time.perf_counter()
+    if _INGEST_BATCH_SECONDS is not None:
+        _INGEST_BATCH_SECONDS.labels(stage=stage).observe(now - started)
+    return now
 
-            metadata = None
-            if filing.ticker:
-                metadata = db.get(SecurityMetadata, filing.ticker.upper())
 
-            existing = db.get(EventRecord, filing.receipt_no)
-            if existing:
-                skipped += 1
+def _ingest_filing_batch(
+    db: Session,
+    filings: Sequence[Filing],
+    *,
+    refresh_existing: bool,
+) -> Tuple[int, int]:
+    """Extract and upsert the events of one chunk of filings; returns (created, skipped)."""
+
+    started = time.perf_counter()
+    extracted: List[Tuple[Filing, EventAttributes]] = []
+    for filing in filings:
+        if not filing.receipt_no:
+            continue
+        attributes = extract_event_attributes(filing)
+        if attributes.event_type:
+            extracted.append((filing, attributes))
+    clock = _observe_ingest_stage("extract", started)
+    if not extracted:
+        _observe_ingest_stage("total", started)
+        return 0, 0
+
+    tickers = {filing.ticker.upper() for filing, _ in extracted if filing.ticker}
+    metadata_by_ticker: Dict[str, SecurityMetadata] = {}
+    if tickers:
+        metadata_by_ticker = {
+            row.ticker: row
+            for row in db.query(SecurityMetadata).filter(SecurityMetadata.ticker.in_(sorted(tickers)))
+        }
+    existing = {
+        rcept_no
+        for (rcept_no,) in db.query(EventRecord.rcept_no).filter(
+            EventRecord.rcept_no.in_([filing.receipt_no for filing, _ in extracted])
+        )
+    }
+    clock = _observe_ingest_stage("prefetch", clock)
+
+    rows: List[Dict[str, Any]] = []
+    skipped = 0
+    for filing, attributes in extracted:
+        if filing.receipt_no in existing and not refresh_existing:
+            skipped += 1
+            continue
+        metadata = metadata_by_ticker.get(filing.ticker.upper()) if filing.ticker else None
+        rows.append(_event_row(filing, attributes, metadata))
+    created = sum(1 for row in rows if row["rcept_no"] not in existing)
+
+    if rows:
+        _upsert_event_rows(db, rows)
+    _observe_ingest_stage("write", clock)
+    _observe_ingest_stage("total", started)
+
+    if _INGEST_EVENTS is not None:
+        _INGEST_EVENTS.labels(result="created").inc(created)
+        _INGEST_EVENTS.labels(result="refreshed").inc(len(rows) - created)
+        _INGEST_EVENTS.labels(result="skipped").inc(skipped)
+    logger.debug(
+        "Ingested event batch: %d filings, %d events created, %d refreshed, %d skipped.",
+        len(filings),
+        created,
+        len(rows) - created,
+        skipped,
+    )
+    return created, skipped
+
+
+def _event_row(
+    filing: Filing,
+    attributes: EventAttributes,
+    metadata: Optional[SecurityMetadata],
+) -> Dict[str, Any]:
+    event_day = filing.filed_at.date() if filing.filed_at else None
+    if (
+        event_day
+        and filing.filed_at
+        and attributes.timing_rule == "AFTER_CLOSE_DPLUS1"
+        and filing.filed_at.hour >= _MARKET_CLOSE_HOUR
+    ):
+        event_day = event_day + timedelta(days=1)
+
+    return {
+        "rcept_no": filing.receipt_no,
+        "corp_code": filing.corp_code or "",
+        "ticker": (filing.ticker or "").upper() or None,
+        "corp_name": filing.corp_name,
+        "event_type": attributes.event_type,
+        "event_date": event_day,
+        "amount": attributes.amount,
+        "ratio": attributes.ratio,
+        "shares": None,
+        "method": attributes.method,
+        "score": attributes.score,
+        "domain": attributes.domain,
+        "subtype": attributes.subtype,
+        "confidence": attributes.confidence,
+        "is_negative": attributes.is_negative,
+        "is_restatement": attributes.is_restatement,
+        "matches": attributes.matches or None,
+        "market_cap": metadata.market_cap if metadata else None,
+        "cap_bucket": metadata.cap_bucket if metadata else None,
+        "created_at": filing.filed_at or datetime.utcnow(),
+        "source_url": (filing.urls or {}).get("viewer"),
+        "metadata": {
+            "timingRule": attributes.timing_rule,
+            "matches": attributes.matches,
+        },
+    }
+
+
+def _upsert_event_rows(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """Write ``rows`` with one ``INSERT ... ON CONFLICT (rcept_no) DO UPDATE``."""
+
+    bind = db.get_bind()
+    dialect = bind.dialect.name if bind is not None else ""
+    if dialect == "postgresql":
+        insert = pg_insert
+    elif dialect == "sqlite":
+        insert = sqlite_insert
+    else:
+        for row in rows:
+            values = dict(row)
+            values["metadata_json"] = values.pop("metadata")
+            db.merge(EventRecord(**values))
+        db.flush()
+        return
+
+    table = EventRecord.__table__
+    stmt = insert(table).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.rcept_no],
+        set_={
+            column.name: stmt.excluded[column.name]
+            for column in table.columns
+            if column.name not in ("rcept_no", "created_at", "start_date", "end_date")
+        },
+    )
+    db.execute(stmt)
+
+
+def update_event_study_series(
+    db: Session,
+    *,
+    benchmark_symbol: Optional[str] = None,
+    estimation_window: Tuple[int, int] = (-120, -11),
+    event_window: Optional[Tuple[int, int]] = None,
+    batch_size: Optional[int] = None,
+) -> int:
+    """Compute AR/CAR rows for events that do not have an event-study series yet.
+
+    Pending events are processed in batches of ``EVENT_STUDY_BATCH_SIZE``: each
+    batch loads the returns of all its tickers plus the benchmark in one query
+    and evaluates every market model at once (see ``event_study_engine``).
+    """
+
+    benchmark = benchmark_symbol or DEFAULT_BENCHMARK_SYMBOL
+    window = event_window or get_event_window_span(db)
+    size = max(1, batch_size or EVENT_STUDY_BATCH_SIZE)
+
+    pending = (
+        db.query(EventRecord.rcept_no, EventRecord.ticker, EventRecord.event_date)
+        .outerjoin(EventStudyResult, EventStudyResult.rcept_no == EventRecord.rcept_no)
+        .filter(
+            EventRecord.event_date != None,  # noqa: E711
+            EventRecord.ticker != None,  # noqa: E711
+            EventStudyResult.rcept_no == None,  # noqa: E711
+        )
+        .order_by(EventRecord.event_date.asc())
+        .all()
+    )
+    specs = [event_study_engine.EventSpec(key=rcept_no, symbol=ticker, event_date=day) for rcept_no, ticker, day in pending]
+
+    rows_created = 0
+    for offset in range(0, len(specs), size):
+        batch = specs[offset : offset + size]
+        matrix_start, matrix_end = event_study_engine.matrix_bounds(
+            (spec.event_date for spec in batch),
+            estimation_window,
+            window,
+        )
+        matrix = event_study_engine.load_return_matrix(
+            db,
+            [spec.symbol for spec in batch if spec.symbol] + [benchmark],
+            matrix_start,
+            matrix_end,
+        )
+        results, errors = event_study_engine.compute_event_returns(
+            matrix,
+            batch,
+            benchmark_symbol=benchmark,
+            estimation_window=estimation_window,
+            event_window=window,
+        )
+        for rcept_no, reason in errors.items():
+            logger.debug("Skipping event study for %s: %s", rcept_no, reason)
+        for spec in batch:
+            result = results.get(spec.key)
+            if result is None:
                 continue
+            for t_index, (ar_value, car_value) in result.as_series().items():
+                db.add(EventStudyResult(rcept_no=spec.key, t=t_index, ar=ar_value, car=car_value))
+                rows_created += 1
+        if rows_created:
+            db.commit()
+    return rows_created
 
-            event_day = filing.filed_at.date() if filing.filed_at else None
-            if (
-                event_day
-                and filing.filed_at
-                and attributes.timing_rule == "AFTER_CLOSE_DPLUS1"
-                and filing.filed_at.hour >= _MARKET_CLOSE_HOUR
-            ):
-                event_day = event_day + timedelta(days=1)
-
-            metadata_payload: Dict[str, object] = {
-                "timingRule": attributes.timing_rule,
-                "matches": attributes.matches,
-            }
-            event = EventRecord(
-                rcept_no=filing.receipt_no,
-                corp_code=filing.corp_code or "",
-                ticker=(filing.ticker or "").upper() or None,
-                corp_name=filing.corp_name,
-                event_type=attributes.event_type,
-                event_date=event_day,
-                amount=attributes.amount,
-                ratio=attributes.ratio,
-                shares=None,
-                method=attributes.method,
-                score=attributes.score,
-                domain=attributes.domain,
-                subtype=attributes.subtype,
-                confidence=attributes.confidence,
-                is_negative=attributes.is_negative,
-                is_restatement=attributes.is_restatement,
-                matches=attributes.matches or None,
-                market_cap=metadata.market_cap if metadata else None,
-                cap_bucket=metadata.cap_bucket if metadata else None,
-                created_at=filing.filed_at or datetime.utcnow(),
-                source_url=(filing.urls or {}).get("viewer"),
-                metadata=metadata_payload,
-            )
-            db.add(event)
-            created += 1
+
+def aggregate_event_summaries(
+    db: Session,
+    *,
     as_of: date,
     window_keys: Optional[Sequence[str]] = None,
     scope: str = "market",
     significance: float = DEFAULT_SIGNIFICANCE,
     min_samples: int = 5,
 ) -> int:
-    """Aggregate AAR/CAAR statistics per event type."""
+    """Aggregate AAR/CAAR statistics per event type.
+
+    Cohorts are merged from per-month partials that are only rebuilt for
+    months whose AR/CAR rows changed since the previous run (see
+    ``event_cohort_partials``).
+    """
 
     presets = list_event_window_presets(db)
     if window_keys:
@@ -192,23 +424,23 @@ def ingest_events_from_filings(
     summaries_created = 0
     for preset in presets:
         window_label = format_window_label(preset.start, preset.end)
+        partials = event_cohort_partials.refresh_cohort_partials(
+            db,
+            window_key=window_label,
+            start=preset.start,
+            end=preset.end,
+            event_types=_EVENT_TYPES,
+        )
+        cohorts = event_cohort_partials.merge_cohorts(partials, width=preset.end - preset.start + 1)
         for event_type in _EVENT_TYPES:
             for cap_bucket in _CAP_BUCKETS:
-                events_query = (
-                    db.query(EventRecord)
-                    .filter(EventRecord.event_type == event_type, EventRecord.event_date != None)  # noqa: E711
-                )
-                if cap_bucket != "ALL":
-                    events_query = events_query.filter(EventRecord.cap_bucket == cap_bucket)
-                events = events_query.all()
-                if not events:
+                cohort = cohorts.get((event_type, cap_bucket))
+                if cohort is None:
                     continue
 
-                summary = _build_cohort_summary(
-                    db,
-                    events,
+                summary = _summarize_partial(
+                    cohort,
                     start=preset.start,
-                    end=preset.end,
                     significance=significance or float(preset.significance or DEFAULT_SIGNIFICANCE),
                     min_samples=min_samples,
                 )
@@ -218,7 +450,7 @@ def ingest_events_from_filings(
                 payload = EventSummary(
                     asof=as_of,
                     event_type=event_type,
-                    window=window_label,
+                    window_key=window_label,
                     scope=scope,
                     cap_bucket=cap_bucket,
                     filters={"capBucket": cap_bucket} if cap_bucket != "ALL" else None,
@@ -235,8 +467,7 @@ def ingest_events_from_filings(
                 db.merge(payload)
                 summaries_created += 1
 
-    if summaries_created:
-        db.commit()
+    db.commit()
     return summaries_created
 
 
@@ -378,7 +609,19 @@ def fetch_event_rows(
     max_market_cap: Optional[float] = None,
     min_salience: Optional[float] = None,
     include_restatement: bool = True,
+    cursor: Optional[str] = None,
+    approximate_total: bool = False,
 ) -> EventStudyEventsResponse:
+    """Return one page of events with window-end CAR, peak |AR| day and evidence count.
+
+    The per-event metrics are computed in the page query itself. Pages are
+    ordered by ``(event_date, rcept_no)`` descending; passing the previous
+    response's ``next_cursor`` as ``cursor`` continues after its last row
+    (keyset pagination) and ``offset`` is then ignored. With
+    ``approximate_total`` the total comes from the planner estimate (PostgreSQL)
+    unless it is small enough to count exactly.
+    """
+
     base_query = (
         db.query(
             EventRecord,
@@ -407,34 +650,58 @@ def fetch_event_rows(
         security_alias=SecurityMetadata,
     )
 
-    total = base_query.count()
-    rows = (
-        base_query.order_by(EventRecord.event_date.desc(), EventRecord.rcept_no.desc())
-        .offset(offset)
-        .limit(limit)
-        .all()
+    window_result = aliased(EventStudyResult)
+    peak_day = (
+        select(EventStudyResult.t)
+        .where(EventStudyResult.rcept_no == EventRecord.rcept_no, EventStudyResult.ar.isnot(None))
+        .order_by(func.abs(EventStudyResult.ar).desc(), EventStudyResult.t.asc())
+        .limit(1)
+        .correlate(EventRecord)
+        .scalar_subquery()
     )
-
-    receipt_nos = [row.EventRecord.rcept_no for row in rows]
-    caar_map: Dict[str, Optional[float]] = {}
-    peak_map: Dict[str, Tuple[float, int]] = {}
-    if receipt_nos:
-        all_series = (
-            db.query(EventStudyResult)
-            .filter(EventStudyResult.rcept_no.in_(receipt_nos))
-            .all()
+    evidence_count = (
+        select(func.count(EvidenceSnapshot.urn_id))
+        .where(EvidenceSnapshot.payload["document"]["receiptNo"].astext == EventRecord.rcept_no)
+        .correlate(EventRecord)
+        .scalar_subquery()
+    )
+    page_query = (
+        base_query.outerjoin(
+            window_result,
+            and_(window_result.rcept_no == EventRecord.rcept_no, window_result.t == window_end),
         )
-        for series_row in all_series:
-            key = series_row.rcept_no
-            if series_row.t == window_end:
-                caar_map[key] = to_float(series_row.car)
-            if series_row.ar is None:
-                continue
-            current_abs = abs(float(series_row.ar))
-            existing = peak_map.get(key)
-            if existing is None or current_abs > existing[0]:
-                peak_map[key] = (current_abs, series_row.t)
-    evidence_counts = _count_evidence_by_receipt(db, receipt_nos)
+        .add_columns(
+            window_result.car.label("window_car"),
+            peak_day.label("peak_day"),
+            evidence_count.label("evidence_count"),
+        )
+        .order_by(EventRecord.event_date.desc().nulls_last(), EventRecord.rcept_no.desc())
+    )
+    if cursor:
+        page_query = page_query.filter(_event_keyset_after(*_decode_event_cursor(cursor)))
+    else:
+        page_query = page_query.offset(offset)
+    rows = page_query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1].EventRecord
+        next_cursor = _encode_event_cursor(last.event_date, last.rcept_no)
+
+    total_is_estimate = False
+    if not cursor and not has_more and (rows or offset == 0):
+        total = offset + len(rows)
+    else:
+        total = None
+        if approximate_total:
+            estimate = _estimate_row_count(db, base_query)
+            if estimate is not None and estimate >= EVENT_LIST_EXACT_COUNT_BELOW:
+                total = estimate
+                total_is_estimate = True
+        if total is None:
+            total = base_query.count()
 
     events: List[EventStudyEventItem] = []
     for row in rows:
@@ -442,7 +709,6 @@ def fetch_event_rows(
         market = row.market
         extra = row.extra
         security_market_cap = row.security_market_cap
-        peak_day = peak_map.get(record.rcept_no, (None, None))[1] if record.rcept_no in peak_map else None
         sector_slug, sector_name = _extract_sector(extra)
         viewer_url = record.source_url
         market_cap = to_float(record.market_cap) or to_float(security_market_cap)
@@ -459,8 +725,8 @@ def fetch_event_rows(
                 ratio=to_float(record.ratio),
                 method=record.method,
                 score=to_float(record.score),
-                caar=caar_map.get(record.rcept_no),
-                aar_peak_day=peak_day,
+                caar=to_float(row.window_car),
+                aar_peak_day=row.peak_day,
                 viewer_url=viewer_url,
                 cap_bucket=(record.cap_bucket or None),
                 market_cap=market_cap,
@@ -470,7 +736,7 @@ def fetch_event_rows(
                 is_restatement=bool(record.is_restatement),
                 subtype=record.subtype,
                 confidence=to_float(record.confidence),
-                evidence_count=evidence_counts.get(record.rcept_no) or None,
+                evidence_count=int(row.evidence_count or 0) or None,
                 focus_score=(record.metadata or {}).get("focus_score"),
             )
         )
@@ -481,9 +747,60 @@ def fetch_event_rows(
         offset=offset,
         window_end=window_end,
         events=events,
+        next_cursor=next_cursor,
+        total_is_estimate=total_is_estimate,
+    )
+
+
+def _encode_event_cursor(event_date: Optional[date], rcept_no: str) -> str:
+    payload = json.dumps({"d": event_date.isoformat() if event_date else None, "r": rcept_no}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("utf-8").rstrip("=")
+
+
+def _decode_event_cursor(token: str) -> Tuple[Optional[date], str]:
+    padding = "=" * (-len(token) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + padding).decode("utf-8"))
+        event_date = date.fromisoformat(payload["d"]) if payload.get("d") else None
+        rcept_no = str(payload["r"])
+    except (ValueError, TypeError, KeyError, binascii.Error):
+        raise ValueError("Invalid event list cursor.") from None
+    return event_date, rcept_no
+
+
+def _event_keyset_after(event_date: Optional[date], rcept_no: str):
+    """Rows after ``(event_date, rcept_no)`` in ``event_date DESC NULLS LAST, rcept_no DESC`` order."""
+
+    if event_date is None:
+        return and_(EventRecord.event_date.is_(None), EventRecord.rcept_no < rcept_no)
+    return or_(
+        EventRecord.event_date < event_date,
+        and_(EventRecord.event_date == event_date, EventRecord.rcept_no < rcept_no),
+        EventRecord.event_date.is_(None),
     )
 
 
+def _estimate_row_count(db: Session, query) -> Optional[int]:
+    """Planner row estimate for ``query``; ``None`` when unavailable (non-PostgreSQL)."""
+
+    bind = db.get_bind()
+    if bind is None or bind.dialect.name != "postgresql":
+        return None
+    compiled = query.statement.compile(dialect=bind.dialect, compile_kwargs={"render_postcompile": True})
+    try:
+        with db.begin_nested():
+            plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    except SQLAlchemyError as exc:
+        logger.debug("Event list row estimate failed: %s", exc)
+        return None
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    try:
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except (TypeError, KeyError, IndexError, ValueError):
+        return None
+
+
 def build_board_snapshot(
     db: Session,
     *,
@@ -502,6 +819,8 @@ def build_board_snapshot(
     significance: float,
     limit: int,
     offset: int,
+    cursor: Optional[str] = None,
+    approximate_total: bool = False,
 ) -> EventStudyBoardResponse:
     preset = resolve_window_preset(db, window_key)
     normalized_types = normalize_str_list(event_types)
@@ -528,6 +847,8 @@ def build_board_snapshot(
         max_market_cap=max_market_cap,
         min_salience=min_salience,
         include_restatement=include_restatement,
+        cursor=cursor,
+        approximate_total=approximate_total,
     )
 
     summary = summarize_event_window(
@@ -923,23 +1244,6 @@ def _extract_sector(extra: Any) -> Tuple[Optional[str], Optional[str]]:
     return slug, name
 
 
-def _count_evidence_by_receipt(db: Session, receipt_nos: Sequence[str]) -> Dict[str, int]:
-    if not receipt_nos:
-        return {}
-    receipt_expr = EvidenceSnapshot.payload["document"]["receiptNo"].astext
-    rows = (
-        db.query(
-            receipt_expr.label("receipt_no"),
-            func.count(EvidenceSnapshot.urn_id).label("evidence_count"),
-        )
-        .filter(receipt_expr.isnot(None))
-        .filter(receipt_expr.in_(receipt_nos))
-        .group_by(receipt_expr)
-        .all()
-    )
-    return {row.receipt_no: int(row.evidence_count or 0) for row in rows if row.receipt_no}
-
-
 def _load_event_evidence(db: Session, receipt_no: str, limit: int = 6) -> List[EventStudyEventEvidence]:
     receipt_expr = EvidenceSnapshot.payload["document"]["receiptNo"].astext
     rows = (
@@ -992,42 +1296,19 @@ def _compute_event_returns(
     if event_day is None:
         raise ValueError("event_date missing")
 
-    estimation_start = event_day + timedelta(days=estimation_window[0])
-    estimation_end = event_day + timedelta(days=estimation_window[1])
-    event_start = event_day + timedelta(days=event_window[0])
-    event_end = event_day + timedelta(days=event_window[1])
-
-    asset_returns = _load_returns(db, event.ticker, estimation_start, event_end)
-    benchmark_returns = _load_returns(db, benchmark_symbol, estimation_start, event_end)
-
-    params = _fit_market_model(
-        asset_returns,
-        benchmark_returns,
-        estimation_start,
-        estimation_end,
+    spec = event_study_engine.EventSpec(key=event.rcept_no, symbol=event.ticker, event_date=event_day)
+    start, end = event_study_engine.matrix_bounds([event_day], estimation_window, event_window)
+    matrix = event_study_engine.load_return_matrix(db, [event.ticker, benchmark_symbol], start, end)
+    results, errors = event_study_engine.compute_event_returns(
+        matrix,
+        [spec],
+        benchmark_symbol=benchmark_symbol,
+        estimation_window=estimation_window,
+        event_window=event_window,
     )
-
-    if params is None:
-        raise ValueError("insufficient estimation window")
-
-    alpha, beta = params
-    ar_car_series: Dict[int, Tuple[float, float]] = {}
-    cumulative = 0.0
-    current_date = event_start
-    while current_date <= event_end:
-        asset_ret = asset_returns.get(current_date)
-        bench_ret = benchmark_returns.get(current_date)
-        if asset_ret is None or bench_ret is None:
-            current_date += timedelta(days=1)
-            continue
-        expected = alpha + beta * bench_ret
-        ar_value = asset_ret - expected
-        cumulative += ar_value
-        t_index = (current_date - event_day).days
-        ar_car_series[t_index] = (round(ar_value, 6), round(cumulative, 6))
-        current_date += timedelta(days=1)
-
-    return ar_car_series
+    if spec.key in errors:
+        raise ValueError(errors[spec.key])
+    return results[spec.key].as_series()
 
 
 def _build_cohort_summary(
@@ -1046,55 +1327,42 @@ def _build_cohort_summary(
         return None
 
     rows = (
-        db.query(EventStudyResult)
+        db.query(EventStudyResult.rcept_no, EventStudyResult.t, EventStudyResult.ar, EventStudyResult.car)
         .filter(
             EventStudyResult.rcept_no.in_(receipt_nos),
             EventStudyResult.t >= start,
             EventStudyResult.t <= end,
         )
-        .order_by(EventStudyResult.rcept_no.asc(), EventStudyResult.t.asc())
         .all()
     )
-    series_by_event: Dict[str, List[EventStudyResult]] = defaultdict(list)
-    for row in rows:
-        series_by_event[row.rcept_no].append(row)
+    partial = event_study_engine.CohortPartial.from_rows(receipt_nos, rows, start=start, end=end)
+    return _summarize_partial(partial, start=start, significance=significance, min_samples=min_samples)
 
-    expected_length = end - start + 1
-    aar_accumulator: Dict[int, List[float]] = defaultdict(list)
-    car_samples: List[float] = []
 
-    for event in events:
-        series = sorted(series_by_event.get(event.rcept_no, []), key=lambda value: value.t)
-        if len(series) < expected_length:
-            continue
-        for entry in series:
-            if entry.ar is not None:
-                aar_accumulator[entry.t].append(float(entry.ar))
-        final_car = next((entry.car for entry in series if entry.t == end), None)
-        if final_car is not None:
-            car_samples.append(float(final_car))
-
-    if len(car_samples) < max(1, min_samples):
+def _summarize_partial(
+    partial: event_study_engine.CohortPartial,
+    *,
+    start: int,
+    significance: float,
+    min_samples: int,
+) -> Optional[CohortSummary]:
+    if partial.n < max(1, min_samples):
         return None
 
     aar_points: List[Dict[str, float]] = []
     caar_points: List[Dict[str, float]] = []
     cumulative = 0.0
-    for t in range(start, end + 1):
-        values = aar_accumulator.get(t, [])
-        aar_value = sum(values) / len(values) if values else 0.0
+    for offset, aar_value in enumerate(partial.aar().tolist()):
         cumulative += aar_value
-        aar_points.append({"t": t, "aar": round(aar_value, 6)})
-        caar_points.append({"t": t, "caar": round(cumulative, 6)})
-
-    stats = _compute_summary_stats(car_samples, significance=significance)
-    histogram = _build_histogram(car_samples)
+        aar_points.append({"t": start + offset, "aar": round(aar_value, 6)})
+        caar_points.append({"t": start + offset, "caar": round(cumulative, 6)})
 
+    stats = partial.stats(significance=significance or DEFAULT_SIGNIFICANCE)
     return CohortSummary(
         n=stats["n"],
         aar=aar_points,
         caar=caar_points,
-        dist=histogram,
+        dist=partial.histogram(),
         hit_rate=stats["hit_rate"],
         mean_caar=stats["mean"],
         ci_lo=stats["ci_lo"],
@@ -1103,101 +1371,6 @@ def _build_cohort_summary(
     )
 
 
-def _load_returns(
-    db: Session,
-    symbol: Optional[str],
-    start: date,
-    end: date,
-) -> Dict[date, float]:
-    if not symbol:
-        return {}
-    rows = (
-        db.query(Price)
-        .filter(
-            Price.symbol == symbol,
-            Price.date >= start,
-            Price.date <= end,
-        )
-        .order_by(asc(Price.date))
-        .all()
-    )
-    return {row.date: float(row.ret) for row in rows if row.ret is not None}
-
-
-def _fit_market_model(
-    asset: Dict[date, float],
-    bench: Dict[date, float],
-    start: date,
-    end: date,
-) -> Optional[Tuple[float, float]]:
-    xs: List[float] = []
-    ys: List[float] = []
-    current = start
-    while current <= end:
-        a = asset.get(current)
-        b = bench.get(current)
-        if a is not None and b is not None:
-            xs.append(b)
-            ys.append(a)
-        current += timedelta(days=1)
-
-    if len(xs) < 30:
-        return None
-
-    mean_x = sum(xs) / len(xs)
-    mean_y = sum(ys) / len(ys)
-    numerator = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
-    denominator = sum((x - mean_x) ** 2 for x in xs)
-    beta = numerator / denominator if denominator else 0.0
-    alpha = mean_y - beta * mean_x
-    return alpha, beta
-
-
-def _compute_summary_stats(samples: Sequence[float], *, significance: float = DEFAULT_SIGNIFICANCE) -> Dict[str, float]:
-    n = len(samples)
-    if n == 0:
-        return {"n": 0, "hit_rate": 0.0, "mean": 0.0, "ci_lo": 0.0, "ci_hi": 0.0, "p_value": 1.0}
-
-    m = sum(samples) / n
-    hit_rate = sum(1 for value in samples if value > 0) / n
-    variance = sum((value - m) ** 2 for value in samples) / max(1, n - 1)
-    stddev = math.sqrt(variance)
-    se = stddev / math.sqrt(n)
-    alpha = min(0.5, max(1e-4, significance or DEFAULT_SIGNIFICANCE))
-    normal_dist = NormalDist()
-    ci = normal_dist.inv_cdf(1 - alpha / 2) * se if se > 0 else 0.0
-    if se > 0:
-        z = m / se
-        p_value = 2 * (1 - normal_dist.cdf(abs(z)))
-    else:
-        p_value = 1.0
-    return {"n": n, "hit_rate": hit_rate, "mean": m, "ci_lo": m - ci, "ci_hi": m + ci, "p_value": p_value}
-
-
-def _build_histogram(samples: Sequence[float], bins: int = 12) -> List[Dict[str, float]]:
-    if not samples:
-        return []
-    lo = min(samples)
-    hi = max(samples)
-    if lo == hi:
-        lo -= 0.01
-        hi += 0.01
-    bin_width = (hi - lo) / bins
-    histogram = []
-    for i in range(bins):
-        start = lo + bin_width * i
-        end = start + bin_width
-        count = sum(1 for value in samples if start <= value < end)
-        histogram.append(
-            {
-                "bin": i,
-                "range": [round(start, 6), round(end, 6)],
-                "count": count,
-            }
-        )
-    return histogram
-
-
 def _create_ingest_job(start_date: date, end_date: date) -> EventIngestJob:
     session = SessionLocal()
     try:
@@ -1262,12 +1435,21 @@ def update_event_derived_metrics(
     db: Session,
     *,
     window_key: Optional[str] = None,
+    batch_size: Optional[int] = None,
+    resume: bool = True,
 ) -> int:
     """
     Push CAAR/p-value into filing_events.derived_metrics for tools/cards.
 
     - CAAR: event_study.t == preset.end
     - p_value: latest EventSummary by (event_type, cap_bucket) for the preset window
+
+    Filing events are walked in ``id`` order, ``batch_size`` at a time, with the
+    window-end CAR and cap bucket joined in SQL. Each batch is written with one
+    bulk UPDATE and committed together with a checkpoint in
+    ``event_job_checkpoints``; with ``resume`` an interrupted run continues after
+    the last committed batch. Returns the number of events updated by the whole
+    pass, including batches committed before a resume.
     """
     preset = get_event_window_preset(window_key, db)
     window_label = format_window_label(preset.start, preset.end)
@@ -1304,43 +1486,77 @@ def update_event_derived_metrics(
             "mean_caar": to_float(row.mean_caar),
         }
 
-    # CAAR at window end by receipt_no
-    caar_rows = (
-        db.query(EventStudyResult)
-        .filter(EventStudyResult.t == preset.end)
-        .all()
-    )
-    caar_map = {row.rcept_no: to_float(row.car) for row in caar_rows if row.car is not None}
-
-    # cap_bucket by receipt_no from EventRecord
-    cap_map = {row.rcept_no: row.cap_bucket or "ALL" for row in db.query(EventRecord).all()}
-
-    updated = 0
-    events = db.query(FilingEvent).all()
-    for event in events:
-        derived = dict(event.derived_metrics or {})
-        changed = False
-
-        if event.receipt_no in caar_map and derived.get("caar") is None:
-            derived["caar"] = caar_map[event.receipt_no]
-            changed = True
-
-        event_type = event.event_type or ""
-        bucket = cap_map.get(event.receipt_no, "ALL")
-        p_val = None
-        if (event_type, bucket) in summary_map:
-            p_val = summary_map[(event_type, bucket)].get("p_value")
-        if p_val is None and (event_type, "ALL") in summary_map:
-            p_val = summary_map[(event_type, "ALL")].get("p_value")
-        if p_val is not None and derived.get("p_value") is None:
-            derived["p_value"] = p_val
-            changed = True
-
-        if changed:
-            event.derived_metrics = derived
-            # Focus Score는 bulk 태스크로 계산되므로 여기서는 skip
-            updated += 1
-
-    if updated:
+    job_name = f"derived_metrics:{window_label}"
+    checkpoint = db.get(EventJobCheckpoint, job_name)
+    if checkpoint is None:
+        checkpoint = EventJobCheckpoint(job_name=job_name, position={})
+        db.add(checkpoint)
+    position = dict(checkpoint.position or {}) if resume else {}
+    last_id = position.get("last_id")
+    updated = int(position.get("updated") or 0)
+    if last_id:
+        logger.info("Resuming %s after filing event %s (%d updated so far).", job_name, last_id, updated)
+
+    size = max(1, batch_size or EVENT_DERIVED_METRICS_BATCH_SIZE)
+    while True:
+        query = (
+            db.query(
+                FilingEvent.id,
+                FilingEvent.event_type,
+                FilingEvent.derived_metrics,
+                EventStudyResult.car,
+                EventRecord.cap_bucket,
+            )
+            .outerjoin(
+                EventStudyResult,
+                and_(
+                    EventStudyResult.rcept_no == FilingEvent.receipt_no,
+                    EventStudyResult.t == preset.end,
+                ),
+            )
+            .outerjoin(EventRecord, EventRecord.rcept_no == FilingEvent.receipt_no)
+            .order_by(FilingEvent.id.asc())
+        )
+        if last_id:
+            query = query.filter(FilingEvent.id > uuid.UUID(last_id))
+        rows = query.limit(size).all()
+        if not rows:
+            break
+
+        changes: List[Dict[str, Any]] = []
+        for event_id, event_type, derived_metrics, car, cap_bucket in rows:
+            derived = dict(derived_metrics or {})
+            changed = False
+
+            caar = to_float(car)
+            if caar is not None and derived.get("caar") is None:
+                derived["caar"] = caar
+                changed = True
+
+            event_type = event_type or ""
+            bucket = cap_bucket or "ALL"
+            p_val = None
+            if (event_type, bucket) in summary_map:
+                p_val = summary_map[(event_type, bucket)].get("p_value")
+            if p_val is None and (event_type, "ALL") in summary_map:
+                p_val = summary_map[(event_type, "ALL")].get("p_value")
+            if p_val is not None and derived.get("p_value") is None:
+                derived["p_value"] = p_val
+                changed = True
+
+            if changed:
+                # Focus Score는 bulk 태스크로 계산되므로 여기서는 skip
+                changes.append({"id": event_id, "derived_metrics": derived})
+
+        if changes:
+            db.execute(update(FilingEvent), changes)
+        updated += len(changes)
+        last_id = str(rows[-1][0])
+        checkpoint.position = {"last_id": last_id, "updated": updated}
         db.commit()
+        if len(rows) < size:
+            break
+
+    db.delete(checkpoint)
+    db.commit()
     return updated
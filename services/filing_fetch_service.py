@@ -48,19 +48,20 @@ def fetch_filing_content(db: Session, filing_id: uuid.UUID) -> Filing:
     
     # 1. Try ZIP download
     try:
-        zip_bytes = client.download_document_zip(receipt_no)
+        download = client.stream_document(receipt_no)
     except Exception as exc:
         logger.warning("Direct ZIP download failed for %s: %s", receipt_no, exc)
-        zip_bytes = None
+        download = None
 
     package_data = None
-    if zip_bytes:
-        package_data = parse_filing_bundle(
-            receipt_no=receipt_no,
-            data=zip_bytes,
-            save_dir=UPLOAD_DIR,
-            download_url=client.make_document_url(receipt_no),
-        )
+    if download is not None:
+        with download:
+            package_data = parse_filing_bundle(
+                receipt_no=receipt_no,
+                data=download,
+                save_dir=UPLOAD_DIR,
+                download_url=client.make_document_url(receipt_no),
+            )
 
     # 2. Fallback to viewer
     if not package_data:
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
-import hashlib
 import logging
+import threading
 import time
 import uuid
-from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
@@ -14,8 +16,17 @@ from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
-from core.env import env_int, env_str
+from core.env import env_bool, env_int, env_str
 from services import vector_service
+from services.circuit_breaker import CircuitBreaker
+from services.prometheus_helpers import build_counter
+from services.rerank_cache import (
+    RerankScoreCache,
+    build_rerank_cache,
+    document_version,
+    query_digest,
+    score_key,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -29,8 +40,43 @@ RERANK_CONFIG = (env_str("RERANK_RANKING_CONFIG", "") or "").strip()
 RERANK_TOPK = env_int("RERANK_TOPK", 50, minimum=1)
 RERANK_TIMEOUT_MS = env_int("RERANK_TIMEOUT_MS", 2000, minimum=500)
 RERANK_CACHE_TTL = env_int("RERANK_CACHE_TTL_S", 7 * 24 * 3600, minimum=60)
+HYBRID_CONCURRENT_LEGS = env_bool("HYBRID_CONCURRENT_LEGS", False)
+HYBRID_LEG_WORKERS = env_int("HYBRID_LEG_WORKERS", 16, minimum=3)
+HYBRID_DENSE_TIMEOUT_MS = env_int("HYBRID_DENSE_TIMEOUT_MS", 4000, minimum=100)
+HYBRID_BM25_TIMEOUT_MS = env_int("HYBRID_BM25_TIMEOUT_MS", 1500, minimum=100)
+BM25_BREAKER_FAILURE_THRESHOLD = env_int("BM25_BREAKER_FAILURE_THRESHOLD", 3, minimum=1)
+BM25_BREAKER_COOLDOWN_SECONDS = env_int("BM25_BREAKER_COOLDOWN_SECONDS", 30, minimum=1)
+BM25_BREAKER_PROBE_INTERVAL_SECONDS = env_int("BM25_BREAKER_PROBE_INTERVAL_SECONDS", 10, minimum=1)
+
+_PG_QUERY_CANCELED = "57014"
+_BM25_PROBE_QUERY = text("SELECT plainto_tsquery('simple', 'probe'), similarity('probe', 'probe')")
+_BM25_BREAKERS: Dict[str, CircuitBreaker] = {
+    leg: CircuitBreaker(
+        f"hybrid_bm25_{leg}",
+        failure_threshold=BM25_BREAKER_FAILURE_THRESHOLD,
+        cooldown_seconds=BM25_BREAKER_COOLDOWN_SECONDS,
+        probe_interval_seconds=BM25_BREAKER_PROBE_INTERVAL_SECONDS,
+    )
+    for leg in ("filings", "news")
+}
 
-_BM25_AVAILABLE = True
+_LEG_COUNTER = build_counter(
+    "hybrid_search_leg_total",
+    "Hybrid retrieval leg outcomes in concurrent mode.",
+    ("leg", "result"),
+)
+_RERANK_CACHE_COUNTER = build_counter(
+    "hybrid_rerank_cache_total",
+    "Rerank calls grouped by score cache outcome (full_hit, partial_hit, miss).",
+    ("result",),
+)
+_RERANK_CACHE_DOCS = build_counter(
+    "hybrid_rerank_cache_documents_total",
+    "Documents considered for reranking grouped by score cache hit/miss.",
+    ("result",),
+)
+_LEG_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_LEG_EXECUTOR_LOCK = threading.Lock()
 
 
 @dataclass
@@ -71,8 +117,18 @@ class DocumentProfile:
     content: str
 
 
+@dataclass
+class HybridLegResults:
+    """Outcome of the concurrently executed retrieval legs."""
+
+    dense: Optional[vector_service.VectorSearchResult] = None
+    filings: Optional[List[Any]] = None
+    news: Optional[List[Any]] = None
+    status: Dict[str, str] = field(default_factory=dict)
+
+
 class VertexReranker:
-    """Minimal Vertex AI Ranking API client with local TTL cache."""
+    """Minimal Vertex AI Ranking API client with a per-document score cache."""
 
     _SCOPES = ("https://www.googleapis.com/auth/cloud-platform",)
 
@@ -84,13 +140,13 @@ class VertexReranker:
         top_n: int,
         timeout_ms: int,
         cache_ttl: int,
+        cache: Optional[RerankScoreCache] = None,
     ) -> None:
         self._ranking_config = ranking_config
         self._model = model
         self._top_n = top_n
         self._timeout = timeout_ms / 1000.0
-        self._cache_ttl = cache_ttl
-        self._cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        self._cache = cache if cache is not None else build_rerank_cache(cache_ttl)
         self._session = None
         self._available = bool(ranking_config and model)
         self._enabled = self._available
@@ -130,13 +186,41 @@ class VertexReranker:
             logger.warning("Failed to build rerank payload: %s", exc)
             return None
 
-        cache_key = self._cache_key(query, request_records)
-        now = time.time()
-        cached = self._cache.get(cache_key)
-        if cached and now - cached[0] <= self._cache_ttl:
+        query_hash = query_digest(self._model, query)
+        keys = [
+            score_key(query_hash, record["id"], document_version(record.get("title"), record.get("content")))
+            for record in request_records
+        ]
+        cached = self._cache.get_many(keys)
+        misses = [record for record, key in zip(request_records, keys) if key not in cached]
+        _record_rerank_cache(len(request_records), len(request_records) - len(misses))
+
+        scores: Dict[str, float] = {}
+        if misses:
+            fresh = self._score_records(query, misses)
+            if fresh is None:
+                return None
+            self._cache.set_many(
+                {
+                    key: fresh[record["id"]]
+                    for record, key in zip(request_records, keys)
+                    if key not in cached and record["id"] in fresh
+                }
+            )
+            scores.update(fresh)
+        if cached:
             self._cache_hits += 1
-            return cached[1]
+        for record, key in zip(request_records, keys):
+            if key in cached:
+                scores[record["id"]] = cached[key]
+
+        if not scores:
+            return None
+        ranked_records = [{"id": doc_id, "score": score} for doc_id, score in scores.items()]
+        ranked_records.sort(key=lambda entry: entry["score"], reverse=True)
+        return ranked_records
 
+    def _score_records(self, query: str, request_records: Sequence[Dict[str, Any]]) -> Optional[Dict[str, float]]:
         session = self._ensure_session()
         if session is None:
             return None
@@ -144,9 +228,9 @@ class VertexReranker:
         payload = {
             "rankingConfig": self._ranking_config,
             "model": self._model,
-            "topN": min(self._top_n, len(request_records)),
+            "topN": len(request_records),
             "query": query,
-            "records": request_records,
+            "records": list(request_records),
         }
 
         url = (
@@ -160,19 +244,15 @@ class VertexReranker:
             logger.warning("Vertex rerank request failed: %s", exc, exc_info=True)
             return None
 
-        ranked_records: List[Dict[str, Any]] = []
+        scores: Dict[str, float] = {}
         for entry in data.get("records") or data.get("rankedRecords") or []:
             doc_id = entry.get("id")
             score = entry.get("score")
             if not doc_id:
                 continue
-            ranked_records.append({"id": doc_id, "score": float(score or 0.0)})
+            scores[doc_id] = float(score or 0.0)
 
-        if not ranked_records:
-            return None
-
-        self._cache[cache_key] = (now, ranked_records)
-        return ranked_records
+        return scores or None
 
     def _ensure_session(self):
         if self._session is not None:
@@ -193,18 +273,6 @@ class VertexReranker:
         self._session = AuthorizedSession(credentials)
         return self._session
 
-    def _cache_key(self, query: str, records: Sequence[Dict[str, Any]]) -> str:
-        digest = hashlib.sha1()
-        digest.update(query.strip().encode("utf-8"))
-        for record in records:
-            digest.update(record.get("id", "").encode("utf-8"))
-            digest.update(
-                hashlib.sha1(
-                    (record.get("content") or "").encode("utf-8"),
-                ).digest()
-            )
-        return digest.hexdigest()
-
 
 _RERANKER: Optional[VertexReranker] = None
 if RERANK_PROVIDER == "vertex" and RERANK_CONFIG and RERANK_MODEL:
@@ -231,20 +299,40 @@ def query_hybrid(
     filters: Dict[str, Any],
     use_reranker: Optional[bool] = None,
     multi_mode: bool = False,
+    concurrent: Optional[bool] = None,
 ) -> vector_service.VectorSearchResult:
-    """Execute BM25 + dense retrieval with optional reranking."""
+    """Execute BM25 + dense retrieval with optional reranking.
+
+    With ``concurrent`` (default ``HYBRID_CONCURRENT_LEGS``) the dense search and
+    both BM25 queries run in parallel, each under its own timeout; legs that do
+    not finish in time are dropped and RRF fuses whatever did finish.
+    """
 
     dense_cap = max(DENSE_TOPN, max_filings)
-    base_result = vector_service.query_vector_store(
-        query_text=question,
-        filing_id=filing_id,
-        top_k=top_k,
-        max_filings=dense_cap,
-        filters=filters,
-        multi_mode=multi_mode,
-    )
+    run_concurrently = HYBRID_CONCURRENT_LEGS if concurrent is None else concurrent
+    if run_concurrently:
+        legs = _run_retrieval_legs(
+            db,
+            question,
+            filing_id=filing_id,
+            top_k=top_k,
+            dense_cap=dense_cap,
+            filters=filters,
+            multi_mode=multi_mode,
+        )
+        base_result = legs.dense or vector_service.VectorSearchResult(filing_id=None)
+        bm25_candidates = _bm25_rows_to_candidates(legs.filings or [], legs.news or [])
+    else:
+        base_result = vector_service.query_vector_store(
+            query_text=question,
+            filing_id=filing_id,
+            top_k=top_k,
+            max_filings=dense_cap,
+            filters=filters,
+            multi_mode=multi_mode,
+        )
+        bm25_candidates = _fetch_bm25_candidates(db, question, filters, limit=BM25_TOPN)
     dense_candidates = _extract_dense_candidates(base_result.related_filings)
-    bm25_candidates = _fetch_bm25_candidates(db, question, filters, limit=BM25_TOPN)
     if not dense_candidates and not bm25_candidates:
         return base_result
 
@@ -369,19 +457,47 @@ def _fetch_bm25_candidates(
     *,
     limit: int,
 ) -> List[CandidateAccumulator]:
-    global _BM25_AVAILABLE
-    if not _BM25_AVAILABLE:
-        return []
-
     params = _build_bm25_params(question, filters, limit)
+    filings = _execute_bm25_leg(db, "filings", _FILINGS_QUERY, params)
+    news = _execute_bm25_leg(db, "news", _NEWS_QUERY, params)
+    return _bm25_rows_to_candidates(filings, news)
+
+
+def bm25_breaker_states() -> Dict[str, str]:
+    """Return the current circuit breaker state per BM25 leg."""
+
+    return {leg: breaker.state for leg, breaker in _BM25_BREAKERS.items()}
+
+
+def _bind_engine(db: Session) -> Any:
+    bind = db.get_bind()
+    return getattr(bind, "engine", bind)
+
+
+def _bm25_probe(engine: Any):
+    def _probe() -> None:
+        with engine.connect() as connection:
+            connection.execute(_BM25_PROBE_QUERY).fetchall()
+
+    return _probe
+
+
+def _execute_bm25_leg(db: Session, leg: str, statement: Any, params: Dict[str, Any]) -> List[Any]:
+    breaker = _BM25_BREAKERS[leg]
+    if not breaker.allow_request():
+        return []
     try:
-        filings = db.execute(_FILINGS_QUERY, params).fetchall()
-        news = db.execute(_NEWS_QUERY, params).fetchall()
+        with db.begin_nested():
+            rows = db.execute(statement, params).fetchall()
     except SQLAlchemyError as exc:
-        logger.warning("BM25 query failed; disabling hybrid BM25 stage: %s", exc)
-        _BM25_AVAILABLE = False
+        logger.warning("BM25 %s query failed (breaker=%s): %s", leg, breaker.state, exc)
+        breaker.record_failure(probe=_bm25_probe(_bind_engine(db)))
         return []
+    breaker.record_success()
+    return rows
+
 
+def _bm25_rows_to_candidates(filings: Sequence[Any], news: Sequence[Any]) -> List[CandidateAccumulator]:
     candidates: List[CandidateAccumulator] = []
     for idx, row in enumerate(filings, start=1):
         candidates.append(
@@ -409,6 +525,149 @@ def _fetch_bm25_candidates(
     return candidates
 
 
+def _record_rerank_cache(total: int, hits: int) -> None:
+    if hits == total:
+        outcome = "full_hit"
+    elif hits:
+        outcome = "partial_hit"
+    else:
+        outcome = "miss"
+    if _RERANK_CACHE_COUNTER is not None:
+        _RERANK_CACHE_COUNTER.labels(result=outcome).inc()
+    if _RERANK_CACHE_DOCS is not None:
+        if hits:
+            _RERANK_CACHE_DOCS.labels(result="hit").inc(hits)
+        if total - hits:
+            _RERANK_CACHE_DOCS.labels(result="miss").inc(total - hits)
+
+
+def _leg_executor() -> ThreadPoolExecutor:
+    global _LEG_EXECUTOR
+    if _LEG_EXECUTOR is None:
+        with _LEG_EXECUTOR_LOCK:
+            if _LEG_EXECUTOR is None:
+                _LEG_EXECUTOR = ThreadPoolExecutor(
+                    max_workers=HYBRID_LEG_WORKERS,
+                    thread_name_prefix="hybrid-leg",
+                )
+    return _LEG_EXECUTOR
+
+
+def _record_leg(leg: str, result: str) -> None:
+    if _LEG_COUNTER is None:
+        return
+    _LEG_COUNTER.labels(leg=leg, result=result).inc()
+
+
+def _is_query_canceled(exc: SQLAlchemyError) -> bool:
+    return getattr(getattr(exc, "orig", None), "pgcode", None) == _PG_QUERY_CANCELED
+
+
+def _run_bm25_leg(engine: Any, statement: Any, params: Dict[str, Any], timeout_ms: int) -> List[Any]:
+    """Run one BM25 statement on its own pooled connection.
+
+    On PostgreSQL the statement is bounded server-side with ``statement_timeout`` so
+    an abandoned leg does not keep the connection busy.
+    """
+
+    with Session(bind=engine) as session:
+        if engine.dialect.name == "postgresql":
+            session.execute(text(f"SET LOCAL statement_timeout = {int(timeout_ms)}"))
+        rows = session.execute(statement, params).fetchall()
+        session.rollback()
+        return rows
+
+
+def _run_retrieval_legs(
+    db: Session,
+    question: str,
+    *,
+    filing_id: Optional[str],
+    top_k: int,
+    dense_cap: int,
+    filters: Dict[str, Any],
+    multi_mode: bool,
+) -> HybridLegResults:
+    """Run the dense, filings-BM25 and news-BM25 legs in parallel.
+
+    Partial-result policy: a leg that times out or is cancelled by the database is
+    skipped for this request only. Non-timeout dense failures propagate (matching the
+    serial path); non-timeout BM25 SQL errors count against that leg's circuit
+    breaker. If no leg finishes at all the request fails.
+    """
+
+    executor = _leg_executor()
+    started = time.monotonic()
+    futures: Dict[str, Tuple[Future, float]] = {
+        "dense": (
+            executor.submit(
+                vector_service.query_vector_store,
+                query_text=question,
+                filing_id=filing_id,
+                top_k=top_k,
+                max_filings=dense_cap,
+                filters=filters,
+                multi_mode=multi_mode,
+            ),
+            HYBRID_DENSE_TIMEOUT_MS,
+        )
+    }
+    engine = _bind_engine(db)
+    params = _build_bm25_params(question, filters, BM25_TOPN)
+    for leg, statement in (("filings", _FILINGS_QUERY), ("news", _NEWS_QUERY)):
+        if not _BM25_BREAKERS[leg].allow_request():
+            continue
+        futures[leg] = (
+            executor.submit(_run_bm25_leg, engine, statement, params, HYBRID_BM25_TIMEOUT_MS),
+            HYBRID_BM25_TIMEOUT_MS,
+        )
+
+    results = HybridLegResults()
+    # BM25 legs hold a half-open trial until they are settled; an exception from
+    # another leg must not leave those trials taken, or the breaker never recovers.
+    unsettled = {leg for leg in futures if leg in _BM25_BREAKERS}
+    try:
+        for leg, (future, timeout_ms) in futures.items():
+            breaker = _BM25_BREAKERS.get(leg)
+            remaining = max(0.0, timeout_ms / 1000.0 - (time.monotonic() - started))
+            try:
+                value = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                future.cancel()
+                results.status[leg] = "timeout"
+                logger.warning("Hybrid %s leg exceeded %dms; continuing with partial results.", leg, timeout_ms)
+            except SQLAlchemyError as exc:
+                if _is_query_canceled(exc):
+                    results.status[leg] = "timeout"
+                    logger.warning("Hybrid %s leg cancelled by statement_timeout: %s", leg, exc)
+                else:
+                    results.status[leg] = "error"
+                    logger.warning("BM25 %s leg failed (breaker=%s): %s", leg, breaker.state if breaker else "-", exc)
+                    if breaker is not None:
+                        breaker.record_failure(probe=_bm25_probe(engine))
+            except Exception:
+                results.status[leg] = "error"
+                _record_leg(leg, "error")
+                raise
+            else:
+                results.status[leg] = "ok"
+                setattr(results, leg, value)
+                if breaker is not None:
+                    breaker.record_success()
+            if breaker is not None and results.status[leg] == "timeout":
+                breaker.release_trial()
+            unsettled.discard(leg)
+            _record_leg(leg, results.status[leg])
+    finally:
+        for leg in unsettled:
+            futures[leg][0].cancel()
+            _BM25_BREAKERS[leg].release_trial()
+
+    if all(status != "ok" for status in results.status.values()):
+        raise RuntimeError("Hybrid retrieval legs did not complete in time.")
+    return results
+
+
 def _reciprocal_rank_fusion(
     dense: Sequence[CandidateAccumulator],
     sparse: Sequence[CandidateAccumulator],
@@ -643,6 +902,8 @@ _NEWS_QUERY = text(
 
 
 __all__ = [
+    "HybridLegResults",
+    "bm25_breaker_states",
     "is_hybrid_enabled",
     "query_hybrid",
     "run_bm25_ranking",
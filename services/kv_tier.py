@@ -0,0 +1,280 @@
+"""Byte-blob key/value tiers shared by the caches and fetch-state stores.
+
+The embedding, completion and rerank caches and the news feed state store all
+persist opaque ``bytes`` under string keys in one of three places: process
+memory, a local SQLite file or a shared Redis instance. Each tier namespaces its
+keys with a ``prefix`` (SQLite additionally keeps them in their own ``table``)
+and expires entries after ``ttl_seconds`` unless a write overrides it.
+
+Callers wrap the chosen tier in :class:`LoggedTier` so a flaky backend degrades
+to cache misses with a single warning instead of failing the request.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, List, Optional, Protocol, Sequence, Tuple
+
+from core.logging import get_logger
+
+try:  # pragma: no cover - optional dependency in some environments
+    import redis  # type: ignore
+except ImportError:  # pragma: no cover - redis might be absent in tests
+    redis = None  # type: ignore
+
+logger = get_logger(__name__)
+
+_TABLE_NAME_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_SCAN_BATCH = 500
+
+
+class BlobTier(Protocol):
+    name: str
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        ...
+
+    def set_many(self, items: Sequence[Tuple[str, bytes]], *, ttl_seconds: Optional[int] = None) -> None:
+        ...
+
+    def delete(self, keys: Sequence[str]) -> None:
+        ...
+
+    def clear(self, prefix: str = "") -> None:
+        ...
+
+
+class MemoryBlobTier:
+    """In-process LRU with per-entry expiry; unbounded when ``max_entries`` is ``None``."""
+
+    name = "memory"
+
+    def __init__(self, *, ttl_seconds: int, max_entries: Optional[int] = None) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = None if max_entries is None else max(1, max_entries)
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        now = time.monotonic()
+        found: List[Optional[bytes]] = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] <= now:
+                    del self._entries[key]
+                    entry = None
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                found.append(None if entry is None else entry[1])
+        return found
+
+    def set_many(self, items: Sequence[Tuple[str, bytes]], *, ttl_seconds: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + (self._ttl if ttl_seconds is None else ttl_seconds)
+        with self._lock:
+            for key, blob in items:
+                self._entries[key] = (expires_at, blob)
+                self._entries.move_to_end(key)
+            if self._max_entries is not None:
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+
+    def delete(self, keys: Sequence[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self, prefix: str = "") -> None:
+        with self._lock:
+            if not prefix:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+
+class RedisBlobTier:
+    name = "redis"
+
+    def __init__(self, client: "redis.Redis", *, prefix: str, ttl_seconds: int) -> None:  # type: ignore[name-defined]
+        self._client = client
+        self._prefix = prefix
+        self._ttl = ttl_seconds
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}:{key}"
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        if not keys:
+            return []
+        return list(self._client.mget([self._key(key) for key in keys]))
+
+    def set_many(self, items: Sequence[Tuple[str, bytes]], *, ttl_seconds: Optional[int] = None) -> None:
+        ttl = self._ttl if ttl_seconds is None else ttl_seconds
+        pipe = self._client.pipeline(transaction=False)
+        for key, blob in items:
+            pipe.set(self._key(key), blob, ex=ttl)
+        pipe.execute()
+
+    def delete(self, keys: Sequence[str]) -> None:
+        if keys:
+            self._client.delete(*[self._key(key) for key in keys])
+
+    def clear(self, prefix: str = "") -> None:
+        batch: List[Any] = []
+        for key in self._client.scan_iter(match=f"{self._key(prefix)}*", count=_SCAN_BATCH):
+            batch.append(key)
+            if len(batch) >= _SCAN_BATCH:
+                self._client.delete(*batch)
+                batch = []
+        if batch:
+            self._client.delete(*batch)
+
+
+class SqliteBlobTier:
+    name = "sqlite"
+
+    def __init__(self, path: str, *, table: str, prefix: str, ttl_seconds: int) -> None:
+        if not _TABLE_NAME_RE.match(table):
+            raise ValueError(f"Invalid SQLite table name: {table!r}")
+        Path(path).expanduser().parent.mkdir(parents=True, exist_ok=True)
+        self._table = table
+        self._prefix = prefix
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}:{key}"
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        if not keys:
+            return []
+        scoped = [self._key(key) for key in keys]
+        placeholders = ",".join("?" for _ in scoped)
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, value, expires_at FROM {self._table} WHERE key IN ({placeholders})",
+                scoped,
+            ).fetchall()
+            expired = [(row[0],) for row in rows if row[2] < now]
+            if expired:
+                self._conn.executemany(f"DELETE FROM {self._table} WHERE key = ?", expired)
+        found = {row[0]: bytes(row[1]) for row in rows if row[2] >= now}
+        return [found.get(key) for key in scoped]
+
+    def set_many(self, items: Sequence[Tuple[str, bytes]], *, ttl_seconds: Optional[int] = None) -> None:
+        expires_at = time.time() + (self._ttl if ttl_seconds is None else ttl_seconds)
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {self._table} (key, value, expires_at) VALUES (?, ?, ?)",
+                [(self._key(key), sqlite3.Binary(blob), expires_at) for key, blob in items],
+            )
+
+    def delete(self, keys: Sequence[str]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                f"DELETE FROM {self._table} WHERE key = ?",
+                [(self._key(key),) for key in keys],
+            )
+
+    def clear(self, prefix: str = "") -> None:
+        pattern = self._key(prefix).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self._table} WHERE key LIKE ? ESCAPE '\\'", (f"{pattern}%",))
+
+
+class LoggedTier:
+    """Wraps a tier so backend errors are logged once and then read as misses."""
+
+    def __init__(self, tier: BlobTier, *, label: str) -> None:
+        self._tier = tier
+        self._label = label
+        self._error_logged = False
+
+    @property
+    def tier(self) -> BlobTier:
+        return self._tier
+
+    @property
+    def name(self) -> str:
+        return self._tier.name
+
+    def _call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return getattr(self._tier, method)(*args, **kwargs)
+        except Exception as exc:  # pragma: no cover - network/disk issues
+            if not self._error_logged:
+                logger.warning("%s %s tier %s failed: %s", self._label, self._tier.name, method, exc)
+                self._error_logged = True
+            return None
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.get_many([key])[0]
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        found = self._call("get_many", keys)
+        return list(found) if found is not None else [None] * len(keys)
+
+    def set(self, key: str, blob: bytes, *, ttl_seconds: Optional[int] = None) -> None:
+        self.set_many([(key, blob)], ttl_seconds=ttl_seconds)
+
+    def set_many(self, items: Sequence[Tuple[str, bytes]], *, ttl_seconds: Optional[int] = None) -> None:
+        if items:
+            self._call("set_many", items, ttl_seconds=ttl_seconds)
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self._call("delete", keys)
+
+    def clear(self, prefix: str = "") -> None:
+        self._call("clear", prefix)
+
+
+def build_shared_tier(
+    label: str,
+    *,
+    redis_url: Optional[str],
+    sqlite_path: Optional[str],
+    table: str,
+    prefix: str,
+    ttl_seconds: int,
+) -> Optional[BlobTier]:
+    """Return a Redis tier when ``redis_url`` is usable, else a SQLite one, else ``None``."""
+
+    if redis_url and redis is not None:
+        try:
+            client = redis.Redis.from_url(redis_url, decode_responses=False)
+            return RedisBlobTier(client, prefix=prefix, ttl_seconds=ttl_seconds)
+        except Exception as exc:  # pragma: no cover - defensive logging
+            logger.warning("%s Redis init failed: %s", label, exc)
+    if sqlite_path:
+        try:
+            return SqliteBlobTier(sqlite_path, table=table, prefix=prefix, ttl_seconds=ttl_seconds)
+        except Exception as exc:  # pragma: no cover - defensive logging
+            logger.warning("%s SQLite init failed (%s): %s", label, sqlite_path, exc)
+    return None
+
+
+__all__ = [
+    "BlobTier",
+    "LoggedTier",
+    "MemoryBlobTier",
+    "RedisBlobTier",
+    "SqliteBlobTier",
+    "build_shared_tier",
+]
@@ -0,0 +1,221 @@
+"""Opt-in cache for deterministic LLM completions.
+
+Filing classification/extraction, self-check and news analysis prompts are
+temperature-0 JSON tasks that are re-run verbatim on every reprocess/backfill.
+When ``LLM_COMPLETION_CACHE_ENABLED`` is set, ``llm_service._safe_completion``
+looks up ``sha256(model, messages, decoding params)`` before calling litellm and
+stores the returned message content afterwards.
+
+Backends (``LLM_COMPLETION_CACHE_BACKEND``):
+
+* ``memory`` – in-process LRU (default),
+* ``sqlite`` – local file at ``LLM_COMPLETION_CACHE_SQLITE_PATH``,
+* ``redis``  – shared instance at ``LLM_COMPLETION_CACHE_REDIS_URL``.
+
+TTLs are per task: ``LLM_COMPLETION_CACHE_TTLS="filing_classification=604800,..."``
+overrides ``LLM_COMPLETION_CACHE_TTL_SECONDS``. Sending ``X-LLM-Cache: bypass``
+to the API (or wrapping code in ``bypass_completion_cache()``) skips the cache
+for debugging.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Iterator, Mapping, Optional, Sequence, Tuple
+
+from core.env import env_bool, env_int, env_str
+from core.logging import get_logger
+from services.kv_tier import BlobTier, LoggedTier, MemoryBlobTier, build_shared_tier
+from services.prometheus_helpers import build_counter
+
+logger = get_logger(__name__)
+
+LLM_COMPLETION_CACHE_ENABLED = env_bool("LLM_COMPLETION_CACHE_ENABLED", False)
+LLM_COMPLETION_CACHE_BACKEND = (env_str("LLM_COMPLETION_CACHE_BACKEND", "memory") or "memory").strip().lower()
+LLM_COMPLETION_CACHE_MAX_ENTRIES = env_int("LLM_COMPLETION_CACHE_MAX_ENTRIES", 1024, minimum=1)
+LLM_COMPLETION_CACHE_TTL_SECONDS = env_int("LLM_COMPLETION_CACHE_TTL_SECONDS", 7 * 24 * 3600, minimum=1)
+LLM_COMPLETION_CACHE_TTLS = env_str("LLM_COMPLETION_CACHE_TTLS", "") or ""
+LLM_COMPLETION_CACHE_SQLITE_PATH = env_str("LLM_COMPLETION_CACHE_SQLITE_PATH", "uploads/cache/llm_completions.sqlite3")
+LLM_COMPLETION_CACHE_REDIS_URL = env_str("LLM_COMPLETION_CACHE_REDIS_URL")
+
+BYPASS_HEADER = "X-LLM-Cache"
+BYPASS_VALUE = "bypass"
+
+_KEY_PREFIX = "llmc:v1"
+_SQLITE_TABLE = "llm_completion_cache"
+
+_BYPASS: contextvars.ContextVar[bool] = contextvars.ContextVar("llm_completion_cache_bypass", default=False)
+
+_LOOKUP_COUNTER = build_counter(
+    "llm_completion_cache_lookups_total",
+    "LLM completion cache lookups grouped by task and result (hit, miss, bypass).",
+    ("task", "result"),
+)
+
+
+def _parse_ttls(raw: str) -> Dict[str, int]:
+    ttls: Dict[str, int] = {}
+    for item in raw.split(","):
+        name, sep, value = item.partition("=")
+        if not sep or not name.strip():
+            continue
+        try:
+            ttls[name.strip()] = max(1, int(value.strip()))
+        except ValueError:
+            logger.warning("Ignoring invalid LLM completion cache TTL entry: %s", item)
+    return ttls
+
+
+_TASK_TTLS = _parse_ttls(LLM_COMPLETION_CACHE_TTLS)
+
+
+def ttl_for_task(task: str) -> int:
+    return _TASK_TTLS.get(task, LLM_COMPLETION_CACHE_TTL_SECONDS)
+
+
+def completion_cache_key(
+    model: str,
+    messages: Sequence[Mapping[str, Any]],
+    params: Optional[Mapping[str, Any]] = None,
+) -> str:
+    """Hash the request inputs that determine a deterministic completion."""
+
+    canonical = json.dumps(
+        {"model": model, "messages": list(messages), "params": dict(params or {})},
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _record_lookup(task: str, result: str) -> None:
+    if _LOOKUP_COUNTER is None:
+        return
+    _LOOKUP_COUNTER.labels(task=task, result=result).inc()
+
+
+@contextlib.contextmanager
+def bypass_completion_cache(enabled: bool = True) -> Iterator[None]:
+    """Skip completion cache reads and writes inside the block."""
+
+    token = _BYPASS.set(enabled)
+    try:
+        yield
+    finally:
+        _BYPASS.reset(token)
+
+
+def is_bypassed() -> bool:
+    return _BYPASS.get()
+
+
+def wants_bypass(headers: Mapping[str, str]) -> bool:
+    return (headers.get(BYPASS_HEADER) or "").strip().lower() == BYPASS_VALUE
+
+
+class CompletionCache:
+    """Stores ``(content, model_used)`` pairs for deterministic completions."""
+
+    def __init__(self, tier: BlobTier) -> None:
+        self._tier = LoggedTier(tier, label="LLM completion cache")
+
+    @property
+    def tier(self) -> BlobTier:
+        return self._tier.tier
+
+    def get(self, task: str, key: str) -> Optional[Tuple[str, str]]:
+        if is_bypassed():
+            _record_lookup(task, "bypass")
+            return None
+        raw = self._tier.get(key)
+        payload: Optional[Dict[str, Any]] = None
+        if raw is not None:
+            try:
+                payload = json.loads(raw.decode("utf-8"))
+            except ValueError:
+                payload = None
+        if not isinstance(payload, dict) or not isinstance(payload.get("content"), str):
+            _record_lookup(task, "miss")
+            return None
+        _record_lookup(task, "hit")
+        return payload["content"], str(payload.get("model_used") or "")
+
+    def set(self, task: str, key: str, content: str, model_used: str) -> None:
+        if is_bypassed() or not content:
+            return
+        value = json.dumps({"content": content, "model_used": model_used}, ensure_ascii=False)
+        self._tier.set(key, value.encode("utf-8"), ttl_seconds=ttl_for_task(task))
+
+    def clear(self) -> None:
+        self._tier.clear()
+
+
+_CACHE: Optional[CompletionCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def _build_tier() -> BlobTier:
+    tier: Optional[BlobTier] = None
+    if LLM_COMPLETION_CACHE_BACKEND == "redis":
+        if LLM_COMPLETION_CACHE_REDIS_URL:
+            tier = _build_shared(redis_url=LLM_COMPLETION_CACHE_REDIS_URL)
+        if tier is None:
+            logger.warning("LLM completion cache backend 'redis' unavailable; using memory.")
+    elif LLM_COMPLETION_CACHE_BACKEND == "sqlite":
+        tier = _build_shared(sqlite_path=LLM_COMPLETION_CACHE_SQLITE_PATH or "llm_completions.sqlite3")
+    elif LLM_COMPLETION_CACHE_BACKEND != "memory":
+        logger.warning("Unknown LLM completion cache backend '%s'; using memory.", LLM_COMPLETION_CACHE_BACKEND)
+    if tier is not None:
+        return tier
+    return MemoryBlobTier(max_entries=LLM_COMPLETION_CACHE_MAX_ENTRIES, ttl_seconds=LLM_COMPLETION_CACHE_TTL_SECONDS)
+
+
+def _build_shared(*, redis_url: Optional[str] = None, sqlite_path: Optional[str] = None) -> Optional[BlobTier]:
+    return build_shared_tier(
+        "LLM completion cache",
+        redis_url=redis_url,
+        sqlite_path=sqlite_path,
+        table=_SQLITE_TABLE,
+        prefix=_KEY_PREFIX,
+        ttl_seconds=LLM_COMPLETION_CACHE_TTL_SECONDS,
+    )
+
+
+def get_completion_cache() -> Optional[CompletionCache]:
+    """Return the process-wide completion cache, or ``None`` when disabled."""
+
+    global _CACHE
+    if not LLM_COMPLETION_CACHE_ENABLED:
+        return None
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = CompletionCache(_build_tier())
+    return _CACHE
+
+
+def reset_completion_cache() -> None:
+    """Forget the process-wide cache instance (used by tests and config reloads)."""
+
+    global _CACHE
+    with _CACHE_LOCK:
+        _CACHE = None
+
+
+__all__ = [
+    "BYPASS_HEADER",
+    "CompletionCache",
+    "bypass_completion_cache",
+    "completion_cache_key",
+    "get_completion_cache",
+    "is_bypassed",
+    "reset_completion_cache",
+    "ttl_for_task",
+    "wants_bypass",
+]
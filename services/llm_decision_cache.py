@@ -0,0 +1,252 @@
+"""Cache for cheap-but-frequent LLM routing decisions.
+
+The front-door query classifier and the semantic router are called for every
+chat turn, and many turns repeat ("삼성전자 최근 공시", "안녕"). ``DecisionCache``
+keeps their JSON payloads in a bounded, TTL-aware LRU keyed by the normalized
+query text. Every key embeds a *version stamp* derived from the rendered prompt
+and model, so editing ``llm/prompts/semantic_router.py`` / ``query_classifier.py``
+(or the tool registry the router prompt is built from) silently invalidates old
+entries.
+
+An optional similarity tier reuses a decision whose query embedding has cosine
+similarity above a threshold. It is disabled by default because near-duplicate
+questions can still differ in the ticker they mention.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.env import env_bool, env_float, env_int
+from core.logging import get_logger
+from services.embedding_cache import normalize_text
+from services.prometheus_helpers import build_counter
+
+logger = get_logger(__name__)
+
+LLM_DECISION_CACHE_ENABLED = env_bool("LLM_DECISION_CACHE_ENABLED", True)
+LLM_DECISION_CACHE_MAX_ENTRIES = env_int("LLM_DECISION_CACHE_MAX_ENTRIES", 2048, minimum=1)
+QUERY_CLASSIFIER_CACHE_TTL_SECONDS = env_int("QUERY_CLASSIFIER_CACHE_TTL_SECONDS", 6 * 3600, minimum=1)
+QUERY_CLASSIFIER_CACHE_SIMILARITY = env_float("QUERY_CLASSIFIER_CACHE_SIMILARITY", 0.0, minimum=0.0)
+ROUTER_CACHE_TTL_SECONDS = env_int("ROUTER_CACHE_TTL_SECONDS", 3600, minimum=1)
+ROUTER_CACHE_SIMILARITY = env_float("ROUTER_CACHE_SIMILARITY", 0.0, minimum=0.0)
+
+_VERSION_PROBE = "__decision_cache_version_probe__"
+
+_LOOKUP_COUNTER = build_counter(
+    "llm_decision_cache_lookups_total",
+    "LLM decision cache lookups grouped by cache and result (exact_hit, similar_hit, miss).",
+    ("cache", "result"),
+)
+
+EmbedFn = Callable[[str], Sequence[float]]
+
+
+def prompt_version(model: str, build_prompt: Callable[[str], Any]) -> str:
+    """Fingerprint ``model`` plus the prompt ``build_prompt`` renders for a fixed probe."""
+
+    rendered = json.dumps(build_prompt(_VERSION_PROBE), ensure_ascii=False, sort_keys=True, default=str)
+    digest = hashlib.sha256(f"{model}\n{rendered}".encode("utf-8")).hexdigest()
+    return digest[:16]
+
+
+def normalize_query(text: str) -> str:
+    return normalize_text(text).lower()
+
+
+def _record_lookup(cache: str, result: str) -> None:
+    if _LOOKUP_COUNTER is None:
+        return
+    _LOOKUP_COUNTER.labels(cache=cache, result=result).inc()
+
+
+class DecisionCache:
+    """TTL-bounded LRU of JSON decisions with an optional embedding-similarity tier."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        version: Callable[[], str],
+        ttl_seconds: int,
+        max_entries: int = LLM_DECISION_CACHE_MAX_ENTRIES,
+        similarity_threshold: float = 0.0,
+        embed_fn: Optional[EmbedFn] = None,
+    ) -> None:
+        self.name = name
+        self._version_fn = version
+        self._version: Optional[str] = None
+        self._ttl = ttl_seconds
+        self._max_entries = max(1, max_entries)
+        self._threshold = similarity_threshold if embed_fn is not None else 0.0
+        self._embed_fn = embed_fn
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def version(self) -> str:
+        if self._version is None:
+            self._version = self._version_fn()
+        return self._version
+
+    def _key(self, query: str) -> str:
+        digest = hashlib.sha256(normalize_query(query).encode("utf-8")).hexdigest()
+        return f"{self.version}:{digest}"
+
+    def _embed(self, query: str) -> Optional[np.ndarray]:
+        if not self._threshold or self._embed_fn is None:
+            return None
+        try:
+            vector = np.asarray(self._embed_fn(normalize_query(query)), dtype=np.float32)
+        except Exception as exc:
+            logger.debug("Decision cache %s embedding failed: %s", self.name, exc)
+            return None
+        norm = float(np.linalg.norm(vector))
+        if not norm:
+            return None
+        return vector / norm
+
+    def _live_locked(self, key: str, now: float) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at <= now:
+            self._entries.pop(key, None)
+            self._vectors.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return payload
+
+    def _nearest_locked(self, vector: np.ndarray, now: float) -> Optional[Dict[str, Any]]:
+        if not self._vectors:
+            return None
+        keys = list(self._vectors.keys())
+        matrix = np.stack([self._vectors[key] for key in keys])
+        if matrix.shape[1] != vector.shape[0]:
+            return None
+        scores = matrix @ vector
+        best = int(np.argmax(scores))
+        if float(scores[best]) < self._threshold:
+            return None
+        return self._live_locked(keys[best], now)
+
+    def get(self, query: str) -> Optional[Dict[str, Any]]:
+        key = self._key(query)
+        now = time.monotonic()
+        with self._lock:
+            payload = self._live_locked(key, now)
+        if payload is not None:
+            _record_lookup(self.name, "exact_hit")
+            return copy.deepcopy(payload)
+        vector = self._embed(query)
+        if vector is not None:
+            with self._lock:
+                payload = self._nearest_locked(vector, now)
+            if payload is not None:
+                _record_lookup(self.name, "similar_hit")
+                return copy.deepcopy(payload)
+        _record_lookup(self.name, "miss")
+        return None
+
+    def set(self, query: str, payload: Dict[str, Any]) -> None:
+        key = self._key(query)
+        vector = self._embed(query)
+        stored = copy.deepcopy(payload)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl, stored)
+            self._entries.move_to_end(key)
+            if vector is not None:
+                self._vectors[key] = vector
+            while len(self._entries) > self._max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._vectors.pop(evicted, None)
+
+    def get_or_compute(
+        self,
+        query: str,
+        compute: Callable[[], Dict[str, Any]],
+        *,
+        cacheable: Callable[[Dict[str, Any]], bool] = lambda payload: "error" not in payload,
+    ) -> Dict[str, Any]:
+        """Return the cached decision for ``query`` or compute (and maybe store) it."""
+
+        cached = self.get(query)
+        if cached is not None:
+            return cached
+        payload = compute()
+        if cacheable(payload):
+            self.set(query, payload)
+        return payload
+
+    def clear(self) -> None:
+        """Drop every entry and recompute the version stamp on next use."""
+
+        with self._lock:
+            self._entries.clear()
+            self._vectors.clear()
+            self._version = None
+
+
+_CACHES: Dict[str, DecisionCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_decision_cache(
+    name: str,
+    *,
+    version: Callable[[], str],
+    ttl_seconds: int,
+    similarity_threshold: float = 0.0,
+) -> Optional[DecisionCache]:
+    """Return the process-wide cache called ``name``, or ``None`` when disabled."""
+
+    if not LLM_DECISION_CACHE_ENABLED:
+        return None
+    cache = _CACHES.get(name)
+    if cache is not None:
+        return cache
+    with _CACHES_LOCK:
+        cache = _CACHES.get(name)
+        if cache is None:
+            embed_fn: Optional[EmbedFn] = None
+            if similarity_threshold:
+                from services.embedding_utils import embed_text
+
+                embed_fn = embed_text
+            cache = _CACHES[name] = DecisionCache(
+                name,
+                version=version,
+                ttl_seconds=ttl_seconds,
+                similarity_threshold=similarity_threshold,
+                embed_fn=embed_fn,
+            )
+    return cache
+
+
+def reset_decision_caches() -> None:
+    """Forget every process-wide decision cache (used by tests and prompt reloads)."""
+
+    with _CACHES_LOCK:
+        _CACHES.clear()
+
+
+__all__ = [
+    "DecisionCache",
+    "get_decision_cache",
+    "normalize_query",
+    "prompt_version",
+    "reset_decision_caches",
+]
@@ -8,14 +8,14 @@ from statistics import mean
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 import threading
 
-from sqlalchemy import asc, func
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from core.logging import get_logger
 from database import SessionLocal
-from models.event_study import Price
 from models.security_metadata import SecurityMetadata
 from services import value_chain_repository
+from services.price_series_cache import PricePoint, load_price_frame
 
 logger = get_logger(__name__)
 
@@ -85,16 +85,7 @@ def _resolve_label(db: Session, ticker: str) -> str:
     return ticker
 
 
-def _load_price_rows(db: Session, ticker: str, start: date, end: date) -> List[Price]:
-    return (
-        db.query(Price)
-        .filter(Price.symbol == ticker, Price.date >= start, Price.date <= end)
-        .order_by(asc(Price.date))
-        .all()
-    )
-
-
-def _normalize_series(rows: Sequence[Price], *, max_points: int) -> Tuple[List[Dict[str, float]], List[float]]:
+def _normalize_series(rows: Sequence[PricePoint], *, max_points: int) -> Tuple[List[Dict[str, float]], List[float]]:
     series: List[Dict[str, float]] = []
     returns: List[float] = []
     base_price: Optional[float] = None
@@ -284,11 +275,10 @@ def get_normalized_returns(
     start = end - timedelta(days=period_days * 2)
     result: Dict[str, Dict[str, object]] = {}
 
-    for raw_symbol in tickers:
-        symbol = _normalize_ticker(raw_symbol)
-        if not symbol:
-            continue
-        rows = _load_price_rows(db, symbol, start, end)
+    symbols = [symbol for symbol in (_normalize_ticker(raw) for raw in tickers) if symbol]
+    frame = load_price_frame(db, symbols, start, end)
+    for symbol in dict.fromkeys(symbols):
+        rows = frame.points(symbol)
         if not rows:
             continue
         series, returns = _normalize_series(rows, max_points=period_days)
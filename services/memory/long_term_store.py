@@ -12,6 +12,7 @@ from qdrant_client import QdrantClient, models
 from datetime import datetime, timezone
 from services.memory.models import MemoryRecord
 from services.embedding_utils import embed_text, EMBEDDING_MODEL
+from services.vector_collection_registry import CollectionSpec, get_collection_registry
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -19,6 +20,15 @@ logger.setLevel(logging.INFO)
 LIGHTMEM_COLLECTION = os.getenv("LIGHTMEM_QDRANT_COLLECTION", "nuvien-memory-store")
 LIGHTMEM_VECTOR_DIM = int(os.getenv("LIGHTMEM_VECTOR_DIM", "384"))
 LIGHTMEM_DISTANCE = models.Distance.COSINE
+LIGHTMEM_COLLECTION_SPEC = CollectionSpec(
+    name=LIGHTMEM_COLLECTION,
+    dimension=LIGHTMEM_VECTOR_DIM,
+    distance=LIGHTMEM_DISTANCE,
+    payload_indexes={
+        "tenant_id": models.PayloadSchemaType.KEYWORD,
+        "user_id": models.PayloadSchemaType.KEYWORD,
+    },
+)
 
 
 def _client() -> QdrantClient:
@@ -27,16 +37,10 @@ def _client() -> QdrantClient:
     return rag_client()
 
 
-def ensure_collection() -> None:
-    client = _client()
-    try:
-        client.get_collection(collection_name=LIGHTMEM_COLLECTION)
-    except Exception:
-        logger.info("Creating LightMem Qdrant collection '%s'.", LIGHTMEM_COLLECTION)
-        client.create_collection(
-            collection_name=LIGHTMEM_COLLECTION,
-            vectors_config=models.VectorParams(size=LIGHTMEM_VECTOR_DIM, distance=LIGHTMEM_DISTANCE),
-        )
+def ensure_collection(*, force: bool = False) -> None:
+    """Ensure the LightMem collection exists; verified once per revalidation interval."""
+
+    get_collection_registry().ensure(_client(), LIGHTMEM_COLLECTION_SPEC, force=force)
 
 
 def persist_records(records: Sequence[MemoryRecord]) -> None:
@@ -68,13 +72,17 @@ def search_records(
             models.FieldCondition(key="user_id", match=models.MatchValue(value=user_id)),
         ]
     )
-    search_result = client.search(
-        collection_name=LIGHTMEM_COLLECTION,
-        query_vector=query_vector,
-        query_filter=filters,
-        with_payload=True,
-        limit=limit,
-    )
+    try:
+        search_result = client.search(
+            collection_name=LIGHTMEM_COLLECTION,
+            query_vector=query_vector,
+            query_filter=filters,
+            with_payload=True,
+            limit=limit,
+        )
+    except Exception:
+        get_collection_registry().invalidate(LIGHTMEM_COLLECTION)
+        raise
     entries: List[MemoryRecord] = []
     for point in search_result:
         payload = point.payload or {}
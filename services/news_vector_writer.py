@@ -0,0 +1,248 @@
+"""Micro-batching writer for news article vectors.
+
+Storing one article at a time costs an embedding request and a Qdrant upsert
+per article, which saturates both during news bursts. ``NewsVectorWriter``
+buffers entries and flushes them as one ``embed_texts`` call plus one bulk
+upsert once ``NEWS_VECTOR_BATCH_SIZE`` entries are pending, when the oldest
+entry has waited ``NEWS_VECTOR_FLUSH_SECONDS``, or when the writer is closed.
+Point ids are the same deterministic ids the per-article path produced, so
+re-ingesting an article overwrites its vector. A failing batch is split in half
+until the offending articles are isolated; they are reported individually and
+the rest of the batch is still written.
+
+``process_news_article`` opens one writer per task and flushes it before
+returning. The process-wide writer from :func:`get_news_vector_writer` batches
+across tasks and is only used when ``NEWS_VECTOR_SHARED_WRITER`` is set.
+"""
+
+from __future__ import annotations
+
+import atexit
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from core.env import env_bool, env_float, env_int
+from core.logging import get_logger
+from services import vector_service
+from services.embedding_utils import embed_texts
+from services.prometheus_helpers import build_counter
+
+logger = get_logger(__name__)
+
+NEWS_VECTOR_BATCH_SIZE = env_int("NEWS_VECTOR_BATCH_SIZE", 64, minimum=1)
+NEWS_VECTOR_FLUSH_SECONDS = env_float("NEWS_VECTOR_FLUSH_SECONDS", 2.0, minimum=0.0)
+NEWS_VECTOR_SHARED_WRITER = env_bool("NEWS_VECTOR_SHARED_WRITER", False)
+
+_WRITE_COUNTER = build_counter(
+    "news_vector_writes_total",
+    "News vector entries written by the batching writer, by result.",
+    ("result",),
+)
+
+
+@dataclass
+class NewsVectorEntry:
+    """One article chunk waiting to be embedded; ``key`` is ``news:<signal id>``."""
+
+    key: str
+    text: str
+    metadata: Dict[str, Any]
+    label: Optional[str] = None
+
+    def chunk(self) -> Dict[str, Any]:
+        return {"id": f"{self.key}#0", "content": self.text, "metadata": self.metadata}
+
+
+@dataclass
+class NewsVectorFlushResult:
+    stored: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+
+
+def _record(result: str, count: int) -> None:
+    if _WRITE_COUNTER is not None and count:
+        _WRITE_COUNTER.labels(result=result).inc(count)
+
+
+class NewsVectorWriter:
+    """Buffer news vector entries and write them in batches.
+
+    ``embed`` and ``upsert`` default to ``embed_texts`` and
+    ``vector_service.upsert_points``. ``on_result`` receives the
+    :class:`NewsVectorFlushResult` of every flush, including timer flushes.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_batch: Optional[int] = None,
+        max_delay: Optional[float] = None,
+        embed: Optional[Callable[[Sequence[str]], List[List[float]]]] = None,
+        upsert: Optional[Callable[[List[Any]], None]] = None,
+        on_result: Optional[Callable[[NewsVectorFlushResult], None]] = None,
+    ) -> None:
+        self.max_batch = max(1, max_batch or NEWS_VECTOR_BATCH_SIZE)
+        self.max_delay = NEWS_VECTOR_FLUSH_SECONDS if max_delay is None else max(0.0, max_delay)
+        self._embed = embed or embed_texts
+        self._upsert = upsert or vector_service.upsert_points
+        self._on_result = on_result
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[str, NewsVectorEntry] = {}
+        self._timer: Optional[threading.Timer] = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def add(self, entry: NewsVectorEntry) -> None:
+        """Queue ``entry``; a later entry for the same key replaces the earlier one."""
+
+        if len(entry.text) > vector_service.EMBEDDING_MAX_CONTENT_CHARS:
+            entry.text = entry.text[: vector_service.EMBEDDING_MAX_CONTENT_CHARS]
+        with self._lock:
+            self._pending.pop(entry.key, None)
+            self._pending[entry.key] = entry
+            full = len(self._pending) >= self.max_batch
+            if not full and self.max_delay > 0 and self._timer is None:
+                self._timer = threading.Timer(self.max_delay, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def _flush_from_timer(self) -> None:
+        try:
+            self.flush()
+        except Exception:  # pragma: no cover - defensive logging on a background thread
+            logger.warning("Timed news vector flush failed.", exc_info=True)
+
+    def flush(self) -> NewsVectorFlushResult:
+        """Embed and upsert everything pending; never raises for per-article failures."""
+
+        with self._flush_lock:
+            with self._lock:
+                entries = list(self._pending.values())
+                self._pending.clear()
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            result = NewsVectorFlushResult()
+            for start in range(0, len(entries), self.max_batch):
+                self._write(entries[start : start + self.max_batch], result)
+        _record("stored", len(result.stored))
+        _record("failed", len(result.failed))
+        if entries:
+            logger.info(
+                "Flushed %d news vector(s): %d stored, %d failed.",
+                len(entries),
+                len(result.stored),
+                len(result.failed),
+            )
+        labels = {entry.key: entry.label or entry.key for entry in entries}
+        for key, error in result.failed.items():
+            logger.warning("Failed to store news vector for %s: %s", labels.get(key, key), error)
+        if self._on_result is not None:
+            self._on_result(result)
+        return result
+
+    def close(self) -> NewsVectorFlushResult:
+        return self.flush()
+
+    def __enter__(self) -> "NewsVectorWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.flush()
+
+    def _write(self, entries: List[NewsVectorEntry], result: NewsVectorFlushResult) -> None:
+        embedded: List[Tuple[NewsVectorEntry, List[float]]] = []
+        self._embed_isolating(entries, embedded, result)
+        points = [
+            vector_service.build_chunk_point(entry.key, entry.chunk(), vector, text=entry.text, metadata=entry.metadata)
+            for entry, vector in embedded
+        ]
+        self._upsert_isolating([entry for entry, _ in embedded], points, result)
+
+    def _embed_isolating(
+        self,
+        entries: List[NewsVectorEntry],
+        embedded: List[Tuple[NewsVectorEntry, List[float]]],
+        result: NewsVectorFlushResult,
+    ) -> None:
+        if not entries:
+            return
+        try:
+            vectors = self._embed([entry.text for entry in entries])
+            if len(vectors) != len(entries):
+                raise ValueError(f"expected {len(entries)} embeddings, got {len(vectors)}")
+        except Exception as exc:
+            if len(entries) == 1:
+                result.failed[entries[0].key] = f"embedding failed: {exc}"
+                return
+            middle = len(entries) // 2
+            self._embed_isolating(entries[:middle], embedded, result)
+            self._embed_isolating(entries[middle:], embedded, result)
+            return
+        embedded.extend(zip(entries, vectors))
+
+    def _upsert_isolating(
+        self,
+        entries: List[NewsVectorEntry],
+        points: List[Any],
+        result: NewsVectorFlushResult,
+    ) -> None:
+        if not points:
+            return
+        try:
+            self._upsert(points)
+        except Exception as exc:
+            if len(points) == 1:
+                result.failed[entries[0].key] = f"upsert failed: {exc}"
+                return
+            middle = len(points) // 2
+            self._upsert_isolating(entries[:middle], points[:middle], result)
+            self._upsert_isolating(entries[middle:], points[middle:], result)
+            return
+        result.stored.extend(entry.key for entry in entries)
+
+
+_WRITER: Optional[NewsVectorWriter] = None
+_WRITER_LOCK = threading.Lock()
+
+
+def get_news_vector_writer() -> NewsVectorWriter:
+    """Return the process-wide writer; pending entries are flushed at interpreter exit.
+
+    Only suitable for long-lived workers (``NEWS_VECTOR_SHARED_WRITER``): entries
+    still pending when the process is killed are lost.
+    """
+
+    global _WRITER
+    if _WRITER is None:
+        with _WRITER_LOCK:
+            if _WRITER is None:
+                _WRITER = NewsVectorWriter()
+                atexit.register(_WRITER.flush)
+    return _WRITER
+
+
+def reset_news_vector_writer() -> None:
+    """Flush and forget the process-wide writer (used by tests and config reloads)."""
+
+    global _WRITER
+    with _WRITER_LOCK:
+        writer, _WRITER = _WRITER, None
+    if writer is not None:
+        atexit.unregister(writer.flush)
+        writer.flush()
+
+
+__all__ = [
+    "NewsVectorEntry",
+    "NewsVectorFlushResult",
+    "NewsVectorWriter",
+    "get_news_vector_writer",
+    "reset_news_vector_writer",
+]
@@ -18,8 +18,9 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-
-
+ALERT_SLACK_DEFAULT_WEBHOOK = os.getenv("ALERT_SLACK_WEBHOOK_URL")
+ALERT_WEBHOOK_TIMEOUT = float(os.getenv("ALERT_WEBHOOK_TIMEOUT", "5"))
+ALERT_WEBHOOK_RETRIES = int(os.getenv("ALERT_WEBHOOK_RETRIES", "3"))
 
 
 @dataclass
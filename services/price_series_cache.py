@@ -0,0 +1,369 @@
+"""Set-based price loading with a bounded, date-range-aware in-process cache.
+
+Peer comparison, normalized-return charts and the event study all read the
+``prices`` table for a handful of tickers over overlapping date ranges.
+``load_price_frame`` loads any number of tickers with one ``symbol IN (...)``
+query per distinct missing range and returns a columnar :class:`PriceFrame`
+(``dates x tickers`` NumPy arrays). Each ticker's cached series remembers the
+calendar range it covers; a request that reaches past that range only fetches
+the missing edges and the cached series is extended in place.
+
+The most recent ``PRICE_CACHE_SETTLE_DAYS`` days are never recorded as covered,
+because today's bars are still being ingested, so requests that touch them
+always re-read that short edge. Entries expire after
+``PRICE_CACHE_TTL_SECONDS`` and the least recently used tickers are evicted
+beyond ``PRICE_CACHE_MAX_SYMBOLS``. Call :func:`invalidate_price_series` after
+rewriting historical prices.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from core.env import env_bool, env_int
+from core.logging import get_logger
+from models.event_study import Price
+from services.prometheus_helpers import build_counter, build_gauge
+
+logger = get_logger(__name__)
+
+PRICE_CACHE_ENABLED = env_bool("PRICE_CACHE_ENABLED", True)
+PRICE_CACHE_MAX_SYMBOLS = env_int("PRICE_CACHE_MAX_SYMBOLS", 1024, minimum=1)
+PRICE_CACHE_MAX_DAYS = env_int("PRICE_CACHE_MAX_DAYS", 1500, minimum=1)
+PRICE_CACHE_TTL_SECONDS = env_int("PRICE_CACHE_TTL_SECONDS", 900, minimum=1)
+PRICE_CACHE_SETTLE_DAYS = env_int("PRICE_CACHE_SETTLE_DAYS", 2, minimum=0)
+
+_SYMBOL_BATCH_SIZE = 500
+
+_LOOKUP_COUNTER = build_counter(
+    "price_cache_lookups_total",
+    "Price series cache lookups per ticker, by result (hit, partial or miss).",
+    ("result",),
+)
+_SIZE_GAUGE = build_gauge(
+    "price_cache_symbols",
+    "Tickers currently held by the in-process price series cache.",
+)
+
+
+class PricePoint(NamedTuple):
+    """One stored bar; fields that are NULL in the table are ``None``."""
+
+    date: date
+    close: Optional[float]
+    adj_close: Optional[float]
+    ret: Optional[float]
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+@dataclass
+class _Series:
+    """Bars of one ticker for every stored date in ``[first, last]`` (ordinal dates)."""
+
+    first: int
+    last: int
+    days: np.ndarray
+    close: np.ndarray
+    adj_close: np.ndarray
+    ret: np.ndarray
+    loaded_at: float
+
+    @classmethod
+    def empty(cls, first: int, last: int, loaded_at: float) -> "_Series":
+        blank = np.empty(0, dtype=np.float64)
+        return cls(first, last, np.empty(0, dtype=np.int64), blank, blank, blank, loaded_at)
+
+    def window(self, first: int, last: int) -> "_Series":
+        lo, hi = np.searchsorted(self.days, [first, last + 1])
+        return _Series(
+            max(first, self.first),
+            min(last, self.last),
+            self.days[lo:hi],
+            self.close[lo:hi],
+            self.adj_close[lo:hi],
+            self.ret[lo:hi],
+            self.loaded_at,
+        )
+
+    def join(self, other: "_Series") -> "_Series":
+        """Combine with an adjacent or overlapping series; ``other`` wins on shared days."""
+
+        keep = ~np.isin(self.days, other.days)
+        days = np.concatenate([self.days[keep], other.days])
+        order = np.argsort(days, kind="stable")
+        return _Series(
+            min(self.first, other.first),
+            max(self.last, other.last),
+            days[order],
+            np.concatenate([self.close[keep], other.close])[order],
+            np.concatenate([self.adj_close[keep], other.adj_close])[order],
+            np.concatenate([self.ret[keep], other.ret])[order],
+            min(self.loaded_at, other.loaded_at),
+        )
+
+
+class PriceFrame:
+    """Columnar prices: ``close``/``adj_close``/``ret`` are ``(len(dates), len(tickers))``.
+
+    Missing values are ``NaN``; ``present`` tells a stored bar with NULL fields
+    apart from a date the ticker has no row for.
+    """
+
+    def __init__(self, tickers: Sequence[str], series: Dict[str, _Series]) -> None:
+        self.tickers: Tuple[str, ...] = tuple(tickers)
+        columns = [series.get(ticker) for ticker in self.tickers]
+        known = [column.days for column in columns if column is not None]
+        ordinals = np.unique(np.concatenate(known)) if known else np.empty(0, dtype=np.int64)
+        self.dates: Tuple[date, ...] = tuple(date.fromordinal(int(day)) for day in ordinals)
+        shape = (len(ordinals), len(self.tickers))
+        self.present = np.zeros(shape, dtype=bool)
+        self.close = np.full(shape, np.nan)
+        self.adj_close = np.full(shape, np.nan)
+        self.ret = np.full(shape, np.nan)
+        self._ordinals = ordinals
+        self._columns = {ticker: index for index, ticker in enumerate(self.tickers)}
+        for index, column in enumerate(columns):
+            if column is None or not column.days.size:
+                continue
+            rows = np.searchsorted(ordinals, column.days)
+            self.present[rows, index] = True
+            self.close[rows, index] = column.close
+            self.adj_close[rows, index] = column.adj_close
+            self.ret[rows, index] = column.ret
+
+    def __contains__(self, ticker: str) -> bool:
+        index = self._columns.get(ticker)
+        return index is not None and bool(self.present[:, index].any())
+
+    def points(self, ticker: str) -> List[PricePoint]:
+        """Stored bars of ``ticker`` in date order."""
+
+        index = self._columns.get(ticker)
+        if index is None:
+            return []
+        rows = np.flatnonzero(self.present[:, index])
+        return [
+            PricePoint(
+                self.dates[row],
+                _optional(self.close[row, index]),
+                _optional(self.adj_close[row, index]),
+                _optional(self.ret[row, index]),
+            )
+            for row in rows
+        ]
+
+    def returns_by_calendar_day(self, start: date, end: date) -> np.ndarray:
+        """``ret`` as ``(len(tickers), calendar days from start to end)``, ``NaN`` where absent."""
+
+        days = max(0, (end - start).days + 1)
+        matrix = np.full((len(self.tickers), days), np.nan)
+        offsets = self._ordinals - start.toordinal()
+        inside = (offsets >= 0) & (offsets < days)
+        matrix[:, offsets[inside]] = self.ret[inside].T
+        return matrix
+
+
+def _fetch(db: Session, symbols: Sequence[str], first: int, last: int, loaded_at: float) -> Dict[str, _Series]:
+    """Load ``[first, last]`` for ``symbols`` with one query per symbol batch."""
+
+    fetched: Dict[str, _Series] = {}
+    start, end = date.fromordinal(first), date.fromordinal(last)
+    for offset in range(0, len(symbols), _SYMBOL_BATCH_SIZE):
+        batch = list(symbols[offset : offset + _SYMBOL_BATCH_SIZE])
+        rows = (
+            db.query(Price.symbol, Price.date, Price.close, Price.adj_close, Price.ret)
+            .filter(Price.symbol.in_(batch), Price.date >= start, Price.date <= end)
+            .order_by(Price.symbol, Price.date)
+            .all()
+        )
+        grouped: Dict[str, List[Tuple]] = defaultdict(list)
+        for symbol, day, close, adj_close, ret in rows:
+            grouped[symbol].append(
+                (
+                    day.toordinal(),
+                    np.nan if close is None else float(close),
+                    np.nan if adj_close is None else float(adj_close),
+                    np.nan if ret is None else float(ret),
+                )
+            )
+        for symbol in batch:
+            bars = grouped.get(symbol)
+            if not bars:
+                fetched[symbol] = _Series.empty(first, last, loaded_at)
+                continue
+            days, close, adj_close, ret = zip(*bars)
+            fetched[symbol] = _Series(
+                first,
+                last,
+                np.asarray(days, dtype=np.int64),
+                np.asarray(close, dtype=np.float64),
+                np.asarray(adj_close, dtype=np.float64),
+                np.asarray(ret, dtype=np.float64),
+                loaded_at,
+            )
+    return fetched
+
+
+def _normalize_symbols(symbols: Iterable[str]) -> List[str]:
+    return list(dict.fromkeys(symbol for symbol in symbols if symbol))
+
+
+class PriceSeriesCache:
+    """LRU of per-ticker price series, each covering one contiguous date range."""
+
+    def __init__(
+        self,
+        *,
+        max_symbols: int = PRICE_CACHE_MAX_SYMBOLS,
+        max_days: int = PRICE_CACHE_MAX_DAYS,
+        ttl_seconds: float = PRICE_CACHE_TTL_SECONDS,
+        settle_days: int = PRICE_CACHE_SETTLE_DAYS,
+    ) -> None:
+        self.max_symbols = max(1, max_symbols)
+        self.max_days = max(1, max_days)
+        self.ttl_seconds = ttl_seconds
+        self.settle_days = max(0, settle_days)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Series]" = OrderedDict()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def load(self, db: Session, symbols: Iterable[str], start: date, end: date) -> PriceFrame:
+        tickers = _normalize_symbols(symbols)
+        first, last = start.toordinal(), end.toordinal()
+        now = time.monotonic()
+        cached: Dict[str, _Series] = {}
+        plan: Dict[Tuple[int, int], List[str]] = defaultdict(list)
+        with self._lock:
+            for ticker in tickers:
+                entry = self._entries.get(ticker)
+                if entry is not None and now - entry.loaded_at > self.ttl_seconds:
+                    del self._entries[ticker]
+                    entry = None
+                if entry is None:
+                    plan[(first, last)].append(ticker)
+                    self._record("miss")
+                    continue
+                self._entries.move_to_end(ticker)
+                cached[ticker] = entry
+                partial = False
+                if first < entry.first:
+                    plan[(first, entry.first - 1)].append(ticker)
+                    partial = True
+                if last > entry.last:
+                    plan[(entry.last + 1, last)].append(ticker)
+                    partial = True
+                self._record("partial" if partial else "hit")
+
+        merged: Dict[str, _Series] = dict(cached)
+        for (edge_first, edge_last), edge_symbols in plan.items():
+            for ticker, series in _fetch(db, edge_symbols, edge_first, edge_last, now).items():
+                current = merged.get(ticker)
+                merged[ticker] = series if current is None else current.join(series)
+
+        if plan:
+            refreshed = {ticker for group in plan.values() for ticker in group}
+            self._store({ticker: merged[ticker] for ticker in refreshed}, first, last)
+        return PriceFrame(tickers, {ticker: series.window(first, last) for ticker, series in merged.items()})
+
+    def invalidate(self, symbols: Optional[Iterable[str]] = None) -> None:
+        with self._lock:
+            if symbols is None:
+                self._entries.clear()
+            else:
+                for symbol in symbols:
+                    self._entries.pop(symbol, None)
+            self._update_size()
+
+    def _store(self, updates: Dict[str, _Series], first: int, last: int) -> None:
+        settled = (date.today() - timedelta(days=self.settle_days)).toordinal()
+        with self._lock:
+            for ticker, series in updates.items():
+                if series.last - series.first + 1 > self.max_days:
+                    series = series.window(first, min(last, first + self.max_days - 1))
+                if series.last > settled:
+                    series = series.window(series.first, settled)
+                if series.last < series.first:
+                    self._entries.pop(ticker, None)
+                    continue
+                self._entries[ticker] = series
+                self._entries.move_to_end(ticker)
+            while len(self._entries) > self.max_symbols:
+                self._entries.popitem(last=False)
+            self._update_size()
+
+    def _update_size(self) -> None:
+        if _SIZE_GAUGE is not None:
+            _SIZE_GAUGE.set(len(self._entries))
+
+    @staticmethod
+    def _record(result: str) -> None:
+        if _LOOKUP_COUNTER is not None:
+            _LOOKUP_COUNTER.labels(result=result).inc()
+
+
+_CACHE: Optional[PriceSeriesCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_price_series_cache() -> Optional[PriceSeriesCache]:
+    """Return the process-wide cache, or ``None`` when caching is disabled."""
+
+    global _CACHE
+    if not PRICE_CACHE_ENABLED:
+        return None
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = PriceSeriesCache()
+    return _CACHE
+
+
+def load_price_frame(db: Session, symbols: Iterable[str], start: date, end: date) -> PriceFrame:
+    """Load ``symbols`` between ``start`` and ``end`` (inclusive) into a :class:`PriceFrame`."""
+
+    cache = get_price_series_cache()
+    if cache is not None:
+        return cache.load(db, symbols, start, end)
+    tickers = _normalize_symbols(symbols)
+    return PriceFrame(tickers, _fetch(db, tickers, start.toordinal(), end.toordinal(), time.monotonic()))
+
+
+def invalidate_price_series(symbols: Optional[Iterable[str]] = None) -> None:
+    """Drop cached series for ``symbols`` (all when ``None``) on the process-wide cache."""
+
+    cache = get_price_series_cache()
+    if cache is not None:
+        cache.invalidate(symbols)
+
+
+def reset_price_series_cache() -> None:
+    """Forget the process-wide cache instance (used by tests and config reloads)."""
+
+    global _CACHE
+    with _CACHE_LOCK:
+        _CACHE = None
+
+
+__all__ = [
+    "PriceFrame",
+    "PricePoint",
+    "PriceSeriesCache",
+    "get_price_series_cache",
+    "invalidate_price_series",
+    "load_price_frame",
+    "reset_price_series_cache",
+]
@@ -9,6 +9,7 @@ from typing import Any, Dict, List, Mapping, Optional, Sequence
 
 from sqlalchemy.orm import Session
 
+from core.env import env_bool
 from core.logging import get_logger
 from schemas.api.rag import (
     EvidenceSchema,
@@ -22,6 +23,8 @@ from services.rag_shared import safe_float
 
 logger = get_logger(__name__)
 
+RAG_BATCHED_GATHER = env_bool("RAG_BATCHED_GATHER", True)
+
 DEFAULT_SOURCE_WEIGHTS: Dict[str, float] = {
     "filing": 1.2,
     "event": 1.1,
@@ -182,16 +185,40 @@ def _gather_chunks_for_documents(
     if seed_result.filing_id:
         seen.add(str(seed_result.filing_id))
 
+    follow_up_ids: List[str] = []
     for related in seed_result.related_filings:
         doc_id = str(related.get("filing_id") or "")
         if not doc_id or doc_id in seen:
             continue
         seen.add(doc_id)
+        follow_up_ids.append(doc_id)
+    if not follow_up_ids:
+        return chunks
+
+    per_filing_top_k = max(2, max_chunks // 2)
+    if RAG_BATCHED_GATHER:
+        try:
+            grouped = vector_service.query_vector_store_by_filings(
+                question,
+                follow_up_ids,
+                top_k=per_filing_top_k,
+                filters=filters,
+            )
+        except Exception as exc:
+            logger.warning("Batched vector follow-up failed; falling back to per-filing search: %s", exc)
+        else:
+            for doc_id in follow_up_ids:
+                chunks.extend(grouped.get(doc_id) or [])
+                if len(chunks) >= max_chunks:
+                    break
+            return chunks
+
+    for doc_id in follow_up_ids:
         try:
             follow_up = vector_service.query_vector_store(
                 query_text=question,
                 filing_id=doc_id,
-                top_k=max(2, max_chunks // 2),
+                top_k=per_filing_top_k,
                 max_filings=1,
                 filters=filters,
             )
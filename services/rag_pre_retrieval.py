@@ -0,0 +1,144 @@
+"""Concurrent execution of the LLM stages that precede RAG retrieval.
+
+``query_rag`` normally runs the front-door classifier, the semantic router and the
+guard judge one after another before any chunk is fetched. ``PreRetrievalStages``
+starts the classifier together with a speculative retrieval and hands the results
+back to the serial control flow, which consumes them in the original order.
+
+The router and judge are only started by :meth:`PreRetrievalStages.start_financial_stages`,
+which ``query_rag`` calls once the classifier returned ``financial_query`` — the
+only case in which the serial path runs them — so other turns make no extra LLM
+calls. The one remaining difference: the judge runs alongside the router and the
+intent gate, so a financial turn that the intent gate or the filing-search tool
+answers before retrieval has made a judge call whose result is discarded. The
+speculative retrieval is likewise dropped whenever the serial path would not
+have retrieved with the same arguments.
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from core.env import env_bool, env_int
+from core.logging import get_logger
+from services.prometheus_helpers import build_counter
+
+logger = get_logger(__name__)
+
+RAG_PARALLEL_PRE_RETRIEVAL = env_bool("RAG_PARALLEL_PRE_RETRIEVAL", False)
+RAG_SPECULATIVE_RETRIEVAL = env_bool("RAG_SPECULATIVE_RETRIEVAL", True)
+RAG_PRE_RETRIEVAL_WORKERS = env_int("RAG_PRE_RETRIEVAL_WORKERS", 32, minimum=4)
+
+_SPECULATION_COUNTER = build_counter(
+    "rag_speculative_retrieval_total",
+    "Speculative RAG retrievals grouped by outcome (used, discarded, failed).",
+    ("result",),
+)
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(
+                    max_workers=RAG_PRE_RETRIEVAL_WORKERS,
+                    thread_name_prefix="rag-pre-retrieval",
+                )
+    return _EXECUTOR
+
+
+def _record_speculation(result: str) -> None:
+    if _SPECULATION_COUNTER is None:
+        return
+    _SPECULATION_COUNTER.labels(result=result).inc()
+
+
+class PreRetrievalStages:
+    """Futures for the classifier, router, guard judge and speculative retrieval."""
+
+    def __init__(
+        self,
+        *,
+        classify: Callable[[], Dict[str, Any]],
+        route: Optional[Callable[[], Any]],
+        judge: Callable[[], Optional[Dict[str, Any]]],
+        retrieve: Optional[Callable[[], Any]] = None,
+        speculation_key: Any = None,
+    ) -> None:
+        executor = _executor()
+        self._classifier = executor.submit(classify)
+        self._route_fn = route
+        self._judge_fn = judge
+        self._route: Optional[Future] = None
+        self._judge: Optional[Future] = None
+        self._retrieval: Optional[Future] = executor.submit(retrieve) if retrieve is not None else None
+        self._speculation_key = speculation_key
+        self._settled = retrieve is None
+
+    def classifier_result(self) -> Dict[str, Any]:
+        return self._classifier.result()
+
+    def start_financial_stages(self) -> None:
+        """Start the router and judge; call only once the serial path would run them."""
+
+        executor = _executor()
+        if self._route is None and self._route_fn is not None:
+            self._route = executor.submit(self._route_fn)
+        if self._judge is None:
+            self._judge = executor.submit(self._judge_fn)
+
+    def route_decision(self) -> Any:
+        if self._route is None:
+            raise RuntimeError("Router stage was not scheduled.")
+        return self._route.result()
+
+    def judge_result(self) -> Optional[Dict[str, Any]]:
+        if self._judge is None:
+            return self._judge_fn()
+        return self._judge.result()
+
+    def take_retrieval(self, speculation_key: Any) -> Optional[Any]:
+        """Return the speculative retrieval if it was issued with ``speculation_key``.
+
+        Returns ``None`` (and discards the speculation) when the key differs or the
+        speculative call failed; the caller then retrieves serially.
+        """
+
+        if self._retrieval is None or self._settled:
+            return None
+        if speculation_key != self._speculation_key:
+            self.discard()
+            return None
+        self._settled = True
+        try:
+            result = self._retrieval.result()
+        except Exception as exc:
+            _record_speculation("failed")
+            logger.info("Speculative retrieval failed; retrying serially: %s", exc)
+            return None
+        _record_speculation("used")
+        return result
+
+    def discard(self) -> None:
+        """Drop the speculative retrieval (and a judge that has not started) if unconsumed."""
+
+        if self._judge is not None:
+            self._judge.cancel()
+        if self._retrieval is None or self._settled:
+            return
+        self._settled = True
+        self._retrieval.cancel()
+        _record_speculation("discarded")
+
+
+__all__ = [
+    "PreRetrievalStages",
+    "RAG_PARALLEL_PRE_RETRIEVAL",
+    "RAG_SPECULATIVE_RETRIEVAL",
+]
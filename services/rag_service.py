@@ -8,7 +8,7 @@ from dataclasses import dataclass
 from copy import deepcopy
 import os
 from datetime import date, datetime, timezone
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Mapping
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Mapping
 
 from pydantic import BaseModel, Field
 from fastapi import HTTPException, Request, status
@@ -60,6 +60,11 @@ from services.agent_tools.event_study_tool import (
     generate_event_study_payload,
 )
 from services.audit_log import audit_rag_event
+from services.rag_pre_retrieval import (
+    RAG_PARALLEL_PRE_RETRIEVAL,
+    RAG_SPECULATIVE_RETRIEVAL,
+    PreRetrievalStages,
+)
 from services.semantic_router import DEFAULT_ROUTER
 from services.user_settings_service import UserLightMemSettings
 from services.rag_shared import build_anchor_payload, normalize_reliability, safe_float, safe_int
@@ -2288,8 +2293,12 @@ def _run_retrieval_stage(
     db: Session,
     *,
     multi_mode: bool = False,
+    prefetched: Optional[PreRetrievalStages] = None,
 ) -> RagRetrievalStage:
-    judge_result = llm_service.assess_query_risk(ctx.question)
+    if prefetched is not None:
+        judge_result = prefetched.judge_result()
+    else:
+        judge_result = llm_service.assess_query_risk(ctx.question)
     rag_mode = (judge_result.get("rag_mode") or "vector") if judge_result else "vector"
     judge_decision = (judge_result.get("decision") or "unknown") if judge_result else "unknown"
     should_retrieve = rag_mode != "none" and judge_decision in {"pass", "unknown"}
@@ -2302,15 +2311,18 @@ def _run_retrieval_stage(
     multi_retrieval = False
 
     if should_retrieve:
-        retrieval = _vector_search(
-            ctx.question,
-            filing_id=ctx.filing_id,
-            top_k=request.top_k,
-            max_filings=ctx.max_filings,
-            filters=ctx.filter_payload,
-            db=db,
-            multi_mode=multi_mode,
-        )
+        if prefetched is not None:
+            retrieval = prefetched.take_retrieval(multi_mode)
+        if retrieval is None:
+            retrieval = _vector_search(
+                ctx.question,
+                filing_id=ctx.filing_id,
+                top_k=request.top_k,
+                max_filings=ctx.max_filings,
+                filters=ctx.filter_payload,
+                db=db,
+                multi_mode=multi_mode,
+            )
         context_chunks, multi_retrieval, filing_blocks = _context_from_retrieval(
             retrieval,
             threshold=RAG_MIN_RELEVANCE,
@@ -2577,6 +2589,47 @@ def _record_rag_audit(
     return audit_stage
 
 
+def _start_pre_retrieval_stages(
+    ctx: RagSessionStage,
+    request: RAGQueryRequest,
+    db: Session,
+    route_decision: Optional[RouteDecision],
+) -> Optional[PreRetrievalStages]:
+    """Kick off the classifier and speculative retrieval; router and judge wait for a financial turn."""
+
+    if not RAG_PARALLEL_PRE_RETRIEVAL:
+        return None
+    question = ctx.question
+    retrieve: Optional[Callable[[], vector_service.VectorSearchResult]] = None
+    speculative_multi_mode = _is_comparison_query(question, None, ctx.max_filings)
+    if RAG_SPECULATIVE_RETRIEVAL:
+        bind = db.get_bind()
+        engine = getattr(bind, "engine", bind)
+
+        def _speculative_retrieve() -> vector_service.VectorSearchResult:
+            # The request session is not thread-safe; BM25 legs read through their own session.
+            with Session(bind=engine) as speculative_db:
+                return _vector_search(
+                    question,
+                    filing_id=ctx.filing_id,
+                    top_k=request.top_k,
+                    max_filings=ctx.max_filings,
+                    filters=ctx.filter_payload,
+                    db=speculative_db,
+                    multi_mode=speculative_multi_mode,
+                )
+
+        retrieve = _speculative_retrieve
+
+    return PreRetrievalStages(
+        classify=lambda: llm_service.classify_query_category(question),
+        route=(lambda: _resolve_route_decision(None, question)) if route_decision is None else None,
+        judge=lambda: llm_service.assess_query_risk(question),
+        retrieve=retrieve,
+        speculation_key=speculative_multi_mode,
+    )
+
+
 def query_rag(
     request: RAGQueryRequest,
     x_user_id: Optional[str],
@@ -2615,14 +2668,23 @@ def query_rag(
     memory_info = ctx.memory_info
     user_meta = ctx.user_meta
 
+    stages = _start_pre_retrieval_stages(ctx, request, db, route_decision)
     try:
-        classifier_result = llm_service.classify_query_category(question)
+        if stages is not None:
+            classifier_result = stages.classifier_result()
+        else:
+            classifier_result = llm_service.classify_query_category(question)
         front_category = classifier_result.get("category") or "financial_query"
         ctx.user_meta["front_door_category"] = front_category
         ctx.user_meta["front_door_model"] = classifier_result.get("model_used")
 
         if front_category == "financial_query":
-            route_decision = _resolve_route_decision(route_decision, question)
+            if stages is not None:
+                stages.start_financial_stages()
+            if stages is not None and route_decision is None:
+                route_decision = stages.route_decision()
+            else:
+                route_decision = _resolve_route_decision(route_decision, question)
         else:
             route_decision = _front_door_route_decision(front_category)
         ctx.user_meta["router_action"] = route_decision.tool_name
@@ -2700,7 +2762,13 @@ def query_rag(
 
         comparison_mode = _is_comparison_query(question, route_decision, max_filings)
         ctx.user_meta["multi_retrieval_mode"] = comparison_mode
-        retrieval_stage = _run_retrieval_stage(ctx, request, db, multi_mode=comparison_mode)
+        retrieval_stage = _run_retrieval_stage(
+            ctx,
+            request,
+            db,
+            multi_mode=comparison_mode,
+            prefetched=stages,
+        )
         event_chunks = _maybe_run_event_study_tool(ctx, route_decision, db)
         if event_chunks:
             retrieval_stage.context_chunks = event_chunks + retrieval_stage.context_chunks
@@ -2788,6 +2856,9 @@ def query_rag(
     except Exception as exc:
         db.rollback()
         raise HTTPException(status_code=500, detail=str(exc)) from exc
+    finally:
+        if stages is not None:
+            stages.discard()
 
 
 def query_rag_stream(
@@ -0,0 +1,222 @@
+"""Decide which DART receipt numbers still need to be seeded.
+
+The seeder used to load every ``Filing.receipt_no`` into memory before doing
+any work. ``DatabaseReceiptDeduper`` instead checks just the candidate receipts
+of the current listing page with batched ``IN`` queries; the
+``INSERT ... ON CONFLICT DO NOTHING RETURNING`` in the seeder remains the final
+guard against races. Offline backfills can additionally use
+``BloomReceiptDeduper``, which keeps a persisted Bloom filter snapshot of stored
+receipts: receipts the filter has never seen skip the database entirely, and
+possible hits are confirmed with the same batched query, so a false positive
+never drops a filing.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import struct
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Set
+
+from sqlalchemy.orm import Session
+
+from core.env import env_float, env_int, env_str
+from core.logging import get_logger
+from models.filing import Filing
+
+logger = get_logger(__name__)
+
+RECEIPT_DEDUP_BATCH_SIZE = env_int("RECEIPT_DEDUP_BATCH_SIZE", 500, minimum=1)
+RECEIPT_BLOOM_PATH = env_str("RECEIPT_BLOOM_PATH")
+RECEIPT_BLOOM_CAPACITY = env_int("RECEIPT_BLOOM_CAPACITY", 5_000_000, minimum=1000)
+RECEIPT_BLOOM_ERROR_RATE = env_float("RECEIPT_BLOOM_ERROR_RATE", 0.001, minimum=1e-9)
+
+_SNAPSHOT_MAGIC = b"KFBLOOM1"
+_SNAPSHOT_HEADER = struct.Struct(">8sQIQ")
+
+
+class DatabaseReceiptDeduper:
+    """Check candidate receipts against ``filings`` in ``IN`` batches.
+
+    Memory is bounded by the receipts of the current run (so a receipt listed
+    twice is only seeded once), not by the size of the ``filings`` table.
+    ``seed_recent_filings`` calls :meth:`reset` when it returns, so a deduper
+    reused across backfill chunks relies on the database (and Bloom filter) for
+    receipts stored by earlier chunks.
+    """
+
+    def __init__(self, db: Session, *, batch_size: Optional[int] = None) -> None:
+        self.db = db
+        self.batch_size = max(1, batch_size or RECEIPT_DEDUP_BATCH_SIZE)
+        self._seen: Set[str] = set()
+
+    def stored_receipts(self, receipts: Sequence[str]) -> Set[str]:
+        """Return the subset of ``receipts`` that already have a filing row."""
+
+        unique = list(dict.fromkeys(receipt for receipt in receipts if receipt))
+        stored: Set[str] = set()
+        for start in range(0, len(unique), self.batch_size):
+            batch = unique[start : start + self.batch_size]
+            rows = self.db.query(Filing.receipt_no).filter(Filing.receipt_no.in_(batch)).all()
+            stored.update(receipt for (receipt,) in rows if receipt)
+        return stored
+
+    def filter_new(self, receipts: Sequence[str]) -> List[str]:
+        """Return receipts (in input order, without repeats) that still need seeding."""
+
+        candidates = [receipt for receipt in dict.fromkeys(receipts) if receipt and receipt not in self._seen]
+        stored = self.stored_receipts(candidates)
+        self._seen.update(candidates)
+        return [receipt for receipt in candidates if receipt not in stored]
+
+    def add(self, receipt_no: str) -> None:
+        """Record that ``receipt_no`` is now stored."""
+
+        self._seen.add(receipt_no)
+
+    def save(self) -> None:
+        """Nothing to persist; present so callers can treat dedupers uniformly."""
+
+    def reset(self) -> None:
+        """Forget the receipts handed out so far; call at the end of each run."""
+
+        self._seen.clear()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing on BLAKE2b."""
+
+    def __init__(self, bit_count: int, hash_count: int, *, bits: Optional[bytearray] = None, count: int = 0) -> None:
+        self.bit_count = max(8, int(bit_count))
+        self.hash_count = max(1, int(hash_count))
+        size = (self.bit_count + 7) // 8
+        self.bits = bits if bits is not None else bytearray(size)
+        if len(self.bits) != size:
+            raise ValueError("Bloom filter bit array does not match its declared size.")
+        self.count = count
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float) -> "BloomFilter":
+        capacity = max(1, capacity)
+        error_rate = min(max(error_rate, 1e-9), 0.5)
+        bit_count = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        hash_count = max(1, round(bit_count / capacity * math.log(2)))
+        return cls(bit_count, hash_count)
+
+    def _positions(self, value: str) -> Iterable[int]:
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+        for index in range(self.hash_count):
+            yield (first + index * second) % self.bit_count
+
+    def add(self, value: str) -> None:
+        added = False
+        for position in self._positions(value):
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+    def save(self, path: str) -> None:
+        """Write the filter atomically (temp file + rename)."""
+
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        with temp_path.open("wb") as handle:
+            handle.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, self.bit_count, self.hash_count, self.count))
+            handle.write(self.bits)
+        os.replace(temp_path, target)
+
+    @classmethod
+    def load(cls, path: str) -> "BloomFilter":
+        with open(path, "rb") as handle:
+            header = handle.read(_SNAPSHOT_HEADER.size)
+            if len(header) != _SNAPSHOT_HEADER.size:
+                raise ValueError(f"Bloom snapshot {path} is truncated.")
+            magic, bit_count, hash_count, count = _SNAPSHOT_HEADER.unpack(header)
+            if magic != _SNAPSHOT_MAGIC:
+                raise ValueError(f"{path} is not a receipt Bloom snapshot.")
+            bits = bytearray(handle.read())
+        return cls(bit_count, hash_count, bits=bits, count=count)
+
+
+class BloomReceiptDeduper(DatabaseReceiptDeduper):
+    """``DatabaseReceiptDeduper`` fronted by a persisted Bloom filter snapshot.
+
+    When ``path`` does not exist yet the filter is built once by streaming the
+    receipt column, then saved; later runs only load the snapshot. Receipts
+    added by other writers after the snapshot was taken are still caught by the
+    seeder's ``ON CONFLICT`` insert, at the cost of a redundant download.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        path: str,
+        *,
+        batch_size: Optional[int] = None,
+        capacity: Optional[int] = None,
+        error_rate: Optional[float] = None,
+    ) -> None:
+        super().__init__(db, batch_size=batch_size)
+        self.path = path
+        self._dirty = False
+        if os.path.exists(path):
+            self.bloom = BloomFilter.load(path)
+            logger.info("Loaded receipt Bloom snapshot %s (%d receipts).", path, self.bloom.count)
+        else:
+            self.bloom = BloomFilter.for_capacity(
+                capacity or RECEIPT_BLOOM_CAPACITY,
+                error_rate if error_rate is not None else RECEIPT_BLOOM_ERROR_RATE,
+            )
+            self._build_from_database()
+
+    def _build_from_database(self) -> None:
+        query = self.db.query(Filing.receipt_no).filter(Filing.receipt_no.isnot(None))
+        for (receipt,) in query.yield_per(10_000):
+            self.bloom.add(receipt)
+        logger.info("Built receipt Bloom filter from %d stored receipts.", self.bloom.count)
+        self._dirty = True
+        self.save()
+
+    def stored_receipts(self, receipts: Sequence[str]) -> Set[str]:
+        maybe_stored = [receipt for receipt in receipts if receipt in self.bloom]
+        if not maybe_stored:
+            return set()
+        return super().stored_receipts(maybe_stored)
+
+    def add(self, receipt_no: str) -> None:
+        super().add(receipt_no)
+        self.bloom.add(receipt_no)
+        self._dirty = True
+
+    def save(self) -> None:
+        if self._dirty:
+            self.bloom.save(self.path)
+            self._dirty = False
+
+
+def build_receipt_deduper(db: Session, *, bloom_path: Optional[str] = None) -> DatabaseReceiptDeduper:
+    """Return a Bloom-backed deduper when a snapshot path is configured, else the plain one."""
+
+    path = bloom_path or RECEIPT_BLOOM_PATH
+    if path:
+        return BloomReceiptDeduper(db, path)
+    return DatabaseReceiptDeduper(db)
+
+
+__all__ = [
+    "BloomFilter",
+    "BloomReceiptDeduper",
+    "DatabaseReceiptDeduper",
+    "build_receipt_deduper",
+]
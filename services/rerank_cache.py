@@ -0,0 +1,125 @@
+"""Per-document reranker score cache.
+
+The Vertex Ranking API scores every ``(query, record)`` pair independently, so a
+score can be reused whenever the same query meets the same document content
+again, regardless of which other candidates are in the set. Entries are keyed
+by ``(model, query hash, document id, document version)`` where the version is
+a hash of the title and content that were sent to the reranker.
+
+Two tiers mirror :mod:`services.embedding_cache`: a bounded in-process
+:class:`services.kv_tier.MemoryBlobTier` holding packed scores and an
+optional shared Redis (``RERANK_CACHE_REDIS_URL``) or SQLite
+(``RERANK_CACHE_SQLITE_PATH``) store.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import struct
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from core.env import env_int, env_str
+from services.embedding_cache import normalize_text
+from services.kv_tier import BlobTier, LoggedTier, MemoryBlobTier, build_shared_tier
+from services.prometheus_helpers import build_gauge
+
+RERANK_CACHE_MAX_ENTRIES = env_int("RERANK_CACHE_MAX_ENTRIES", 20000, minimum=1)
+RERANK_CACHE_REDIS_URL = env_str("RERANK_CACHE_REDIS_URL")
+RERANK_CACHE_SQLITE_PATH = env_str("RERANK_CACHE_SQLITE_PATH")
+
+_KEY_PREFIX = "rrk:v1"
+_SQLITE_TABLE = "rerank_score_cache"
+_SCORE = struct.Struct("<d")
+
+_SIZE_GAUGE = build_gauge(
+    "rerank_cache_entries",
+    "Current number of document scores held by the in-process rerank cache.",
+)
+
+
+def query_digest(model: str, query: str) -> str:
+    return hashlib.sha256(f"{model}\n{normalize_text(query)}".encode("utf-8")).hexdigest()
+
+
+def document_version(title: Optional[str], content: Optional[str]) -> str:
+    digest = hashlib.sha1()
+    digest.update((title or "").encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update((content or "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+def score_key(query_hash: str, document_id: str, version: str) -> str:
+    return f"{query_hash}:{document_id}:{version}"
+
+
+class RerankScoreCache:
+    """Bounded LRU of per-document rerank scores with an optional shared tier."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_seconds: int,
+        shared: Optional[BlobTier] = None,
+    ) -> None:
+        self._memory = MemoryBlobTier(ttl_seconds=ttl_seconds, max_entries=max_entries)
+        self._shared = LoggedTier(shared, label="Rerank cache") if shared is not None else None
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _remember(self, items: Sequence[Tuple[str, bytes]]) -> None:
+        self._memory.set_many(items)
+        if _SIZE_GAUGE is not None:
+            _SIZE_GAUGE.set(float(len(self._memory)))
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, float]:
+        """Return cached scores for whichever ``keys`` are present."""
+
+        found: Dict[str, float] = {}
+        missing: List[str] = []
+        for key, blob in zip(keys, self._memory.get_many(keys)):
+            if blob is None:
+                missing.append(key)
+            else:
+                found[key] = _SCORE.unpack(blob)[0]
+        if missing and self._shared is not None:
+            promoted: List[Tuple[str, bytes]] = []
+            for key, blob in zip(missing, self._shared.get_many(missing)):
+                if blob is None:
+                    continue
+                found[key] = _SCORE.unpack(blob)[0]
+                promoted.append((key, blob))
+            if promoted:
+                self._remember(promoted)
+        return found
+
+    def set_many(self, scores: Dict[str, float]) -> None:
+        if not scores:
+            return
+        items = [(key, _SCORE.pack(score)) for key, score in scores.items()]
+        self._remember(items)
+        if self._shared is not None:
+            self._shared.set_many(items)
+
+
+def build_rerank_cache(ttl_seconds: int) -> RerankScoreCache:
+    shared = build_shared_tier(
+        "Rerank cache",
+        redis_url=RERANK_CACHE_REDIS_URL,
+        sqlite_path=RERANK_CACHE_SQLITE_PATH,
+        table=_SQLITE_TABLE,
+        prefix=_KEY_PREFIX,
+        ttl_seconds=ttl_seconds,
+    )
+    return RerankScoreCache(max_entries=RERANK_CACHE_MAX_ENTRIES, ttl_seconds=ttl_seconds, shared=shared)
+
+
+__all__ = [
+    "RerankScoreCache",
+    "build_rerank_cache",
+    "document_version",
+    "query_digest",
+    "score_key",
+]
@@ -59,7 +59,9 @@ _TOOL_DEFINITIONS: Dict[str, ToolDefinition] = {
         requires_context=("tenant.snapshot",),
     ),
     "news_insights": ToolDefinition(
+        tool_id="news_insights",
         call_name="news.rag",
+        intent="news_insights",
         title="뉴스 리포터",
         description="최근 뉴스 요약과 신호를 카드 형태로 제공합니다.",
         ui_container=UiContainer.OVERLAY,
@@ -0,0 +1,154 @@
+"""Process-wide readiness registry for Qdrant collections.
+
+Both the RAG vector store and the LightMem long-term store used to call
+``get_collection`` before every search/upsert. The registry verifies a
+collection (existence, vector size, distance, payload indexes) once, remembers
+the result for ``QDRANT_COLLECTION_REVALIDATE_SECONDS`` and forgets it as soon as
+a caller reports a connection error, so the hot path skips the extra round-trip.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Optional
+
+from qdrant_client import QdrantClient, models
+from qdrant_client.http.exceptions import UnexpectedResponse
+
+from core.env import env_int
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+COLLECTION_REVALIDATE_SECONDS = env_int("QDRANT_COLLECTION_REVALIDATE_SECONDS", 300, minimum=0)
+
+
+class CollectionMismatchError(RuntimeError):
+    """Raised when an existing collection does not match the expected vector config."""
+
+
+@dataclass(frozen=True)
+class CollectionSpec:
+    """Expected shape of a Qdrant collection."""
+
+    name: str
+    dimension: int
+    distance: models.Distance = models.Distance.COSINE
+    payload_indexes: Mapping[str, models.PayloadSchemaType] = field(default_factory=dict)
+
+
+def _status_code(exc: Exception) -> Optional[int]:
+    return getattr(exc, "status_code", None)
+
+
+def _vector_params(info: models.CollectionInfo) -> Optional[models.VectorParams]:
+    vectors = info.config.params.vectors
+    if isinstance(vectors, models.VectorParams):
+        return vectors
+    if isinstance(vectors, dict) and len(vectors) == 1:
+        return next(iter(vectors.values()))
+    return None
+
+
+class CollectionRegistry:
+    """Memoizes collection verification per process."""
+
+    def __init__(self, *, revalidate_seconds: int = COLLECTION_REVALIDATE_SECONDS) -> None:
+        self._revalidate_seconds = revalidate_seconds
+        self._verified_at: Dict[str, float] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def _lock_for(self, name: str) -> threading.Lock:
+        with self._guard:
+            lock = self._locks.get(name)
+            if lock is None:
+                lock = self._locks[name] = threading.Lock()
+            return lock
+
+    def is_ready(self, name: str) -> bool:
+        verified_at = self._verified_at.get(name)
+        if verified_at is None:
+            return False
+        if self._revalidate_seconds and time.monotonic() - verified_at >= self._revalidate_seconds:
+            return False
+        return True
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Forget cached readiness for ``name`` (or every collection)."""
+
+        if name is None:
+            self._verified_at.clear()
+        else:
+            self._verified_at.pop(name, None)
+
+    def ensure(self, client: QdrantClient, spec: CollectionSpec, *, force: bool = False) -> None:
+        """Create or verify ``spec`` unless it was verified recently."""
+
+        if not force and self.is_ready(spec.name):
+            return
+        with self._lock_for(spec.name):
+            if not force and self.is_ready(spec.name):
+                return
+            try:
+                self._verify(client, spec)
+            except Exception:
+                self.invalidate(spec.name)
+                raise
+            self._verified_at[spec.name] = time.monotonic()
+
+    def _verify(self, client: QdrantClient, spec: CollectionSpec) -> None:
+        try:
+            info = client.get_collection(collection_name=spec.name)
+        except UnexpectedResponse as exc:
+            if _status_code(exc) != 404:
+                raise
+            info = None
+
+        if info is None:
+            logger.info("Creating Qdrant collection '%s'.", spec.name)
+            try:
+                client.create_collection(
+                    collection_name=spec.name,
+                    vectors_config=models.VectorParams(size=spec.dimension, distance=spec.distance),
+                )
+            except UnexpectedResponse as exc:
+                if _status_code(exc) != 409:
+                    raise
+                logger.debug("Qdrant collection '%s' already exists (409).", spec.name)
+            existing_indexes: Mapping[str, object] = {}
+        else:
+            params = _vector_params(info)
+            if params is not None and (params.size != spec.dimension or params.distance != spec.distance):
+                raise CollectionMismatchError(
+                    f"Qdrant collection '{spec.name}' has size={params.size}/distance={params.distance}, "
+                    f"expected size={spec.dimension}/distance={spec.distance}."
+                )
+            existing_indexes = info.payload_schema or {}
+
+        for field_name, schema in spec.payload_indexes.items():
+            if field_name in existing_indexes:
+                continue
+            logger.info("Creating payload index '%s' on Qdrant collection '%s'.", field_name, spec.name)
+            client.create_payload_index(
+                collection_name=spec.name,
+                field_name=field_name,
+                field_schema=schema,
+            )
+
+
+_REGISTRY = CollectionRegistry()
+
+
+def get_collection_registry() -> CollectionRegistry:
+    return _REGISTRY
+
+
+__all__ = [
+    "CollectionMismatchError",
+    "CollectionRegistry",
+    "CollectionSpec",
+    "get_collection_registry",
+]
@@ -2,20 +2,23 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
 import time
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import litellm
 from litellm.exceptions import ContextWindowExceededError
 from dotenv import load_dotenv
 from qdrant_client import QdrantClient, models
-from qdrant_client.http.exceptions import UnexpectedResponse
 
+from services.embedding_utils import embed_text
 from services.rag_shared import build_anchor_payload, normalize_reliability
+from services.vector_collection_registry import CollectionSpec, get_collection_registry
 
 load_dotenv()
 
@@ -33,6 +36,20 @@ EMBEDDING_MAX_CONTENT_CHARS = max(1024, int(os.getenv("EMBEDDING_MAX_CONTENT_CHA
 VECTOR_DIMENSION = 1536
 COLLECTION_NAME = "nuvien-rag-collection"
 MULTI_FILING_SCORE_RATIO = float(os.getenv("RAG_MULTI_FILING_SCORE_RATIO", "0.9"))
+VECTOR_UPSERT_PIPELINED = os.getenv("VECTOR_UPSERT_PIPELINED", "false").strip().lower() in {"1", "true", "yes", "on"}
+
+_POINT_ID_NAMESPACE = uuid.UUID("6f1d2c1e-6a57-5b8e-9a43-5b1d3c0f7a21")
+
+RAG_COLLECTION_SPEC = CollectionSpec(
+    name=COLLECTION_NAME,
+    dimension=VECTOR_DIMENSION,
+    distance=models.Distance.COSINE,
+    payload_indexes={
+        "filing_id": models.PayloadSchemaType.KEYWORD,
+        "ticker": models.PayloadSchemaType.KEYWORD,
+        "source_type": models.PayloadSchemaType.KEYWORD,
+    },
+)
 
 _qdrant_client: Optional[QdrantClient] = None
 
@@ -109,62 +126,29 @@ def _client() -> QdrantClient:
     return _qdrant_client
 
 
-def init_collection() -> None:
-    client = _client()
-    try:
-        client.get_collection(collection_name=COLLECTION_NAME)
-        logger.debug("Qdrant collection '%s' already exists.", COLLECTION_NAME)
-        return
-    except UnexpectedResponse as exc:
-        if getattr(exc, "status_code", None) != 404:
-            raise
-        logger.info("Creating Qdrant collection '%s'.", COLLECTION_NAME)
-    # Create collection and tolerate 'already exists' races
-    try:
-        client.create_collection(
-            collection_name=COLLECTION_NAME,
-            vectors_config=models.VectorParams(size=VECTOR_DIMENSION, distance=models.Distance.COSINE),
-        )
-    except UnexpectedResponse as exc:
-        if getattr(exc, "status_code", None) == 409:
-            logger.debug("Qdrant collection '%s' already exists (409).", COLLECTION_NAME)
-            return
-        raise
+def init_collection(*, force: bool = False) -> None:
+    """Ensure the RAG collection exists; verified once per revalidation interval."""
 
+    get_collection_registry().ensure(_client(), RAG_COLLECTION_SPEC, force=force)
 
-def store_chunk_vectors(
-    filing_id: str,
-    chunks: List[Dict[str, Any]],
-    *,
-    metadata: Optional[Dict[str, Any]] = None,
-) -> None:
-    if not chunks:
-        logger.warning("No chunks provided for filing %s. Skipping vector store upsert.", filing_id)
-        return
 
-    client = _client()
-    init_collection()
+def point_id_for_chunk(filing_id: str, chunk_id: Any, content: str) -> str:
+    """Derive a stable Qdrant point id from the filing, chunk and chunk content.
 
-    jobs: List[Dict[str, Any]] = []
-    for idx, chunk in enumerate(chunks):
-        text = _prepare_chunk_text(chunk.get("content", ""))
-        if not text:
-            continue
-        if len(text) > EMBEDDING_MAX_CONTENT_CHARS:
-            logger.debug(
-                "Truncating chunk content for filing %s (chars=%d -> %d).",
-                filing_id,
-                len(text),
-                EMBEDDING_MAX_CONTENT_CHARS,
-            )
-            text = text[:EMBEDDING_MAX_CONTENT_CHARS]
-        jobs.append({"index": idx, "text": text})
+    Re-ingesting the same chunk produces the same id so the upsert overwrites the
+    existing point instead of adding a duplicate vector.
+    """
+
+    content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    return str(uuid.uuid5(_POINT_ID_NAMESPACE, f"{filing_id}:{chunk_id}:{content_hash}"))
 
-    if not jobs:
-        logger.warning("All chunk contents are empty or invalid for filing %s.", filing_id)
-        return
 
-    vectors: Dict[int, List[float]] = {}
+def _iter_embedding_batches(
+    filing_id: str,
+    jobs: List[Dict[str, Any]],
+) -> Iterator[Tuple[List[Dict[str, Any]], List[List[float]]]]:
+    """Embed ``jobs`` in batches, shrinking the batch when the context window is exceeded."""
+
     cursor = 0
     batch_size = EMBEDDING_BATCH_SIZE
     total = len(jobs)
@@ -209,41 +193,162 @@ def store_chunk_vectors(
             logger.error("Embedding generation failed for filing %s: %s", filing_id, exc, exc_info=True)
             raise
 
-        for offset, item in enumerate(embedding_response.data):
-            job = batch_jobs[offset]
-            vectors[job["index"]] = item["embedding"]
-
+        yield batch_jobs, [item["embedding"] for item in embedding_response.data]
         cursor = end
         batch_size = EMBEDDING_BATCH_SIZE
-    points: List[models.PointStruct] = []
-    for job in jobs:
-        vector = vectors.get(job["index"])
-        if vector is None:
-            continue
-        chunk = chunks[job["index"]]
-        payload = {
-            "filing_id": filing_id,
-            "id": chunk.get("id"),
-            "chunk_id": chunk.get("id"),
-            "page_number": chunk.get("page_number"),
-            "type": chunk.get("type"),
-            "section": chunk.get("section"),
-            "source": chunk.get("source"),
-            "content": job["text"],
-            "metadata": chunk.get("metadata"),
-        }
-        if metadata:
-            for key, value in metadata.items():
-                if value is None:
-                    continue
-                payload[key] = value
-        points.append(models.PointStruct(id=str(uuid.uuid4()), vector=vector, payload=payload))
+
+
+def build_chunk_point(
+    filing_id: str,
+    chunk: Dict[str, Any],
+    vector: List[float],
+    *,
+    text: str,
+    fallback_chunk_id: Any = None,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> models.PointStruct:
+    """Build the Qdrant point for one embedded chunk with its deterministic id."""
+
+    chunk_id = chunk.get("id")
+    payload = {
+        "filing_id": filing_id,
+        "id": chunk_id,
+        "chunk_id": chunk_id,
+        "page_number": chunk.get("page_number"),
+        "type": chunk.get("type"),
+        "section": chunk.get("section"),
+        "source": chunk.get("source"),
+        "content": text,
+        "metadata": chunk.get("metadata"),
+    }
+    if metadata:
+        for key, value in metadata.items():
+            if value is None:
+                continue
+            payload[key] = value
+    point_id = point_id_for_chunk(filing_id, chunk_id if chunk_id is not None else fallback_chunk_id, text)
+    return models.PointStruct(id=point_id, vector=vector, payload=payload)
+
+
+def _build_points(
+    filing_id: str,
+    chunks: List[Dict[str, Any]],
+    batch_jobs: List[Dict[str, Any]],
+    vectors: List[List[float]],
+    metadata: Optional[Dict[str, Any]],
+) -> List[models.PointStruct]:
+    return [
+        build_chunk_point(
+            filing_id,
+            chunks[job["index"]],
+            vector,
+            text=job["text"],
+            fallback_chunk_id=job["index"],
+            metadata=metadata,
+        )
+        for job, vector in zip(batch_jobs, vectors)
+    ]
+
+
+def upsert_points(points: List[models.PointStruct], *, wait: bool = True) -> None:
+    """Upsert pre-built points into the RAG collection in a single request."""
 
     if not points:
+        return
+    client = _client()
+    init_collection()
+    client.upsert(collection_name=COLLECTION_NAME, points=points, wait=wait)
+
+
+def store_chunk_vectors(
+    filing_id: str,
+    chunks: List[Dict[str, Any]],
+    *,
+    metadata: Optional[Dict[str, Any]] = None,
+    pipelined: Optional[bool] = None,
+) -> None:
+    """Embed and upsert ``chunks`` for ``filing_id``.
+
+    Point ids are deterministic (see :func:`point_id_for_chunk`), so re-ingesting a
+    filing overwrites its vectors. With ``pipelined`` (default from
+    ``VECTOR_UPSERT_PIPELINED``) each embedded batch is upserted in the background
+    while the next batch is embedded; only the final upsert waits for Qdrant.
+    """
+
+    if not chunks:
+        logger.warning("No chunks provided for filing %s. Skipping vector store upsert.", filing_id)
+        return
+
+    client = _client()
+    init_collection()
+
+    jobs: List[Dict[str, Any]] = []
+    for idx, chunk in enumerate(chunks):
+        text = _prepare_chunk_text(chunk.get("content", ""))
+        if not text:
+            continue
+        if len(text) > EMBEDDING_MAX_CONTENT_CHARS:
+            logger.debug(
+                "Truncating chunk content for filing %s (chars=%d -> %d).",
+                filing_id,
+                len(text),
+                EMBEDDING_MAX_CONTENT_CHARS,
+            )
+            text = text[:EMBEDDING_MAX_CONTENT_CHARS]
+        jobs.append({"index": idx, "text": text})
+
+    if not jobs:
+        logger.warning("All chunk contents are empty or invalid for filing %s.", filing_id)
+        return
+
+    use_pipeline = VECTOR_UPSERT_PIPELINED if pipelined is None else pipelined
+    if use_pipeline:
+        stored = _store_batches_pipelined(client, filing_id, chunks, jobs, metadata)
+    else:
+        points: List[models.PointStruct] = []
+        for batch_jobs, vectors in _iter_embedding_batches(filing_id, jobs):
+            points.extend(_build_points(filing_id, chunks, batch_jobs, vectors, metadata))
+        if points:
+            client.upsert(collection_name=COLLECTION_NAME, points=points, wait=True)
+        stored = len(points)
+
+    if not stored:
         logger.warning("No vectors generated for filing %s after filtering invalid chunks.", filing_id)
         return
-    client.upsert(collection_name=COLLECTION_NAME, points=points, wait=True)
-    logger.info("Stored %d vectors for filing %s.", len(points), filing_id)
+    logger.info("Stored %d vectors for filing %s.", stored, filing_id)
+
+
+def _store_batches_pipelined(
+    client: QdrantClient,
+    filing_id: str,
+    chunks: List[Dict[str, Any]],
+    jobs: List[Dict[str, Any]],
+    metadata: Optional[Dict[str, Any]],
+) -> int:
+    """Overlap the upsert of batch N with the embedding of batch N+1.
+
+    Intermediate batches are sent with ``wait=False``; the last batch uses
+    ``wait=True`` so the call returns only once every preceding write has been applied.
+    """
+
+    stored = 0
+    in_flight: Optional[Future] = None
+    pending: List[models.PointStruct] = []
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="qdrant-upsert") as executor:
+        for batch_jobs, vectors in _iter_embedding_batches(filing_id, jobs):
+            if pending:
+                if in_flight is not None:
+                    in_flight.result()
+                in_flight = executor.submit(
+                    client.upsert, collection_name=COLLECTION_NAME, points=pending, wait=False
+                )
+            pending = _build_points(filing_id, chunks, batch_jobs, vectors, metadata)
+            stored += len(pending)
+        if in_flight is not None:
+            in_flight.result()
+    if pending:
+        client.upsert(collection_name=COLLECTION_NAME, points=pending, wait=True)
+    return stored
 
 
 def update_filing_metadata(filing_id: str, metadata: Dict[str, Any]) -> None:
@@ -277,44 +382,17 @@ def update_filing_metadata(filing_id: str, metadata: Dict[str, Any]) -> None:
             filter=payload_filter,
         )
     except Exception as exc:
+        get_collection_registry().invalidate(COLLECTION_NAME)
         logger.error("Failed to update vector metadata for filing %s: %s", filing_id, exc, exc_info=True)
         raise RuntimeError("Vector metadata update failed.") from exc
     else:
         logger.info("Updated vector metadata for filing %s with keys: %s.", filing_id, ", ".join(cleaned.keys()))
 
 
-def query_vector_store(
-    query_text: str,
-    *,
-    filing_id: Optional[str] = None,
-    top_k: int = 5,
-    max_filings: int = 1,
-    filters: Optional[Dict[str, Any]] = None,
-    multi_mode: bool = False,
-) -> VectorSearchResult:
-    normalized_query = query_text.strip() if isinstance(query_text, str) else str(query_text or "").strip()
-    if not normalized_query:
-        raise ValueError("query_text must be a non-empty string.")
-    if top_k <= 0:
-        raise ValueError("top_k must be greater than zero.")
-    if max_filings <= 0:
-        raise ValueError("max_filings must be greater than zero.")
-
-    client = _client()
-    try:
-        init_collection()
-    except Exception as exc:
-        logger.error("Failed to ensure Qdrant collection: %s", exc, exc_info=True)
-        raise RuntimeError("Vector collection unavailable.") from exc
-
-    try:
-        embedding_response = litellm.embedding(model=EMBEDDING_MODEL, input=[normalized_query])
-    except Exception as exc:
-        logger.error("Embedding generation for query failed: %s", exc, exc_info=True)
-        raise RuntimeError("Embedding generation failed.") from exc
-
-    query_vector = embedding_response.data[0]["embedding"]
-
+def _build_filter_conditions(
+    filing_id: Optional[str],
+    filters: Optional[Dict[str, Any]],
+) -> List[models.FieldCondition]:
     filter_conditions: List[models.FieldCondition] = []
     if filing_id:
         filter_conditions.append(
@@ -366,6 +444,40 @@ def query_vector_store(
                 )
             )
 
+    return filter_conditions
+
+
+def query_vector_store(
+    query_text: str,
+    *,
+    filing_id: Optional[str] = None,
+    top_k: int = 5,
+    max_filings: int = 1,
+    filters: Optional[Dict[str, Any]] = None,
+    multi_mode: bool = False,
+) -> VectorSearchResult:
+    normalized_query = query_text.strip() if isinstance(query_text, str) else str(query_text or "").strip()
+    if not normalized_query:
+        raise ValueError("query_text must be a non-empty string.")
+    if top_k <= 0:
+        raise ValueError("top_k must be greater than zero.")
+    if max_filings <= 0:
+        raise ValueError("max_filings must be greater than zero.")
+
+    client = _client()
+    try:
+        init_collection()
+    except Exception as exc:
+        logger.error("Failed to ensure Qdrant collection: %s", exc, exc_info=True)
+        raise RuntimeError("Vector collection unavailable.") from exc
+
+    try:
+        query_vector = embed_text(normalized_query, model_name=EMBEDDING_MODEL)
+    except Exception as exc:
+        logger.error("Embedding generation for query failed: %s", exc, exc_info=True)
+        raise RuntimeError("Embedding generation failed.") from exc
+
+    filter_conditions = _build_filter_conditions(filing_id, filters)
     query_filter = models.Filter(must=filter_conditions) if filter_conditions else None
 
     search_limit = max(top_k * max_filings * 4, top_k)
@@ -378,6 +490,7 @@ def query_vector_store(
             with_payload=True,
         )
     except Exception as exc:
+        get_collection_registry().invalidate(COLLECTION_NAME)
         logger.error("Qdrant search failed: %s", exc, exc_info=True)
         raise RuntimeError("Vector search failed.") from exc
 
@@ -444,10 +557,89 @@ def query_vector_store(
     )
 
 
+def query_vector_store_by_filings(
+    query_text: str,
+    filing_ids: List[str],
+    *,
+    top_k: int = 5,
+    filters: Optional[Dict[str, Any]] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Return the top ``top_k`` chunks for each filing using one embedding and one round-trip.
+
+    Equivalent to calling :func:`query_vector_store` with ``filing_id`` set for each
+    entry in ``filing_ids``, but the question is embedded once and all per-filing
+    searches are sent in a single Qdrant ``search_batch`` request.
+    """
+
+    normalized_query = query_text.strip() if isinstance(query_text, str) else str(query_text or "").strip()
+    if not normalized_query:
+        raise ValueError("query_text must be a non-empty string.")
+    if top_k <= 0:
+        raise ValueError("top_k must be greater than zero.")
+    ordered_ids = list(dict.fromkeys(str(doc_id) for doc_id in filing_ids if doc_id))
+    if not ordered_ids:
+        return {}
+
+    client = _client()
+    try:
+        init_collection()
+    except Exception as exc:
+        logger.error("Failed to ensure Qdrant collection: %s", exc, exc_info=True)
+        raise RuntimeError("Vector collection unavailable.") from exc
+
+    try:
+        query_vector = embed_text(normalized_query, model_name=EMBEDDING_MODEL)
+    except Exception as exc:
+        logger.error("Embedding generation for query failed: %s", exc, exc_info=True)
+        raise RuntimeError("Embedding generation failed.") from exc
+
+    search_limit = max(top_k * 4, top_k)
+    requests = [
+        models.SearchRequest(
+            vector=query_vector,
+            filter=models.Filter(must=_build_filter_conditions(doc_id, filters)),
+            limit=search_limit,
+            with_payload=True,
+        )
+        for doc_id in ordered_ids
+    ]
+    try:
+        batch_results = client.search_batch(collection_name=COLLECTION_NAME, requests=requests)
+    except Exception as exc:
+        get_collection_registry().invalidate(COLLECTION_NAME)
+        logger.error("Qdrant batch search failed: %s", exc, exc_info=True)
+        raise RuntimeError("Vector search failed.") from exc
+
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for doc_id, points in zip(ordered_ids, batch_results):
+        items: List[Dict[str, Any]] = []
+        for point in points:
+            normalized = _normalize_chunk_payload(dict(point.payload or {}))
+            normalized["score"] = float(point.score or 0.0)
+            if str(normalized.get("filing_id") or "") != doc_id:
+                continue
+            normalized.setdefault("id", normalized.get("chunk_id"))
+            items.append(normalized)
+        items.sort(key=lambda item: float(item.get("score") or 0.0), reverse=True)
+        grouped[doc_id] = items[:top_k]
+
+    logger.info(
+        "Retrieved %d chunks across %d filings in one batch.",
+        sum(len(items) for items in grouped.values()),
+        len(grouped),
+    )
+    return grouped
+
+
 __all__ = [
+    "build_chunk_point",
+    "point_id_for_chunk",
     "store_chunk_vectors",
+    "upsert_points",
     "update_filing_metadata",
     "query_vector_store",
+    "query_vector_store_by_filings",
     "init_collection",
+    "RAG_COLLECTION_SPEC",
     "VectorSearchResult",
 ]
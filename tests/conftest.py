@@ -58,6 +58,21 @@ def pytest_configure(config: pytest.Config) -> None:
     config.addinivalue_line("markers", "postgres: requires a PostgreSQL database")
 
 
+_FILING_EVENT_TABLES = (
+    "evidence_snapshots",
+    "filings",
+    "security_metadata",
+    "filing_events",
+    "prices",
+    "events",
+    "event_study",
+    "event_windows",
+    "event_summary",
+    "event_cohort_partials",
+    "event_job_checkpoints",
+)
+
+
 def _resolve_test_database_url() -> Tuple[str, bool]:
     candidate = os.getenv("TEST_DATABASE_URL") or os.getenv("DATABASE_URL")
     url = candidate or "sqlite+pysqlite:///:memory:"
@@ -94,7 +109,7 @@ def engine(request: pytest.FixtureRequest) -> Generator["Engine", None, None]:
         "chat_messages",
         "chat_messages_archive",
         "chat_audit",
-        "evidence_snapshots",
+        *_FILING_EVENT_TABLES,
     }
 
     tables = [
@@ -170,3 +185,17 @@ def db_session(engine: "Engine") -> Generator["Session", None, None]:
         session_factory.configure(bind=engine)
         transaction.rollback()
         connection.close()
+
+
+@pytest.fixture()
+def filing_event_db(db_session: "Session") -> "Session":
+    """``db_session`` with the filing, evidence and event-study tables emptied.
+
+    Tests that commit through these tables leave rows behind on SQLite, so each
+    test starts from empty tables and seeds only what it needs.
+    """
+
+    for table in reversed(Base.metadata.sorted_tables):
+        if table.name in _FILING_EVENT_TABLES:
+            db_session.execute(table.delete())
+    return db_session
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import time
+
+from services.circuit_breaker import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, CircuitBreaker
+
+
+def test_opens_after_threshold_and_recovers_after_cooldown() -> None:
+    breaker = CircuitBreaker("unit-cooldown", failure_threshold=2, cooldown_seconds=0.05)
+
+    breaker.record_failure()
+    assert breaker.state == STATE_CLOSED
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert breaker.allow_request() is False
+
+    time.sleep(0.06)
+    assert breaker.allow_request() is True
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.allow_request() is False
+
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.allow_request() is True
+
+
+def test_half_open_failure_reopens() -> None:
+    breaker = CircuitBreaker("unit-reopen", failure_threshold=1, cooldown_seconds=0.0)
+    breaker.record_failure()
+    assert breaker.allow_request() is True
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+
+
+def test_background_probe_moves_breaker_to_half_open() -> None:
+    calls = []
+    breaker = CircuitBreaker(
+        "unit-probe",
+        failure_threshold=1,
+        cooldown_seconds=0.0,
+        probe_interval_seconds=0.1,
+    )
+
+    breaker.record_failure(probe=lambda: calls.append("probe"))
+    assert breaker.allow_request() is False
+
+    deadline = time.monotonic() + 2.0
+    while breaker.state == STATE_OPEN and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert calls
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.allow_request() is True
@@ -0,0 +1,131 @@
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+
+from ingest.dart_client import DartClient
+from ingest.rate_limiter import TokenBucket
+
+TOTAL_PAGES = 5
+PAGE_COUNT = 3
+
+
+class _StubDartHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802 - http.server API
+        parsed = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        server = self.server
+        with server.lock:
+            server.requests.append((time.monotonic(), parsed.path, query, self.client_address[1]))
+        if parsed.path.endswith("/list.json"):
+            page = int(query["page_no"])
+            items = [{"rcept_no": f"{page:04d}{index}"} for index in range(PAGE_COUNT if page < TOTAL_PAGES else 1)]
+            payload = {"status": "000", "page_no": page, "total_page": TOTAL_PAGES, "list": items}
+        else:
+            payload = {"status": "000", "list": [{"corp_code": query.get("corp_code")}]}
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pragma: no cover - keep test output quiet
+        pass
+
+
+@pytest.fixture()
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubDartHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _client(server, *, limiter=None, http_client=None):
+    host, port = server.server_address
+    return DartClient(
+        api_key="test-key",
+        base_url=f"http://{host}:{port}/api",
+        http_client=http_client,
+        rate_limiter=limiter or TokenBucket(1000.0, 1000),
+    )
+
+
+def test_token_bucket_paces_after_burst():
+    now = [0.0]
+    sleeps = []
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(2.0, 2, clock=lambda: now[0], sleep=fake_sleep)
+    waits = [bucket.acquire() for _ in range(4)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.5)
+    assert waits[3] == pytest.approx(0.5)
+    assert sum(sleeps) == pytest.approx(1.0)
+
+
+def test_concurrent_pagination_matches_sequential(stub_server):
+    with httpx.Client() as http_client:
+        client = _client(stub_server, http_client=http_client)
+        since = datetime(2024, 1, 1)
+        sequential = client.list_recent_filings(since, page_count=PAGE_COUNT, concurrency=1)
+        concurrent = client.list_recent_filings(since, page_count=PAGE_COUNT, concurrency=4)
+        capped = client.list_recent_filings(since, page_count=PAGE_COUNT, concurrency=4, max_pages=2)
+
+    assert [item["rcept_no"] for item in concurrent] == [item["rcept_no"] for item in sequential]
+    assert len(sequential) == (TOTAL_PAGES - 1) * PAGE_COUNT + 1
+    assert len(capped) == 2 * PAGE_COUNT
+    list_calls = [entry for entry in stub_server.requests if entry[1].endswith("/list.json")]
+    assert len(list_calls) == TOTAL_PAGES * 2 + 2
+
+
+def test_rate_limiter_bounds_request_rate_across_threads(stub_server):
+    limiter = TokenBucket(20.0, 1)
+    with httpx.Client() as http_client:
+        client = _client(stub_server, limiter=limiter, http_client=http_client)
+        started = time.monotonic()
+        threads = [
+            threading.Thread(target=client.fetch_major_shareholders, args=(f"{index:08d}", 2023, "11011"))
+            for index in range(6)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+    assert len(stub_server.requests) == 6
+    # One token up front, then 20/s: five further requests need at least 0.25s.
+    assert elapsed >= 0.24
+    stamps = sorted(entry[0] for entry in stub_server.requests)
+    assert stamps[-1] - stamps[0] >= 0.2
+
+
+def test_fetch_methods_reuse_pooled_connections(stub_server):
+    with httpx.Client() as http_client:
+        client = _client(stub_server, http_client=http_client)
+        for year in (2021, 2022, 2023):
+            client.fetch_single_account_summary("00126380", year, "11011")
+            client.fetch_major_shareholders("00126380", year, "11011")
+
+    client_ports = {entry[3] for entry in stub_server.requests}
+    assert len(stub_server.requests) == 6
+    assert len(client_ports) == 1
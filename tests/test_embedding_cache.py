@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from services import embedding_utils, kv_tier
+from services.embedding_cache import EmbeddingCache, reset_embedding_cache
+from services.kv_tier import SqliteBlobTier
+
+
+class _FakeEmbedder:
+    def __init__(self) -> None:
+        self.calls: List[List[str]] = []
+
+    def __call__(self, texts: List[str]) -> List[List[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(text)), 0.5, -1.25] for text in texts]
+
+
+def test_get_or_embed_only_embeds_misses() -> None:
+    cache = EmbeddingCache(max_entries=8)
+    embedder = _FakeEmbedder()
+
+    first = cache.get_or_embed("model-a", ["삼성전자 실적", "배당 정책"], embedder)
+    second = cache.get_or_embed("model-a", ["삼성전자   실적", "신규 질문"], embedder)
+
+    assert embedder.calls == [["삼성전자 실적", "배당 정책"], ["신규 질문"]]
+    assert second[0] == first[0]
+    assert second[1] == [5.0, 0.5, -1.25]
+
+
+def test_keys_are_scoped_by_model_and_deduplicated() -> None:
+    cache = EmbeddingCache(max_entries=8)
+    embedder = _FakeEmbedder()
+
+    cache.get_or_embed("model-a", ["query", "query "], embedder)
+    cache.get_or_embed("model-b", ["query"], embedder)
+
+    assert embedder.calls == [["query"], ["query"]]
+
+
+def test_lru_evicts_oldest_entry() -> None:
+    cache = EmbeddingCache(max_entries=2)
+    cache.set("m", "a", [1.0])
+    cache.set("m", "b", [2.0])
+    assert cache.get("m", "a") == [1.0]
+    cache.set("m", "c", [3.0])
+
+    assert cache.get("m", "b") is None
+    assert cache.get("m", "a") == [1.0]
+    assert len(cache) == 2
+
+
+def test_memory_entries_expire_after_ttl(monkeypatch) -> None:
+    clock = [1000.0]
+    monkeypatch.setattr(kv_tier.time, "monotonic", lambda: clock[0])
+    cache = EmbeddingCache(max_entries=8, ttl_seconds=60)
+    cache.set("m", "a", [1.0])
+
+    clock[0] += 59
+    assert cache.get("m", "a") == [1.0]
+    clock[0] += 2
+    assert cache.get("m", "a") is None
+    assert len(cache) == 0
+
+
+def test_invalidate_by_text_and_model() -> None:
+    cache = EmbeddingCache(max_entries=8)
+    cache.set("m1", "a", [1.0])
+    cache.set("m1", "b", [2.0])
+    cache.set("m2", "a", [3.0])
+
+    cache.invalidate(model="m1", text="a")
+    assert cache.get("m1", "a") is None
+    assert cache.get("m1", "b") == [2.0]
+
+    cache.invalidate(model="m1")
+    assert cache.get("m1", "b") is None
+    assert cache.get("m2", "a") == [3.0]
+
+    with pytest.raises(ValueError):
+        cache.invalidate(text="a")
+
+
+def _sqlite_tier(path: str) -> SqliteBlobTier:
+    return SqliteBlobTier(path, table="embedding_cache", prefix="emb:v1", ttl_seconds=60)
+
+
+def test_sqlite_tier_survives_new_process_cache(tmp_path: Path) -> None:
+    path = str(tmp_path / "embeddings.sqlite3")
+    writer = EmbeddingCache(max_entries=4, shared=_sqlite_tier(path))
+    writer.set("m", "persisted question", [0.25, 0.5])
+
+    reader = EmbeddingCache(max_entries=4, shared=_sqlite_tier(path))
+    embedder = _FakeEmbedder()
+    vectors = reader.get_or_embed("m", ["persisted question"], embedder)
+
+    assert vectors == [[0.25, 0.5]]
+    assert embedder.calls == []
+
+
+def test_invalidate_reaches_the_shared_tier(tmp_path: Path) -> None:
+    path = str(tmp_path / "embeddings.sqlite3")
+    writer = EmbeddingCache(max_entries=4, shared=_sqlite_tier(path))
+    writer.set("m_1", "a", [1.0])
+    writer.set("m_1", "b", [2.0])
+    writer.set("m%1", "a", [3.0])
+    writer.invalidate(model="m_1", text="a")
+    writer.invalidate(model="m%1")
+
+    reader = EmbeddingCache(max_entries=4, shared=_sqlite_tier(path))
+    assert reader.get("m_1", "a") is None
+    assert reader.get("m_1", "b") == [2.0]
+    assert reader.get("m%1", "a") is None
+
+
+def test_embed_text_uses_process_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    reset_embedding_cache()
+    embedder = _FakeEmbedder()
+    monkeypatch.setattr(embedding_utils, "_embed_remote", lambda _model, texts: embedder(texts))
+
+    first = embedding_utils.embed_text("  반복 질문 ", model_name="unit-test-model")
+    second = embedding_utils.embed_text("반복 질문", model_name="unit-test-model")
+
+    assert first == second
+    assert len(embedder.calls) == 1
+    reset_embedding_cache()
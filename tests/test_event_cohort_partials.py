@@ -0,0 +1,126 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from models.event_study import (
+    EventRecord,
+    EventStudyResult,
+    EventSummary,
+    EventWindow,
+)
+from services import event_cohort_partials, event_study_service
+
+
+@pytest.fixture()
+def event_db(filing_event_db):
+    filing_event_db.add(
+        EventWindow(key="window_test", label="[-1,+1]", start_offset=-1, end_offset=1, is_default=True)
+    )
+    filing_event_db.commit()
+    return filing_event_db
+
+
+def _add_event(db, rng, index, *, event_type="BUYBACK", cap_bucket="LARGE", day=None, complete=True):
+    rcept_no = f"R{index:04d}"
+    db.add(
+        EventRecord(
+            rcept_no=rcept_no,
+            corp_code="00000000",
+            ticker="005930",
+            event_type=event_type,
+            event_date=day or date(2024, 1 + index % 3, 1 + index % 27),
+            cap_bucket=cap_bucket,
+        )
+    )
+    car = 0.0
+    for t in (-1, 0, 1) if complete else (-1, 0):
+        ar = round(rng.gauss(0.001, 0.02), 6)
+        car = round(car + ar, 6)
+        db.add(EventStudyResult(rcept_no=rcept_no, t=t, ar=ar, car=car))
+    return rcept_no
+
+
+def _full_summary(db, event_type, cap_bucket):
+    query = db.query(EventRecord).filter(EventRecord.event_type == event_type)
+    if cap_bucket != "ALL":
+        query = query.filter(EventRecord.cap_bucket == cap_bucket)
+    return event_study_service._build_cohort_summary(
+        db, query.all(), start=-1, end=1, significance=0.1, min_samples=5
+    )
+
+
+def _stored_summary(db, event_type, cap_bucket):
+    return (
+        db.query(EventSummary)
+        .filter(EventSummary.event_type == event_type, EventSummary.cap_bucket == cap_bucket)
+        .one()
+    )
+
+
+def test_incremental_summaries_match_full_recompute(event_db, monkeypatch):
+    rng = random.Random(42)
+    for index in range(60):
+        _add_event(event_db, rng, index, cap_bucket=("LARGE", "SMALL", None)[index % 3], complete=index % 10 != 0)
+    event_db.commit()
+
+    as_of = date(2024, 6, 30)
+    created = event_study_service.aggregate_event_summaries(event_db, as_of=as_of)
+    assert created == 3  # BUYBACK x (ALL, LARGE, SMALL)
+
+    for cap_bucket in ("ALL", "LARGE", "SMALL"):
+        stored = _stored_summary(event_db, "BUYBACK", cap_bucket)
+        expected = _full_summary(event_db, "BUYBACK", cap_bucket)
+        assert stored.n == expected.n
+        assert stored.dist == expected.dist
+        assert stored.caar == expected.caar
+        assert float(stored.mean_caar) == pytest.approx(expected.mean_caar, abs=1e-9)
+        assert float(stored.p_value) == pytest.approx(expected.p_value, abs=1e-9)
+
+    rebuilt = []
+    original = event_cohort_partials._rebuild_cells
+
+    def tracking_rebuild(db, cells, **kwargs):
+        rebuilt.append(list(cells))
+        return original(db, cells, **kwargs)
+
+    monkeypatch.setattr(event_cohort_partials, "_rebuild_cells", tracking_rebuild)
+
+    event_study_service.aggregate_event_summaries(event_db, as_of=as_of)
+    assert rebuilt == []
+
+    _add_event(event_db, rng, 999, cap_bucket="SMALL", day=date(2024, 5, 10))
+    event_db.commit()
+    event_study_service.aggregate_event_summaries(event_db, as_of=as_of)
+
+    assert rebuilt == [[event_cohort_partials.CohortCell("BUYBACK", "SMALL", date(2024, 5, 1))]]
+    event_db.expire_all()
+    for cap_bucket in ("ALL", "SMALL"):
+        stored = _stored_summary(event_db, "BUYBACK", cap_bucket)
+        expected = _full_summary(event_db, "BUYBACK", cap_bucket)
+        assert stored.n == expected.n
+        assert stored.dist == expected.dist
+
+
+def test_moved_and_deleted_events_drop_out_of_their_old_cells(event_db):
+    rng = random.Random(1)
+    receipts = [_add_event(event_db, rng, index, cap_bucket="LARGE", day=date(2024, 3, 1) + timedelta(days=index)) for index in range(6)]
+    event_db.commit()
+    event_study_service.aggregate_event_summaries(event_db, as_of=date(2024, 6, 30))
+    assert _stored_summary(event_db, "BUYBACK", "LARGE").n == 6
+
+    event_db.get(EventRecord, receipts[0]).cap_bucket = "MID"
+    event_db.query(EventStudyResult).filter(EventStudyResult.rcept_no == receipts[1]).delete()
+    event_db.commit()
+
+    partials = event_cohort_partials.refresh_cohort_partials(
+        event_db,
+        window_key="[-1,1]",
+        start=-1,
+        end=1,
+        event_types=["BUYBACK"],
+    )
+    cohorts = event_cohort_partials.merge_cohorts(partials, width=3)
+    assert cohorts[("BUYBACK", "LARGE")].n == 4
+    assert cohorts[("BUYBACK", "MID")].n == 1
+    assert cohorts[("BUYBACK", "ALL")].n == 5
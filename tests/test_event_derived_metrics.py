@@ -0,0 +1,115 @@
+import uuid
+from datetime import date
+
+import pytest
+
+from models.company import FilingEvent
+from models.event_study import (
+    EventJobCheckpoint,
+    EventRecord,
+    EventStudyResult,
+    EventSummary,
+    EventWindow,
+)
+from services import event_study_service
+
+
+@pytest.fixture()
+def metrics_db(filing_event_db):
+    filing_event_db.add(
+        EventWindow(key="window_test", label="[-1,+1]", start_offset=-1, end_offset=1, is_default=True)
+    )
+    for cap_bucket, p_value in (("ALL", 0.2), ("LARGE", 0.03)):
+        filing_event_db.add(
+            EventSummary(
+                asof=date(2024, 6, 30),
+                event_type="BUYBACK",
+                window_key="[-1,1]",
+                cap_bucket=cap_bucket,
+                n=10,
+                p_value=p_value,
+            )
+        )
+    for index in range(7):
+        rcept_no = f"R{index:03d}"
+        filing_event_db.add(
+            EventRecord(
+                rcept_no=rcept_no,
+                corp_code="00000000",
+                event_type="BUYBACK",
+                cap_bucket="LARGE" if index % 2 else None,
+            )
+        )
+        if index != 4:
+            filing_event_db.add(EventStudyResult(rcept_no=rcept_no, t=1, ar=0.01, car=0.01 * index))
+            filing_event_db.add(EventStudyResult(rcept_no=rcept_no, t=0, ar=0.5, car=0.5))
+        filing_event_db.add(
+            FilingEvent(
+                id=uuid.UUID(int=index + 1),
+                corp_code="00000000",
+                receipt_no=rcept_no,
+                event_type="BUYBACK",
+                source="test",
+                derived_metrics={"caar": -1.0} if index == 6 else None,
+            )
+        )
+    filing_event_db.add(FilingEvent(id=uuid.UUID(int=99), corp_code="00000000", receipt_no="UNKNOWN", event_type="SEO", source="test"))
+    filing_event_db.commit()
+    return filing_event_db
+
+
+def _derived(db):
+    db.expire_all()
+    return {row.receipt_no: row.derived_metrics for row in db.query(FilingEvent)}
+
+
+def test_streaming_update_matches_expected_metrics(metrics_db):
+    updated = event_study_service.update_event_derived_metrics(metrics_db, batch_size=3)
+
+    assert updated == 7
+    derived = _derived(metrics_db)
+    assert derived["R001"] == {"caar": pytest.approx(0.01), "p_value": pytest.approx(0.03)}
+    assert derived["R002"] == {"caar": pytest.approx(0.02), "p_value": pytest.approx(0.2)}
+    assert derived["R004"] == {"p_value": pytest.approx(0.2)}
+    assert derived["R006"] == {"caar": -1.0, "p_value": pytest.approx(0.2)}
+    assert derived["UNKNOWN"] is None
+    assert metrics_db.query(EventJobCheckpoint).count() == 0
+
+    assert event_study_service.update_event_derived_metrics(metrics_db, batch_size=3) == 0
+
+
+def test_interrupted_run_resumes_after_last_committed_batch(metrics_db, monkeypatch):
+    original_update = event_study_service.update
+    calls = []
+
+    def failing_update(model):
+        calls.append(model)
+        if len(calls) == 2:
+            raise RuntimeError("worker killed")
+        return original_update(model)
+
+    monkeypatch.setattr(event_study_service, "update", failing_update)
+    with pytest.raises(RuntimeError):
+        event_study_service.update_event_derived_metrics(metrics_db, batch_size=3)
+
+    checkpoint = metrics_db.get(EventJobCheckpoint, "derived_metrics:[-1,1]")
+    assert checkpoint.position["updated"] == 3
+    assert checkpoint.position["last_id"] == str(uuid.UUID(int=3))
+
+    monkeypatch.setattr(event_study_service, "update", original_update)
+    processed = []
+    original_to_float = event_study_service.to_float
+
+    def tracking_to_float(value):
+        processed.append(value)
+        return original_to_float(value)
+
+    monkeypatch.setattr(event_study_service, "to_float", tracking_to_float)
+    updated = event_study_service.update_event_derived_metrics(metrics_db, batch_size=3)
+
+    assert updated == 7
+    assert len(processed) == 4 + 5  # two summaries, then only the filing events after the checkpoint
+    derived = _derived(metrics_db)
+    assert derived.pop("UNKNOWN") is None
+    assert all(value and "p_value" in value for value in derived.values())
+    assert metrics_db.query(EventJobCheckpoint).count() == 0
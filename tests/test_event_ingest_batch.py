@@ -0,0 +1,111 @@
+import uuid
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+
+from models.event_study import EventRecord
+from models.filing import Filing
+from models.security_metadata import SecurityMetadata
+from services import event_study_service
+from services.event_extractor import EventAttributes
+
+
+@pytest.fixture()
+def ingest_jobs():
+    return []
+
+
+@pytest.fixture()
+def ingest_db(filing_event_db, ingest_jobs, monkeypatch):
+    monkeypatch.setattr(
+        event_study_service,
+        "_create_ingest_job",
+        lambda start_date, end_date: SimpleNamespace(id=uuid.uuid4()),
+    )
+    monkeypatch.setattr(event_study_service, "_update_ingest_job", lambda job_id, **fields: ingest_jobs.append(fields))
+
+    def fake_extract(filing):
+        if "skip" in (filing.title or ""):
+            return EventAttributes(event_type=None, amount=None, ratio=None, method=None, score=0.0)
+        return EventAttributes(
+            event_type="BUYBACK",
+            amount=1_000.0,
+            ratio=None,
+            method=filing.title,
+            score=0.5,
+            timing_rule="AFTER_CLOSE_DPLUS1",
+            matches={"any_of": [filing.title]},
+        )
+
+    monkeypatch.setattr(event_study_service, "extract_event_attributes", fake_extract)
+    return filing_event_db
+
+
+def _add_filing(db, index, *, ticker="005930", hour=9, title="buyback"):
+    db.add(
+        Filing(
+            corp_code="00126380",
+            corp_name="Samsung",
+            ticker=ticker,
+            title=title,
+            receipt_no=f"2024{index:08d}",
+            filed_at=datetime(2024, 3, 4 + index % 3, hour),
+            urls={"viewer": f"https://dart.example/{index}"},
+        )
+    )
+
+
+def test_batched_ingest_prefetches_per_chunk_and_upserts(ingest_db, ingest_jobs):
+    ingest_db.add(SecurityMetadata(ticker="005930", market_cap=400_000, cap_bucket="LARGE"))
+    for index in range(7):
+        _add_filing(ingest_db, index, ticker="005930" if index % 2 else "000660", hour=17 if index == 3 else 9)
+    _add_filing(ingest_db, 7, title="skip me")
+    ingest_db.add(EventRecord(rcept_no="202400000001", corp_code="00126380", event_type="BUYBACK", method="stale"))
+    ingest_db.commit()
+
+    statements = []
+    engine = ingest_db.get_bind()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        created = event_study_service.ingest_events_from_filings(
+            ingest_db, start_date=date(2024, 3, 1), end_date=date(2024, 3, 31), batch_size=3
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert created == 6
+    assert ingest_jobs[-1] == {"status": "completed", "events_created": 6, "events_skipped": 1}
+    metadata_queries = [sql for sql in statements if "FROM security_metadata" in sql]
+    event_inserts = [sql for sql in statements if sql.startswith("INSERT INTO events")]
+    assert len(metadata_queries) == 3  # one per chunk of three filings
+    assert len(event_inserts) == 3
+
+    ingest_db.expire_all()
+    assert ingest_db.get(EventRecord, "202400000001").method == "stale"
+    late = ingest_db.get(EventRecord, "202400000003")
+    assert late.event_date == date(2024, 3, 5)  # filed after the close -> D+1
+    assert (late.cap_bucket, float(late.market_cap)) == ("LARGE", 400_000)
+    assert late.metadata == {"timingRule": "AFTER_CLOSE_DPLUS1", "matches": {"any_of": ["buyback"]}}
+    assert ingest_db.get(EventRecord, "202400000000").cap_bucket is None
+    assert ingest_db.get(EventRecord, "202400000007") is None
+
+
+def test_refresh_existing_overwrites_ingested_events(ingest_db):
+    _add_filing(ingest_db, 1)
+    ingest_db.add(EventRecord(rcept_no="202400000001", corp_code="00126380", event_type="SEO", method="stale"))
+    ingest_db.commit()
+
+    created = event_study_service.ingest_events_from_filings(
+        ingest_db, start_date=date(2024, 3, 1), end_date=date(2024, 3, 31), refresh_existing=True
+    )
+
+    assert created == 0
+    ingest_db.expire_all()
+    refreshed = ingest_db.get(EventRecord, "202400000001")
+    assert (refreshed.event_type, refreshed.method, refreshed.ticker) == ("BUYBACK", "buyback", "005930")
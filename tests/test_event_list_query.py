@@ -0,0 +1,113 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from models.event_study import EventRecord, EventStudyResult
+from models.evidence import EvidenceSnapshot
+from services import event_study_service
+
+
+@pytest.fixture()
+def events_db(filing_event_db):
+    rng = random.Random(3)
+    for index in range(11):
+        rcept_no = f"R{index:03d}"
+        event_date = None if index in (4, 9) else date(2024, 5, 1) + timedelta(days=index % 4)
+        filing_event_db.add(
+            EventRecord(
+                rcept_no=rcept_no,
+                corp_code="00000000",
+                ticker="005930",
+                event_type="BUYBACK",
+                event_date=event_date,
+            )
+        )
+        if index % 5 != 0:
+            car = 0.0
+            for t in range(-2, 4):
+                ar = None if t == 1 and index == 3 else round(rng.gauss(0, 0.02), 6)
+                car = round(car + (ar or 0.0), 6)
+                filing_event_db.add(EventStudyResult(rcept_no=rcept_no, t=t, ar=ar, car=car))
+        for copy in range(index % 3):
+            filing_event_db.add(
+                EvidenceSnapshot(
+                    urn_id=f"urn:{rcept_no}:{copy}",
+                    snapshot_hash="h",
+                    payload={"document": {"receiptNo": rcept_no}},
+                )
+            )
+    filing_event_db.commit()
+    return filing_event_db
+
+
+def _fetch(db, **kwargs):
+    params = dict(
+        limit=50,
+        offset=0,
+        window_end=2,
+        event_types=["BUYBACK"],
+        ticker=None,
+        markets=None,
+        cap_buckets=None,
+        start_date=None,
+        end_date=None,
+        search_query=None,
+    )
+    params.update(kwargs)
+    return event_study_service.fetch_event_rows(db, **params)
+
+
+def _expected(db, window_end):
+    expected = {}
+    for record in db.query(EventRecord):
+        series = sorted(
+            db.query(EventStudyResult).filter(EventStudyResult.rcept_no == record.rcept_no),
+            key=lambda row: row.t,
+        )
+        caar = next((float(row.car) for row in series if row.t == window_end), None)
+        peak = None
+        for row in series:
+            if row.ar is not None and (peak is None or abs(float(row.ar)) > peak[0]):
+                peak = (abs(float(row.ar)), row.t)
+        evidence = int(record.rcept_no[1:]) % 3 or None
+        expected[record.rcept_no] = (record.event_date, caar, peak[1] if peak else None, evidence)
+    return expected
+
+
+def test_fused_query_matches_per_row_metrics(events_db):
+    response = _fetch(events_db)
+    expected = _expected(events_db, 2)
+
+    assert response.total == 11 and response.next_cursor is None
+    order = sorted(expected, key=lambda key: (expected[key][0] is not None, expected[key][0] or date.min, key), reverse=True)
+    assert [event.receipt_no for event in response.events] == order
+    for event in response.events:
+        _, caar, peak_day, evidence = expected[event.receipt_no]
+        if caar is None:
+            assert event.caar is None
+        else:
+            assert event.caar == pytest.approx(caar, abs=1e-9)
+        assert event.aar_peak_day == peak_day
+        assert event.evidence_count == evidence
+
+
+def test_keyset_pages_cover_the_offset_listing(events_db):
+    full = [event.receipt_no for event in _fetch(events_db).events]
+
+    seen = []
+    cursor = None
+    while True:
+        page = _fetch(events_db, limit=3, cursor=cursor, approximate_total=True)
+        assert page.total == 11 and not page.total_is_estimate
+        seen.extend(event.receipt_no for event in page.events)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert seen == full
+    offset_page = _fetch(events_db, limit=3, offset=3)
+    assert [event.receipt_no for event in offset_page.events] == full[3:6]
+
+    with pytest.raises(ValueError):
+        _fetch(events_db, cursor="not-a-cursor")
@@ -0,0 +1,217 @@
+import math
+import random
+from datetime import date, timedelta
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+from models.event_study import EventRecord, EventStudyResult, Price
+from services import event_study_engine, event_study_service, price_series_cache
+
+
+@pytest.fixture(autouse=True)
+def _fresh_price_cache():
+    price_series_cache.reset_price_series_cache()
+    yield
+    price_series_cache.reset_price_series_cache()
+
+
+def _legacy_event_returns(asset, bench, event_day, estimation_window, event_window):
+    """Day-by-day market model the engine replaced, kept here as the reference."""
+
+    estimation_start = event_day + timedelta(days=estimation_window[0])
+    estimation_end = event_day + timedelta(days=estimation_window[1])
+    event_end = event_day + timedelta(days=event_window[1])
+    asset = {day: value for day, value in asset.items() if estimation_start <= day <= event_end}
+    bench = {day: value for day, value in bench.items() if estimation_start <= day <= event_end}
+
+    xs, ys = [], []
+    current = estimation_start
+    while current <= estimation_end:
+        if current in asset and current in bench:
+            xs.append(bench[current])
+            ys.append(asset[current])
+        current += timedelta(days=1)
+    if len(xs) < 30:
+        return None
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    denominator = sum((x - mean_x) ** 2 for x in xs)
+    beta = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / denominator if denominator else 0.0
+    alpha = mean_y - beta * mean_x
+
+    series = {}
+    cumulative = 0.0
+    current = event_day + timedelta(days=event_window[0])
+    while current <= event_end:
+        if current in asset and current in bench:
+            ar_value = asset[current] - (alpha + beta * bench[current])
+            cumulative += ar_value
+            series[(current - event_day).days] = (round(ar_value, 6), round(cumulative, 6))
+        current += timedelta(days=1)
+    return series
+
+
+def _random_returns(rng, start, days, missing_rate):
+    return {
+        start + timedelta(days=offset): rng.gauss(0.0005, 0.02)
+        for offset in range(days)
+        if rng.random() > missing_rate
+    }
+
+
+def test_engine_matches_day_by_day_market_model():
+    rng = random.Random(7)
+    start = date(2023, 1, 1)
+    days = 400
+    bench = _random_returns(rng, start, days, 0.25)
+    tickers = [f"T{index:03d}" for index in range(12)]
+    assets = {ticker: _random_returns(rng, start, days, rng.choice([0.1, 0.3, 0.9])) for ticker in tickers}
+
+    symbols = tickers + ["BENCH"]
+    values = np.full((len(symbols), days), np.nan)
+    for row, symbol in enumerate(symbols):
+        for day, value in (bench if symbol == "BENCH" else assets[symbol]).items():
+            values[row, (day - start).days] = value
+    matrix = event_study_engine.ReturnMatrix(start=start, symbols=tuple(symbols), values=values)
+
+    estimation_window, event_window = (-120, -11), (-5, 20)
+    events = [
+        event_study_engine.EventSpec(key=f"E{index}", symbol=rng.choice(tickers + ["UNKNOWN"]), event_date=start + timedelta(days=rng.randint(0, days + 10)))
+        for index in range(80)
+    ]
+    results, errors = event_study_engine.compute_event_returns(
+        matrix,
+        events,
+        benchmark_symbol="BENCH",
+        estimation_window=estimation_window,
+        event_window=event_window,
+    )
+
+    assert results and errors
+    for event in events:
+        expected = _legacy_event_returns(assets.get(event.symbol, {}), bench, event.event_date, estimation_window, event_window)
+        if expected is None:
+            assert event.key in errors
+            continue
+        actual = results[event.key].as_series()
+        assert actual.keys() == expected.keys()
+        for t, (ar_value, car_value) in expected.items():
+            assert actual[t][0] == pytest.approx(ar_value, abs=2e-6)
+            assert actual[t][1] == pytest.approx(car_value, abs=2e-6)
+
+
+def _legacy_stats(samples, significance):
+    n = len(samples)
+    m = sum(samples) / n
+    variance = sum((value - m) ** 2 for value in samples) / max(1, n - 1)
+    se = math.sqrt(variance) / math.sqrt(n)
+    ci = NormalDist().inv_cdf(1 - significance / 2) * se if se > 0 else 0.0
+    p_value = 2 * (1 - NormalDist().cdf(abs(m / se))) if se > 0 else 1.0
+    return {"n": n, "hit_rate": sum(1 for v in samples if v > 0) / n, "mean": m, "ci_lo": m - ci, "ci_hi": m + ci, "p_value": p_value}
+
+
+def _legacy_histogram(samples, bins=12):
+    lo, hi = min(samples), max(samples)
+    if lo == hi:
+        lo, hi = lo - 0.01, hi + 0.01
+    width = (hi - lo) / bins
+    output = []
+    for i in range(bins):
+        start = lo + width * i
+        end = start + width
+        output.append({"bin": i, "range": [round(start, 6), round(end, 6)], "count": sum(1 for v in samples if start <= v < end)})
+    return output
+
+
+@pytest.mark.parametrize("samples", [[0.05], [0.01, 0.01, 0.01], [random.Random(3).gauss(0, 0.05) for _ in range(501)]])
+def test_summary_stats_and_histogram_match_reference(samples):
+    stats = event_study_engine.summary_stats(samples, significance=0.1)
+    expected = _legacy_stats(samples, 0.1)
+    assert stats.keys() == expected.keys()
+    for key, value in expected.items():
+        assert stats[key] == pytest.approx(value, rel=1e-9, abs=1e-12)
+    assert event_study_engine.histogram(samples) == _legacy_histogram(samples)
+
+
+def test_cohort_partial_skips_incomplete_events():
+    rows = [
+        ("A", -1, 0.01, 0.01), ("A", 0, 0.02, 0.03), ("A", 1, None, 0.03),
+        ("B", -1, 0.03, 0.03), ("B", 0, -0.02, 0.01), ("B", 1, 0.04, 0.05),
+        ("C", -1, 0.5, 0.5), ("C", 1, 0.5, 1.0),
+    ]
+    cohort = event_study_engine.CohortPartial.from_rows(["A", "B", "C"], rows, start=-1, end=1)
+
+    assert cohort.aar().tolist() == pytest.approx([0.02, 0.0, 0.04])
+    values, counts = cohort.car_samples()
+    assert sorted(values.tolist()) == pytest.approx([0.03, 0.05])
+    assert counts.tolist() == [1, 1]
+
+
+def test_merged_partials_match_a_single_pass():
+    rng = random.Random(5)
+    rows = []
+    for index in range(300):
+        car = 0.0
+        for t in range(-2, 3):
+            ar = round(rng.gauss(0, 0.02), 6)
+            car = round(car + ar, 6)
+            rows.append((f"E{index}", t, ar, car))
+    keys = [f"E{index}" for index in range(300)]
+    whole = event_study_engine.CohortPartial.from_rows(keys, rows, start=-2, end=2)
+
+    merged = event_study_engine.CohortPartial(width=5)
+    for part in range(3):
+        part_keys = set(keys[part::3])
+        part_rows = [row for row in rows if row[0] in part_keys]
+        chunk = event_study_engine.CohortPartial.from_rows(sorted(part_keys), part_rows, start=-2, end=2)
+        merged.merge(event_study_engine.CohortPartial.from_json(chunk.to_json()))
+
+    samples = [row[3] for row in rows if row[1] == 2]
+    assert merged.n == whole.n == 300
+    assert merged.aar() == pytest.approx(whole.aar(), abs=1e-12)
+    expected = event_study_engine.summary_stats(samples, significance=0.1)
+    for key, value in merged.stats(significance=0.1).items():
+        assert value == pytest.approx(expected[key], rel=1e-9, abs=1e-12)
+    assert merged.histogram() == event_study_engine.histogram(samples)
+
+
+@pytest.mark.usefixtures("filing_event_db")
+def test_update_event_study_series_batches_events(db_session):
+    rng = random.Random(11)
+    start = date(2024, 1, 1)
+    for symbol in ("005930", "000660", "BENCH"):
+        for offset in range(90):
+            db_session.add(Price(symbol=symbol, date=start + timedelta(days=offset), ret=rng.gauss(0, 0.01)))
+    for index, ticker in enumerate(["005930", "000660", "005930"]):
+        db_session.add(
+            EventRecord(
+                rcept_no=f"R{index}",
+                corp_code="00000000",
+                ticker=ticker,
+                event_type="BUYBACK",
+                event_date=start + timedelta(days=60 + index * 5),
+            )
+        )
+    db_session.commit()
+
+    created = event_study_service.update_event_study_series(
+        db_session,
+        benchmark_symbol="BENCH",
+        estimation_window=(-50, -6),
+        event_window=(-2, 3),
+        batch_size=2,
+    )
+
+    assert created == 3 * 6
+    event = db_session.get(EventRecord, "R2")
+    series = event_study_service._compute_event_returns(
+        db_session,
+        event=event,
+        benchmark_symbol="BENCH",
+        estimation_window=(-50, -6),
+        event_window=(-2, 3),
+    )
+    stored = db_session.query(EventStudyResult).filter(EventStudyResult.rcept_no == "R2").all()
+    assert {row.t: (float(row.ar), float(row.car)) for row in stored} == pytest.approx(series)
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+
+from services import hybrid_search, vector_service
+from services.circuit_breaker import CircuitBreaker
+from services.kv_tier import SqliteBlobTier
+from services.rerank_cache import RerankScoreCache
+
+
+def _row(document_id: str, score: float) -> SimpleNamespace:
+    return SimpleNamespace(document_id=document_id, title=f"title-{document_id}", published_at=None, bm25_score=score)
+
+
+@pytest.fixture()
+def fake_legs(monkeypatch: pytest.MonkeyPatch) -> Dict[str, Any]:
+    state: Dict[str, Any] = {"dense_delay": 0.0, "bm25_delay": {}, "dense_calls": []}
+
+    def _fake_dense(**kwargs: Any) -> vector_service.VectorSearchResult:
+        state["dense_calls"].append(kwargs.get("filing_id"))
+        if kwargs.get("filing_id") is None:
+            time.sleep(state["dense_delay"])
+            return vector_service.VectorSearchResult(
+                filing_id="dense-1",
+                chunks=[{"id": "c1"}],
+                related_filings=[{"filing_id": "dense-1", "score": 0.9}],
+            )
+        return vector_service.VectorSearchResult(filing_id=kwargs["filing_id"], chunks=[{"id": "c2"}])
+
+    def _fake_bm25(_engine: Any, statement: Any, _params: Dict[str, Any], _timeout_ms: int) -> List[Any]:
+        leg = "filings" if statement is hybrid_search._FILINGS_QUERY else "news"
+        time.sleep(state["bm25_delay"].get(leg, 0.0))
+        return [_row(f"{leg}-1", 0.5)]
+
+    monkeypatch.setattr(vector_service, "query_vector_store", _fake_dense)
+    monkeypatch.setattr(hybrid_search, "_run_bm25_leg", _fake_bm25)
+    monkeypatch.setattr(hybrid_search, "_RERANKER", None)
+    for breaker in hybrid_search._BM25_BREAKERS.values():
+        breaker.reset()
+    monkeypatch.setattr(hybrid_search, "HYBRID_DENSE_TIMEOUT_MS", 200)
+    monkeypatch.setattr(hybrid_search, "HYBRID_BM25_TIMEOUT_MS", 200)
+    return state
+
+
+def _db() -> SimpleNamespace:
+    return SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name="sqlite")))
+
+
+def test_concurrent_legs_fuse_all_results(fake_legs: Dict[str, Any]) -> None:
+    result = hybrid_search.query_hybrid(
+        _db(), "배당 확대", filing_id=None, top_k=3, max_filings=5, filters={}, concurrent=True
+    )
+
+    related = {entry["filing_id"] for entry in result.related_filings}
+    assert related == {"dense-1", "filings-1", "news-1"}
+
+
+def test_slow_bm25_leg_degrades_without_disabling_bm25(fake_legs: Dict[str, Any]) -> None:
+    fake_legs["bm25_delay"]["news"] = 0.5
+
+    result = hybrid_search.query_hybrid(
+        _db(), "배당 확대", filing_id=None, top_k=3, max_filings=5, filters={}, concurrent=True
+    )
+
+    related = {entry["filing_id"] for entry in result.related_filings}
+    assert related == {"dense-1", "filings-1"}
+    assert hybrid_search.bm25_breaker_states() == {"filings": "closed", "news": "closed"}
+
+
+def test_slow_dense_leg_falls_back_to_bm25_fusion(fake_legs: Dict[str, Any]) -> None:
+    fake_legs["dense_delay"] = 0.5
+
+    legs = hybrid_search._run_retrieval_legs(
+        _db(), "배당", filing_id=None, top_k=3, dense_cap=5, filters={}, multi_mode=False
+    )
+
+    assert legs.status == {"dense": "timeout", "filings": "ok", "news": "ok"}
+    assert legs.dense is None
+
+
+def test_bm25_errors_open_leg_breaker(fake_legs: Dict[str, Any], monkeypatch: pytest.MonkeyPatch) -> None:
+    from sqlalchemy.exc import OperationalError
+
+    def _failing_bm25(_engine: Any, statement: Any, _params: Dict[str, Any], _timeout_ms: int) -> List[Any]:
+        if statement is hybrid_search._NEWS_QUERY:
+            raise OperationalError("SELECT", {}, Exception("connection reset"))
+        return [_row("filings-1", 0.5)]
+
+    monkeypatch.setattr(hybrid_search, "_run_bm25_leg", _failing_bm25)
+    monkeypatch.setattr(hybrid_search, "_bm25_probe", lambda _engine: None)
+    for _ in range(hybrid_search.BM25_BREAKER_FAILURE_THRESHOLD):
+        hybrid_search._run_retrieval_legs(
+            _db(), "배당", filing_id=None, top_k=3, dense_cap=5, filters={}, multi_mode=False
+        )
+
+    assert hybrid_search.bm25_breaker_states() == {"filings": "closed", "news": "open"}
+    legs = hybrid_search._run_retrieval_legs(
+        _db(), "배당", filing_id=None, top_k=3, dense_cap=5, filters={}, multi_mode=False
+    )
+    assert "news" not in legs.status
+
+
+
+def test_dense_error_releases_half_open_bm25_trial(fake_legs: Dict[str, Any], monkeypatch: pytest.MonkeyPatch) -> None:
+    breaker = CircuitBreaker("bm25-news-test", failure_threshold=1, cooldown_seconds=0.0)
+    breaker.record_failure()
+    monkeypatch.setitem(hybrid_search._BM25_BREAKERS, "news", breaker)
+
+    def _broken_dense(**_kwargs: Any) -> None:
+        raise RuntimeError("vector store down")
+
+    monkeypatch.setattr(vector_service, "query_vector_store", _broken_dense)
+    with pytest.raises(RuntimeError, match="vector store down"):
+        hybrid_search._run_retrieval_legs(
+            _db(), "배당", filing_id=None, top_k=3, dense_cap=5, filters={}, multi_mode=False
+        )
+
+    assert breaker.state == "half_open"
+    assert breaker.allow_request()
+
+class _FakeSession:
+    def __init__(self) -> None:
+        self.requests: List[List[str]] = []
+
+    def post(self, _url: str, *, json: Dict[str, Any], timeout: float) -> Any:
+        ids = [record["id"] for record in json["records"]]
+        self.requests.append(ids)
+        scores = {"a": 0.2, "b": 0.9, "c": 0.5}
+        records = sorted(
+            ({"id": doc_id, "score": scores.get(doc_id, 0.1)} for doc_id in ids),
+            key=lambda entry: entry["score"],
+            reverse=True,
+        )
+        return SimpleNamespace(raise_for_status=lambda: None, json=lambda: {"records": records})
+
+
+def _reranker(session: _FakeSession) -> hybrid_search.VertexReranker:
+    reranker = hybrid_search.VertexReranker(
+        ranking_config="projects/p/locations/global/rankingConfigs/default",
+        model="ranker",
+        top_n=10,
+        timeout_ms=1000,
+        cache_ttl=60,
+        cache=RerankScoreCache(max_entries=8, ttl_seconds=60),
+    )
+    reranker._session = session
+    return reranker
+
+
+def _profile(doc_id: str, content: str = "body") -> hybrid_search.DocumentProfile:
+    return hybrid_search.DocumentProfile(document_id=doc_id, doc_type="filing", title=doc_id, content=content)
+
+
+def test_reranker_only_sends_uncached_documents() -> None:
+    session = _FakeSession()
+    reranker = _reranker(session)
+
+    first = reranker.rerank("삼성전자 실적", [_profile("a"), _profile("b")])
+    second = reranker.rerank("삼성전자  실적", [_profile("a"), _profile("b"), _profile("c")])
+
+    assert session.requests == [["a", "b"], ["c"]]
+    assert [entry["id"] for entry in first] == ["b", "a"]
+    assert [entry["id"] for entry in second] == ["b", "c", "a"]
+
+
+def test_reranker_rescores_changed_documents() -> None:
+    session = _FakeSession()
+    reranker = _reranker(session)
+
+    reranker.rerank("q", [_profile("a"), _profile("b")])
+    reranker.rerank("q", [_profile("a", content="amended"), _profile("b")])
+    reranker.rerank("other", [_profile("a"), _profile("b")])
+
+    assert session.requests == [["a", "b"], ["a"], ["a", "b"]]
+
+
+def _sqlite_tier(path: str) -> SqliteBlobTier:
+    return SqliteBlobTier(path, table="rerank_score_cache", prefix="rrk:v1", ttl_seconds=60)
+
+
+def test_rerank_cache_is_bounded_and_shares_sqlite_tier(tmp_path) -> None:
+    path = str(tmp_path / "rerank.sqlite3")
+    cache = RerankScoreCache(max_entries=2, ttl_seconds=60, shared=_sqlite_tier(path))
+    cache.set_many({"k1": 0.1, "k2": 0.2, "k3": 0.3})
+    assert len(cache) == 2
+
+    other_worker = RerankScoreCache(max_entries=2, ttl_seconds=60, shared=_sqlite_tier(path))
+    assert other_worker.get_many(["k1", "k3", "missing"]) == {"k1": 0.1, "k3": 0.3}
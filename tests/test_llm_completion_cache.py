@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+
+import llm.llm_service as llm_service
+from services import kv_tier
+from services.kv_tier import MemoryBlobTier, SqliteBlobTier
+from services.llm_completion_cache import (
+    CompletionCache,
+    bypass_completion_cache,
+    completion_cache_key,
+    wants_bypass,
+)
+
+
+def _response(content: str) -> Any:
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=None)
+
+
+class _FakeLiteLLM:
+    def __init__(self, content: str) -> None:
+        self.content = content
+        self.calls: List[Dict[str, Any]] = []
+
+    def __call__(self, **kwargs: Any) -> Any:
+        self.calls.append(kwargs)
+        return _response(self.content)
+
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    cache = CompletionCache(MemoryBlobTier(max_entries=16, ttl_seconds=60))
+    monkeypatch.setattr(llm_service, "get_completion_cache", lambda: cache)
+    return cache
+
+
+def test_key_depends_on_model_messages_and_params() -> None:
+    messages = [{"role": "user", "content": "hello"}]
+    base = completion_cache_key("m", messages, {"response_format": {"type": "json_object"}})
+
+    assert base == completion_cache_key("m", list(messages), {"response_format": {"type": "json_object"}})
+    assert base != completion_cache_key("n", messages, {"response_format": {"type": "json_object"}})
+    assert base != completion_cache_key("m", [{"role": "user", "content": "bye"}], None)
+    assert base != completion_cache_key("m", messages, {"response_format": None})
+
+
+def test_json_task_is_served_from_cache(monkeypatch, memory_cache) -> None:
+    fake = _FakeLiteLLM('{"category": "earnings"}')
+    monkeypatch.setattr(llm_service.litellm, "completion", fake)
+
+    first = llm_service.classify_filing_content("# 분기보고서")
+    second = llm_service.classify_filing_content("# 분기보고서")
+
+    assert len(fake.calls) == 1
+    assert first == second
+    assert second["category"] == "earnings"
+    assert second["model_used"] == llm_service.CLASSIFICATION_MODEL
+
+
+def test_uncached_tasks_and_bypass_hit_the_provider(monkeypatch, memory_cache) -> None:
+    fake = _FakeLiteLLM('{"ok": true}')
+    monkeypatch.setattr(llm_service.litellm, "completion", fake)
+    messages = [{"role": "user", "content": "x"}]
+
+    llm_service._json_completion("m", messages)
+    llm_service._json_completion("m", messages)
+    assert len(fake.calls) == 2
+
+    llm_service._json_completion("m", messages, cache_task="filing_extraction")
+    with bypass_completion_cache():
+        llm_service._json_completion("m", messages, cache_task="filing_extraction")
+    llm_service._json_completion("m", messages, cache_task="filing_extraction")
+    assert len(fake.calls) == 4
+
+
+
+def test_unparseable_json_replies_are_not_cached(monkeypatch, memory_cache) -> None:
+    fake = _FakeLiteLLM('{"category": "earn')
+    monkeypatch.setattr(llm_service.litellm, "completion", fake)
+    messages = [{"role": "user", "content": "x"}]
+
+    assert "error" in llm_service._json_completion("m", messages, cache_task="filing_extraction")
+    fake.content = '{"category": "earnings"}'
+    result = llm_service._json_completion("m", messages, cache_task="filing_extraction")
+
+    assert len(fake.calls) == 2
+    assert result["category"] == "earnings"
+    llm_service._json_completion("m", messages, cache_task="filing_extraction")
+    assert len(fake.calls) == 2
+
+def test_memory_tier_expires_and_evicts(monkeypatch) -> None:
+    clock = {"now": 0.0}
+    monkeypatch.setattr(kv_tier.time, "monotonic", lambda: clock["now"])
+    tier = MemoryBlobTier(max_entries=2, ttl_seconds=60)
+    tier.set_many([("a", b"1"), ("b", b"2")], ttl_seconds=10)
+    tier.set_many([("c", b"3")], ttl_seconds=10)
+    assert tier.get_many(["a", "c"]) == [None, b"3"]
+
+    clock["now"] = 11.0
+    assert tier.get_many(["b"]) == [None]
+
+
+def test_sqlite_backend_round_trip(tmp_path: Path) -> None:
+    path = str(tmp_path / "llm.sqlite3")
+    cache = CompletionCache(SqliteBlobTier(path, table="llm_completion_cache", prefix="llmc:v1", ttl_seconds=60))
+    cache.set("self_check", "k", '{"verdict": "ok"}', "judge_model")
+
+    assert cache.get("self_check", "k") == ('{"verdict": "ok"}', "judge_model")
+    assert cache.get("self_check", "other") is None
+
+
+def test_bypass_header_detection() -> None:
+    assert wants_bypass({"X-LLM-Cache": "Bypass"})
+    assert not wants_bypass({"X-LLM-Cache": "use"})
+    assert not wants_bypass({})
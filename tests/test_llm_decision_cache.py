@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from services.llm_decision_cache import DecisionCache, prompt_version
+
+
+def _counting(payload: Dict[str, Any]):
+    calls: List[int] = []
+
+    def _compute() -> Dict[str, Any]:
+        calls.append(1)
+        return dict(payload)
+
+    return _compute, calls
+
+
+def test_exact_hits_share_normalized_queries() -> None:
+    cache = DecisionCache("test", version=lambda: "v1", ttl_seconds=60)
+    compute, calls = _counting({"category": "financial_query"})
+
+    first = cache.get_or_compute("삼성전자  최근 공시", compute)
+    second = cache.get_or_compute(" 삼성전자 최근 공시 ", compute)
+
+    assert first == second == {"category": "financial_query"}
+    assert len(calls) == 1
+
+
+def test_error_payloads_are_not_cached() -> None:
+    cache = DecisionCache("test", version=lambda: "v1", ttl_seconds=60)
+    compute, calls = _counting({"category": "financial_query", "error": "timeout"})
+
+    cache.get_or_compute("질문", compute)
+    cache.get_or_compute("질문", compute)
+
+    assert len(calls) == 2
+    assert len(cache) == 0
+
+
+def test_version_change_invalidates_entries() -> None:
+    version = {"value": "v1"}
+    cache = DecisionCache("test", version=lambda: version["value"], ttl_seconds=60)
+    cache.set("안녕", {"category": "chitchat"})
+    assert cache.get("안녕") == {"category": "chitchat"}
+
+    version["value"] = "v2"
+    cache.clear()
+    assert cache.get("안녕") is None
+
+
+def test_prompt_version_tracks_prompt_and_model() -> None:
+    def prompt_a(query: str):
+        return [{"role": "system", "content": "A"}, {"role": "user", "content": query}]
+
+    def prompt_b(query: str):
+        return [{"role": "system", "content": "B"}, {"role": "user", "content": query}]
+
+    assert prompt_version("m", prompt_a) == prompt_version("m", prompt_a)
+    assert prompt_version("m", prompt_a) != prompt_version("m", prompt_b)
+    assert prompt_version("m", prompt_a) != prompt_version("n", prompt_a)
+
+
+def test_expired_entries_are_dropped(monkeypatch) -> None:
+    clock = {"now": 100.0}
+    monkeypatch.setattr("services.llm_decision_cache.time.monotonic", lambda: clock["now"])
+    cache = DecisionCache("test", version=lambda: "v1", ttl_seconds=10)
+    cache.set("q", {"category": "chitchat"})
+
+    clock["now"] = 111.0
+    assert cache.get("q") is None
+    assert len(cache) == 0
+
+
+def test_similarity_tier_reuses_near_duplicate_queries() -> None:
+    vectors = {
+        "삼성전자 실적 어때": [1.0, 0.0, 0.0],
+        "삼성전자 실적 어때?": [0.99, 0.01, 0.0],
+        "날씨 알려줘": [0.0, 1.0, 0.0],
+    }
+    cache = DecisionCache(
+        "test",
+        version=lambda: "v1",
+        ttl_seconds=60,
+        similarity_threshold=0.95,
+        embed_fn=lambda text: vectors[text],
+    )
+    cache.set("삼성전자 실적 어때", {"category": "financial_query"})
+
+    assert cache.get("삼성전자 실적 어때?") == {"category": "financial_query"}
+    assert cache.get("날씨 알려줘") is None
+
+
+def test_cached_payloads_are_isolated_copies() -> None:
+    cache = DecisionCache("test", version=lambda: "v1", ttl_seconds=60)
+    cache.set("q", {"metadata": {"a": 1}})
+    hit = cache.get("q")
+    hit["metadata"]["a"] = 2
+
+    assert cache.get("q") == {"metadata": {"a": 1}}
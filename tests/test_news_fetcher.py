@@ -1,7 +1,20 @@
+import threading
 import time
 import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
 
 from ingest import news_fetcher
+from ingest.news_feed_state import FeedState, FeedStateStore, reset_feed_state_store
+from services.kv_tier import SqliteBlobTier
+
+
+@pytest.fixture(autouse=True)
+def _fresh_feed_state():
+    reset_feed_state_store()
+    yield
+    reset_feed_state_store()
 
 
 class DummyEntry(dict):
@@ -34,7 +47,7 @@ def test_fetch_news_batch(monkeypatch):
         bozo=0,
     )
 
-    monkeypatch.setattr(news_fetcher, "_parse_feed_retry", lambda url: result)
+    monkeypatch.setattr(news_fetcher, "_parse_feed_retry", lambda url, *args, **kwargs: result)
 
     articles = news_fetcher.fetch_news_batch(limit_per_feed=2)
     assert len(articles) == 1
@@ -55,3 +68,139 @@ def test_fetch_news_batch_fallback(monkeypatch):
 
     result = news_fetcher.fetch_news_batch(limit_per_feed=1, use_mock_fallback=True)
     assert result is sentinel
+
+
+RSS_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>{title}</title>{items}</channel></rss>"""
+ITEM_TEMPLATE = "<item><title>{title}</title><link>{link}</link><guid>{guid}</guid><description>본문</description></item>"
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802 - http.server API
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, self.headers.get("If-None-Match")))
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        try:
+            time.sleep(server.delay)
+            feed = server.feeds[self.path]
+            if self.headers.get("If-None-Match") == feed["etag"]:
+                self.send_response(304)
+                self.send_header("ETag", feed["etag"])
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            items = "".join(
+                ITEM_TEMPLATE.format(title=f"기사 {guid}", link=f"https://news.example.com/{guid}", guid=guid)
+                for guid in feed["guids"]
+            )
+            body = RSS_TEMPLATE.format(title=self.path, items=items).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("ETag", feed["etag"])
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, *args):  # pragma: no cover - keep test output quiet
+        pass
+
+
+@pytest.fixture()
+def feed_server(monkeypatch):
+    if news_fetcher.feedparser is None:
+        pytest.skip("feedparser is not installed")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FeedHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.active = 0
+    server.peak = 0
+    server.delay = 0.0
+    server.feeds = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    server.base = f"http://{host}:{port}"
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_fetch_news_batch_uses_validators_and_seen_set(feed_server, monkeypatch):
+    feed_server.feeds = {
+        "/a.xml": {"etag": '"a1"', "guids": ["a1", "a2"]},
+        "/b.xml": {"etag": '"b1"', "guids": ["b1"]},
+    }
+    monkeypatch.setenv("NEWS_FEEDS", f"{feed_server.base}/a.xml,{feed_server.base}/b.xml")
+
+    first = news_fetcher.fetch_news_batch(limit_per_feed=5)
+    assert [article.url for article in first] == [
+        "https://news.example.com/a1",
+        "https://news.example.com/a2",
+        "https://news.example.com/b1",
+    ]
+    first.commit()
+
+    # Feed a is unchanged (304); feed b changed its ETag but only adds one new item.
+    feed_server.feeds["/b.xml"] = {"etag": '"b2"', "guids": ["b2", "b1"]}
+    second = news_fetcher.fetch_news_batch(limit_per_feed=5)
+    assert [article.url for article in second] == ["https://news.example.com/b2"]
+    second.commit()
+    assert ("/a.xml", '"a1"') in feed_server.requests
+
+    assert news_fetcher.fetch_news_batch(limit_per_feed=5) == []
+
+
+def test_feed_state_is_only_saved_once_the_batch_is_committed(feed_server, monkeypatch):
+    feed_server.feeds = {
+        "/a.xml": {"etag": '"a1"', "guids": ["a1"]},
+        "/b.xml": {"etag": '"b1"', "guids": ["b1"]},
+    }
+    monkeypatch.setenv("NEWS_FEEDS", f"{feed_server.base}/a.xml,{feed_server.base}/b.xml")
+
+    # Never committed, e.g. the worker died before the articles were enqueued.
+    news_fetcher.fetch_news_batch(limit_per_feed=5)
+    batch = news_fetcher.fetch_news_batch(limit_per_feed=5)
+    assert [article.url for article in batch] == ["https://news.example.com/a1", "https://news.example.com/b1"]
+    assert ("/a.xml", '"a1"') not in feed_server.requests
+
+    # Only feed b's article was enqueued; feed a keeps its old state and is fetched again.
+    batch.commit(failed=[batch[0]])
+    retry = news_fetcher.fetch_news_batch(limit_per_feed=5)
+    assert [article.url for article in retry] == ["https://news.example.com/a1"]
+    assert ("/b.xml", '"b1"') in feed_server.requests
+
+
+def test_fetch_news_batch_limits_connections_per_host(feed_server, monkeypatch):
+    feed_server.delay = 0.05
+    feed_server.feeds = {f"/{index}.xml": {"etag": f'"{index}"', "guids": [f"g{index}"]} for index in range(6)}
+    monkeypatch.setenv("NEWS_FEEDS", ",".join(f"{feed_server.base}/{index}.xml" for index in range(6)))
+    monkeypatch.setenv("NEWS_FEED_CONCURRENCY", "6")
+    monkeypatch.setenv("NEWS_FEED_PER_HOST_CONNECTIONS", "2")
+
+    articles = news_fetcher.fetch_news_batch(limit_per_feed=5)
+
+    assert [article.url for article in articles] == [f"https://news.example.com/g{index}" for index in range(6)]
+    assert feed_server.peak == 2
+
+
+def test_sqlite_feed_state_survives_a_new_store(tmp_path):
+    path = str(tmp_path / "feed_state.sqlite3")
+    state = FeedState(etag='"v1"')
+    state.remember(["g1", "g2"])
+    FeedStateStore(SqliteBlobTier(path, table="news_feed_state", prefix="news:feed-state:v1", ttl_seconds=60)).set(
+        "https://example.com/rss", state
+    )
+
+    reader = FeedStateStore(SqliteBlobTier(path, table="news_feed_state", prefix="news:feed-state:v1", ttl_seconds=60))
+    loaded = reader.get("https://example.com/rss")
+    assert loaded.etag == '"v1"' and loaded.has_seen(["g2"])
+    assert reader.get("https://example.com/other").etag is None
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import time
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+
+from parse import tasks
+from services import news_vector_writer, vector_service
+from services.news_vector_writer import NewsVectorEntry, NewsVectorWriter, reset_news_vector_writer
+
+
+def _entry(index: int) -> NewsVectorEntry:
+    return NewsVectorEntry(
+        key=f"news:{index}",
+        text=f"기사 본문 {index}",
+        metadata={"source_type": "news", "source_id": str(index)},
+        label=f"https://news.example.com/{index}",
+    )
+
+
+class _Recorder:
+    def __init__(self, *, bad_embed: set[str] | None = None, bad_upsert: set[str] | None = None) -> None:
+        self.embed_calls: List[int] = []
+        self.upsert_calls: List[int] = []
+        self.points: dict[str, Any] = {}
+        self.bad_embed = bad_embed or set()
+        self.bad_upsert = bad_upsert or set()
+
+    def embed(self, texts):
+        self.embed_calls.append(len(texts))
+        if self.bad_embed.intersection(texts):
+            raise RuntimeError("provider rejected input")
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def upsert(self, points):
+        self.upsert_calls.append(len(points))
+        if any(point.payload["chunk_id"] in self.bad_upsert for point in points):
+            raise RuntimeError("qdrant rejected point")
+        for point in points:
+            self.points[point.id] = point.payload
+
+
+def test_writer_batches_embeddings_and_upserts_with_stable_ids() -> None:
+    recorder = _Recorder()
+    with NewsVectorWriter(max_batch=4, max_delay=0, embed=recorder.embed, upsert=recorder.upsert) as writer:
+        for index in range(10):
+            writer.add(_entry(index))
+
+    assert recorder.embed_calls == [4, 4, 2]
+    assert recorder.upsert_calls == [4, 4, 2]
+    expected_id = vector_service.point_id_for_chunk("news:3", "news:3#0", "기사 본문 3")
+    assert recorder.points[expected_id]["filing_id"] == "news:3"
+    assert recorder.points[expected_id]["source_id"] == "3"
+
+
+def test_writer_isolates_per_article_failures() -> None:
+    recorder = _Recorder(bad_embed={"기사 본문 2"}, bad_upsert={"news:5#0"})
+    writer = NewsVectorWriter(max_batch=16, max_delay=0, embed=recorder.embed, upsert=recorder.upsert)
+    for index in range(8):
+        writer.add(_entry(index))
+
+    result = writer.flush()
+
+    assert set(result.failed) == {"news:2", "news:5"}
+    assert sorted(result.stored) == sorted(f"news:{index}" for index in range(8) if index not in (2, 5))
+    assert len(recorder.points) == 6
+
+
+def test_writer_flushes_after_time_window() -> None:
+    recorder = _Recorder()
+    results = []
+    writer = NewsVectorWriter(
+        max_batch=100,
+        max_delay=0.05,
+        embed=recorder.embed,
+        upsert=recorder.upsert,
+        on_result=results.append,
+    )
+    writer.add(_entry(1))
+    writer.add(_entry(2))
+    deadline = time.monotonic() + 2.0
+    while not results and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert results and sorted(results[0].stored) == ["news:1", "news:2"]
+    assert recorder.embed_calls == [2]
+    assert len(writer) == 0
+
+
+def _article(index: int) -> dict:
+    return {
+        "source": "연합뉴스",
+        "url": f"https://news.example.com/{index}",
+        "headline": f"헤드라인 {index}",
+        "summary": f"요약 {index}",
+        "published_at": datetime(2025, 1, 2, tzinfo=timezone.utc).isoformat(),
+        "original_text": f"본문 {index}",
+    }
+
+
+@pytest.fixture()
+def news_task(monkeypatch: pytest.MonkeyPatch) -> _Recorder:
+    recorder = _Recorder()
+
+    def _persist(db, article, analysis):
+        return SimpleNamespace(
+            id=uuid.uuid5(uuid.NAMESPACE_URL, article.url),
+            headline=article.headline,
+            summary=article.summary,
+            source=article.source,
+            ticker=article.ticker,
+            url=article.url,
+            published_at=article.published_at,
+            topics=analysis["topics"],
+            sentiment=analysis["sentiment"],
+            source_reliability=0.9,
+        )
+
+    monkeypatch.setattr(tasks, "_open_session", lambda: SimpleNamespace(rollback=lambda: None, close=lambda: None))
+    monkeypatch.setattr(tasks, "_persist_news_signal", _persist)
+    monkeypatch.setattr(
+        tasks.llm_service, "analyze_news_article", lambda text: {"sentiment": 0.4, "topics": ["반도체"]}
+    )
+    monkeypatch.setattr(news_vector_writer, "embed_texts", recorder.embed)
+    monkeypatch.setattr(vector_service, "upsert_points", recorder.upsert)
+    reset_news_vector_writer()
+    yield recorder
+    reset_news_vector_writer()
+
+
+def test_news_task_flushes_its_own_writer_before_returning(news_task: _Recorder) -> None:
+    result = tasks.process_news_article(_article(1))
+
+    assert result["status"] == "processed"
+    assert news_task.embed_calls == [1]
+    (payload,) = news_task.points.values()
+    assert payload["summary"] == "요약 1"
+    assert payload["topics"] == ["반도체"]
+    assert payload["sentiment"] == "positive"
+    assert news_vector_writer._WRITER is None
+
+
+def test_news_task_batches_on_the_shared_writer_when_enabled(
+    news_task: _Recorder, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(tasks, "NEWS_VECTOR_SHARED_WRITER", True)
+    monkeypatch.setattr(news_vector_writer, "NEWS_VECTOR_FLUSH_SECONDS", 0.05)
+
+    tasks.process_news_article(_article(1))
+    tasks.process_news_article(_article(2))
+    assert news_task.embed_calls == []
+
+    deadline = time.monotonic() + 2.0
+    while not news_task.points and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert news_task.embed_calls == [2]
+    assert len(news_task.points) == 2
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+
+from parse import pdf_analysis, table_extraction
+from parse.pdf_parser import extract_chunks, iter_chunks
+from parse.table_extraction import TableExtractor
+
+
+class _FakeTable:
+    def __init__(self, rows: List[List[str]]) -> None:
+        self._rows = rows
+        self.bbox = (50.0, 600.0, 300.0, 660.0)
+        self.cells = [(50.0, 600.0, 175.0, 620.0)]
+
+    def extract(self) -> List[List[str]]:
+        return self._rows
+
+
+class _FakePage:
+    def __init__(self, number: int) -> None:
+        self.number = number
+        self.rect = SimpleNamespace(width=600.0, height=800.0)
+        self.find_table_calls = 0
+
+    def get_text(self, mode: str) -> Any:
+        if mode == "blocks":
+            return [
+                (50.0, 60.0, 550.0, 80.0, f"매출액이 전년 대비 크게 증가했습니다 page {self.number}", 0, 0),
+                (50.0, 700.0, 550.0, 720.0, f"1) 주석 {self.number}", 1, 0),
+            ]
+        return {"blocks": [{"type": 1, "bbox": [320, 600, 380, 660], "image": b"png"}] if self.number % 2 else []}
+
+    def find_tables(self) -> Any:
+        self.find_table_calls += 1
+        if self.number % 3:
+            return SimpleNamespace(tables=[])
+        return SimpleNamespace(tables=[_FakeTable([["구분", "금액"], ["배당금", f"{self.number * 100}"]])])
+
+
+class _FakeDocument:
+    def __init__(self, page_count: int) -> None:
+        self.pages = [_FakePage(index + 1) for index in range(page_count)]
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def __getitem__(self, index: int) -> _FakePage:
+        return self.pages[index]
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture()
+def documents() -> List[_FakeDocument]:
+    return []
+
+
+@pytest.fixture()
+def fake_pdf(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, documents: List[_FakeDocument]) -> str:
+    path = tmp_path / "report.pdf"
+    path.write_bytes(b"%PDF-1.4")
+
+    def _open(_path: str) -> _FakeDocument:
+        document = _FakeDocument(9)
+        documents.append(document)
+        return document
+
+    monkeypatch.setattr(pdf_analysis, "fitz", SimpleNamespace(open=_open))
+    monkeypatch.setattr(pdf_analysis, "PDF_FIGURE_SPILL_DIR", str(tmp_path / "figures"))
+    return str(path)
+
+
+def _find_table_calls(documents: List[_FakeDocument]) -> List[int]:
+    (document,) = documents
+    return [page.find_table_calls for page in document.pages]
+
+
+def test_page_ranges_cover_every_page_in_order() -> None:
+    assert pdf_analysis._page_ranges(7, 3) == [(0, 3), (3, 6), (6, 7)]
+    assert pdf_analysis._page_ranges(0, 3) == []
+
+
+def test_parallel_analysis_matches_serial_output(fake_pdf: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    serial = extract_chunks(fake_pdf, workers=1)
+
+    monkeypatch.setattr(pdf_analysis, "PDF_PARSE_PARALLEL_MIN_PAGES", 1)
+    parallel = extract_chunks(fake_pdf, workers=3)
+
+    assert parallel == serial
+    assert [chunk["id"] for chunk in serial][:3] == ["pdf-text-1-1", "pdf-footnote-1-2", "pdf-figure-1-3"]
+
+
+def test_table_extractor_reuses_shared_analysis(fake_pdf: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    analyses = pdf_analysis.analyze_document(fake_pdf, workers=1)
+    chunks = extract_chunks(fake_pdf, analyses=analyses)
+
+    def _fail(_path: str) -> Any:
+        raise AssertionError("document should not be reopened")
+
+    monkeypatch.setattr(pdf_analysis, "fitz", SimpleNamespace(open=_fail))
+    tables = TableExtractor().extract(fake_pdf, analyses=analyses)
+
+    assert [(table.page_number, table.table_index) for table in tables] == [(3, 1), (6, 1), (9, 1)]
+    assert tables[0].table_type == "dividend"
+    assert sum(1 for chunk in chunks if chunk["type"] == "table") == 3
+
+
+def test_table_extractor_stops_detecting_at_the_table_cap(fake_pdf: str, documents: List[_FakeDocument]) -> None:
+    tables = TableExtractor(max_tables=1).extract(fake_pdf, workers=1)
+
+    assert [table.page_number for table in tables] == [3]
+    assert _find_table_calls(documents) == [1, 1, 1, 0, 0, 0, 0, 0, 0]
+
+
+def test_table_extractor_stops_detecting_when_the_budget_runs_out(
+    fake_pdf: str, documents: List[_FakeDocument], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    clock = iter(range(0, 1000, 10))
+    monkeypatch.setattr(table_extraction, "time", SimpleNamespace(perf_counter=lambda: float(next(clock))))
+
+    tables = TableExtractor(time_budget_seconds=5.0).extract(fake_pdf, workers=1)
+
+    assert [table.page_number for table in tables] == [3]
+    assert _find_table_calls(documents) == [1, 1, 1, 0, 0, 0, 0, 0, 0]
+
+
+def test_figures_are_spilled_and_metadata_keeps_only_hash(fake_pdf: str, tmp_path: Path) -> None:
+    chunks = extract_chunks(fake_pdf)
+    figures = [chunk for chunk in chunks if chunk["type"] == "figure"]
+
+    assert len(figures) == 5
+    metadata = figures[0]["metadata"]
+    assert "image" not in metadata
+    assert metadata["image_bytes"] == 3
+    assert (tmp_path / "figures" / metadata["image_sha256"]).read_bytes() == b"png"
+
+
+def test_iter_chunks_closes_document_when_consumer_stops_early(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "report.pdf"
+    path.write_bytes(b"%PDF-1.4")
+    closed: List[bool] = []
+
+    class _TrackedDocument(_FakeDocument):
+        def close(self) -> None:
+            closed.append(True)
+
+    monkeypatch.setattr(pdf_analysis, "fitz", SimpleNamespace(open=lambda _path: _TrackedDocument(9)))
+    stream = iter_chunks(str(path), spill_dir="")
+    first = next(stream)
+    stream.close()
+
+    assert first["id"] == "pdf-text-1-1"
+    assert closed == [True]
@@ -0,0 +1,111 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from models.event_study import Price
+from services import market_data, price_series_cache
+from services.price_series_cache import PriceSeriesCache
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    price_series_cache.reset_price_series_cache()
+    yield
+    price_series_cache.reset_price_series_cache()
+
+
+@pytest.fixture()
+def prices(filing_event_db):
+    start = date(2024, 1, 1)
+    for offset in range(60):
+        day = start + timedelta(days=offset)
+        if day.weekday() >= 5:
+            continue
+        filing_event_db.add(Price(symbol="005930", date=day, close=100 + offset, adj_close=None, ret=0.001 * offset))
+        if offset % 3:
+            filing_event_db.add(Price(symbol="000660", date=day, close=50 + offset, adj_close=49 + offset, ret=None))
+    filing_event_db.commit()
+    return filing_event_db
+
+
+@pytest.fixture()
+def fetch_log(monkeypatch):
+    calls = []
+    original = price_series_cache._fetch
+
+    def recording_fetch(db, symbols, first, last, loaded_at):
+        calls.append((tuple(symbols), date.fromordinal(first), date.fromordinal(last)))
+        return original(db, symbols, first, last, loaded_at)
+
+    monkeypatch.setattr(price_series_cache, "_fetch", recording_fetch)
+    return calls
+
+
+def test_frame_is_columnar_and_matches_rows(prices, fetch_log):
+    cache = PriceSeriesCache(settle_days=0)
+    frame = cache.load(prices, ["005930", "000660", "MISSING"], date(2024, 1, 5), date(2024, 1, 20))
+
+    assert fetch_log == [(("005930", "000660", "MISSING"), date(2024, 1, 5), date(2024, 1, 20))]
+    assert frame.close.shape == (len(frame.dates), 3)
+    assert list(frame.dates) == sorted(frame.dates)
+    assert "MISSING" not in frame and frame.points("MISSING") == []
+
+    rows = (
+        prices.query(Price)
+        .filter(Price.symbol == "000660", Price.date >= date(2024, 1, 5), Price.date <= date(2024, 1, 20))
+        .order_by(Price.date)
+        .all()
+    )
+    points = frame.points("000660")
+    assert [point.date for point in points] == [row.date for row in rows]
+    assert [point.adj_close for point in points] == [float(row.adj_close) for row in rows]
+    assert all(point.ret is None for point in points)
+
+    matrix = frame.returns_by_calendar_day(date(2024, 1, 5), date(2024, 1, 20))
+    assert matrix.shape == (3, 16)
+    assert np.isnan(matrix[0, 1])  # 2024-01-06 is a Saturday
+    assert matrix[0, 0] == pytest.approx(0.004)
+
+
+def test_extending_a_cached_range_fetches_only_the_missing_edges(prices, fetch_log):
+    cache = PriceSeriesCache(settle_days=0)
+    cache.load(prices, ["005930", "000660"], date(2024, 1, 10), date(2024, 1, 20))
+    fetch_log.clear()
+
+    frame = cache.load(prices, ["005930", "000660"], date(2024, 1, 5), date(2024, 1, 25))
+
+    assert sorted(fetch_log) == [
+        (("005930", "000660"), date(2024, 1, 5), date(2024, 1, 9)),
+        (("005930", "000660"), date(2024, 1, 21), date(2024, 1, 25)),
+    ]
+    expected = PriceSeriesCache().load(prices, ["005930"], date(2024, 1, 5), date(2024, 1, 25)).points("005930")
+    assert frame.points("005930") == expected
+
+    fetch_log.clear()
+    cache.load(prices, ["005930"], date(2024, 1, 7), date(2024, 1, 22))
+    assert fetch_log == []
+
+
+def test_recent_days_are_refetched_and_cache_is_bounded(prices, fetch_log):
+    today = date.today()
+    cache = PriceSeriesCache(max_symbols=2, settle_days=2)
+    cache.load(prices, ["005930"], today - timedelta(days=10), today)
+    fetch_log.clear()
+
+    cache.load(prices, ["005930"], today - timedelta(days=10), today)
+    assert fetch_log == [(("005930",), today - timedelta(days=1), today)]
+
+    cache.load(prices, ["000660", "A", "B"], date(2024, 1, 1), date(2024, 1, 31))
+    assert len(cache) == 2
+
+
+def test_normalized_returns_load_all_tickers_in_one_query(prices, fetch_log, monkeypatch):
+    monkeypatch.setattr(market_data, "MIN_DATA_POINTS", 3)
+    result = market_data.get_normalized_returns(prices, ["5930", "000660"], period_days=15, end_date=date(2024, 2, 29))
+
+    assert len(fetch_log) == 1
+    assert set(result) == {"005930", "000660"}
+    series = result["005930"]["data"]
+    assert series[0]["value"] == 0.0
+    assert len(result["005930"]["returns"]) == len(series)
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from services.rag_pre_retrieval import PreRetrievalStages
+
+
+def test_stages_run_concurrently_and_return_results() -> None:
+    barrier = threading.Barrier(3, timeout=2)
+
+    def _stage(value):
+        def _run():
+            barrier.wait()
+            return value
+
+        return _run
+
+    stages = PreRetrievalStages(
+        classify=lambda: {"category": "financial_query"},
+        route=_stage("route"),
+        judge=_stage({"decision": "pass"}),
+        retrieve=_stage("speculative"),
+        speculation_key=False,
+    )
+
+    assert stages.classifier_result() == {"category": "financial_query"}
+    stages.start_financial_stages()
+    assert stages.route_decision() == "route"
+    assert stages.judge_result() == {"decision": "pass"}
+    assert stages.take_retrieval(False) == "speculative"
+
+
+def test_router_and_judge_wait_for_a_financial_turn() -> None:
+    calls = []
+
+    stages = PreRetrievalStages(
+        classify=lambda: {"category": "small_talk"},
+        route=lambda: calls.append("route"),
+        judge=lambda: calls.append("judge"),
+    )
+
+    assert stages.classifier_result() == {"category": "small_talk"}
+    stages.discard()
+    assert calls == []
+    with pytest.raises(RuntimeError):
+        stages.route_decision()
+
+
+def test_judge_runs_inline_when_financial_stages_were_not_started() -> None:
+    calls = []
+
+    def _judge():
+        calls.append("judge")
+        return {"decision": "pass"}
+
+    stages = PreRetrievalStages(classify=lambda: {}, route=None, judge=_judge)
+
+    assert stages.judge_result() == {"decision": "pass"}
+    assert calls == ["judge"]
+
+
+def test_unconsumed_judge_is_discarded() -> None:
+    # A financial turn answered by the intent gate never reads the judge: the
+    # call may already have been spent, but its result is dropped.
+    calls = []
+
+    stages = PreRetrievalStages(
+        classify=lambda: {"category": "financial_query"},
+        route=lambda: "route",
+        judge=lambda: calls.append("judge") or {"decision": "block"},
+    )
+    stages.start_financial_stages()
+    stages.route_decision()
+    stages.discard()
+
+    assert calls in ([], ["judge"])
+
+
+def test_speculation_used_only_when_key_matches() -> None:
+    stages = PreRetrievalStages(
+        classify=lambda: {},
+        route=None,
+        judge=lambda: None,
+        retrieve=lambda: "speculative",
+        speculation_key=False,
+    )
+    assert stages.take_retrieval(True) is None
+    assert stages.take_retrieval(False) is None
+
+    stages = PreRetrievalStages(
+        classify=lambda: {},
+        route=None,
+        judge=lambda: None,
+        retrieve=lambda: "speculative",
+        speculation_key=False,
+    )
+    assert stages.take_retrieval(False) == "speculative"
+
+
+def test_failed_speculation_falls_back_to_serial() -> None:
+    def _boom():
+        raise RuntimeError("vector store down")
+
+    stages = PreRetrievalStages(
+        classify=lambda: {},
+        route=None,
+        judge=lambda: None,
+        retrieve=_boom,
+        speculation_key=False,
+    )
+    assert stages.take_retrieval(False) is None
@@ -0,0 +1,83 @@
+import uuid
+
+import pytest
+
+from models.filing import Filing
+from services.receipt_dedup_service import BloomFilter, BloomReceiptDeduper, DatabaseReceiptDeduper
+
+
+@pytest.fixture()
+def filings_db(filing_event_db):
+    for receipt in ("20240101000001", "20240101000003"):
+        filing_event_db.add(Filing(id=uuid.uuid4(), receipt_no=receipt, corp_name="테스트"))
+    filing_event_db.flush()
+    return filing_event_db
+
+
+def test_database_deduper_checks_only_candidates_in_batches(filings_db):
+    statements = []
+    deduper = DatabaseReceiptDeduper(filings_db, batch_size=2)
+    original_query = filings_db.query
+
+    def counting_query(*args, **kwargs):
+        statements.append(args)
+        return original_query(*args, **kwargs)
+
+    filings_db.query = counting_query
+    candidates = ["20240101000001", "20240101000002", "20240101000003", "20240101000004", "20240101000002"]
+
+    assert deduper.filter_new(candidates) == ["20240101000002", "20240101000004"]
+    assert len(statements) == 2
+    # Receipts already handed out in this run are not offered again.
+    assert deduper.filter_new(["20240101000002", "20240101000005"]) == ["20240101000005"]
+
+
+def test_database_deduper_reset_forgets_the_previous_run(filings_db):
+    deduper = DatabaseReceiptDeduper(filings_db)
+    assert deduper.filter_new(["20240101000002"]) == ["20240101000002"]
+
+    deduper.reset()
+
+    assert deduper._seen == set()
+    # Nothing was stored for it, so the next run offers it again.
+    assert deduper.filter_new(["20240101000002", "20240101000001"]) == ["20240101000002"]
+
+
+def test_bloom_filter_round_trips_through_snapshot(tmp_path):
+    bloom = BloomFilter.for_capacity(1000, 0.01)
+    receipts = [f"2024{index:010d}" for index in range(500)]
+    for receipt in receipts:
+        bloom.add(receipt)
+    path = tmp_path / "receipts.bloom"
+    bloom.save(str(path))
+
+    loaded = BloomFilter.load(str(path))
+    assert loaded.count == 500
+    assert all(receipt in loaded for receipt in receipts)
+    false_positives = sum(f"2023{index:010d}" in loaded for index in range(5000))
+    assert false_positives < 150
+
+
+def test_bloom_deduper_builds_snapshot_and_skips_database_for_misses(filings_db, tmp_path):
+    path = tmp_path / "receipts.bloom"
+    deduper = BloomReceiptDeduper(filings_db, str(path), capacity=1000, error_rate=0.001)
+    assert path.exists()
+
+    statements = []
+    original_query = filings_db.query
+
+    def counting_query(*args, **kwargs):
+        statements.append(args)
+        return original_query(*args, **kwargs)
+
+    filings_db.query = counting_query
+    assert deduper.filter_new(["20240101000007", "20240101000008"]) == ["20240101000007", "20240101000008"]
+    assert statements == []
+
+    assert deduper.filter_new(["20240101000001", "20240101000009"]) == ["20240101000009"]
+    assert len(statements) == 1
+
+    deduper.add("20240101000009")
+    deduper.save()
+    reloaded = BloomReceiptDeduper(filings_db, str(path))
+    assert "20240101000009" in reloaded.bloom
@@ -0,0 +1,150 @@
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from ingest import dart_seed
+from ingest.staged_pipeline import Stage, run_staged_pipeline
+from services.receipt_dedup_service import DatabaseReceiptDeduper
+
+
+def _jitter(value):
+    time.sleep(random.uniform(0, 0.003))
+    return value
+
+
+def test_pipeline_delivers_results_in_input_order():
+    delivered = []
+    stats = run_staged_pipeline(
+        range(200),
+        [
+            Stage("double", lambda value: _jitter(value * 2), workers=4),
+            Stage("increment", lambda value: _jitter(value + 1), workers=3),
+        ],
+        delivered.append,
+        queue_size=4,
+    )
+
+    assert delivered == [value * 2 + 1 for value in range(200)]
+    assert stats.stages["double"].processed == 200
+    assert stats.stages["sink"].processed == 200
+
+
+def test_pipeline_bounds_items_in_flight():
+    lock = threading.Lock()
+    produced = []
+    in_flight_peak = [0]
+    sunk = []
+
+    def source():
+        for value in range(100):
+            with lock:
+                produced.append(value)
+                in_flight_peak[0] = max(in_flight_peak[0], len(produced) - len(sunk))
+            yield value
+
+    def slow_sink(value):
+        time.sleep(0.002)
+        with lock:
+            sunk.append(value)
+
+    run_staged_pipeline(source(), [Stage("noop", _jitter, workers=4)], slow_sink, queue_size=3)
+
+    assert sunk == list(range(100))
+    # queue_size * (stages + 1) admitted items, plus one waiting for admission
+    # and one inside the sink.
+    assert in_flight_peak[0] <= 3 * 2 + 2
+
+
+def test_pipeline_raises_stage_error_after_earlier_items_and_cleans_up():
+    delivered = []
+    cleaned = []
+
+    def explode(value):
+        if value == 7:
+            raise RuntimeError("boom")
+        return _jitter(value)
+
+    with pytest.raises(RuntimeError, match="boom"):
+        run_staged_pipeline(
+            range(50),
+            [Stage("explode", explode, workers=4), Stage("noop", _jitter, workers=2)],
+            delivered.append,
+            queue_size=2,
+            cleanup=cleaned.append,
+        )
+
+    assert delivered == list(range(7))
+    assert 7 in cleaned
+    assert not set(cleaned) & set(delivered)
+
+
+class _StaticDeduper(DatabaseReceiptDeduper):
+    def __init__(self, stored):
+        super().__init__(db=None, batch_size=7)
+        self.stored = set(stored)
+
+    def stored_receipts(self, receipts):
+        return self.stored.intersection(receipts)
+
+
+class _Download:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return None
+
+    def discard(self):
+        pass
+
+
+def test_seed_recent_filings_writes_in_listing_order(monkeypatch):
+    listing = [{"rcept_no": f"2024{index:06d}", "corp_code": "00126380", "report_nm": "보고서"} for index in range(30)]
+    listing.append(dict(listing[3]))
+
+    class _FakeClient:
+        def list_recent_filings(self, **_kwargs):
+            return listing
+
+        def make_viewer_url(self, receipt_no):
+            return f"viewer/{receipt_no}"
+
+        def make_document_url(self, receipt_no):
+            return f"document/{receipt_no}"
+
+        def stream_document(self, receipt_no):
+            time.sleep(random.uniform(0, 0.004))
+            return _Download()
+
+    inserted = []
+    enqueued = []
+
+    def fake_insert(_db, values):
+        inserted.append(values["receipt_no"])
+        return SimpleNamespace(id=values["id"], urls=values["urls"])
+
+    monkeypatch.setattr(dart_seed, "DartClient", _FakeClient)
+    monkeypatch.setattr(
+        dart_seed,
+        "parse_filing_bundle",
+        lambda receipt_no, data, save_dir, download_url: {"pdf": None, "xml": [], "download_url": download_url},
+    )
+    monkeypatch.setattr(dart_seed, "_insert_filing_record", fake_insert)
+    monkeypatch.setattr(dart_seed, "sync_additional_disclosures", lambda **_kwargs: None)
+    monkeypatch.setattr(dart_seed, "_enqueue_filing_task", enqueued.append)
+    monkeypatch.setattr(dart_seed.storage_service, "is_enabled", lambda: False)
+
+    created = dart_seed.seed_recent_filings(
+        db=SimpleNamespace(),
+        deduper=_StaticDeduper([listing[0]["rcept_no"]]),
+        workers={"fetch": 4, "parse": 2, "upload": 2},
+        queue_size=2,
+    )
+
+    expected = [meta["rcept_no"] for meta in listing[1:30]]
+    assert inserted == expected
+    assert created == len(expected)
+    assert len(enqueued) == len(expected)
@@ -0,0 +1,145 @@
+import hashlib
+import io
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from ingest.file_downloader import parse_filing_bundle
+from ingest.streaming_download import DownloadTooLargeError, stream_download
+
+PAYLOAD = bytes(range(256)) * 400  # 100 KiB
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802 - http.server API
+        server = self.server
+        start = 0
+        range_header = self.headers.get("Range")
+        with server.lock:
+            server.ranges.append(range_header)
+            drop = server.drop_after.pop(0) if server.drop_after else None
+            skew = server.range_skew.pop(0) if range_header and server.range_skew else 0
+        if range_header and server.honour_ranges:
+            start = int(range_header.split("=")[1].split("-")[0]) + skew
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(PAYLOAD) - 1}/{len(PAYLOAD)}")
+        else:
+            self.send_response(200)
+        body = PAYLOAD[start:]
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        if drop is not None:
+            self.wfile.write(body[:drop])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pragma: no cover - keep test output quiet
+        pass
+
+
+@pytest.fixture()
+def range_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RangeHandler)
+    server.lock = threading.Lock()
+    server.ranges = []
+    server.drop_after = []
+    server.range_skew = []
+    server.honour_ranges = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address
+        server.url = f"http://{host}:{port}/bundle.zip"
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_stream_download_writes_file_and_checksum(range_server, tmp_path):
+    with httpx.Client() as client:
+        download = stream_download(client, range_server.url, dest_dir=str(tmp_path), chunk_size=4096)
+
+    with download:
+        assert download.read_bytes() == PAYLOAD
+        assert download.size == len(PAYLOAD)
+        assert download.sha256 == hashlib.sha256(PAYLOAD).hexdigest()
+        assert download.head == PAYLOAD[:4096]
+        assert download.resumed == 0
+    assert not download.path.exists()
+
+
+def test_stream_download_resumes_with_range(range_server, tmp_path):
+    range_server.drop_after = [30000, 20000]
+    with httpx.Client() as client:
+        download = stream_download(client, range_server.url, dest_dir=str(tmp_path), chunk_size=4096)
+
+    with download:
+        assert download.read_bytes() == PAYLOAD
+        assert download.sha256 == hashlib.sha256(PAYLOAD).hexdigest()
+        assert download.resumed == 2
+    assert range_server.ranges[0] is None
+    assert range_server.ranges[1].startswith("bytes=")
+    assert len(range_server.ranges) == 3
+
+
+def test_stream_download_restarts_when_range_is_ignored(range_server, tmp_path):
+    range_server.drop_after = [30000]
+    range_server.honour_ranges = False
+    with httpx.Client() as client:
+        download = stream_download(client, range_server.url, dest_dir=str(tmp_path), chunk_size=4096)
+
+    with download:
+        assert download.read_bytes() == PAYLOAD
+        assert download.sha256 == hashlib.sha256(PAYLOAD).hexdigest()
+    assert range_server.ranges[1].startswith("bytes=")
+
+
+def test_stream_download_retries_a_misaligned_range(range_server, tmp_path):
+    range_server.drop_after = [30000]
+    range_server.range_skew = [512]
+    with httpx.Client() as client:
+        download = stream_download(
+            client, range_server.url, dest_dir=str(tmp_path), chunk_size=4096, resume_attempts=2
+        )
+
+    with download:
+        assert download.read_bytes() == PAYLOAD
+        assert download.resumed == 2
+    assert [value.startswith("bytes=") for value in range_server.ranges[1:]] == [True, True]
+    assert range_server.ranges[1] == range_server.ranges[2]
+
+
+def test_stream_download_enforces_size_cap(range_server, tmp_path):
+    with httpx.Client() as client:
+        with pytest.raises(DownloadTooLargeError):
+            stream_download(client, range_server.url, dest_dir=str(tmp_path), max_bytes=1024)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_parse_filing_bundle_extracts_from_disk(tmp_path):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("20240101000001.xml", "<DOCUMENT>본문</DOCUMENT>")
+        archive.writestr("attach/report.pdf", b"%PDF-1.4 test")
+    bundle_path = tmp_path / "bundle.zip"
+    bundle_path.write_bytes(buffer.getvalue())
+
+    from_disk = parse_filing_bundle("20240101000001", bundle_path, str(tmp_path / "disk"))
+    from_bytes = parse_filing_bundle("20240101000001", buffer.getvalue(), str(tmp_path / "bytes"))
+
+    assert from_disk is not None and from_bytes is not None
+    assert [path.split("disk")[-1] for path in from_disk["xml"]] == [path.split("bytes")[-1] for path in from_bytes["xml"]]
+    assert from_disk["pdf"].endswith("report.pdf")
+    with open(from_disk["xml"][0], encoding="utf-8") as handle:
+        assert handle.read() == "<DOCUMENT>본문</DOCUMENT>"
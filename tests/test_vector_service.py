@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+
+from services import vector_service
+
+
+class _FakeQdrant:
+    def __init__(self) -> None:
+        self.points: Dict[str, Dict[str, Any]] = {}
+        self.calls: List[Dict[str, Any]] = []
+
+    def upsert(self, *, collection_name: str, points: List[Any], wait: bool) -> None:
+        self.calls.append({"collection": collection_name, "count": len(points), "wait": wait})
+        for point in points:
+            self.points[point.id] = point.payload
+
+
+@pytest.fixture()
+def fake_qdrant(monkeypatch: pytest.MonkeyPatch) -> _FakeQdrant:
+    client = _FakeQdrant()
+    monkeypatch.setattr(vector_service, "_client", lambda: client)
+    monkeypatch.setattr(vector_service, "init_collection", lambda: None)
+    monkeypatch.setattr(vector_service, "EMBEDDING_BATCH_SIZE", 2)
+
+    def _fake_embedding(*, model: str, input: List[str]):
+        return SimpleNamespace(data=[{"embedding": [float(len(text)), 1.0]} for text in input])
+
+    monkeypatch.setattr(vector_service.litellm, "embedding", _fake_embedding)
+    return client
+
+
+def _chunks(count: int) -> List[Dict[str, Any]]:
+    return [{"id": f"chunk-{idx}", "content": f"본문 {idx}", "type": "text"} for idx in range(count)]
+
+
+def test_reingest_overwrites_existing_points(fake_qdrant: _FakeQdrant) -> None:
+    vector_service.store_chunk_vectors("filing-1", _chunks(5))
+    vector_service.store_chunk_vectors("filing-1", _chunks(5))
+
+    assert len(fake_qdrant.points) == 5
+    assert vector_service.point_id_for_chunk("filing-1", "chunk-0", "본문 0") in fake_qdrant.points
+
+
+def test_point_id_changes_with_content() -> None:
+    first = vector_service.point_id_for_chunk("filing-1", "chunk-0", "a")
+    assert first == vector_service.point_id_for_chunk("filing-1", "chunk-0", "a")
+    assert first != vector_service.point_id_for_chunk("filing-1", "chunk-0", "b")
+    assert first != vector_service.point_id_for_chunk("filing-2", "chunk-0", "a")
+
+
+def test_pipelined_mode_waits_only_on_final_batch(fake_qdrant: _FakeQdrant) -> None:
+    vector_service.store_chunk_vectors("filing-2", _chunks(5), pipelined=True)
+
+    assert [call["count"] for call in fake_qdrant.calls] == [2, 2, 1]
+    assert [call["wait"] for call in fake_qdrant.calls] == [False, False, True]
+    assert len(fake_qdrant.points) == 5
+
+
+class _RegistryQdrant:
+    def __init__(self, *, exists: bool = True, size: int = 1536) -> None:
+        from qdrant_client import models
+
+        self.get_calls = 0
+        self.created = False
+        self.indexes: List[str] = []
+        self._exists = exists
+        self._info = SimpleNamespace(
+            config=SimpleNamespace(
+                params=SimpleNamespace(vectors=models.VectorParams(size=size, distance=models.Distance.COSINE))
+            ),
+            payload_schema={"filing_id": object()},
+        )
+
+    def get_collection(self, *, collection_name: str):
+        from qdrant_client.http.exceptions import UnexpectedResponse
+
+        self.get_calls += 1
+        if not self._exists:
+            raise UnexpectedResponse(404, "Not Found", b"", None)
+        return self._info
+
+    def create_collection(self, *, collection_name: str, vectors_config) -> None:
+        self.created = True
+
+    def create_payload_index(self, *, collection_name: str, field_name: str, field_schema) -> None:
+        self.indexes.append(field_name)
+
+
+def test_collection_registry_memoizes_until_invalidated() -> None:
+    from services.vector_collection_registry import CollectionRegistry
+
+    registry = CollectionRegistry(revalidate_seconds=300)
+    client = _RegistryQdrant()
+
+    registry.ensure(client, vector_service.RAG_COLLECTION_SPEC)
+    registry.ensure(client, vector_service.RAG_COLLECTION_SPEC)
+    assert client.get_calls == 1
+    assert sorted(client.indexes) == ["source_type", "ticker"]
+
+    registry.invalidate(vector_service.COLLECTION_NAME)
+    registry.ensure(client, vector_service.RAG_COLLECTION_SPEC)
+    assert client.get_calls == 2
+
+
+def test_collection_registry_creates_missing_and_rejects_mismatch() -> None:
+    from services.vector_collection_registry import CollectionMismatchError, CollectionRegistry
+
+    registry = CollectionRegistry(revalidate_seconds=300)
+    missing = _RegistryQdrant(exists=False)
+    registry.ensure(missing, vector_service.RAG_COLLECTION_SPEC)
+    assert missing.created
+    assert registry.is_ready(vector_service.COLLECTION_NAME)
+
+    registry = CollectionRegistry(revalidate_seconds=300)
+    with pytest.raises(CollectionMismatchError):
+        registry.ensure(_RegistryQdrant(size=384), vector_service.RAG_COLLECTION_SPEC)
+    assert not registry.is_ready(vector_service.COLLECTION_NAME)
+
+
+def test_query_by_filings_embeds_once_and_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    embed_calls: List[str] = []
+
+    class _BatchQdrant:
+        def __init__(self) -> None:
+            self.batches: List[int] = []
+
+        def search_batch(self, *, collection_name: str, requests: List[Any]):
+            self.batches.append(len(requests))
+            results = []
+            for request in requests:
+                doc_id = request.filter.must[0].match.value
+                results.append(
+                    [
+                        SimpleNamespace(payload={"filing_id": doc_id, "chunk_id": f"{doc_id}-{idx}"}, score=score)
+                        for idx, score in enumerate((0.2, 0.9, 0.5))
+                    ]
+                )
+            return results
+
+    client = _BatchQdrant()
+    monkeypatch.setattr(vector_service, "_client", lambda: client)
+    monkeypatch.setattr(vector_service, "init_collection", lambda: None)
+    monkeypatch.setattr(
+        vector_service, "embed_text", lambda text, model_name=None: embed_calls.append(text) or [0.1, 0.2]
+    )
+
+    grouped = vector_service.query_vector_store_by_filings("질문", ["a", "b", "a"], top_k=2)
+
+    assert embed_calls == ["질문"]
+    assert client.batches == [2]
+    assert list(grouped) == ["a", "b"]
+    assert [chunk["chunk_id"] for chunk in grouped["a"]] == ["a-1", "a-2"]
@@ -2,7 +2,25 @@ import tempfile
 import unittest
 from pathlib import Path
 
-from parse.xml_parser import parse_xml_chunks
+from parse.xml_parser import extract_chunks_from_xml, parse_xml_chunks
+
+DART_LIKE_XML = """<?xml version="1.0" encoding="utf-8"?>
+<DOCUMENT xmlns:dart="urn:dart">
+  <BODY>
+    <SECTION-1>
+      <TITLE>제1장 회사의 개요</TITLE>
+      <P>회사는 반도체와 디스플레이 사업을 영위하고 있으며 <!-- memo -->전년 대비 매출이 증가하였습니다.</P>
+      <TABLE><TR><TD>매출액</TD><TD>1,000</TD></TR></TABLE>
+      <table><tr><td>영업이익</td><td>200</td></tr><tr><th>순이익</th><td>150</td></tr></table>
+      <ul><li>첫 번째 위험 요인</li><li>두 번째 위험 요인</li></ul>
+      <dart:NOTE class="footnote">주) 단위는 백만원입니다.</dart:NOTE>
+      <figure>그림 1. 사업 구조</figure>
+      <img src="chart.png"/>
+      <section><p>1.1 세부 내용</p><div>중첩된 문단 <![CDATA[원문 그대로]]> 입니다.</div></section>
+    </SECTION-1>
+  </BODY>
+</DOCUMENT>
+"""
 
 
 class XmlParserTests(unittest.TestCase):
@@ -27,6 +45,23 @@ class XmlParserTests(unittest.TestCase):
             self.assertTrue(any(chunk["type"] == "text" for chunk in chunks))
             self.assertTrue(any("paragraph" in chunk["section"] for chunk in chunks if chunk["type"] == "text"))
 
+    def test_stream_engine_matches_dom_engine(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            xml_path = Path(tmpdir) / "dart.xml"
+            xml_path.write_text(DART_LIKE_XML, encoding="utf-8")
+
+            dom_chunks = extract_chunks_from_xml([str(xml_path)], engine="dom")
+            stream_chunks = extract_chunks_from_xml([str(xml_path)], engine="stream")
+
+        self.assertEqual(stream_chunks, dom_chunks)
+        types = [chunk["type"] for chunk in stream_chunks]
+        for expected in ("text", "table", "list", "footnote", "figure"):
+            self.assertIn(expected, types)
+        tables = [chunk for chunk in stream_chunks if chunk["type"] == "table"]
+        # The first table is consumed before the second is emitted, so both sit at index 1.
+        self.assertEqual(tables[1]["metadata"]["xpath"], "DOCUMENT[1]/BODY[1]/SECTION-1[1]/table[1]")
+        self.assertEqual(tables[1]["metadata"]["table_rows"], [["영업이익", "200"], ["순이익", "150"]])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -11,12 +11,17 @@ except Exception:  # pragma: no cover
   CONTENT_TYPE_LATEST = "text/plain"
   generate_latest = None
 
+from core.env import env_bool
+from core.logging import get_logger
+from services import llm_completion_cache
 from services.plan_service import resolve_plan_context
 from web import routers
 from web.middleware.auth_context import auth_context_middleware
 from web.middleware.rbac import rbac_context_middleware
 from web.middleware.audit_trail import audit_trail_middleware
 
+logger = get_logger(__name__)
+
 app = FastAPI(
   title="Nuvien API",
   version="0.1.0",
@@ -26,6 +31,21 @@ app = FastAPI(
 )
 
 
+@app.on_event("startup")
+def warm_vector_collections():
+  """Pre-validate the RAG and LightMem Qdrant collections before serving traffic."""
+  if not env_bool("QDRANT_WARM_ON_STARTUP", True):
+    return
+  from services import vector_service
+  from services.memory import long_term_store
+
+  for label, ensure in (("rag", vector_service.init_collection), ("lightmem", long_term_store.ensure_collection)):
+    try:
+      ensure(force=True)
+    except Exception as exc:  # pragma: no cover - best effort, first request retries
+      logger.warning("Qdrant %s collection warm-up failed: %s", label, exc)
+
+
 @app.middleware("http")
 async def apply_auth_context(request: Request, call_next):
   """Attach authenticated user info (if present)."""
@@ -48,6 +68,15 @@ async def apply_rbac_context(request: Request, call_next):
   return await rbac_context_middleware(request, call_next)
 
 
+@app.middleware("http")
+async def apply_llm_cache_bypass(request: Request, call_next):
+  """Honour ``X-LLM-Cache: bypass`` so debugging requests skip the LLM completion cache."""
+  if not llm_completion_cache.wants_bypass(request.headers):
+    return await call_next(request)
+  with llm_completion_cache.bypass_completion_cache():
+    return await call_next(request)
+
+
 @app.middleware("http")
 async def track_sensitive_requests(request: Request, call_next):
   """Record audit trails for privileged or export endpoints."""